@@ -21,15 +21,214 @@ Repository: https://github.com/yourusername/glm-ocr-webui
 """
 
 # 标准库导入 | Standard Library Imports
-import gradio as gr  # Gradio Web UI 框架
-from ollama_client import OllamaOCR  # Ollama OCR 客户端
-from pypdf import PdfReader  # PDF 文件读取
-from datetime import datetime  # 日期时间处理
-import re  # 正则表达式
+import asyncio  # 异步 I/O
+import logging  # 日志
+import os  # 文件路径
+import threading  # 服务初始化锁
+import time  # 轮询间隔
+from concurrent.futures import Future, ThreadPoolExecutor  # 线程池
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import aclosing, closing, contextmanager  # 上下文管理器
+from dataclasses import dataclass  # 数据类
+from typing import TYPE_CHECKING, AsyncIterator, Iterator  # 类型提示
+from ollama_client import AsyncOllamaOCR, OllamaOCR  # Ollama OCR 客户端
+from src.handlers.doc_handler import extract_doc_text  # Word 文档处理
+from src.handlers.job_runner import FINISHED_STATES, JobRunner  # 后台任务
+from src.handlers.pdf_handler import NO_TEXT_PLACEHOLDER, iter_pdf_page_texts  # PDF 页面处理
+from src.models.document_result import (  # 文档识别结果
+    KIND_DOCX,
+    KIND_IMAGE,
+    KIND_PDF,
+    DocumentResult,
+    FileResult,
+    PageResult,
+)
+from src.utils.concurrency import map_ordered  # 有界并发执行
+from src.utils.env import env_bool, env_int, env_str, load_env_file  # 环境变量解析
+from src.utils.memory import MemoryBudget, MemoryMonitor  # 内存预算
+from src.utils.metrics import (  # 运行指标
+    FILES_TOTAL,
+    REGISTRY,
+    REQUEST_SECONDS,
+    REQUESTS_IN_FLIGHT,
+    client_collector,
+    mount_metrics,
+    submit_queued,
+)
+from src.utils.scheduler import AsyncScheduledClient, FairScheduler, ScheduledClient  # 公平调度
+from src.utils.warmup import KeepWarmPinger  # 模型保活
+
+if TYPE_CHECKING:
+    # Gradio 只在构建界面时导入 | Gradio is only imported when the interface is built
+    import gradio as gr
+
+logger = logging.getLogger("glm_ocr_webui")
+
+
+def log_warm_up(results: list) -> None:
+    """
+    记录预热结果，模型加载耗时与推理耗时分开报告
+    Log warm-up results, reporting model load time separately from inference time
+
+    Args:
+        results: OllamaOCR.warm_up 的返回值 | Return value of OllamaOCR.warm_up
+    """
+    for result in results:
+        if result["error"]:
+            logger.warning(
+                "模型预热失败 | Model warm-up failed on %s: %s",
+                result["host"], result["error"]
+            )
+        elif result["inference_seconds"] is None:
+            logger.info(
+                "模型已加载 | Model loaded on %s: load %.2fs",
+                result["host"], result["load_seconds"]
+            )
+        else:
+            logger.info(
+                "模型预热完成 | Model warmed up on %s: load %.2fs, inference %.2fs",
+                result["host"], result["load_seconds"], result["inference_seconds"]
+            )
+
+
+def keep_warm_ping() -> None:
+    """
+    唤醒所有主机上的模型，任一主机失败时抛出异常（由保活线程记录）
+    Wake the model on every host, raising if any host fails (logged by the pinger)
+    """
+    errors = [
+        f"{result['host']}: {result['error']}"
+        for result in services().ocr_client.warm_up(probe=False)
+        if result["error"]
+    ]
+    if errors:
+        raise ConnectionError("; ".join(errors))
 
-# 初始化 OCR 客户端
-# Initialize OCR client
-ocr_client = OllamaOCR()
+
+@dataclass
+class AppServices:
+    """
+    Web UI 的 OCR 客户端、调度器和后台服务
+    OCR clients, scheduler and background services of the web UI
+
+    Attributes:
+        ocr_client: 同步 OCR 客户端 | Sync OCR client
+        async_ocr_client: 异步 OCR 客户端（与同步客户端共享缓存、主机和重试）
+                          Async OCR client (sharing cache, hosts and retries with the sync client)
+        scheduler: 按会话公平调度，未启用时为 None | Per-session fair scheduler, None when disabled
+        job_runner: 后台任务，未启用时为 None | Background jobs, None when disabled
+        keep_warm: 模型保活线程 | Model keep-warm pinger
+        memory_budget: 流式模式的内存预算 | Memory budget of the streaming mode
+        use_async_handlers: 处理函数是否使用 asyncio | Whether the handlers run on asyncio
+    """
+
+    ocr_client: OllamaOCR
+    async_ocr_client: AsyncOllamaOCR
+    scheduler: FairScheduler | None
+    job_runner: JobRunner | None
+    keep_warm: KeepWarmPinger
+    memory_budget: MemoryBudget
+    use_async_handlers: bool
+
+
+_services: AppServices | None = None
+_services_lock = threading.Lock()
+
+
+def _create_services() -> AppServices:
+    """
+    读取 .env，创建 OCR 客户端并启动后台服务
+    Read .env, create the OCR clients and start the background services
+
+    Environment Variables:
+        LOG_LEVEL: 日志级别（默认：INFO）
+        OCR_WARMUP / OCR_WARMUP_PROBE: 启动时预加载模型（默认：false / true）
+        OCR_ASYNC_HANDLERS: 处理函数使用 asyncio，需要 aiohttp（默认：false）
+    """
+    load_env_file()
+
+    # 日志配置 | Logging configuration
+    logging.basicConfig(
+        level=(env_str("LOG_LEVEL", "INFO") or "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    ocr_client = OllamaOCR()
+
+    # 启动时预加载模型，避免第一个用户承担冷启动（OCR_WARMUP=true）
+    # Preload the model at startup so the first user does not pay the cold start (OCR_WARMUP=true)
+    if env_bool("OCR_WARMUP", False):
+        log_warm_up(ocr_client.warm_up(probe=env_bool("OCR_WARMUP_PROBE", True)))
+
+    # 工作时间内定期唤醒模型（OCR_KEEP_WARM=true）
+    # Keep the model loaded during business hours (OCR_KEEP_WARM=true)
+    keep_warm = KeepWarmPinger(keep_warm_ping)
+    keep_warm.start()
+
+    # 异步 OCR 客户端（OCR_ASYNC_HANDLERS=true 时处理函数使用 asyncio，需要 aiohttp）
+    # Async OCR client (handlers run on asyncio when OCR_ASYNC_HANDLERS=true, requires aiohttp)
+    async_ocr_client = AsyncOllamaOCR(
+        cache=ocr_client.cache or False,
+        preprocessor=ocr_client.preprocessor or False,
+        tiler=ocr_client.tiler or False,
+        backends=ocr_client.backends,
+        retrier=ocr_client.retrier,
+        keep_alive=ocr_client.keep_alive,
+    )
+
+    # 按会话轮转分配 OCR 并发，大文件不会阻塞其他用户（OCR_FAIR_SCHEDULING=false 关闭）
+    # Share OCR concurrency round-robin between sessions so one big upload does
+    # not block everyone else (disable with OCR_FAIR_SCHEDULING=false)
+    scheduler = FairScheduler.from_env(ocr_client.max_workers)
+
+    # 缓存、主机和重试统计在抓取 /metrics 时读取
+    # Cache, host and retry statistics are read when /metrics is scraped
+    REGISTRY.register_collector(client_collector(ocr_client))
+
+    # 后台任务：每页结果写入 SQLite，重启后继续未完成的任务（OCR_JOBS=false 关闭）
+    # Background jobs: every page is stored in SQLite and unfinished jobs resume
+    # after a restart (disable with OCR_JOBS=false)
+    job_runner = JobRunner.from_env(
+        ocr_client, scheduler=scheduler, text_extractor=_job_doc_text
+    )
+    if job_runner is not None:
+        job_runner.resume()
+
+    return AppServices(
+        ocr_client=ocr_client,
+        async_ocr_client=async_ocr_client,
+        scheduler=scheduler,
+        job_runner=job_runner,
+        keep_warm=keep_warm,
+        # 流式模式的内存预算（OCR_STREAMING=true 时限制同时在内存中的 PDF 页面数）
+        # Memory budget for the streaming mode (with OCR_STREAMING=true the PDF
+        # pages held in memory at once are capped)
+        memory_budget=MemoryBudget.from_env(),
+        use_async_handlers=env_bool("OCR_ASYNC_HANDLERS", False),
+    )
+
+
+def services() -> AppServices:
+    """
+    首次调用时创建 OCR 客户端和后台服务（线程安全），之后返回同一实例
+    Create the OCR clients and background services on the first call
+    (thread-safe), then return the same instance
+
+    导入本模块不会读取 .env、创建客户端或启动线程；直接传入客户端调用
+    处理函数时也不会创建。
+    Importing this module neither reads .env, creates clients nor starts
+    threads; calling the processing functions with an explicit client does
+    not create them either.
+
+    Returns:
+        AppServices: Web UI 的客户端和后台服务 | Clients and background services of the web UI
+    """
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                _services = _create_services()
+    return _services
 
 
 def is_pdf_file(file_path: str) -> bool:
@@ -60,55 +259,278 @@ def is_doc_file(file_path: str) -> bool:
     return file_path.lower().endswith(('.doc', '.docx'))
 
 
-def process_doc_file(file_path: str) -> str:
+def _session_id(request: "gr.Request | None") -> str:
+    """Gradio 会话标识 | Gradio session identifier"""
+    return getattr(request, "session_hash", None) or "anonymous"
+
+
+def session_clients(request: "gr.Request | None" = None) -> tuple:
     """
-    从 Word 文档中提取文本内容
-    Extract text content from Word documents
+    为会话创建经过公平调度的同步和异步客户端
+    Build the fair-scheduled sync and async clients for a session
+
+    Args:
+        request: Gradio 请求，用于取得会话标识 | Gradio request carrying the session id
+
+    Returns:
+        tuple: (同步客户端, 异步客户端)，未启用调度时为全局客户端
+               (sync client, async client), the global clients when scheduling is off
+    """
+    app = services()
+    if app.scheduler is None:
+        return app.ocr_client, app.async_ocr_client
+    session = _session_id(request)
+    return (
+        ScheduledClient(app.ocr_client, app.scheduler, session),
+        AsyncScheduledClient(app.async_ocr_client, app.scheduler, session),
+    )
+
+
+def queue_status(request: "gr.Request | None" = None) -> str:
+    """
+    OCR 槽位已满时的排队位置和预计等待时间
+    Queue position and estimated wait while every OCR slot is busy
+
+    Returns:
+        str: 状态文本，无需排队时为空 | Status text, empty when there is no wait
+    """
+    scheduler = services().scheduler
+    if scheduler is None:
+        return ""
+    estimate = scheduler.estimate(_session_id(request))
+    if not estimate["busy"]:
+        return ""
+    eta = estimate["eta_seconds"]
+    eta_text = f"~{eta:.0f}s" if eta is not None else "未知 | unknown"
+    position = estimate["position"]
+    return (
+        f"⏳ 排队中：前面还有 {position} 个会话，预计等待 {eta_text}\n"
+        f"Queued: {position} session(s) ahead, estimated wait {eta_text}"
+    )
+
+
+# 等待第一个结果时刷新排队状态的间隔（秒）| Interval for refreshing the queue status until the first result (seconds)
+QUEUE_STATUS_INTERVAL = 1.0
+
+# 流结束标记 | End-of-stream marker
+_END = object()
+
+
+def with_queue_status(stream: Iterator, request: "gr.Request | None" = None,
+                      interval: float = QUEUE_STATUS_INTERVAL) -> Iterator:
+    """
+    产出 stream 的每一项；第一项到达前，每隔 interval 秒产出刷新后的排队状态（str）
+    Yield every item of stream; until the first one arrives, yield the
+    refreshed queue status (a str) every interval seconds
+
+    第一项在后台线程中等待，之后在调用线程中继续读取；提前关闭时 stream
+    也会被关闭（仍在等待第一项时，在其到达后关闭）。状态变为空时产出一次
+    空字符串，清除过时的排队提示。
+    The first item is awaited on a background thread and the rest are read
+    on the caller's thread; stream is closed when this generator is closed
+    early (once its first item arrives if it is still pending). An empty
+    string is yielded once when the status clears, removing the stale notice.
+    """
+    status = queue_status(request)
+    if not status:
+        yield from stream
+        return
+
+    first: Future = Future()
+
+    def _advance() -> None:
+        try:
+            first.set_result(next(stream, _END))
+        except BaseException as e:
+            first.set_exception(e)
+
+    threading.Thread(target=_advance, name="queue-wait", daemon=True).start()
+    try:
+        yield status
+        while True:
+            try:
+                item = first.result(timeout=interval)
+                break
+            except FutureTimeoutError:
+                refreshed = queue_status(request)
+                if refreshed != status:
+                    status = refreshed
+                    yield status
+        if item is _END:
+            return
+        yield item
+        yield from stream
+    finally:
+        # 不能关闭正在另一个线程中执行的生成器 | A generator running on another thread cannot be closed
+        first.add_done_callback(lambda _: stream.close())
+
+
+async def with_queue_status_async(stream: AsyncIterator, request: "gr.Request | None" = None,
+                                  interval: float = QUEUE_STATUS_INTERVAL) -> AsyncIterator:
+    """
+    with_queue_status 的异步版本
+    Async version of with_queue_status
+    """
+    status = queue_status(request)
+    async with aclosing(stream):
+        first = asyncio.ensure_future(anext(stream, _END))
+        try:
+            if status:
+                yield status
+            while status:
+                done, _ = await asyncio.wait({first}, timeout=interval)
+                if done:
+                    break
+                refreshed = queue_status(request)
+                if refreshed != status:
+                    status = refreshed
+                    yield status
+            item = await first
+        finally:
+            if not first.done():
+                # 等待取消完成后才能关闭 stream | stream can only be closed once the cancellation has finished
+                first.cancel()
+                await asyncio.wait({first})
+        if item is _END:
+            return
+        yield item
+        async for item in stream:
+            yield item
+
+
+@contextmanager
+def request_memory_monitor(source: str) -> Iterator[None]:
+    """
+    流式模式下记录一次转换期间进程常驻内存的峰值
+    In streaming mode, log the process's peak resident memory during one conversion
+    """
+    if not services().memory_budget.enabled:
+        yield
+        return
+    with MemoryMonitor() as monitor:
+        yield
+    logger.info(
+        "%s: 峰值内存 | peak RSS %s MB (+%s MB)",
+        os.path.basename(source), monitor.peak_mb, monitor.growth_mb,
+    )
+
+
+def file_type(file_path: str) -> str:
+    """
+    文件类型，用于指标标签（image/pdf/docx）
+    File type used as a metrics label (image/pdf/docx)
+    """
+    if is_pdf_file(file_path):
+        return KIND_PDF
+    if is_doc_file(file_path):
+        return KIND_DOCX
+    return KIND_IMAGE
+
+
+def docx_image_ocr_enabled() -> bool:
+    """
+    是否识别 Word 文档中的嵌入图片（DOCX_IMAGE_OCR，默认：true），Web UI 和后台任务共用
+    Whether images embedded in Word documents are recognized (DOCX_IMAGE_OCR,
+    default true), shared by the web UI and background jobs
+    """
+    return env_bool("DOCX_IMAGE_OCR", True)
+
+
+def process_doc_file(file_path: str, client=None) -> str:
+    """
+    从 Word 文档中提取文本内容，并识别嵌入的图片
+    Extract text content from Word documents and recognize embedded images
 
     Args:
         file_path: Word 文档路径 | Word document path
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
 
     Returns:
         str: 提取的文本内容 | Extracted text content
     """
+    if not docx_image_ocr_enabled():
+        client = None
+    elif client is None:
+        client = services().ocr_client
     try:
-        from docx import Document
-        doc = Document(file_path)
-        text = '\n'.join([para.text for para in doc.paragraphs])
-        return text if text.strip() else "[未提取到文本 | No text extracted]"
+        return extract_doc_text(file_path, client=client)
     except ImportError:
         return "[错误：未安装 python-docx，请运行：pip install python-docx | Error: python-docx not installed]"
     except Exception as e:
         return f"[处理文档时出错 | Error processing document: {str(e)}]"
 
 
-def clean_pdf_text(text: str) -> str:
+def _job_doc_text(file_path: str, client) -> str:
     """
-    清理 PDF 提取的文本
-    Clean up extracted PDF text
+    后台任务的 Word 文本提取：嵌入图片识别失败时抛出异常，任务标记为失败并可恢复
+    Word text extraction for background jobs: raises when an embedded image
+    fails OCR, so the job is marked failed and can be resumed
+    """
+    client = client if docx_image_ocr_enabled() else None
+    return extract_doc_text(file_path, client=client, strict=True)
 
-    保留原始行结构，仅移除过多的空行。
-    Preserves original line structure, removes excessive blank lines only.
 
-    Args:
-        text: 原始文本 | Raw text
+def _is_separate_mode(output_mode: str) -> bool:
+    """
+    检查 PDF 输出模式是否为逐页输出（未知值按合并模式处理）
+    Check whether the PDF output mode is per-page (unknown values merge)
+    """
+    # 支持中英文模式值，以及界面上的双语选项
+    # Support Chinese and English values as well as the bilingual UI choice
+    values = {part.strip().lower() for part in (output_mode or "").split("|")}
+    return bool(values & {"每页独立文件", "separate", "separate pages"})
 
-    Returns:
-        str: 清理后的文本 | Cleaned text
+
+def _pdf_error_message(error: Exception) -> str:
+    """
+    PDF 处理失败时的错误信息
+    Error message for a failed PDF
+    """
+    if isinstance(error, ImportError):
+        return f"[错误：未安装 {error.name}，请运行：pip install {error.name} | Error: {error.name} not installed]"
+    return f"处理 PDF 时出错 | Error processing PDF: {str(error)}"
+
+
+def _pdf_page_text(text: str | None) -> str:
+    """空页显示占位符 | Placeholder for empty pages"""
+    return text if text and text.strip() else NO_TEXT_PLACEHOLDER
+
+
+def iter_pdf_result(
+    pdf_path: str,
+    pipelined: bool | None = None,
+    client=None,
+    result: FileResult | None = None
+) -> Iterator[FileResult]:
     """
-    if not text:
-        return text
+    按页码顺序识别 PDF，每完成一页产出一次结果
+    Recognize a PDF in page order, yielding the result once per finished page
+
+    Args:
+        pdf_path: PDF 文件路径 | Path to PDF file
+        pipelined: 是否重叠执行文本提取、栅格化和 OCR，默认读取 PDF_PIPELINE
+                   Overlap text extraction, rasterization and OCR, defaults to PDF_PIPELINE
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
+        result: 追加页面的结果对象，默认新建 | Result the pages are appended to, a new one by default
 
-    # 移除超过 3 个连续空行
-    # Remove excessive blank lines (3+ blank lines -> 2 blank lines)
-    text = re.sub(r'\n\s*\n\s*\n\s*', '\n\n', text)
-    return text.strip()
+    Yields:
+        FileResult: 追加了最新一页的（同一个）结果 | The (same) result with the latest page appended
+    """
+    result = result or FileResult(pdf_path, KIND_PDF)
+    for _, total_pages, text in iter_pdf_page_texts(
+        pdf_path, client or services().ocr_client, pipelined=pipelined
+    ):
+        result.total_pages = total_pages
+        result.add_page(_pdf_page_text(text))
+        yield result
 
 
 def process_pdf_pages(
     pdf_path: str,
     output_mode: str = "合并为一个文件",
-    show_page_markers: bool = True
+    show_page_markers: bool = True,
+    pipelined: bool | None = None,
+    client=None
 ) -> str | list:
     """
     处理 PDF 文件并返回 OCR 结果
@@ -120,143 +542,109 @@ def process_pdf_pages(
             - "合并为一个文件" 或 "merge": 合并所有页面
             - "每页独立文件" 或 "separate": 逐页输出
         show_page_markers: 是否显示页面标记 | Whether to show page markers
+        pipelined: 是否重叠执行文本提取、栅格化和 OCR，默认读取 PDF_PIPELINE
+                   Overlap text extraction, rasterization and OCR, defaults to PDF_PIPELINE
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
 
     Returns:
         str | list: 合并的字符串或页面列表 | Combined string or list of strings
     """
+    result = FileResult(pdf_path, KIND_PDF)
     try:
-        from pdf2image import convert_from_path
-        reader = PdfReader(pdf_path)
-        total_pages = len(reader.pages)
-
-        # 支持中英文模式值
-        # Support both Chinese and English values
-        is_merge = output_mode in ["合并为一个文件", "merge"]
-        is_separate = output_mode in ["每页独立文件", "separate"]
-
-        if is_merge:
-            results = []
-            for i, page in enumerate(reader.pages):
-                text = page.extract_text()
-
-                # 如果没有提取到文本，使用 OCR 识别页面图片
-                # If no text found, use OCR to recognize the page image
-                if not text or not text.strip():
-                    try:
-                        # 将页面转换为图片
-                        # Convert page to image
-                        images = convert_from_path(
-                            pdf_path,
-                            first_page=i + 1,
-                            last_page=i + 1
-                        )
-                        if images:
-                            # 保存临时图片并进行 OCR 识别
-                            # Save temporary image and use OCR
-                            import tempfile
-                            import os
-                            temp_path = os.path.join(
-                                tempfile.gettempdir(),
-                                f"pdf_page_{i}.png"
-                            )
-                            images[0].save(temp_path, 'PNG')
-                            text = ocr_client.recognize(temp_path)
-                            text = clean_pdf_text(text)
-
-                            # 清理临时文件
-                            # Clean up temporary file
-                            try:
-                                os.remove(temp_path)
-                            except:
-                                pass
-                    except Exception as ocr_err:
-                        text = f"[OCR 错误 | OCR Error: {str(ocr_err)}]"
-                else:
-                    # 清理文本 - 移除过多的换行
-                    text = clean_pdf_text(text)
-
-                if text and text.strip():
-                    if show_page_markers:
-                        results.append(
-                            f"--- 第 {i + 1}/{total_pages} 页 | Page {i + 1}/{total_pages} ---\n\n{text}"
-                        )
-                    else:
-                        results.append(text)
-                else:
-                    if show_page_markers:
-                        results.append(
-                            f"--- 第 {i + 1}/{total_pages} 页 | Page {i + 1}/{total_pages} ---\n\n"
-                            "[未提取到文本 - 可能是图片型 PDF | No text extracted - may be image-only PDF]"
-                        )
-                    else:
-                        results.append(
-                            "[未提取到文本 - 可能是图片型 PDF | No text extracted - may be image-only PDF]"
-                        )
-
-            # 添加页面分隔符
-            # Add page separator between pages
-            if not show_page_markers:
-                return '\n\n'.join(results)
-            return "\n\n".join(results)
-
-        elif is_separate:
-            # 分离模式 - 返回标签页列表
-            # Separate mode - return list for tabs
-            results = []
-            for i, page in enumerate(reader.pages):
-                text = page.extract_text()
-
-                # 如果没有提取到文本，使用 OCR
-                # If no text found, use OCR
-                if not text or not text.strip():
-                    try:
-                        from pdf2image import convert_from_path
-                        images = convert_from_path(
-                            pdf_path,
-                            first_page=i + 1,
-                            last_page=i + 1
-                        )
-                        if images:
-                            import tempfile
-                            import os
-                            temp_path = os.path.join(
-                                tempfile.gettempdir(),
-                                f"pdf_page_{i}.png"
-                            )
-                            images[0].save(temp_path, 'PNG')
-                            text = ocr_client.recognize(temp_path)
-                            text = clean_pdf_text(text)
-                            try:
-                                os.remove(temp_path)
-                            except:
-                                pass
-                    except Exception as ocr_err:
-                        text = f"[OCR 错误 | OCR Error: {str(ocr_err)}]"
-                else:
-                    text = clean_pdf_text(text)
-
-                if text and text.strip():
-                    results.append(text)
-                else:
-                    results.append(
-                        "[未提取到文本 - 可能是图片型 PDF | No text extracted - may be image-only PDF]"
-                    )
-            return results
-        else:
-            # 默认使用合并模式
-            # Default to merge mode
-            return process_pdf_pages(pdf_path, "合并为一个文件", show_page_markers)
+        for _ in iter_pdf_result(pdf_path, pipelined, client, result):
+            pass
+    except Exception as e:
+        return _pdf_error_message(e)
+
+    if _is_separate_mode(output_mode):
+        # 分离模式 - 返回标签页列表
+        # Separate mode - return list for tabs
+        return [page.text for page in result.pages]
+    return result.render(page_markers=show_page_markers)
+
+
+def iter_file_result(file, client=None, stream: bool = True) -> Iterator[FileResult]:
+    """
+    识别单个上传的文件，结果每增长一次产出一次
+    Recognize one uploaded file, yielding the result whenever it grows
+
+    PDF 每完成一页产出一次；stream 为 True 时图片逐个令牌产出，否则识别完成后
+    产出一次。出错时错误记录在结果中，保留已完成的部分。
+    PDFs are yielded once per finished page; with stream=True images are
+    yielded token by token, otherwise once recognized. Errors are recorded on
+    the result, keeping the part already finished.
+
+    Args:
+        file: Gradio 上传的文件对象 | Gradio file upload object
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
+        stream: 图片是否逐个令牌产出 | Yield images token by token
+
+    Yields:
+        FileResult: 当前的（同一个）结果 | The (same) result so far
+    """
+    client = client or services().ocr_client
+    file_path = file.name
+    result = FileResult(file_path, file_type(file_path))
+    try:
+        if result.kind == KIND_PDF:
+            yield from iter_pdf_result(file_path, client=client, result=result)
+            return
+
+        if result.kind == KIND_DOCX:
+            result.add_page(process_doc_file(file_path, client=client))
+            yield result
+            return
+
+        page = result.add_page()
+        if not stream:
+            page.text = client.recognize(file_path)
+            yield result
+            return
+        # 提前停止时关闭流，及时归还调度槽位 | Close the stream when stopped early so its scheduler slot is returned
+        with closing(client.recognize_stream(file_path)) as chunks:
+            for chunk in chunks:
+                page.text += chunk
+                yield result
 
-    except ImportError:
-        return "[错误：未安装 pdf2image，请运行：pip install pdf2image | Error: pdf2image not installed]"
     except Exception as e:
-        return f"处理 PDF 时出错 | Error processing PDF: {str(e)}"
+        result.error = (
+            _pdf_error_message(e) if result.kind == KIND_PDF
+            else f"错误 | Error: {str(e)}"
+        )
+        yield result
+
+
+def file_result(file, client=None) -> FileResult:
+    """
+    识别单个上传的文件并返回完整结果
+    Recognize one uploaded file and return the complete result
+
+    Args:
+        file: Gradio 上传的文件对象 | Gradio file upload object
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
+
+    Returns:
+        FileResult: 文件的识别结果 | Result of the file
+    """
+    result = None
+    for result in iter_file_result(file, client, stream=False):
+        pass
+    return result or FileResult(file.name, file_type(file.name))
+
+
+def _file_error_result(file, error: BaseException) -> FileResult:
+    """
+    多文件上传中失败文件的结果
+    Result of a failed file of a multi-file upload
+    """
+    return FileResult(file.name, file_type(file.name), error=f"错误 | Error: {str(error)}")
 
 
 def process_single_file(
     file,
     pdf_output_mode: str = "合并为一个文件",
-    show_page_markers: bool = True
+    show_page_markers: bool = True,
+    client=None
 ) -> str:
     """
     处理单个上传的文件并返回 OCR 结果
@@ -266,70 +654,551 @@ def process_single_file(
         file: Gradio 上传的文件对象 | Gradio file upload object
         pdf_output_mode: PDF 输出模式 | PDF output mode
         show_page_markers: 是否显示页面标记 | Whether to show page markers
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
 
     Returns:
         str: OCR 识别结果 | OCR recognition result
     """
     if file is None:
         return ""
+    return file_result(file, client).render(
+        _is_separate_mode(pdf_output_mode), show_page_markers
+    )
+
 
+def stream_single_file(
+    file,
+    pdf_output_mode: str = "合并为一个文件",
+    show_page_markers: bool = True,
+    client=None
+) -> Iterator[str]:
+    """
+    以流式方式处理单个文件，每次产出到目前为止的完整结果
+    Process a single file as a stream, yielding the full result so far each time
+
+    图片逐个令牌产出，PDF 每完成一页产出一次。
+    Images are yielded token by token, PDFs once per finished page.
+
+    Args:
+        file: Gradio 上传的文件对象 | Gradio file upload object
+        pdf_output_mode: PDF 输出模式 | PDF output mode
+        show_page_markers: 是否显示页面标记 | Whether to show page markers
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
+
+    Yields:
+        str: 累积的 OCR 结果 | Accumulated OCR result
+    """
+    if file is None:
+        return
+    separate = _is_separate_mode(pdf_output_mode)
+    for result in iter_file_result(file, client):
+        yield result.render(separate, show_page_markers)
+
+
+def _stream_file_results(files, max_workers: int | None, client) -> Iterator[DocumentResult]:
+    """
+    并发识别多个文件，按上传顺序每完成一个文件产出一次文档结果
+    Recognize files concurrently, yielding the document result whenever the
+    next file in upload order finishes
+    """
+    document = DocumentResult(file_headers=True)
+    executor = ThreadPoolExecutor(max_workers=max_workers or client.max_workers)
     try:
-        file_path = file.name
+        futures = [submit_queued(executor, file_result, file, client) for file in files]
+        for file, future in zip(files, futures):
+            try:
+                document.files.append(future.result())
+            except Exception as e:
+                document.files.append(_file_error_result(file, e))
+            yield document
+    finally:
+        # 客户端断开时取消尚未开始的文件 | Cancel files not yet started if the client goes away
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stream_document(
+    files,
+    max_workers: int | None = None,
+    client=None
+) -> Iterator[DocumentResult]:
+    """
+    识别上传的文件，结果每增长一次产出一次文档结果
+    Recognize the uploaded files, yielding the document result whenever it grows
 
-        # 处理 PDF 文件
-        # Handle PDF files
-        if is_pdf_file(file_path):
-            return process_pdf_pages(file_path, pdf_output_mode, show_page_markers)
+    单个文件逐页（PDF）或逐个令牌（图片）产出；多个文件并发处理，按上传顺序
+    每完成一个文件产出一次。
+    A single file is yielded page by page (PDF) or token by token (image);
+    several files are processed concurrently and yielded whenever the next
+    file in upload order finishes.
 
-        # 处理 Word 文档
-        # Handle Word documents
-        if is_doc_file(file_path):
-            return process_doc_file(file_path)
+    Args:
+        files: Gradio 上传的文件列表 | List of Gradio file upload objects
+        max_workers: 同时处理的文件数，默认使用 OCR 客户端的并发数
+                     Files processed at once, defaults to the OCR client's concurrency
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
 
-        # 处理图片文件
-        # Handle image files
-        return ocr_client.recognize(file_path)
+    Yields:
+        DocumentResult: 当前的（同一个）文档结果 | The (same) document result so far
+    """
+    if files is None or len(files) == 0:
+        return
+    client = client or services().ocr_client
 
-    except Exception as e:
-        return f"错误 | Error: {str(e)}"
+    if len(files) > 1:
+        yield from _stream_file_results(files, max_workers, client)
+        return
+    document = DocumentResult()
+    for result in iter_file_result(files[0], client):
+        document.files = [result]
+        yield document
+
+
+def stream_multiple_files(
+    files,
+    pdf_output_mode: str = "合并为一个文件",
+    show_page_markers: bool = True,
+    max_workers: int | None = None,
+    client=None
+) -> Iterator[str]:
+    """
+    并发处理多个文件，按上传顺序每完成一个文件产出一次结果
+    Process files concurrently, yielding the result whenever the next file in
+    upload order finishes
+
+    Args:
+        files: Gradio 上传的文件列表 | List of Gradio file upload objects
+        pdf_output_mode: PDF 输出模式 | PDF output mode
+        show_page_markers: 是否显示页面标记 | Whether to show page markers
+        max_workers: 同时处理的文件数，默认使用 OCR 客户端的并发数
+                     Files processed at once, defaults to the OCR client's concurrency
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
+
+    Yields:
+        str: 已完成文件的合并结果 | Combined results of the finished files
+    """
+    if files is None or len(files) == 0:
+        return
+    separate = _is_separate_mode(pdf_output_mode)
+    for document in _stream_file_results(files, max_workers, client or services().ocr_client):
+        yield document.render(separate, show_page_markers)
 
 
 def process_multiple_files(
     files,
     pdf_output_mode: str = "合并为一个文件",
-    show_page_markers: bool = True
+    show_page_markers: bool = True,
+    max_workers: int | None = None,
+    client=None
+) -> str:
+    """
+    并发处理多个上传的文件并返回合并的 OCR 结果
+    Process multiple uploaded files concurrently and return combined OCR results
+
+    Args:
+        files: Gradio 上传的文件列表 | List of Gradio file upload objects
+        pdf_output_mode: PDF 输出模式 | PDF output mode
+        show_page_markers: 是否显示页面标记 | Whether to show page markers
+        max_workers: 同时处理的文件数，默认使用 OCR 客户端的并发数
+                     Files processed at once, defaults to the OCR client's concurrency
+        client: OCR 客户端，默认使用全局 ocr_client | OCR client, the global ocr_client by default
+
+    Returns:
+        str: 合并的 OCR 结果（按上传顺序）| Combined OCR results (in upload order)
+    """
+    if files is None or len(files) == 0:
+        return ""
+    client = client or services().ocr_client
+
+    results = map_ordered(
+        lambda file: file_result(file, client),
+        files,
+        max_workers=max_workers or client.max_workers,
+        on_error=_file_error_result,
+    )
+    return DocumentResult(results, file_headers=True).render(
+        _is_separate_mode(pdf_output_mode), show_page_markers
+    )
+
+
+async def file_result_async(file, client=None, sync_client=None) -> FileResult:
+    """
+    file_result 的异步版本，图片识别使用 AsyncOllamaOCR
+    Async version of file_result; images go through AsyncOllamaOCR
+
+    Args:
+        file: Gradio 上传的文件对象 | Gradio file upload object
+        client: 异步 OCR 客户端，默认使用全局 async_ocr_client
+                Async OCR client, the global async_ocr_client by default
+        sync_client: 处理 PDF 的同步客户端，默认使用全局 ocr_client
+                     Sync client used for PDFs, the global ocr_client by default
+
+    Returns:
+        FileResult: 文件的识别结果 | Result of the file
+    """
+    file_path = file.name
+
+    # PDF 和 Word 解析是 CPU 密集型操作，放到线程中执行
+    # PDF and Word parsing are CPU-bound, run them in a thread
+    if is_pdf_file(file_path) or is_doc_file(file_path):
+        return await asyncio.to_thread(file_result, file, sync_client)
+
+    result = FileResult(file_path, KIND_IMAGE)
+    try:
+        result.add_page(await (client or services().async_ocr_client).recognize(file_path))
+    except Exception as e:
+        result.error = f"错误 | Error: {str(e)}"
+    return result
+
+
+async def iter_file_result_async(file, client=None, sync_client=None) -> AsyncIterator[FileResult]:
+    """
+    iter_file_result 的异步版本，图片令牌流来自 AsyncOllamaOCR
+    Async version of iter_file_result; image tokens come from AsyncOllamaOCR
+
+    Args:
+        file: Gradio 上传的文件对象 | Gradio file upload object
+        client: 异步 OCR 客户端，默认使用全局 async_ocr_client
+                Async OCR client, the global async_ocr_client by default
+        sync_client: 处理 PDF 的同步客户端，默认使用全局 ocr_client
+                     Sync client used for PDFs, the global ocr_client by default
+
+    Yields:
+        FileResult: 当前的（同一个）结果 | The (same) result so far
+    """
+    file_path = file.name
+
+    # PDF 和 Word 在线程中逐步推进，避免阻塞事件循环
+    # PDF and Word are advanced in a thread so the event loop is not blocked
+    if is_pdf_file(file_path) or is_doc_file(file_path):
+        stream = iter_file_result(file, sync_client)
+        while True:
+            result = await asyncio.to_thread(next, stream, None)
+            if result is None:
+                return
+            yield result
+
+    result = FileResult(file_path, KIND_IMAGE)
+    page = result.add_page()
+    try:
+        chunks = (client or services().async_ocr_client).recognize_stream(file_path)
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                page.text += chunk
+                yield result
+    except Exception as e:
+        result.error = f"错误 | Error: {str(e)}"
+        yield result
+
+
+async def process_single_file_async(
+    file,
+    pdf_output_mode: str = "合并为一个文件",
+    show_page_markers: bool = True,
+    client=None,
+    sync_client=None
+) -> str:
+    """
+    process_single_file 的异步版本，图片识别使用 AsyncOllamaOCR
+    Async version of process_single_file; images go through AsyncOllamaOCR
+
+    Args:
+        file: Gradio 上传的文件对象 | Gradio file upload object
+        pdf_output_mode: PDF 输出模式 | PDF output mode
+        show_page_markers: 是否显示页面标记 | Whether to show page markers
+        client: 异步 OCR 客户端，默认使用全局 async_ocr_client
+                Async OCR client, the global async_ocr_client by default
+        sync_client: 处理 PDF 的同步客户端，默认使用全局 ocr_client
+                     Sync client used for PDFs, the global ocr_client by default
+
+    Returns:
+        str: OCR 识别结果 | OCR recognition result
+    """
+    if file is None:
+        return ""
+    result = await file_result_async(file, client, sync_client)
+    return result.render(_is_separate_mode(pdf_output_mode), show_page_markers)
+
+
+async def _file_results_async(files, max_workers: int | None, client, sync_client) -> list:
+    """
+    并发识别多个文件，返回按上传顺序排列的任务
+    Recognize files concurrently, returning the tasks in upload order
+    """
+    semaphore = asyncio.Semaphore(max_workers or (client or services().async_ocr_client).max_workers)
+
+    async def _process(file) -> FileResult:
+        async with semaphore:
+            return await file_result_async(file, client, sync_client)
+
+    return [asyncio.ensure_future(_process(file)) for file in files]
+
+
+async def process_multiple_files_async(
+    files,
+    pdf_output_mode: str = "合并为一个文件",
+    show_page_markers: bool = True,
+    max_workers: int | None = None,
+    client=None,
+    sync_client=None
 ) -> str:
     """
-    处理多个上传的文件并返回合并的 OCR 结果
-    Process multiple uploaded files and return combined OCR results
+    process_multiple_files 的异步版本
+    Async version of process_multiple_files
 
     Args:
         files: Gradio 上传的文件列表 | List of Gradio file upload objects
         pdf_output_mode: PDF 输出模式 | PDF output mode
         show_page_markers: 是否显示页面标记 | Whether to show page markers
+        max_workers: 同时处理的文件数 | Files processed at once
+        client: 异步 OCR 客户端，默认使用全局 async_ocr_client
+                Async OCR client, the global async_ocr_client by default
+        sync_client: 处理 PDF 的同步客户端，默认使用全局 ocr_client
+                     Sync client used for PDFs, the global ocr_client by default
 
     Returns:
-        str: 合并的 OCR 结果 | Combined OCR results
+        str: 合并的 OCR 结果（按上传顺序）| Combined OCR results (in upload order)
     """
     if files is None or len(files) == 0:
         return ""
 
-    results = []
+    tasks = await _file_results_async(files, max_workers, client, sync_client)
+    results = await asyncio.gather(*tasks)
+    return DocumentResult(list(results), file_headers=True).render(
+        _is_separate_mode(pdf_output_mode), show_page_markers
+    )
+
+
+async def stream_single_file_async(
+    file,
+    pdf_output_mode: str = "合并为一个文件",
+    show_page_markers: bool = True,
+    client=None,
+    sync_client=None
+) -> AsyncIterator[str]:
+    """
+    stream_single_file 的异步版本，图片令牌流来自 AsyncOllamaOCR
+    Async version of stream_single_file; image tokens come from AsyncOllamaOCR
+
+    Args:
+        file: Gradio 上传的文件对象 | Gradio file upload object
+        pdf_output_mode: PDF 输出模式 | PDF output mode
+        show_page_markers: 是否显示页面标记 | Whether to show page markers
+        client: 异步 OCR 客户端，默认使用全局 async_ocr_client
+                Async OCR client, the global async_ocr_client by default
+        sync_client: 处理 PDF 的同步客户端，默认使用全局 ocr_client
+                     Sync client used for PDFs, the global ocr_client by default
+
+    Yields:
+        str: 累积的 OCR 结果 | Accumulated OCR result
+    """
+    if file is None:
+        return
+    separate = _is_separate_mode(pdf_output_mode)
+    async for result in iter_file_result_async(file, client, sync_client):
+        yield result.render(separate, show_page_markers)
+
+
+async def _stream_file_results_async(
+    files,
+    max_workers: int | None,
+    client,
+    sync_client
+) -> AsyncIterator[DocumentResult]:
+    """
+    _stream_file_results 的异步版本
+    Async version of _stream_file_results
+    """
+    document = DocumentResult(file_headers=True)
+    tasks = await _file_results_async(files, max_workers, client, sync_client)
+    try:
+        for task in tasks:
+            document.files.append(await task)
+            yield document
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def stream_document_async(
+    files,
+    max_workers: int | None = None,
+    client=None,
+    sync_client=None
+) -> AsyncIterator[DocumentResult]:
+    """
+    stream_document 的异步版本
+    Async version of stream_document
+
+    Args:
+        files: Gradio 上传的文件列表 | List of Gradio file upload objects
+        max_workers: 同时处理的文件数 | Files processed at once
+        client: 异步 OCR 客户端，默认使用全局 async_ocr_client
+                Async OCR client, the global async_ocr_client by default
+        sync_client: 处理 PDF 的同步客户端，默认使用全局 ocr_client
+                     Sync client used for PDFs, the global ocr_client by default
+
+    Yields:
+        DocumentResult: 当前的（同一个）文档结果 | The (same) document result so far
+    """
+    if files is None or len(files) == 0:
+        return
+
+    if len(files) > 1:
+        async for document in _stream_file_results_async(files, max_workers, client, sync_client):
+            yield document
+        return
+    document = DocumentResult()
+    async for result in iter_file_result_async(files[0], client, sync_client):
+        document.files = [result]
+        yield document
+
+
+async def stream_multiple_files_async(
+    files,
+    pdf_output_mode: str = "合并为一个文件",
+    show_page_markers: bool = True,
+    max_workers: int | None = None,
+    client=None,
+    sync_client=None
+) -> AsyncIterator[str]:
+    """
+    stream_multiple_files 的异步版本
+    Async version of stream_multiple_files
+
+    Args:
+        files: Gradio 上传的文件列表 | List of Gradio file upload objects
+        pdf_output_mode: PDF 输出模式 | PDF output mode
+        show_page_markers: 是否显示页面标记 | Whether to show page markers
+        max_workers: 同时处理的文件数 | Files processed at once
+        client: 异步 OCR 客户端，默认使用全局 async_ocr_client
+                Async OCR client, the global async_ocr_client by default
+        sync_client: 处理 PDF 的同步客户端，默认使用全局 ocr_client
+                     Sync client used for PDFs, the global ocr_client by default
+
+    Yields:
+        str: 已完成文件的合并结果 | Combined results of the finished files
+    """
+    if files is None or len(files) == 0:
+        return
+    separate = _is_separate_mode(pdf_output_mode)
+    async for document in _stream_file_results_async(files, max_workers, client, sync_client):
+        yield document.render(separate, show_page_markers)
+
+
+def submit_jobs(files) -> str:
+    """
+    将上传的文件提交为后台任务
+    Submit the uploaded files as background jobs
+
+    Args:
+        files: Gradio 上传的文件列表 | List of Gradio file upload objects
+
+    Returns:
+        str: 任务 ID，每行一个 | Job IDs, one per line
+    """
+    job_runner = services().job_runner
+    if job_runner is None:
+        import gradio as gr
+
+        raise gr.Error("后台任务未启用 | Background jobs are disabled (OCR_JOBS=false)")
+    if not files:
+        return ""
     for file in files:
-        try:
-            file_path = file.name
+        FILES_TOTAL.inc(file_type=file_type(file.name))
+    return "\n".join(job_runner.submit(file.name) for file in files)
+
+
+def _parse_job_ids(job_ids: str) -> list:
+    """解析文本框中的任务 ID | Parse job IDs from the textbox"""
+    return [job_id for job_id in (job_ids or "").replace(",", " ").split() if job_id]
+
+
+def job_result(job_id: str) -> FileResult:
+    """
+    任务的进度和已完成页面
+    A job's progress and finished pages
+
+    Args:
+        job_id: 任务 ID | Job ID
 
-            if is_pdf_file(file_path):
-                result = process_pdf_pages(file_path, pdf_output_mode, show_page_markers)
-                results.append(f"## {file.name}\n\n{result}")
-            else:
-                result = ocr_client.recognize(file_path)
-                results.append(f"## {file.name}\n\n{result}")
+    Returns:
+        FileResult: 以任务进度为状态行的结果 | Result with the job progress as its status line
+    """
+    job_runner = services().job_runner
+    status = job_runner.status(job_id) if job_runner is not None else None
+    if status is None:
+        return FileResult(job_id, error="错误 | Error: 未找到任务 | Job not found")
+
+    total = status["total_pages"] or "?"
+    lines = [f"任务 | Job {job_id}: {status['status']}, {status['done_pages']}/{total} 页 | pages"]
+    if status["error"]:
+        lines.append(f"错误 | Error: {status['error']}")
+    stats = status.get("stats") or {}
+    if stats:
+        lines.append(", ".join(
+            f"{key}: {value}" for key, value in stats.items() if value is not None
+        ))
+
+    pages = job_runner.pages(job_id)
+    result = FileResult(
+        status["file_name"], status["kind"], total_pages=len(pages), status="\n\n".join(lines)
+    )
+    # 未完成的页面留空，页码保持不变 | Unfinished pages are left out, page numbers unchanged
+    result.pages = [
+        PageResult(i + 1, _pdf_page_text(text) if status["kind"] == KIND_PDF else text)
+        for i, text in enumerate(pages) if text is not None
+    ]
+    return result
 
-        except Exception as e:
-            results.append(f"## {file.name}\n\n错误 | Error: {str(e)}")
 
-    return "\n\n---\n\n".join(results)
+def render_job(job_id: str, output_mode: str = "合并为一个文件", show_page_markers: bool = True) -> str:
+    """
+    显示任务的进度和已完成页面
+    Render a job's progress and finished pages
+
+    Args:
+        job_id: 任务 ID | Job ID
+        output_mode: PDF 输出模式 | PDF output mode
+        show_page_markers: 是否显示页面标记 | Whether to show page markers
+
+    Returns:
+        str: 任务状态和结果 | Job status and result
+    """
+    return DocumentResult([job_result(job_id)], file_headers=True).render(
+        _is_separate_mode(output_mode), show_page_markers
+    )
+
+
+def watch_jobs(job_ids: str, interval: float = 1.0) -> Iterator[DocumentResult]:
+    """
+    流式产出任务进度，所有任务结束后停止（刷新页面后可用任务 ID 重新查看）
+    Stream job progress until every job finishes (after a refresh the job IDs
+    can be entered again)
+
+    Args:
+        job_ids: 任务 ID，空格、逗号或换行分隔 | Job IDs separated by spaces, commas or newlines
+        interval: 轮询间隔（秒）| Poll interval (seconds)
+
+    Yields:
+        DocumentResult: 所有任务的进度和结果（有变化时）| Progress and results of every job (when changed)
+    """
+    ids = _parse_job_ids(job_ids)
+    if not ids:
+        return
+    job_runner = services().job_runner
+    last = None
+    while True:
+        statuses = [job_runner.status(job_id) if job_runner is not None else None for job_id in ids]
+        marker = [
+            (status["status"], status["done_pages"]) if status else None
+            for status in statuses
+        ]
+        if marker != last:
+            last = marker
+            yield DocumentResult([job_result(job_id) for job_id in ids], file_headers=True)
+        if all(status is None or status["status"] in FINISHED_STATES for status in statuses):
+            return
+        time.sleep(interval)
 
 
 # ============================================================================
@@ -337,263 +1206,399 @@ def process_multiple_files(
 # Gradio Web UI Interface Construction
 # ============================================================================
 
-with gr.Blocks(
-    title="GLM-OCR Web UI",
-    theme=gr.themes.Soft(),
-    css="""
-    .gradio-container {
-        max-width: 1200px !important;
-    }
-    """
-) as demo:
-    # 页面标题 | Page Title
-    gr.Markdown(
-        """
-        # 🖼️ GLM-OCR Web UI
-        基于 Gradio 的 OCR 识别工具 | OCR Recognition Tool based on Gradio
+def build_demo() -> "gr.Blocks":
+    """
+    构建 Gradio 界面（首次调用时创建 OCR 客户端和后台服务）
+    Build the Gradio interface (the OCR clients and background services are
+    created on the first call)
 
-        支持图片、PDF 和 Word 文档的文字识别 | Supports image, PDF and Word document recognition
-        """
-    )
+    Gradio 在这里才导入，只使用处理函数的调用方（命令行、基准测试、测试）
+    不承担导入 Gradio 和构建界面的开销。
+    Gradio is only imported here, so callers that only use the processing
+    functions (CLI, benchmarks, tests) do not pay for importing Gradio and
+    building the interface.
 
-    with gr.Row():
-        with gr.Column(scale=1):
-            # 文件上传组件 | File upload component
-            file_upload = gr.File(
-                label="📁 上传文件 | Upload Files",
-                file_types=['image/*', '.pdf', '.doc', '.docx'],
-                file_count="multiple",
-                elem_id="file-upload",
-                info="支持的格式 | Supported formats: PNG, JPG, PDF, DOC, DOCX"
-            )
+    Environment Variables:
+        GRADIO_CONCURRENCY_LIMIT: 同时运行的事件数（默认：8）
+        GRADIO_MAX_QUEUE_SIZE: 最大排队数，0 表示不限（默认：64）
 
-            # 转换按钮 | Convert button
-            convert_button = gr.Button(
-                "🔄 开始转换 | Start Conversion",
-                variant="primary",
-                size="lg"
-            )
+    Returns:
+        gr.Blocks: 已配置队列的界面 | Interface with its queue configured
+    """
+    import gradio as gr
 
-            # PDF 输出模式选择器 | PDF output mode selector
-            pdf_output_mode = gr.Radio(
-                label="📄 PDF 输出模式 | PDF Output Mode",
-                choices=["合并为一个文件 | Merge to Single File", "每页独立文件 | Separate Pages"],
-                value="合并为一个文件 | Merge to Single File",
-                elem_id="pdf-output-mode",
-                info="选择如何处理多页 PDF | Choose how to handle multi-page PDFs"
-            )
+    use_async_handlers = services().use_async_handlers
 
-            # 页面标记开关 | Page marker toggle
-            show_page_markers = gr.Checkbox(
-                label="📑 显示页面标记 | Show Page Markers",
-                value=True,
-                elem_id="show-page-markers",
-                info="显示 '--- 第 X/Y 页 ---' 标记 | Show '--- Page X/Y ---' markers"
-            )
+    with gr.Blocks(
+        title="GLM-OCR Web UI",
+        theme=gr.themes.Soft(),
+        css="""
+        .gradio-container {
+            max-width: 1200px !important;
+        }
+        """
+    ) as demo:
+        # 页面标题 | Page Title
+        gr.Markdown(
+            """
+            # 🖼️ GLM-OCR Web UI
+            基于 Gradio 的 OCR 识别工具 | OCR Recognition Tool based on Gradio
+
+            支持图片、PDF 和 Word 文档的文字识别 | Supports image, PDF and Word document recognition
+            """
+        )
+
+        with gr.Row():
+            with gr.Column(scale=1):
+                # 文件上传组件 | File upload component
+                file_upload = gr.File(
+                    label="📁 上传文件 | Upload Files",
+                    file_types=['image/*', '.pdf', '.doc', '.docx'],
+                    file_count="multiple",
+                    elem_id="file-upload",
+                    info="支持的格式 | Supported formats: PNG, JPG, PDF, DOC, DOCX"
+                )
 
-            # 隐藏组件 - 存储原始 OCR 结果
-            # Hidden components - store raw OCR result
-            raw_ocr_result = gr.Textbox(
-                visible=False,
-                elem_id="raw-ocr-result"
-            )
+                # 转换按钮 | Convert button
+                convert_button = gr.Button(
+                    "🔄 开始转换 | Start Conversion",
+                    variant="primary",
+                    size="lg"
+                )
 
-            # 隐藏组件 - 存储页面数量
-            # Hidden component - store page count
-            pdf_page_count = gr.Number(
-                visible=False,
-                elem_id="pdf-page-count"
-            )
+                # 后台任务 | Background jobs
+                with gr.Accordion("🗂️ 后台任务 | Background Jobs", open=False):
+                    submit_job_button = gr.Button(
+                        "📥 作为后台任务提交 | Submit as Background Job",
+                        variant="secondary"
+                    )
+                    job_ids_box = gr.Textbox(
+                        label="任务 ID | Job IDs",
+                        lines=2,
+                        elem_id="job-ids",
+                        info="刷新页面后粘贴任务 ID 即可继续查看 | Paste job IDs here after a refresh to keep watching"
+                    )
+                    watch_job_button = gr.Button(
+                        "🔍 查看进度 | Watch Progress",
+                        variant="secondary"
+                    )
 
-            # PDF 文件路径存储
-            # PDF file path storage
-            pdf_file_path = gr.Textbox(
-                visible=False,
-                elem_id="pdf-file-path"
-            )
+                # PDF 输出模式选择器 | PDF output mode selector
+                pdf_output_mode = gr.Radio(
+                    label="📄 PDF 输出模式 | PDF Output Mode",
+                    choices=["合并为一个文件 | Merge to Single File", "每页独立文件 | Separate Pages"],
+                    value="合并为一个文件 | Merge to Single File",
+                    elem_id="pdf-output-mode",
+                    info="选择如何处理多页 PDF | Choose how to handle multi-page PDFs"
+                )
 
-        with gr.Column(scale=2):
-            # 结果显示 | Results display
-            result_output = gr.Textbox(
-                label="📝 OCR 识别结果 | OCR Recognition Results",
-                lines=20,
-                elem_id="result-output",
-                show_copy_button=True,
-                info="识别结果将以 Markdown 格式显示 | Results will be displayed in Markdown format"
-            )
+                # 页面标记开关 | Page marker toggle
+                show_page_markers = gr.Checkbox(
+                    label="📑 显示页面标记 | Show Page Markers",
+                    value=True,
+                    elem_id="show-page-markers",
+                    info="显示 '--- 第 X/Y 页 ---' 标记 | Show '--- Page X/Y ---' markers"
+                )
 
-            # 复制按钮和状态 | Copy button and status
-            with gr.Row():
-                copy_button = gr.Button(
-                    "📋 复制到剪贴板 | Copy to Clipboard",
+                # 会话状态 - 结构化的识别结果，只保存在服务器端，切换视图时重新渲染
+                # Session state - the structured result, kept server-side only and
+                # re-rendered when the view changes
+                document_state = gr.State(None)
+
+            with gr.Column(scale=2):
+                # 结果显示 | Results display
+                result_output = gr.Textbox(
+                    label="📝 OCR 识别结果 | OCR Recognition Results",
+                    lines=20,
+                    elem_id="result-output",
+                    show_copy_button=True,
+                    info="识别结果将以 Markdown 格式显示 | Results will be displayed in Markdown format"
+                )
+
+                # 复制按钮和状态 | Copy button and status
+                with gr.Row():
+                    copy_button = gr.Button(
+                        "📋 复制到剪贴板 | Copy to Clipboard",
+                        variant="secondary"
+                    )
+                    copy_status = gr.Textbox(
+                        label="状态 | Status",
+                        interactive=False,
+                        lines=1,
+                        elem_id="copy-status",
+                        placeholder="点击按钮后显示状态 | Status will appear here"
+                    )
+
+                # 导出按钮 | Export button
+                export_button = gr.Button(
+                    "💾 导出为 Markdown | Export as Markdown",
                     variant="secondary"
                 )
-                copy_status = gr.Textbox(
-                    label="状态 | Status",
+
+                # 导出状态 | Export status
+                export_status = gr.Textbox(
+                    label="导出状态 | Export Status",
+                    value="点击 '导出为 Markdown' 按钮下载文件 | Click 'Export as Markdown' to download",
                     interactive=False,
                     lines=1,
-                    elem_id="copy-status",
-                    placeholder="点击按钮后显示状态 | Status will appear here"
+                    elem_id="export-status"
                 )
 
-            # 导出按钮 | Export button
-            export_button = gr.Button(
-                "💾 导出为 Markdown | Export as Markdown",
-                variant="secondary"
-            )
-
-            # 导出状态 | Export status
-            export_status = gr.Textbox(
-                label="导出状态 | Export Status",
-                value="点击 '导出为 Markdown' 按钮下载文件 | Click 'Export as Markdown' to download",
-                interactive=False,
-                lines=1,
-                elem_id="export-status"
-            )
-
-    # JavaScript 用于剪贴板复制
-    # JavaScript for clipboard copy
-    copy_js = """
-    async () => {
-        try {
-            const text = document.querySelector('#result-output textarea').value;
-            await navigator.clipboard.writeText(String(text));
-            return "已复制到剪贴板 | Copied to clipboard!";
-        } catch (err) {
-            return "复制失败 | Copy failed: " + err.message;
+        # JavaScript 用于剪贴板复制
+        # JavaScript for clipboard copy
+        copy_js = """
+        async () => {
+            try {
+                const text = document.querySelector('#result-output textarea').value;
+                await navigator.clipboard.writeText(String(text));
+                return "已复制到剪贴板 | Copied to clipboard!";
+            } catch (err) {
+                return "复制失败 | Copy failed: " + err.message;
+            }
         }
-    }
-    """
-
-    # 绑定复制按钮事件
-    # Wire up copy button event
-    copy_button.click(fn=None, js=copy_js, outputs=copy_status)
-
-    # 文件转换处理函数
-    # File conversion handler
-    def process_handler(files, pdf_mode, show_markers):
-        if files is None or len(files) == 0:
-            return "", "", ""
-        if len(files) == 1:
-            result = process_single_file(
-                files[0],
-                pdf_mode,
-                show_page_markers=False
+        """
+
+        # 绑定复制按钮事件
+        # Wire up copy button event
+        copy_button.click(fn=None, js=copy_js, outputs=copy_status)
+
+        # 文件转换处理函数 - 生成器，结果随识别进度渲染到文本框
+        # File conversion handler - a generator that renders the result into the
+        # textbox as recognition progresses
+        def process_handler(files, pdf_mode, show_markers, request: gr.Request):
+            if files is None or len(files) == 0:
+                yield "", None
+                return
+            client, _ = session_clients(request)
+            # OCR 槽位已满时显示排队位置，第一个结果到达前持续刷新
+            # Show the queue position while every slot is busy, refreshed until the first result
+            stream = with_queue_status(stream_document(files, client=client), request)
+            source = files[0].name if len(files) == 1 else "multiple"
+
+            for file in files:
+                FILES_TOTAL.inc(file_type=file_type(file.name))
+
+            # 会话状态只在完成时更新一次 | Session state is only updated once, when finished
+            separate = _is_separate_mode(pdf_mode)
+            document = None
+            with REQUESTS_IN_FLIGHT.track(), REQUEST_SECONDS.time(), request_memory_monitor(source), \
+                    closing(stream):
+                for item in stream:
+                    if isinstance(item, str):
+                        yield item, gr.update()
+                        continue
+                    document = item
+                    yield document.render(separate, show_markers), gr.update()
+            yield gr.update(), document
+
+        # 异步文件转换处理函数
+        # Async file conversion handler
+        async def process_handler_async(files, pdf_mode, show_markers, request: gr.Request):
+            if files is None or len(files) == 0:
+                yield "", None
+                return
+            sync_client, client = session_clients(request)
+            stream = with_queue_status_async(
+                stream_document_async(files, client=client, sync_client=sync_client), request
             )
-            return result, result, files[0].name
-        else:
-            result = process_multiple_files(
-                files,
-                pdf_mode,
-                show_page_markers=False
+            source = files[0].name if len(files) == 1 else "multiple"
+
+            for file in files:
+                FILES_TOTAL.inc(file_type=file_type(file.name))
+
+            separate = _is_separate_mode(pdf_mode)
+            document = None
+            with REQUESTS_IN_FLIGHT.track(), REQUEST_SECONDS.time(), request_memory_monitor(source):
+                async with aclosing(stream):
+                    async for item in stream:
+                        if isinstance(item, str):
+                            yield item, gr.update()
+                            continue
+                        document = item
+                        yield document.render(separate, show_markers), gr.update()
+            yield gr.update(), document
+
+        # 后台任务查看处理函数 | Background job watch handler
+        def watch_jobs_handler(job_ids, pdf_mode, show_markers):
+            separate = _is_separate_mode(pdf_mode)
+            document = None
+            for document in watch_jobs(job_ids):
+                yield document.render(separate, show_markers), gr.update()
+            yield gr.update(), document
+
+        # 视图切换处理函数：从会话状态重新渲染，不重新识别
+        # View toggle handler: re-render from session state, no OCR
+        def render_view(document, pdf_mode, show_markers):
+            if document is None:
+                return gr.update()
+            return document.render(_is_separate_mode(pdf_mode), show_markers)
+
+        # 绑定转换按钮 - 结构化结果存入会话状态
+        # Wire up convert button - the structured result goes into session state
+        convert_button.click(
+            fn=process_handler_async if use_async_handlers else process_handler,
+            inputs=[file_upload, pdf_output_mode, show_page_markers],
+            outputs=[result_output, document_state]
+        )
+
+        # 绑定后台任务按钮：提交后立即开始流式显示进度
+        # Wire up background job buttons: progress streams right after submission
+        submit_job_button.click(
+            fn=submit_jobs,
+            inputs=[file_upload],
+            outputs=[job_ids_box],
+            api_name="submit_job"
+        ).then(
+            fn=watch_jobs_handler,
+            inputs=[job_ids_box, pdf_output_mode, show_page_markers],
+            outputs=[result_output, document_state]
+        )
+        watch_job_button.click(
+            fn=watch_jobs_handler,
+            inputs=[job_ids_box, pdf_output_mode, show_page_markers],
+            outputs=[result_output, document_state],
+            api_name="watch_job"
+        )
+
+        # 绑定页面标记复选框和 PDF 输出模式 - 快速切换，不重新进行 OCR
+        # Wire up the page marker checkbox and PDF output mode - fast toggle, no OCR
+        for view_control in (show_page_markers, pdf_output_mode):
+            view_control.change(
+                fn=render_view,
+                inputs=[document_state, pdf_output_mode, show_page_markers],
+                outputs=result_output
             )
-            return result, result, "multiple"
-
-    # 页面标记切换处理函数
-    # Page marker toggle handler
-    def toggle_markers(raw_result, show_markers):
-        if not raw_result or not raw_result.strip():
-            return raw_result
-
-        if show_markers:
-            # 将分隔符转换为带编号的标记
-            # Convert separators to numbered markers
-            pages = raw_result.split('\n\n--- Page Separator ---\n\n')
-            marked_pages = []
-            total = len([p for p in pages if p.strip()])
-            for i, page in enumerate(pages):
-                if page.strip():
-                    marked_pages.append(
-                        f"--- 第 {i + 1}/{total} 页 | Page {i + 1}/{total} ---\n\n{page}"
-                    )
-                else:
-                    marked_pages.append(page)
-            return '\n\n'.join(marked_pages)
-        else:
-            # 不带编号标记显示
-            # Show without numbered markers
-            return raw_result
-
-    # 绑定转换按钮 - 存储原始结果到隐藏组件
-    # Wire up convert button - stores raw result to hidden component
-    convert_button.click(
-        fn=process_handler,
-        inputs=[file_upload, pdf_output_mode, show_page_markers],
-        outputs=[result_output, raw_ocr_result, pdf_file_path]
-    )
 
-    # 绑定页面标记复选框 - 快速切换，不重新进行 OCR
-    # Wire up page marker checkbox - fast toggle, no OCR
-    show_page_markers.change(
-        fn=toggle_markers,
-        inputs=[raw_ocr_result, show_page_markers],
-        outputs=result_output
-    )
-
-    # JavaScript 用于导出文件
-    # JavaScript for exporting files
-    export_js = """
-    async () => {
-        try {
-            const text = document.querySelector('#result-output textarea').value;
-            if (!text || !text.trim()) {
-                return "没有内容可导出 | No content to export";
+        # JavaScript 用于导出文件
+        # JavaScript for exporting files
+        export_js = """
+        async () => {
+            try {
+                const text = document.querySelector('#result-output textarea').value;
+                if (!text || !text.trim()) {
+                    return "没有内容可导出 | No content to export";
+                }
+
+                // 创建 Blob 并下载
+                // Create blob and download
+                const blob = new Blob([text], { type: 'text/markdown;charset=utf-8' });
+                const url = URL.createObjectURL(blob);
+                const a = document.createElement('a');
+                a.href = url;
+
+                // 使用时间戳生成文件名
+                // Generate filename with timestamp
+                const timestamp = new Date().toISOString().slice(0, 19).replace(/[:-]/g, '');
+                a.download = 'ocr_result_' + timestamp + '.md';
+
+                document.body.appendChild(a);
+                a.click();
+                document.body.removeChild(a);
+                URL.revokeObjectURL(url);
+
+                return "已下载: ocr_result_" + timestamp + ".md | Downloaded: ocr_result_" + timestamp + ".md";
+            } catch (err) {
+                return "导出失败 | Export failed: " + err.message;
             }
-
-            // 创建 Blob 并下载
-            // Create blob and download
-            const blob = new Blob([text], { type: 'text/markdown;charset=utf-8' });
-            const url = URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-
-            // 使用时间戳生成文件名
-            // Generate filename with timestamp
-            const timestamp = new Date().toISOString().slice(0, 19).replace(/[:-]/g, '');
-            a.download = 'ocr_result_' + timestamp + '.md';
-
-            document.body.appendChild(a);
-            a.click();
-            document.body.removeChild(a);
-            URL.revokeObjectURL(url);
-
-            return "已下载: ocr_result_" + timestamp + ".md | Downloaded: ocr_result_" + timestamp + ".md";
-        } catch (err) {
-            return "导出失败 | Export failed: " + err.message;
         }
-    }
-    """
-
-    # 绑定导出按钮
-    # Wire up export button
-    export_button.click(fn=None, js=export_js, outputs=export_status)
-
-    # 页脚 | Footer
-    gr.Markdown(
         """
-        ---
-        ## 📖 使用说明 | Usage Guide
-
-        1. **上传文件** - 点击上传区域或拖拽文件
-        2. **选择选项** - 设置 PDF 输出模式和页面标记
-        3. **开始转换** - 点击转换按钮
-        4. **查看结果** - 在右侧查看识别结果
-        5. **导出结果** - 点击导出按钮保存为 Markdown
-
-        ---
-
-        **🔗 相关链接 | Links**
 
-        - [GLM-OCR GitHub](https://github.com/zai-org/glm-ocr)
-        - [Ollama 官网](https://ollama.com/)
-        - [Gradio 文档](https://www.gradio.app/)
-        """
+        # 绑定导出按钮
+        # Wire up export button
+        export_button.click(fn=None, js=export_js, outputs=export_status)
+
+        # 页脚 | Footer
+        gr.Markdown(
+            """
+            ---
+            ## 📖 使用说明 | Usage Guide
+
+            1. **上传文件** - 点击上传区域或拖拽文件
+            2. **选择选项** - 设置 PDF 输出模式和页面标记
+            3. **开始转换** - 点击转换按钮
+            4. **查看结果** - 在右侧查看识别结果
+            5. **导出结果** - 点击导出按钮保存为 Markdown
+
+            ---
+
+            **🔗 相关链接 | Links**
+
+            - [GLM-OCR GitHub](https://github.com/zai-org/glm-ocr)
+            - [Ollama 官网](https://ollama.com/)
+            - [Gradio 文档](https://www.gradio.app/)
+            """
+        )
+
+    # Gradio 队列：同时运行的事件数和最大排队数（Gradio 默认每个事件只运行一个）
+    # Gradio queue: events run at once and the maximum queue size (Gradio runs
+    # one event at a time by default)
+    demo.queue(
+        default_concurrency_limit=max(1, env_int("GRADIO_CONCURRENCY_LIMIT", 8)),
+        max_size=env_int("GRADIO_MAX_QUEUE_SIZE", 64) or None,
     )
+    return demo
+
 
 # ============================================================================
 # 程序入口点
 # Program Entry Point
 # ============================================================================
 
+def launch() -> None:
+    """
+    启动 Web UI；OCR_METRICS=true 时在同一端口挂载 Prometheus 指标端点
+    Start the web UI; with OCR_METRICS=true a Prometheus metrics endpoint is
+    mounted on the same port
+
+    Environment Variables:
+        OCR_METRICS: 挂载指标端点（默认：false）
+        OCR_METRICS_PATH: 指标端点路径（默认：/metrics）
+        GRADIO_SERVER_NAME: 监听地址（默认：127.0.0.1）
+        GRADIO_SERVER_PORT: 监听端口（默认：7860）
+    """
+    # 构建界面时读取 .env，之后再读取启动设置 | .env is read while building, before the launch settings
+    demo = build_demo()
+    if not env_bool("OCR_METRICS", False):
+        demo.launch()
+        return
+
+    import gradio as gr
+    import uvicorn
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    mount_metrics(app, path=env_str("OCR_METRICS_PATH", "/metrics") or "/metrics")
+    app = gr.mount_gradio_app(app, demo, path="/")
+    uvicorn.run(
+        app,
+        host=env_str("GRADIO_SERVER_NAME", "127.0.0.1") or "127.0.0.1",
+        port=env_int("GRADIO_SERVER_PORT", 7860),
+    )
+
+
+# 兼容按模块属性访问的旧用法（例如 app.ocr_client、gradio app.py 查找的 demo），首次访问时创建
+# Compatibility for module attribute access (e.g. app.ocr_client, or the demo
+# that `gradio app.py` looks up), created on first access
+_SERVICE_ATTRIBUTES = {
+    "ocr_client": "ocr_client",
+    "async_ocr_client": "async_ocr_client",
+    "scheduler": "scheduler",
+    "job_runner": "job_runner",
+    "keep_warm": "keep_warm",
+    "MEMORY_BUDGET": "memory_budget",
+    "USE_ASYNC_HANDLERS": "use_async_handlers",
+}
+
+
+def __getattr__(name: str):
+    """首次访问时创建服务或界面（PEP 562）| Create the services or interface on first access (PEP 562)"""
+    if name == "demo":
+        demo = globals()["demo"] = build_demo()
+        return demo
+    if name in _SERVICE_ATTRIBUTES:
+        return getattr(services(), _SERVICE_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
-    demo.launch()
+    launch()
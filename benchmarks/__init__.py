@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试：模拟 Ollama 服务器、合成语料和场景运行器
+Benchmarks: a mock Ollama server, a synthetic corpus and the scenario runner
+"""
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+基准测试语料
+Benchmark Corpus
+
+生成固定的合成语料：带文字的图片、有文本层的 PDF 和只有图片的
+扫描 PDF。内容由种子决定，每次生成的文件完全相同，不同版本的
+测量结果可以直接比较。
+Builds a fixed synthetic corpus: images with text, PDFs with a text layer
+and image-only scanned PDFs. The content is seeded so every build produces
+identical files and measurements from different versions are comparable.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import os  # 文件路径
+import random  # 确定的随机内容
+from dataclasses import dataclass, field  # 数据类
+from typing import Callable, List
+
+# 生成文字时使用的单词（仅 ASCII，PDF 标准字体可直接显示）
+# Words for generated text (ASCII only so the standard PDF font can show them)
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua invoice total amount due date "
+    "quantity price tax subtotal account number reference summary report table"
+).split()
+
+# A4 页面尺寸（PDF 点）| A4 page size (PDF points)
+_PAGE_WIDTH, _PAGE_HEIGHT = 595, 842
+
+# 生成方式的版本，修改生成逻辑时递增，旧语料不再被重用
+# Generator version; bump it whenever generation changes so old corpora are not reused
+CORPUS_VERSION = 1
+
+
+@dataclass
+class Corpus:
+    """
+    基准测试语料中的文件
+    Files of the benchmark corpus
+
+    Attributes:
+        images: 图片路径 | Image paths
+        text_pdfs: 有文本层的 PDF | PDFs with a text layer
+        scanned_pdfs: 只有图片的 PDF | Image-only PDFs
+        pages: 每个 PDF 的页数 | Pages per PDF
+    """
+
+    images: List[str] = field(default_factory=list)
+    text_pdfs: List[str] = field(default_factory=list)
+    scanned_pdfs: List[str] = field(default_factory=list)
+    pages: int = 0
+
+    @property
+    def files(self) -> List[str]:
+        """所有文件 | Every file"""
+        return self.images + self.text_pdfs + self.scanned_pdfs
+
+
+def _lines(rng: random.Random, count: int, width: int = 70) -> List[str]:
+    """生成若干行随机文字 | Generate lines of random words"""
+    lines = []
+    for _ in range(count):
+        line = ""
+        while len(line) < width:
+            line += rng.choice(_WORDS) + " "
+        lines.append(line.strip())
+    return lines
+
+
+def _render_page(rng: random.Random, width: int = 1240, height: int = 1754):
+    """
+    渲染一张带文字的白色页面图片（默认 A4 150 DPI）
+    Render a white page image with text (A4 at 150 DPI by default)
+    """
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    y = 80
+    for line in _lines(rng, (height - 160) // 36):
+        draw.text((80, y), line, fill="black")
+        y += 36
+    # 一个表格框，让图片不完全是文字 | A table frame so the page is not text only
+    draw.rectangle((80, height - 400, width - 80, height - 120), outline="black", width=3)
+    return image
+
+
+def _escape_pdf(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: str, pages: List[List[str]]) -> None:
+    """
+    写入使用标准字体的文本层 PDF（不依赖第三方库）
+    Write a text-layer PDF using a standard font (no third-party library)
+
+    Args:
+        path: 输出路径 | Output path
+        pages: 每页的文字行 | Text lines per page
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    font_id = 3 + len(pages) * 2
+    kids = " ".join(f"{3 + i * 2} 0 R" for i in range(len(pages)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>")
+    for i, lines in enumerate(pages):
+        content = "BT /F1 10 Tf 14 TL 50 790 Td " + " ".join(
+            f"({_escape_pdf(line)}) '" for line in lines
+        ) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_PAGE_WIDTH} {_PAGE_HEIGHT}]"
+            f" /Contents {4 + i * 2} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    ).encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def corpus_directory(
+    root: str,
+    images: int,
+    text_pdfs: int,
+    scanned_pdfs: int,
+    pages: int,
+    seed: int
+) -> str:
+    """
+    以生成参数命名的语料目录 | Corpus directory named after the generation parameters
+    """
+    name = f"v{CORPUS_VERSION}-img{images}-text{text_pdfs}-scan{scanned_pdfs}-p{pages}-seed{seed}"
+    return os.path.join(root, name)
+
+
+def _write_atomic(path: str, write: Callable[[str], None]) -> None:
+    """
+    先写临时文件再重命名，中断时不会留下会被重用的不完整文件
+    Write to a temporary file and rename, so an interruption never leaves a
+    partial file that would be reused
+    """
+    temp = f"{path}.tmp"
+    write(temp)
+    os.replace(temp, path)
+
+
+def build_corpus(
+    directory: str,
+    images: int = 8,
+    text_pdfs: int = 2,
+    scanned_pdfs: int = 2,
+    pages: int = 10,
+    seed: int = 0
+) -> Corpus:
+    """
+    生成（或重用已生成的）基准测试语料
+    Build the benchmark corpus (or reuse one already built)
+
+    文件写入 directory 下以生成参数命名的子目录，只有参数完全相同时才重用，
+    例如 --pages 不同的运行不会测到旧的语料。
+    Files go into a subdirectory of `directory` named after the generation
+    parameters and are reused only when every parameter matches, so a run
+    with a different --pages never measures an older corpus.
+
+    Args:
+        directory: 语料根目录 | Corpus root directory
+        images: 图片数 | Number of images
+        text_pdfs: 文本层 PDF 数 | Number of text-layer PDFs
+        scanned_pdfs: 扫描 PDF 数 | Number of scanned PDFs
+        pages: 每个 PDF 的页数 | Pages per PDF
+        seed: 随机种子 | Random seed
+
+    Returns:
+        Corpus: 生成的文件 | Generated files
+    """
+    directory = corpus_directory(directory, images, text_pdfs, scanned_pdfs, pages, seed)
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    corpus = Corpus(pages=pages)
+
+    for i in range(images):
+        path = os.path.join(directory, f"image_{i:02d}.png")
+        page = _render_page(rng)
+        if not os.path.exists(path):
+            _write_atomic(path, lambda temp, page=page: page.save(temp, format="PNG", optimize=False))
+        corpus.images.append(path)
+
+    for i in range(text_pdfs):
+        path = os.path.join(directory, f"text_{i:02d}.pdf")
+        content = [_lines(rng, 50) for _ in range(pages)]
+        if not os.path.exists(path):
+            _write_atomic(path, lambda temp, content=content: write_text_pdf(temp, content))
+        corpus.text_pdfs.append(path)
+
+    for i in range(scanned_pdfs):
+        path = os.path.join(directory, f"scanned_{i:02d}.pdf")
+        scans = [_render_page(rng, 1240, 1754).convert("L") for _ in range(pages)]
+        if not os.path.exists(path):
+            _write_atomic(path, lambda temp, scans=scans: scans[0].save(
+                temp, format="PDF", save_all=True, append_images=scans[1:], resolution=150
+            ))
+        corpus.scanned_pdfs.append(path)
+
+    return corpus
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+模拟 Ollama 服务器
+Mock Ollama Server
+
+本地替代 /api/generate、/api/version 和 /api/tags，延迟、抖动、
+错误率和流式行为可配置，无需 GPU 即可测量客户端流水线的吞吐量。
+A local stand-in for /api/generate, /api/version and /api/tags with
+configurable latency, jitter, error rate and streaming behavior, so the
+client pipeline's throughput can be measured without a GPU.
+
+用法 | Usage:
+    python -m benchmarks.mock_ollama --port 11434 --latency 0.5 --jitter 0.1
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import argparse  # 命令行参数
+import json  # JSON 编解码
+import random  # 延迟抖动和错误注入
+import threading  # 服务线程
+import time  # 模拟延迟
+from dataclasses import dataclass  # 数据类
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # HTTP 服务器
+from typing import Any, Dict, Optional
+
+# 模拟识别结果中的单词 | Words used in the mock recognition result
+_WORDS = (
+    "invoice", "total", "amount", "date", "page", "table", "summary", "report",
+    "发票", "金额", "日期", "合计", "页面", "表格", "摘要", "报告",
+)
+
+
+@dataclass
+class MockConfig:
+    """
+    模拟服务器配置
+    Mock server configuration
+
+    Attributes:
+        latency: 每个请求的平均处理时间（秒）| Mean processing time per request (seconds)
+        jitter: 处理时间的标准差（秒）| Standard deviation of the processing time (seconds)
+        latency_per_mb: 每 MB 图片数据额外的处理时间（模拟预填充）| Extra time per MB of image data (models prefill)
+        error_rate: 返回 503 的请求比例 | Share of requests answered with 503
+        stream_chunks: 流式响应的数据块数 | Chunks in a streaming response
+        tokens: 每个响应的单词数 | Words per response
+        load_delay: 第一个请求的模型加载时间（秒）| Model load time on the first request (seconds)
+        model: 模型名称 | Model name
+        seed: 随机种子，保证结果可复现 | Random seed for reproducible runs
+    """
+
+    latency: float = 0.2
+    jitter: float = 0.05
+    latency_per_mb: float = 0.0
+    error_rate: float = 0.0
+    stream_chunks: int = 8
+    tokens: int = 64
+    load_delay: float = 0.0
+    model: str = "glm-ocr"
+    seed: int = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """请求处理器（server 属性指向 MockOllamaServer）| Request handler (server points at MockOllamaServer)"""
+
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _send_json(self, body: Dict[str, Any], status: int = 200) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = self.headers.get("Content-Length")
+        if length is not None:
+            raw = self.rfile.read(int(length))
+        else:
+            # 分块传输编码 | Chunked transfer encoding
+            parts = []
+            while True:
+                size = int(self.rfile.readline().strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                parts.append(self.rfile.read(size))
+                self.rfile.readline()
+            raw = b"".join(parts)
+        return json.loads(raw or b"{}")
+
+    def do_GET(self) -> None:
+        mock = self.server.mock
+        if self.path == "/api/version":
+            self._send_json({"version": "0.0.0-mock"})
+        elif self.path == "/api/tags":
+            self._send_json({"models": [{"name": f"{mock.config.model}:latest", "size": 0}]})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self) -> None:
+        if self.path != "/api/generate":
+            self._send_json({"error": "not found"}, status=404)
+            return
+        mock = self.server.mock
+        body = self._read_body()
+        images = body.get("images") or []
+        image_bytes = sum(len(image) * 3 // 4 for image in images)
+
+        delay, load, fail = mock._plan(image_bytes, bool(images))
+        time.sleep(load + delay)
+        if fail:
+            self._send_json({"error": "mock server overloaded"}, status=503)
+            return
+
+        timing = {
+            "model": mock.config.model,
+            "total_duration": int((load + delay) * 1e9),
+            "load_duration": int(load * 1e9),
+            "prompt_eval_count": 256 if images else 0,
+            "prompt_eval_duration": int(delay * 0.4 * 1e9),
+            "eval_count": mock.config.tokens if images else 0,
+            "eval_duration": int(delay * 0.6 * 1e9),
+        }
+        text = mock._text(image_bytes) if images else ""
+
+        if not body.get("stream"):
+            self._send_json({"response": text, "done": True, **timing})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunks = max(1, mock.config.stream_chunks)
+        step = max(1, -(-len(text) // chunks))
+        lines = [{"response": text[i:i + step], "done": False} for i in range(0, len(text), step)]
+        lines.append({"response": "", "done": True, **timing})
+        for line in lines:
+            data = (json.dumps(line) + "\n").encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockOllamaServer"
+
+
+class MockOllamaServer:
+    """
+    在后台线程中运行的模拟 Ollama 服务器
+    Mock Ollama server running in a background thread
+
+    Example:
+        >>> with MockOllamaServer(MockConfig(latency=0.1)) as server:
+        ...     client = OllamaOCR(host=server.url)
+        ...     print(client.recognize("page.png"))
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            config: 服务器配置 | Server configuration
+            host: 监听地址 | Listen address
+            port: 监听端口，0 表示随机端口 | Listen port, 0 picks a free port
+        """
+        self.config = config or MockConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._requests = 0
+        self._errors = 0
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """服务器地址 | Server URL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _plan(self, image_bytes: int, has_images: bool):
+        """
+        决定一个请求的延迟、加载时间和是否失败
+        Decide a request's delay, load time and whether it fails
+        """
+        config = self.config
+        with self._lock:
+            self._requests += 1
+            load = 0.0
+            if not self._loaded:
+                self._loaded = True
+                load = config.load_delay
+            if not has_images:
+                return 0.0, load, False
+            delay = max(0.0, self._random.gauss(config.latency, config.jitter))
+            delay += config.latency_per_mb * image_bytes / (1024 * 1024)
+            fail = self._random.random() < config.error_rate
+            if fail:
+                self._errors += 1
+        return delay, load, fail
+
+    def _text(self, image_bytes: int) -> str:
+        """生成确定的识别结果 | Build a deterministic recognition result"""
+        words = [_WORDS[(image_bytes + i) % len(_WORDS)] for i in range(self.config.tokens)]
+        return f"# Mock Page\n\n{' '.join(words)}\n\n(image {image_bytes} bytes)"
+
+    def stats(self) -> Dict[str, int]:
+        """收到的请求数和注入的错误数 | Requests received and errors injected"""
+        with self._lock:
+            return {"requests": self._requests, "errors": self._errors}
+
+    def start(self) -> "MockOllamaServer":
+        """在后台线程中启动 | Start in a background thread"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-ollama", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止服务器 | Stop the server"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockOllamaServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """独立运行模拟服务器 | Run the mock server standalone"""
+    parser = argparse.ArgumentParser(description="模拟 Ollama 服务器 | Mock Ollama server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=MockConfig.latency)
+    parser.add_argument("--jitter", type=float, default=MockConfig.jitter)
+    parser.add_argument("--latency-per-mb", type=float, default=MockConfig.latency_per_mb)
+    parser.add_argument("--error-rate", type=float, default=MockConfig.error_rate)
+    parser.add_argument("--stream-chunks", type=int, default=MockConfig.stream_chunks)
+    parser.add_argument("--load-delay", type=float, default=MockConfig.load_delay)
+    parser.add_argument("--seed", type=int, default=MockConfig.seed)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        latency_per_mb=args.latency_per_mb,
+        error_rate=args.error_rate,
+        stream_chunks=args.stream_chunks,
+        load_delay=args.load_delay,
+        seed=args.seed,
+    )
+    server = MockOllamaServer(config, args.host, args.port)
+    print(f"模拟 Ollama 服务器 | Mock Ollama server: {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
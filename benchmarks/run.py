@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+基准测试
+Benchmarks
+
+启动本地模拟 Ollama 服务器，用固定的合成语料驱动
+OllamaOCR.recognize、recognize_batch、process_pdf_pages 和
+process_multiple_files，报告 pages/s、p50/p95/p99 请求延迟和内存峰值。
+指定基线文件时，吞吐量或延迟退化超过阈值会以非零状态退出，便于在 CI 中发现回归。
+Starts a local mock Ollama server and drives OllamaOCR.recognize,
+recognize_batch, process_pdf_pages and process_multiple_files over a fixed
+synthetic corpus, reporting pages/s, p50/p95/p99 request latency and peak
+memory. With a baseline file, a throughput or latency regression beyond
+the threshold exits non-zero so CI catches it.
+
+用法 | Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --latency 0.05 --jitter 0.01 --json results.json
+    python -m benchmarks.run --baseline results.json --max-regression 0.2
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import argparse  # 命令行参数
+import gc  # 场景之间回收内存
+import json  # 结果输出
+import logging  # 请求失败日志
+import math  # 百分位数
+import os  # 环境变量和路径
+import shutil  # 查找 poppler
+import sys  # 退出码
+import tempfile  # 语料目录
+import threading  # 延迟记录锁
+import time  # 计时
+from dataclasses import asdict, dataclass, field  # 数据类
+from types import SimpleNamespace  # 模拟上传文件
+from typing import Any, Callable, Dict, List, Optional
+
+# 从仓库根目录导入项目模块 | Import project modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import Corpus, build_corpus
+from benchmarks.mock_ollama import MockConfig, MockOllamaServer
+from src.utils.memory import MemoryMonitor
+
+logger = logging.getLogger(__name__)
+
+# 所有场景 | Every scenario
+SCENARIOS = (
+    "recognize",
+    "recognize_stream",
+    "recognize_batch",
+    "pdf_text",
+    "pdf_scanned",
+    "multiple_files",
+)
+
+
+@dataclass
+class ScenarioResult:
+    """
+    单个场景的测量结果
+    Measurements of one scenario
+
+    Attributes:
+        name: 场景名称 | Scenario name
+        pages: 处理的页数（图片计为一页）| Pages processed (an image counts as one)
+        requests: OCR 请求数 | OCR requests
+        errors: 失败的请求数 | Failed requests
+        seconds: 总耗时 | Wall time
+        latencies: 每个 OCR 请求的耗时（秒）| Time of every OCR request (seconds)
+        peak_rss_mb: 常驻内存峰值 | Peak resident memory
+        rss_growth_mb: 峰值相对开始时的增长 | Peak growth over the start
+        skipped: 跳过原因 | Reason the scenario was skipped
+    """
+
+    name: str
+    pages: int = 0
+    requests: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    peak_rss_mb: Optional[float] = None
+    rss_growth_mb: Optional[float] = None
+    skipped: Optional[str] = None
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        """请求延迟的百分位数（最近秩法）| Request latency percentile (nearest rank)"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(q * len(ordered) / 100))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("latencies")
+        data["pages_per_second"] = round(self.pages_per_second, 3)
+        for q in (50, 95, 99):
+            value = self.percentile(q)
+            data[f"p{q}_ms"] = round(value * 1000, 1) if value is not None else None
+        data["seconds"] = round(self.seconds, 3)
+        return data
+
+
+def _instrument(client: Any, result: ScenarioResult) -> None:
+    """
+    包装客户端的 recognize，记录每个请求的耗时和失败
+    Wrap the client's recognize to record every request's time and failures
+
+    recognize_batch 和 PDF 处理都通过 self.recognize / client.recognize 调用，
+    实例属性会覆盖类方法。
+    recognize_batch and PDF processing call self.recognize / client.recognize,
+    so the instance attribute takes precedence over the method.
+    """
+    lock = threading.Lock()
+    recognize = type(client).recognize.__get__(client)
+
+    def _timed(image: Any) -> str:
+        started = time.perf_counter()
+        try:
+            return recognize(image)
+        except Exception:
+            with lock:
+                result.errors += 1
+            raise
+        finally:
+            with lock:
+                result.requests += 1
+                result.latencies.append(time.perf_counter() - started)
+
+    client.recognize = _timed
+
+
+def _pdf_pages(path: str) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(path).pages)
+
+
+def _upload(path: str) -> SimpleNamespace:
+    """模拟 Gradio 上传的文件对象 | Stand-in for a Gradio upload object"""
+    return SimpleNamespace(name=path)
+
+
+def _load_app(server_url: str):
+    """
+    指向模拟服务器后导入 app（首次使用时才创建客户端）
+    Import app pointed at the mock server (the clients are created on first use)
+    """
+    os.environ["OLLAMA_BASE_URL"] = server_url
+    os.environ.setdefault("OCR_JOBS", "false")
+    os.environ.setdefault("OCR_WARMUP", "false")
+    os.environ.setdefault("OCR_KEEP_WARM", "false")
+    import app
+
+    return app
+
+
+def run_scenario(
+    name: str,
+    corpus: Corpus,
+    client_factory: Callable[[], Any],
+    app_loader: Callable[[], Any],
+    repeat: int = 1
+) -> ScenarioResult:
+    """
+    运行一个场景
+    Run one scenario
+
+    Args:
+        name: 场景名称 | Scenario name
+        corpus: 语料 | Corpus
+        client_factory: 创建 OllamaOCR 客户端 | Creates an OllamaOCR client
+        app_loader: 导入 app 模块 | Imports the app module
+        repeat: 重复次数 | Repetitions
+
+    Returns:
+        ScenarioResult: 测量结果 | Measurements
+    """
+    result = ScenarioResult(name)
+    has_poppler = shutil.which("pdftoppm") is not None
+    if name in ("pdf_scanned",) and not has_poppler:
+        result.skipped = "未安装 poppler | poppler not installed"
+        return result
+
+    if name in ("pdf_text", "pdf_scanned", "multiple_files"):
+        try:
+            app = app_loader()
+        except Exception as e:
+            # 缺少 gradio 或版本不兼容时仍可运行客户端场景
+            # Client scenarios still run when gradio is missing or incompatible
+            result.skipped = f"无法导入 app | cannot import app: {e}"
+            return result
+
+    client = client_factory()
+    _instrument(client, result)
+    gc.collect()
+
+    with MemoryMonitor() as monitor:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            if name == "recognize":
+                for image in corpus.images:
+                    try:
+                        client.recognize(image)
+                    except Exception as e:
+                        # 失败已由 _instrument 计入 errors | The failure is already counted in errors by _instrument
+                        logger.debug("识别失败 | Recognition failed for %s: %s", image, e)
+                result.pages += len(corpus.images)
+            elif name == "recognize_stream":
+                for image in corpus.images:
+                    # 与 _instrument 一致，失败请求的耗时也计入 | Failed requests are timed too, as in _instrument
+                    request_started = time.perf_counter()
+                    try:
+                        for _chunk in client.recognize_stream(image):
+                            pass
+                    except Exception:
+                        result.errors += 1
+                    result.requests += 1
+                    result.latencies.append(time.perf_counter() - request_started)
+                result.pages += len(corpus.images)
+            elif name == "recognize_batch":
+                client.recognize_batch(corpus.images, show_progress=False)
+                result.pages += len(corpus.images)
+            elif name in ("pdf_text", "pdf_scanned"):
+                pdfs = corpus.text_pdfs if name == "pdf_text" else corpus.scanned_pdfs
+                for pdf in pdfs:
+                    app.process_pdf_pages(pdf, client=client)
+                    result.pages += _pdf_pages(pdf)
+            elif name == "multiple_files":
+                files = corpus.images + corpus.text_pdfs
+                if has_poppler:
+                    files += corpus.scanned_pdfs
+                app.process_multiple_files([_upload(path) for path in files], client=client)
+                result.pages += sum(
+                    _pdf_pages(path) if path.endswith(".pdf") else 1 for path in files
+                )
+            else:
+                raise ValueError(f"未知场景 | Unknown scenario: {name}")
+        result.seconds = time.perf_counter() - started
+
+    result.peak_rss_mb = monitor.peak_mb
+    result.rss_growth_mb = monitor.growth_mb
+    client.close()
+    return result
+
+
+def format_table(results: List[ScenarioResult]) -> str:
+    """格式化结果表格 | Format the results table"""
+    header = (
+        f"{'scenario':<18}{'pages':>7}{'req':>6}{'err':>5}{'seconds':>9}"
+        f"{'pages/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak MB':>9}{'+MB':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        if result.skipped:
+            lines.append(f"{result.name:<18}跳过 | skipped: {result.skipped}")
+            continue
+        data = result.to_dict()
+
+        def _cell(value: Any, width: int) -> str:
+            return f"{'-' if value is None else value:>{width}}"
+
+        lines.append(
+            f"{result.name:<18}{result.pages:>7}{result.requests:>6}{result.errors:>5}"
+            f"{data['seconds']:>9}{data['pages_per_second']:>9}"
+            f"{_cell(data['p50_ms'], 9)}{_cell(data['p95_ms'], 9)}{_cell(data['p99_ms'], 9)}"
+            f"{_cell(result.peak_rss_mb, 9)}{_cell(result.rss_growth_mb, 7)}"
+        )
+    return "\n".join(lines)
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], max_regression: float) -> List[str]:
+    """
+    与基线比较，返回退化的场景说明
+    Compare with a baseline and describe the scenarios that regressed
+
+    Args:
+        results: 本次结果（to_dict）| Current results (to_dict)
+        baseline: 基线结果 | Baseline results
+        max_regression: 允许的退化比例 | Allowed regression ratio
+    """
+    previous = {item["name"]: item for item in baseline}
+    regressions = []
+    for item in results:
+        old = previous.get(item["name"])
+        if old is None or item.get("skipped") or old.get("skipped"):
+            continue
+        if old["pages_per_second"] and item["pages_per_second"] < old["pages_per_second"] * (1 - max_regression):
+            regressions.append(
+                f"{item['name']}: pages/s {old['pages_per_second']} -> {item['pages_per_second']}"
+            )
+        if old.get("p95_ms") and item.get("p95_ms") and item["p95_ms"] > old["p95_ms"] * (1 + max_regression):
+            regressions.append(f"{item['name']}: p95 {old['p95_ms']} ms -> {item['p95_ms']} ms")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    Command-line entry point
+
+    Returns:
+        int: 退出码，发现退化时为 1 | Exit code, 1 when a regression is found
+    """
+    parser = argparse.ArgumentParser(description="GLM-OCR 基准测试 | GLM-OCR benchmarks")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--corpus-dir", help="语料目录（默认：临时目录）| Corpus directory (default: temp dir)")
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--pdfs", type=int, default=2, help="每种 PDF 的数量 | PDFs of each kind")
+    parser.add_argument("--pages", type=int, default=10, help="每个 PDF 的页数 | Pages per PDF")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=4, help="客户端并发数 | Client concurrency")
+    parser.add_argument("--latency", type=float, default=MockConfig.latency)
+    parser.add_argument("--jitter", type=float, default=MockConfig.jitter)
+    parser.add_argument("--latency-per-mb", type=float, default=MockConfig.latency_per_mb)
+    parser.add_argument("--error-rate", type=float, default=MockConfig.error_rate)
+    parser.add_argument("--stream-chunks", type=int, default=MockConfig.stream_chunks)
+    parser.add_argument("--seed", type=int, default=MockConfig.seed)
+    parser.add_argument("--cache", action="store_true", help="启用 OCR 缓存 | Enable the OCR cache")
+    parser.add_argument("--json", help="结果 JSON 输出路径 | Write results as JSON")
+    parser.add_argument("--baseline", help="基线 JSON，用于检测退化 | Baseline JSON for regression checks")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    config = MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        latency_per_mb=args.latency_per_mb,
+        error_rate=args.error_rate,
+        stream_chunks=args.stream_chunks,
+        seed=args.seed,
+    )
+    corpus_dir = args.corpus_dir or os.path.join(tempfile.gettempdir(), "glm-ocr-bench-corpus")
+    corpus = build_corpus(
+        corpus_dir, images=args.images, text_pdfs=args.pdfs, scanned_pdfs=args.pdfs,
+        pages=args.pages, seed=args.seed,
+    )
+
+    # 缓存默认关闭，否则重复运行只测到缓存命中
+    # The cache is off by default, otherwise repeated runs only measure cache hits
+    os.environ["OCR_CACHE_ENABLED"] = "true" if args.cache else "false"
+
+    with MockOllamaServer(config) as server:
+        from ollama_client import OllamaOCR
+
+        def _client() -> OllamaOCR:
+            return OllamaOCR(host=server.url, max_workers=args.workers, cache=None)
+
+        results = [
+            run_scenario(name, corpus, _client, lambda: _load_app(server.url), args.repeat)
+            for name in args.scenarios
+        ]
+        server_stats = server.stats()
+
+    print(format_table(results))
+    print(
+        f"\n模拟服务器 | Mock server: {server_stats['requests']} 请求 | requests, "
+        f"{server_stats['errors']} 注入错误 | injected errors"
+    )
+
+    report = {
+        "config": {**asdict(config), "workers": args.workers, "repeat": args.repeat, "cache": args.cache},
+        "scenarios": [result.to_dict() for result in results],
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["scenarios"]
+        regressions = compare(report["scenarios"], baseline, args.max_regression)
+        if regressions:
+            print("\n性能退化 | Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+启动时间基准测试
+Startup-Time Benchmark
+
+在全新的解释器进程中分阶段测量新副本就绪前的开销：导入 ollama_client、
+导入 app、创建客户端和后台服务、导入 Gradio 以及构建界面。每个阶段
+取多次运行的中位数；可选列出导入耗时最多的模块。就绪时间超过目标，
+或与基线相比退化超过阈值时以非零状态退出。
+Measures, phase by phase and in fresh interpreter processes, what a new
+replica pays before it is ready: importing ollama_client, importing app,
+creating the clients and background services, importing Gradio and
+building the interface. Every phase reports the median of several runs;
+the modules with the highest import cost can be listed too. Exits non-zero
+when readiness exceeds the target or regresses against a baseline.
+
+用法 | Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 10 --max-seconds 3 --json startup.json
+    python -m benchmarks.startup --baseline startup.json --max-regression 0.2
+    python -m benchmarks.startup --importtime 15
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import argparse  # 命令行参数
+import json  # 结果输出
+import os  # 环境变量和路径
+import statistics  # 中位数
+import subprocess  # 全新的解释器进程
+import sys  # 解释器路径和退出码
+import time  # 计时
+from dataclasses import asdict, dataclass, field  # 数据类
+from typing import Any, Dict, List, Optional
+
+# 仓库根目录 | Repository root
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 按顺序测量的阶段 | Phases, measured in order
+PHASES = (
+    "import_ollama_client",
+    "import_app",
+    "services",
+    "import_gradio",
+    "build_demo",
+)
+
+# 子进程中运行的测量代码：逐阶段计时，出错时记录并停止
+# Measurement code run in the child: time each phase, record the error and stop on failure
+_CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+phases, error = {{}}, None
+
+def _app():
+    import app
+    return app
+
+steps = [
+    ("import_ollama_client", lambda: __import__("ollama_client")),
+    ("import_app", lambda: __import__("app")),
+    ("services", lambda: _app().services()),
+    ("import_gradio", lambda: __import__("gradio")),
+    ("build_demo", lambda: _app().build_demo()),
+]
+for name, step in steps:
+    started = time.perf_counter()
+    try:
+        step()
+    except Exception as e:
+        error = f"{{name}}: {{type(e).__name__}}: {{e}}"
+        break
+    phases[name] = time.perf_counter() - started
+print(json.dumps({{"phases": phases, "error": error}}))
+"""
+
+
+@dataclass
+class StartupResult:
+    """
+    启动时间测量结果（秒）
+    Startup-time measurements (seconds)
+
+    Attributes:
+        interpreter: 空解释器进程的启动时间 | Startup time of an empty interpreter process
+        phases: 每个阶段每次运行的耗时 | Time of every phase in every run
+        totals: 每次运行的进程总耗时（含解释器启动）| Process wall time of every run (interpreter included)
+        error: 首次出错的阶段和原因 | First failing phase and why
+    """
+
+    interpreter: List[float] = field(default_factory=list)
+    phases: Dict[str, List[float]] = field(default_factory=dict)
+    totals: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @staticmethod
+    def _median_ms(values: List[float]) -> Optional[float]:
+        return round(statistics.median(values) * 1000, 1) if values else None
+
+    @property
+    def ready_seconds(self) -> Optional[float]:
+        """就绪时间：进程总耗时的中位数 | Readiness: median process wall time"""
+        return round(statistics.median(self.totals), 3) if self.totals else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（中位数，毫秒）| Convert to a dictionary (medians, milliseconds)"""
+        return {
+            "interpreter_ms": self._median_ms(self.interpreter),
+            "phases_ms": {name: self._median_ms(self.phases.get(name, [])) for name in PHASES},
+            "ready_seconds": self.ready_seconds,
+            "runs": len(self.totals),
+            "error": self.error,
+        }
+
+
+def _child_env() -> Dict[str, str]:
+    """
+    子进程环境：不启动预热、保活和后台任务，避免测到网络和磁盘
+    Child environment: no warm-up, keep-warm or background jobs, so the
+    network and disk are not measured
+    """
+    env = dict(os.environ)
+    env.setdefault("OCR_WARMUP", "false")
+    env.setdefault("OCR_KEEP_WARM", "false")
+    env.setdefault("OCR_JOBS", "false")
+    return env
+
+
+def _timed_run(args: List[str], env: Dict[str, str]) -> "tuple[float, subprocess.CompletedProcess]":
+    """运行子进程并返回总耗时 | Run a child process and return its wall time"""
+    started = time.perf_counter()
+    completed = subprocess.run(args, env=env, cwd=_ROOT, capture_output=True, text=True)
+    return time.perf_counter() - started, completed
+
+
+def measure(repeat: int = 5) -> StartupResult:
+    """
+    在全新的解释器中测量每个阶段
+    Measure every phase in fresh interpreters
+
+    Args:
+        repeat: 运行次数 | Number of runs
+
+    Returns:
+        StartupResult: 测量结果 | Measurements
+    """
+    env = _child_env()
+    code = _CHILD.format(root=_ROOT)
+    result = StartupResult()
+    for _ in range(max(1, repeat)):
+        seconds, _ = _timed_run([sys.executable, "-c", "pass"], env)
+        result.interpreter.append(seconds)
+
+        seconds, completed = _timed_run([sys.executable, "-c", code], env)
+        try:
+            report = json.loads(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            result.error = (completed.stderr.strip().splitlines() or ["no output"])[-1]
+            break
+        for name, value in report["phases"].items():
+            result.phases.setdefault(name, []).append(value)
+        if report["error"]:
+            # 未完成所有阶段的运行不计入就绪时间 | Runs that did not finish every phase are not counted as ready
+            result.error = report["error"]
+            break
+        result.totals.append(seconds)
+    return result
+
+
+def import_breakdown(module: str = "app", top: int = 15) -> List[Dict[str, Any]]:
+    """
+    用 -X importtime 列出导入某模块时累计耗时最多的顶层导入
+    List the top-level imports with the highest cumulative cost when
+    importing a module, using -X importtime
+
+    Args:
+        module: 要导入的模块 | Module to import
+        top: 列出的数量 | How many to list
+
+    Returns:
+        List[Dict[str, Any]]: 模块名和累计耗时（毫秒）| Module name and cumulative time (ms)
+    """
+    _, completed = _timed_run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], _child_env()
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        if not cumulative.strip().isdigit() or depth > 1:
+            continue
+        entries.append({"module": name.strip(), "ms": round(int(cumulative) / 1000, 1)})
+    return sorted(entries, key=lambda entry: entry["ms"], reverse=True)[:top]
+
+
+def format_report(result: StartupResult) -> str:
+    """格式化结果表格 | Format the results table"""
+    data = result.to_dict()
+
+    def _row(name: str, values: List[float]) -> str:
+        if not values:
+            return f"{name:<24}{'-':>10}{'-':>10}{'-':>10}"
+        return (
+            f"{name:<24}{statistics.median(values) * 1000:>10.1f}"
+            f"{min(values) * 1000:>10.1f}{max(values) * 1000:>10.1f}"
+        )
+
+    header = f"{'phase':<24}{'p50 ms':>10}{'min ms':>10}{'max ms':>10}"
+    lines = [header, "-" * len(header), _row("interpreter", result.interpreter)]
+    lines += [_row(name, result.phases.get(name, [])) for name in PHASES]
+    lines += ["-" * len(header), _row("ready (process)", result.totals)]
+    if data["error"]:
+        lines.append(f"\n错误 | Error: {data['error']}")
+    return "\n".join(lines)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    与基线比较，返回退化的阶段说明（基线低于 5 ms 的阶段不比较）
+    Compare with a baseline and describe the phases that regressed (phases
+    under 5 ms in the baseline are not compared)
+    """
+    regressions = []
+    for name, old in baseline.get("phases_ms", {}).items():
+        new = current["phases_ms"].get(name)
+        if old and new and old >= 5 and new > old * (1 + max_regression):
+            regressions.append(f"{name}: {old} ms -> {new} ms")
+    old, new = baseline.get("ready_seconds"), current.get("ready_seconds")
+    if old and new and new > old * (1 + max_regression):
+        regressions.append(f"ready: {old}s -> {new}s")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    Command-line entry point
+
+    Returns:
+        int: 退出码，超过目标或发现退化时为 1 | Exit code, 1 over the target or on a regression
+    """
+    parser = argparse.ArgumentParser(description="GLM-OCR 启动时间基准测试 | GLM-OCR startup-time benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, help="就绪时间目标（秒）| Readiness target in seconds")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                        help="列出导入 app 时耗时最多的 N 个模块 | List the N costliest imports of app")
+    parser.add_argument("--json", help="结果 JSON 输出路径 | Write results as JSON")
+    parser.add_argument("--baseline", help="基线 JSON，用于检测退化 | Baseline JSON for regression checks")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    result = measure(args.repeat)
+    print(format_report(result))
+
+    report = {"repeat": args.repeat, **result.to_dict(), "raw": asdict(result)}
+    if args.importtime:
+        report["imports"] = import_breakdown("app", args.importtime)
+        print("\n导入耗时 | Import cost (cumulative ms):")
+        for entry in report["imports"]:
+            print(f"  {entry['ms']:>9.1f}  {entry['module']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    failed = result.error is not None
+    if args.max_seconds is not None:
+        ready = result.ready_seconds
+        if ready is None:
+            print("\n未能测得就绪时间 | Readiness could not be measured")
+            failed = True
+        elif ready > args.max_seconds:
+            print(f"\n就绪时间超过目标 | Readiness over target: {ready}s > {args.max_seconds}s")
+            failed = True
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        if regressions:
+            print("\n性能退化 | Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
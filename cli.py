@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+GLM-OCR 命令行批量识别
+GLM-OCR Command-line Bulk OCR
+
+遍历目录树，识别 Web UI 支持的所有格式（图片、PDF、Word），多个文件
+并发处理，每完成一个文件立即写入对应的 Markdown 文件和/或 JSONL。
+清单文件按内容哈希记录已完成的文件，重新运行时跳过，结束时输出吞吐量统计。
+Walks directory trees and recognizes every format the web UI supports
+(images, PDF, Word) with several files in flight. Each result is written
+to its own Markdown file and/or a JSONL stream as soon as it completes. A
+manifest keyed by content hash records finished inputs so re-runs skip
+them, and throughput statistics are printed at the end.
+
+用法 | Usage:
+    python cli.py scans/ -o ocr_output/
+    python cli.py scans/ invoices/ --jsonl results.jsonl -w 8
+    python cli.py book.pdf -o out/ --force
+
+Author: GLM-OCR Team
+License: MIT License
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import argparse  # 命令行参数
+import hashlib  # 内容哈希
+import json  # JSONL 输出
+import os  # 文件路径
+import sys  # 标准输出
+import threading  # 写入锁
+import time  # 计时
+from collections import Counter  # 页面路由计数
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack  # 持有清单文件和 JSONL 输出
+from dataclasses import dataclass, field  # 数据类
+from typing import Dict, Iterable, Iterator, List, MutableSequence, Optional, Set, TextIO, Tuple
+
+# 本地模块导入 | Local Module Imports
+from ollama_client import OllamaOCR  # Ollama OCR 客户端
+from src.handlers.doc_handler import extract_doc_text  # Word 文档处理
+from src.handlers.job_runner import KIND_DOCX, KIND_PDF, file_kind  # 文件类型
+from src.handlers.pdf_handler import NO_TEXT_PLACEHOLDER, PageError, iter_pdf_page_texts  # PDF 页面处理
+from src.utils.env import env_bool, env_int, load_env_file  # 环境变量解析
+from src.utils.memory import MemoryBudget, MemoryMonitor, SpillBuffer  # 内存预算
+from src.utils.scheduler import FairScheduler, ScheduledClient  # 公平调度
+from src.utils.text_layer import MODES, TextLayerConfig, format_route_counts  # 文本层路由
+
+# 支持的文件扩展名（与 Web UI 一致）| Supported extensions (same as the web UI)
+SUPPORTED_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp", ".tif", ".tiff",
+    ".pdf", ".doc", ".docx",
+)
+
+# 清单文件名 | Manifest file name
+MANIFEST_NAME = ".ocr_manifest.jsonl"
+
+
+def iter_input_files(
+    paths: Iterable[str],
+    extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS
+) -> Iterator[Tuple[str, str]]:
+    """
+    遍历输入路径，按名称顺序产出支持的文件
+    Walk the input paths and yield supported files in name order
+
+    Args:
+        paths: 文件或目录 | Files or directories
+        extensions: 支持的扩展名 | Supported extensions
+
+    Yields:
+        Tuple[str, str]: (文件路径, 用于计算输出相对路径的根目录)
+                         (file path, root used for the relative output path)
+    """
+    for path in paths:
+        if os.path.isfile(path):
+            yield path, os.path.dirname(os.path.abspath(path))
+            continue
+        for directory, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.lower().endswith(extensions) and not filename.startswith("."):
+                    yield os.path.join(directory, filename), path
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    分块计算文件的 SHA-256
+    Compute a file's SHA-256 in chunks
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    按内容哈希记录已完成文件的清单（JSONL，仅追加，中断后仍然有效）
+    Manifest of finished inputs keyed by content hash (append-only JSONL,
+    stays valid after an interruption)
+    """
+
+    def __init__(self, path: str, load: bool = True):
+        """
+        Args:
+            path: 清单文件路径 | Manifest file path
+            load: 是否读取已有记录（False 时重新识别所有文件）| Read existing entries (False re-processes everything)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: Set[str] = set()
+        if load and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._done.add(json.loads(line)["sha256"])
+                    except (ValueError, KeyError, TypeError):
+                        # 中断时写了一半的行 | A line cut short by an interruption
+                        continue
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # 清单文件随对象一起存活，由 close() 关闭
+        # The manifest file lives as long as the object and close() releases it
+        with ExitStack() as stack:
+            self._file = stack.enter_context(open(path, "a", encoding="utf-8"))
+            self._resources = stack.pop_all()
+
+    def __contains__(self, sha256: str) -> bool:
+        with self._lock:
+            return sha256 in self._done
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._done)
+
+    def add(self, entry: Dict) -> None:
+        """记录一个已完成的文件 | Record a finished input"""
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._done.add(entry["sha256"])
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._resources.close()
+
+    def __enter__(self) -> "Manifest":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+@dataclass
+class FileResult:
+    """
+    单个文件的识别结果
+    Recognition result of one file
+    """
+
+    path: str
+    sha256: str
+    kind: str
+    pages: MutableSequence[str] = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+    skipped: bool = False
+    routes: Counter = field(default_factory=Counter)
+
+    def iter_markdown(self) -> Iterator[str]:
+        """
+        逐页产出 Markdown（多页时带页面标记），不在内存中合并
+        Yield the Markdown page by page (page markers for several pages)
+        without joining it in memory
+        """
+        total = len(self.pages)
+        for i, text in enumerate(self.pages):
+            if i:
+                yield "\n\n"
+            if total > 1:
+                yield f"--- 第 {i + 1}/{total} 页 | Page {i + 1}/{total} ---\n\n"
+            yield text
+
+    def close(self) -> None:
+        """释放磁盘缓冲 | Release the disk buffer"""
+        if isinstance(self.pages, SpillBuffer):
+            self.pages.close()
+
+
+@dataclass
+class BulkStats:
+    """
+    批量运行的吞吐量统计
+    Throughput statistics of a bulk run
+    """
+
+    files: int = 0
+    skipped: int = 0
+    failed: int = 0
+    pages: int = 0
+    bytes: int = 0
+    routes: Counter = field(default_factory=Counter)
+    peak_rss_mb: Optional[float] = None
+    started: float = field(default_factory=time.perf_counter)
+
+    def summary(self) -> str:
+        """统计摘要 | Summary line"""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        summary = (
+            f"完成 | Done: {self.files} 个文件 | files, {self.skipped} 跳过 | skipped, "
+            f"{self.failed} 失败 | failed, {self.pages} 页 | pages, "
+            f"{self.bytes / (1024 * 1024):.1f} MB in {elapsed:.1f}s — "
+            f"{self.files / elapsed:.2f} files/s, {self.pages / elapsed:.2f} pages/s"
+        )
+        if self.routes:
+            summary += f"\nPDF 页面路由 | PDF page routes: {format_route_counts(self.routes)}"
+        if self.peak_rss_mb is not None:
+            summary += f"\n峰值内存 | Peak RSS: {self.peak_rss_mb} MB"
+        return summary
+
+
+def recognize_file(
+    path: str,
+    client,
+    text_config: Optional[TextLayerConfig] = None,
+    routes: Optional[Counter] = None,
+    pages: Optional[MutableSequence[str]] = None,
+    doc_images: bool = True,
+    failed_pages: Optional[List[int]] = None
+) -> MutableSequence[str]:
+    """
+    识别一个文件，返回每页的文本
+    Recognize one file and return the text of every page
+
+    PDF 中 OCR 失败的页面保留错误占位符，页码索引追加到 failed_pages；
+    图片和 Word 文档识别失败时抛出异常。
+    PDF pages that failed OCR keep their error placeholder and their index
+    is appended to failed_pages; images and Word documents raise on failure.
+
+    Args:
+        path: 文件路径 | File path
+        client: OCR 客户端 | OCR client
+        text_config: PDF 文本层路由配置 | PDF text-layer routing settings
+        routes: PDF 页面路由计数 | PDF page routing counts
+        pages: 追加页面文本的容器（例如 SpillBuffer），默认为列表
+               Container the page texts are appended to (e.g. a SpillBuffer), a list by default
+        doc_images: 识别 Word 文档中的嵌入图片 | Recognize images embedded in Word documents
+        failed_pages: 可选的列表，追加 OCR 失败的 PDF 页码索引（从 0 开始）
+                      Optional list the 0-based indexes of PDF pages that failed OCR are appended to
+
+    Returns:
+        MutableSequence[str]: 每页文本（图片和 Word 文档为一页）| Text per page (one page for images and Word)
+    """
+    pages = pages if pages is not None else []
+    kind = file_kind(path)
+    if kind == KIND_PDF:
+        for i, _, text in iter_pdf_page_texts(
+            path, client, text_config=text_config, routes=routes
+        ):
+            if isinstance(text, PageError) and failed_pages is not None:
+                failed_pages.append(i)
+            pages.append(text if text and text.strip() else NO_TEXT_PLACEHOLDER)
+    elif kind == KIND_DOCX:
+        pages.append(
+            extract_doc_text(path, client=client if doc_images else None, strict=True)
+        )
+    else:
+        pages.append(client.recognize(path))
+    return pages
+
+
+def _output_path(output_dir: str, path: str, root: str) -> str:
+    """
+    输出文件路径：保留相对目录结构，扩展名后追加 .md（a.pdf -> a.pdf.md）
+    Output path keeping the relative directory layout, with .md appended
+    to the file name (a.pdf -> a.pdf.md)
+    """
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+    return os.path.join(output_dir, relative + ".md")
+
+
+def _write_atomic(path: str, parts: Iterable[str]) -> None:
+    """
+    先写临时文件再重命名，中断时不会留下不完整的输出
+    Write to a temporary file and rename, so an interruption never leaves a
+    partial output
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp = f"{path}.tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        for part in parts:
+            f.write(part)
+    os.replace(temp, path)
+
+
+def _write_jsonl_record(stream: TextIO, record: Dict, pages: Iterable[str]) -> None:
+    """
+    写入一行 JSONL，pages 字段逐页序列化，不在内存中构造整行
+    Write one JSONL line, serializing the pages field page by page instead of
+    building the whole line in memory
+    """
+    stream.write(json.dumps(record, ensure_ascii=False)[:-1] + ', "pages": [')
+    for i, text in enumerate(pages):
+        stream.write((", " if i else "") + json.dumps(text, ensure_ascii=False))
+    stream.write("]}\n")
+
+
+def run(
+    inputs: List[str],
+    output_dir: Optional[str] = None,
+    jsonl: Optional[TextIO] = None,
+    workers: int = 4,
+    manifest: Optional[Manifest] = None,
+    client: Optional[OllamaOCR] = None,
+    text_config: Optional[TextLayerConfig] = None,
+    memory_budget: Optional[MemoryBudget] = None,
+    doc_images: bool = True,
+    log: TextIO = sys.stderr
+) -> BulkStats:
+    """
+    批量识别输入路径下的所有文件，结果随完成随写出
+    Recognize every file under the inputs, writing results as they complete
+
+    Args:
+        inputs: 文件或目录 | Files or directories
+        output_dir: 每个文件一个 Markdown 的输出目录 | Directory for one Markdown file per input
+        jsonl: JSONL 输出流 | JSONL output stream
+        workers: 同时进行的 OCR 请求数 | OCR requests in flight
+        manifest: 已完成文件清单 | Manifest of finished inputs
+        client: OCR 客户端，默认新建 | OCR client, created if not provided
+        text_config: PDF 文本层路由配置，默认从环境变量读取
+                     PDF text-layer routing settings, read from the environment if not provided
+        memory_budget: 内存预算，启用时每个文件的页面超过预算份额后转存到磁盘，默认从环境变量读取
+                       Memory budget; when enabled each file's pages spill to disk past its
+                       share of the budget. Read from the environment if not provided
+        doc_images: 识别 Word 文档中的嵌入图片 | Recognize images embedded in Word documents
+        log: 进度输出流 | Progress stream
+
+    Returns:
+        BulkStats: 吞吐量统计 | Throughput statistics
+    """
+    stats = BulkStats()
+    files = list(iter_input_files(inputs))
+    total = len(files)
+    owns_client = client is None
+    client = client or OllamaOCR(max_workers=workers)
+    # 文件之间按页轮转，总并发不超过 workers | Pages rotate between files, at most `workers` in flight
+    scheduler = FairScheduler(workers)
+    text_config = text_config or TextLayerConfig.from_env()
+    memory_budget = memory_budget or MemoryBudget.from_env()
+    write_lock = threading.Lock()
+
+    def _page_buffer() -> MutableSequence[str]:
+        if not memory_budget.enabled:
+            return []
+        # 处理中的文件最多为 workers * 2 个，平分结果缓冲预算
+        # At most workers * 2 files are in flight and share the result budget
+        return SpillBuffer(
+            max(1024 * 1024, memory_budget.spill_bytes() // (workers * 2)),
+            memory_budget.spill_dir,
+        )
+
+    def _process(path: str) -> FileResult:
+        sha256 = file_sha256(path)
+        result = FileResult(path, sha256, file_kind(path))
+        if manifest is not None and sha256 in manifest:
+            result.skipped = True
+            return result
+        started = time.perf_counter()
+        failed_pages: List[int] = []
+        try:
+            result.pages = recognize_file(
+                path, ScheduledClient(client, scheduler, path), text_config, result.routes,
+                _page_buffer(), doc_images, failed_pages,
+            )
+        except Exception as e:
+            result.error = str(e)
+        else:
+            # 有页面识别失败时整个文件计为失败，不写入清单，下次运行重新识别
+            # A file with failed pages counts as failed and stays out of the manifest, so the next run retries it
+            if failed_pages:
+                numbers = ", ".join(str(i + 1) for i in failed_pages[:10])
+                more = ", ..." if len(failed_pages) > 10 else ""
+                result.error = (
+                    f"{len(failed_pages)} 页识别失败 | page(s) failed OCR: {numbers}{more}"
+                )
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _finish(index: int, root: str, result: FileResult) -> None:
+        try:
+            _write_result(index, root, result)
+        finally:
+            result.close()
+
+    def _write_result(index: int, root: str, result: FileResult) -> None:
+        if result.skipped:
+            stats.skipped += 1
+            print(f"[{index}/{total}] 跳过 | skip {result.path}", file=log)
+            return
+
+        if result.error is not None:
+            stats.failed += 1
+            print(f"[{index}/{total}] 失败 | FAILED {result.path}: {result.error}", file=log)
+        else:
+            stats.files += 1
+            stats.pages += len(result.pages)
+            stats.bytes += os.path.getsize(result.path)
+            stats.routes.update(result.routes)
+            print(
+                f"[{index}/{total}] {result.path} "
+                f"({len(result.pages)} 页 | pages, {result.seconds:.1f}s)",
+                file=log,
+            )
+
+        output = None
+        if output_dir and result.error is None:
+            output = _output_path(output_dir, result.path, root)
+            _write_atomic(output, result.iter_markdown())
+        if jsonl is not None:
+            record = {
+                "path": result.path,
+                "sha256": result.sha256,
+                "type": result.kind,
+                "seconds": round(result.seconds, 3),
+                "error": result.error,
+            }
+            with write_lock:
+                _write_jsonl_record(jsonl, record, result.pages)
+                jsonl.flush()
+        if manifest is not None and result.error is None:
+            manifest.add({
+                "sha256": result.sha256,
+                "path": result.path,
+                "output": output,
+                "pages": len(result.pages),
+                "time": time.time(),
+            })
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ocr-cli")
+    pending: Dict[Future, str] = {}
+    completed = 0
+    monitor = MemoryMonitor().start()
+    try:
+        queue = iter(files)
+        while True:
+            # 同时只保留有限个文件在处理中，避免一次性提交整个目录树
+            # Keep a bounded number of files in flight instead of submitting the whole tree
+            while len(pending) < workers * 2:
+                item = next(queue, None)
+                if item is None:
+                    break
+                path, root = item
+                pending[executor.submit(_process, path)] = root
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                root = pending.pop(future)
+                completed += 1
+                _finish(completed, root, future.result())
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        monitor.stop()
+        stats.peak_rss_mb = monitor.peak_mb
+        if owns_client:
+            client.close()
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """命令行参数 | Command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description="GLM-OCR 批量识别 | Bulk OCR with GLM-OCR (images, PDF, Word)"
+    )
+    parser.add_argument("inputs", nargs="+", help="文件或目录 | Files or directories")
+    parser.add_argument(
+        "-o", "--output-dir",
+        help="每个文件一个 Markdown 的输出目录 | Directory for one Markdown file per input",
+    )
+    parser.add_argument(
+        "--jsonl",
+        help="JSONL 输出文件，'-' 表示标准输出 | JSONL output file, '-' for stdout",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=env_int("OLLAMA_MAX_WORKERS", 4),
+        help="同时进行的 OCR 请求数（默认：OLLAMA_MAX_WORKERS）| OCR requests in flight",
+    )
+    parser.add_argument(
+        "--manifest",
+        help=f"清单文件路径（默认：输出目录下的 {MANIFEST_NAME}）| Manifest path",
+    )
+    parser.add_argument(
+        "--text-layer", choices=MODES,
+        help="PDF 文本层路由：auto（按质量）、text（从不 OCR）、ocr（全部 OCR），默认读取 PDF_TEXT_LAYER_MODE"
+             " | PDF text-layer routing: auto (by quality), text (never OCR), ocr (OCR every page)",
+    )
+    parser.add_argument(
+        "--no-doc-images", dest="doc_images", action="store_false",
+        default=env_bool("DOCX_IMAGE_OCR", True),
+        help="不识别 Word 文档中的嵌入图片（默认读取 DOCX_IMAGE_OCR）| Skip images embedded in Word documents",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="忽略清单，重新识别所有文件 | Ignore the manifest and process everything",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    Command-line entry point
+
+    Returns:
+        int: 退出码，有文件失败时为 1 | Exit code, 1 if any file failed
+    """
+    # 参数默认值来自环境变量，先读取 .env | Argument defaults come from the environment, read .env first
+    load_env_file()
+    args = build_parser().parse_args(argv)
+    if not args.output_dir and not args.jsonl:
+        args.output_dir = "ocr_output"
+
+    manifest_path = args.manifest or os.path.join(
+        args.output_dir or os.path.dirname(os.path.abspath(args.jsonl)), MANIFEST_NAME
+    )
+
+    text_config = TextLayerConfig.from_env()
+    if args.text_layer:
+        text_config.mode = args.text_layer
+
+    with ExitStack() as stack:
+        manifest = stack.enter_context(Manifest(manifest_path, load=not args.force))
+        jsonl: Optional[TextIO] = None
+        if args.jsonl == "-":
+            jsonl = sys.stdout
+        elif args.jsonl:
+            jsonl = stack.enter_context(open(args.jsonl, "a", encoding="utf-8"))
+
+        stats = run(
+            args.inputs,
+            output_dir=args.output_dir,
+            jsonl=jsonl,
+            workers=max(1, args.workers),
+            manifest=manifest,
+            text_config=text_config,
+            doc_images=args.doc_images,
+        )
+
+    print(stats.summary(), file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
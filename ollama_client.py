@@ -10,8 +10,10 @@ Handles communication with Ollama server for image recognition using GLM-OCR.
 
 功能特性：
 - 单张图片 OCR 识别
-- 批量图片处理
+- 批量图片并发处理
 - Base64 编码传输
+- keep-alive 连接池复用
+- asyncio 异步客户端（需要 aiohttp）
 - 错误处理和重试机制
 
 Author: GLM-OCR Team
@@ -20,18 +22,710 @@ License: MIT License
 """
 
 # 标准库导入 | Standard Library Imports
+import asyncio  # 异步 I/O
 import base64  # Base64 编解码
+import json  # JSON 解析
+import logging  # 日志
 import os  # 操作系统接口
+import sys  # 异常信息
+import time  # 计时
+from contextlib import AsyncExitStack, ExitStack  # 上下文栈
+from dataclasses import dataclass  # 数据类
 from io import BytesIO  # 字节流处理
-from typing import List, Optional  # 类型提示
+from typing import (  # 类型提示
+    Any, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+)
 
 # 第三方库导入 | Third-party Library Imports
 import requests  # HTTP 请求库
-from dotenv import load_dotenv  # 环境变量加载
 
-# 加载 .env 文件中的环境变量
-# Load environment variables from .env file
-load_dotenv()
+# 本地模块导入 | Local Module Imports
+from src.models.ocr_result import OCRResult, OCRTimings  # 识别结果与耗时
+from src.utils.concurrency import ProgressCallback, map_ordered  # 有界并发
+from src.utils.env import env_int, env_str, load_env_file  # 环境变量解析
+from src.utils.backend_pool import BackendPool, parse_backends  # 多主机负载均衡
+from src.utils.http_pool import PoolConfig, PooledSession  # HTTP 连接池
+from src.utils.metrics import (  # 运行指标
+    OLLAMA_IN_FLIGHT,
+    OLLAMA_REQUESTS_TOTAL,
+    OLLAMA_SECONDS,
+)
+from src.utils.image_preprocess import (  # 图片预处理
+    ImagePreprocessor,
+    PreprocessResult,
+    _is_pil_image,
+)
+from src.utils.ocr_cache import OCRCache  # OCR 结果缓存
+from src.utils.retry import CircuitOpenError, Retrier, RetryPolicy  # 重试与熔断
+from src.utils.tiling import MODEL_INPUT_SIZE, ImageTiler, TilePlan, stitch_tiles  # 分块识别
+from src.utils.warmup import KeepAlive, parse_keep_alive  # 模型保活
+
+logger = logging.getLogger(__name__)
+
+
+# 可识别的图片输入：文件路径、字节、文件对象或 PIL 图片
+# Accepted image inputs: file path, bytes, file-like object or PIL image
+ImageInput = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, BinaryIO, Any]
+
+# GLM-OCR 模型名称 | GLM-OCR model name
+OCR_MODEL = "glm-ocr"
+
+# OCR 提示词 | OCR prompt
+OCR_PROMPT = (
+    "请识别图片中的所有文字内容，并以 Markdown 格式输出。\n"
+    "Please recognize all text content in the image and output in Markdown format."
+)
+
+# OCR 相关选项 | OCR related options
+OCR_OPTIONS = {
+    "temperature": 0.1,  # 低温度以获得更稳定的结果 | Low temperature for stable results
+}
+
+# 发送给模型的单张图片最大字节数（20MB）
+# Maximum size of a single image sent to the model (20MB)
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+# 启用预处理时允许读取的原始图片最大字节数（100MB），缩小后再检查 20MB 限制
+# Maximum source image read when pre-processing is on (100MB); the 20MB
+# limit is checked again after downscaling
+MAX_SOURCE_IMAGE_BYTES = 100 * 1024 * 1024
+
+# 请求体中图片数据的占位符（不会出现在提示词或选项中）
+# Placeholder for the image data in the request body (never appears in the prompt or options)
+_IMAGE_PLACEHOLDER = "@@GLM_OCR_IMAGE@@"
+
+# 预先编码的 JSON 请求体的请求头 | Headers for a pre-encoded JSON body
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def describe_image(image: ImageInput) -> str:
+    """
+    返回图片输入的简短描述，用于日志和错误信息
+    Return a short description of an image input for logs and errors
+
+    Args:
+        image: 图片输入 | Image input
+
+    Returns:
+        str: 文件名或类型描述 | File name or type description
+    """
+    if isinstance(image, (str, os.PathLike)):
+        return os.path.basename(os.fspath(image))
+    name = getattr(image, "name", None)
+    if isinstance(name, str):
+        return os.path.basename(name)
+    return f"<{type(image).__name__}>"
+
+
+def _check_image_size(size: int, max_bytes: int = MAX_IMAGE_BYTES) -> None:
+    """
+    检查图片大小（默认限制为 20MB）
+    Check image size (limit to 20MB by default)
+    """
+    if size > max_bytes:
+        limit = max_bytes // 1024 // 1024
+        raise ValueError(
+            f"图片文件过大 | Image file too large: {size / 1024 / 1024:.2f}MB "
+            f"(最大 {limit}MB | maximum {limit}MB)"
+        )
+
+
+def _load_image_bytes(image: ImageInput, max_bytes: int = MAX_IMAGE_BYTES) -> bytes:
+    """
+    将任意图片输入读取为字节，不经过临时文件
+    Read any image input into bytes without a temporary file
+
+    Args:
+        image: 文件路径、字节、文件对象或 PIL 图片
+               File path, bytes, file-like object or PIL image
+        max_bytes: 允许的最大字节数 | Maximum allowed size in bytes
+
+    Returns:
+        bytes: 图片字节（PIL 图片编码为 PNG）| Image bytes (PIL images are encoded as PNG)
+
+    Raises:
+        FileNotFoundError: 如果图片文件不存在 | If image file doesn't exist
+        ValueError: 如果图片过大 | If the image is too large
+        TypeError: 如果输入类型不受支持 | If the input type is unsupported
+    """
+    # 文件路径 | File path
+    if isinstance(image, (str, os.PathLike)):
+        image_path = os.fspath(image)
+
+        # 验证文件是否存在
+        # Validate file exists
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(
+                f"图片文件不存在 | Image file not found: {image_path}"
+            )
+
+        _check_image_size(os.path.getsize(image_path), max_bytes)
+        with open(image_path, 'rb') as f:
+            return f.read()
+
+    # 内存中的字节 | In-memory bytes
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        data = bytes(image)
+
+    # 文件对象 | File-like object
+    elif hasattr(image, "read"):
+        data = image.read()
+        if isinstance(data, str):
+            raise ValueError(
+                f"无法解码图片文件 | Cannot decode image file: {describe_image(image)} "
+                "(需要二进制模式 | binary mode required)"
+            )
+
+    # PIL 图片直接编码为 PNG | PIL images are encoded to PNG directly
+    elif _is_pil_image(image):
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        data = buffer.getvalue()
+
+    else:
+        raise TypeError(
+            f"不支持的图片类型 | Unsupported image type: {type(image).__name__}"
+        )
+
+    if not data:
+        raise ValueError("图片数据为空 | Image data is empty")
+    _check_image_size(len(data), max_bytes)
+    return data
+
+
+def _build_payload(
+    image_data: str,
+    stream: bool = False,
+    keep_alive: Optional[KeepAlive] = None
+) -> dict:
+    """
+    构建 /api/generate 请求负载
+    Build the /api/generate request payload
+
+    Args:
+        image_data: Base64 编码的图片数据 | Base64 encoded image data
+        stream: 是否以 NDJSON 流式返回 | Stream the response as NDJSON
+        keep_alive: 请求结束后模型保持加载的时长，None 使用服务器默认值
+                    How long the model stays loaded afterwards, None for the server default
+
+    Returns:
+        dict: 请求负载 | Request payload
+    """
+    payload = {
+        "model": OCR_MODEL,
+        "prompt": OCR_PROMPT,
+        "images": [image_data],
+        "stream": stream,
+        "options": dict(OCR_OPTIONS),
+    }
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+def _encode_request(
+    image_bytes: bytes,
+    stream: bool = False,
+    keep_alive: Optional[KeepAlive] = None
+) -> bytes:
+    """
+    直接生成 /api/generate 的 JSON 请求体
+    Build the /api/generate JSON request body directly
+
+    Base64 数据以字节形式拼接进请求体，不经过 Python 字符串和 json.dumps，
+    内存中只有图片字节和一份请求体；重试时重用同一个请求体。
+    The Base64 data is spliced into the body as bytes instead of going
+    through a Python string and json.dumps, so memory only holds the image
+    bytes and one body, which retries reuse.
+
+    Args:
+        image_bytes: 图片字节 | Image bytes
+        stream: 是否以 NDJSON 流式返回 | Stream the response as NDJSON
+        keep_alive: 模型保持加载的时长 | How long the model stays loaded
+
+    Returns:
+        bytes: UTF-8 编码的 JSON 请求体 | UTF-8 encoded JSON body
+    """
+    head, tail = json.dumps(
+        _build_payload(_IMAGE_PLACEHOLDER, stream=stream, keep_alive=keep_alive),
+        ensure_ascii=False,
+    ).split(_IMAGE_PLACEHOLDER)
+    return b"".join((head.encode("utf-8"), base64.b64encode(image_bytes), tail.encode("utf-8")))
+
+
+def _probe_image() -> str:
+    """
+    生成用于预热推理的小图片（Base64 PNG）
+    Build a tiny image (Base64 PNG) for the warm-up inference
+    """
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("L", (64, 64), 255).save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def _seconds(nanoseconds: Any) -> Optional[float]:
+    """将 Ollama 返回的纳秒时长转换为秒 | Convert an Ollama nanosecond duration to seconds"""
+    return round(nanoseconds / 1e9, 3) if isinstance(nanoseconds, (int, float)) else None
+
+
+def _cache_key(image_bytes: bytes, preprocessor: Optional[ImagePreprocessor] = None) -> str:
+    """
+    计算图片对应的缓存键（图片字节 + 模型 + 提示词 + 选项 + 预处理设置）
+    Compute the cache key for an image (bytes + model + prompt + options +
+    pre-processing settings)
+    """
+    options = dict(OCR_OPTIONS)
+    if preprocessor is not None:
+        options["preprocess"] = preprocessor.config.signature()
+    return OCRCache.make_key(image_bytes, OCR_MODEL, OCR_PROMPT, options)
+
+
+def _resolve_preprocessor(
+    preprocessor: Union[ImagePreprocessor, bool, None]
+) -> Optional[ImagePreprocessor]:
+    """
+    解析预处理参数：None 从环境变量创建，False 禁用
+    Resolve the pre-processor argument: None builds from the environment, False disables
+    """
+    if preprocessor is None or preprocessor is True:
+        preprocessor = ImagePreprocessor()
+    if preprocessor is False or not preprocessor.config.enabled:
+        return None
+    return preprocessor
+
+
+def _resolve_tiler(
+    tiler: Union[ImageTiler, bool, None],
+    preprocessor: Optional[ImagePreprocessor]
+) -> Optional[ImageTiler]:
+    """
+    解析分块参数：None 从环境变量创建，图块边长默认取预处理的最长边上限；False 禁用
+    Resolve the tiler argument: None builds from the environment with the
+    pre-processing longest-side cap as the default tile size; False disables
+    """
+    if tiler is None or tiler is True:
+        max_dimension = preprocessor.config.max_dimension if preprocessor is not None else 0
+        tiler = ImageTiler(model_input_size=max_dimension or MODEL_INPUT_SIZE)
+    if tiler is False or not tiler.config.enabled:
+        return None
+    return tiler
+
+
+def _plan_tiles(
+    image: ImageInput,
+    tiler: Optional[ImageTiler],
+    preprocessor: Optional[ImagePreprocessor]
+) -> Optional[TilePlan]:
+    """
+    超大图片的分块方案，其他图片返回 None；超过可接受的原始大小时也分块
+    Tiling plan for an oversized image, None otherwise; images over the
+    accepted source size are tiled as well
+    """
+    if tiler is None or isinstance(image, PreprocessResult):
+        return None
+    max_bytes = MAX_SOURCE_IMAGE_BYTES if preprocessor is not None else MAX_IMAGE_BYTES
+    return tiler.plan(image, max_bytes)
+
+
+def _tiled_result(plan: TilePlan, results: List[OCRResult], started: float) -> OCRResult:
+    """
+    拼接各图块的识别结果 | Stitch the results of every tile
+    """
+    text = stitch_tiles(plan.group([result.text for result in results]))
+    timings = OCRTimings.combined(
+        (result.timings for result in results), time.perf_counter() - started
+    )
+    logger.info(
+        "分块识别 | Tiled OCR: %dx%d, %d tiles, %.2fs",
+        plan.image.size[0], plan.image.size[1], plan.count, timings.total_seconds,
+    )
+    return OCRResult(
+        text,
+        timings,
+        cached=all(result.cached for result in results),
+        host=next((result.host for result in results if result.host), None),
+        model=results[0].model if results else OCR_MODEL,
+        tiles=plan.count,
+    )
+
+
+@dataclass
+class _PreparedImage:
+    """
+    准备好发送的图片（或缓存命中的结果）
+    An image ready to send (or a cache hit)
+    """
+
+    cache_key: Optional[str]
+    cached_text: Optional[str]
+    data: Optional[bytes]
+    preprocess: Optional[PreprocessResult]
+
+
+def _prepare_image(
+    image: ImageInput,
+    preprocessor: Optional[ImagePreprocessor],
+    cache: Optional[OCRCache]
+) -> _PreparedImage:
+    """
+    读取图片、查询缓存，未命中时执行预处理
+    Load the image, consult the cache and pre-process on a miss
+
+    字节类输入按原始字节计算缓存键，命中时跳过预处理；PIL 图片直接预处理，
+    避免先编码为 PNG 再解码。
+    Byte-like inputs are keyed on their original bytes so hits skip
+    pre-processing; PIL images are pre-processed directly instead of being
+    encoded to PNG and decoded again.
+    """
+    prepared: Optional[PreprocessResult] = None
+
+    if isinstance(image, PreprocessResult):
+        # 已在其他进程中完成预处理 | Pre-processed in another process
+        prepared = image
+        if preprocessor is not None:
+            preprocessor.record(prepared)
+        data = prepared.data
+    elif preprocessor is not None and _is_pil_image(image):
+        prepared = preprocessor.process(image)
+        data = prepared.data
+    else:
+        max_bytes = MAX_SOURCE_IMAGE_BYTES if preprocessor is not None else MAX_IMAGE_BYTES
+        data = _load_image_bytes(image, max_bytes)
+
+    cache_key = None
+    if cache is not None:
+        cache_key = _cache_key(data, preprocessor)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return _PreparedImage(cache_key, cached, None, prepared)
+
+    if prepared is None and preprocessor is not None:
+        prepared = preprocessor.process(data)
+        data = prepared.data
+
+    _check_image_size(len(data))
+    return _PreparedImage(cache_key, None, data, prepared)
+
+
+def _response_host(url: Any) -> Optional[str]:
+    """
+    从 /api/generate 响应的 URL 中取出主机地址
+    Take the host out of an /api/generate response URL
+    """
+    if url is None:
+        return None
+    return str(url).rsplit("/api/generate", 1)[0]
+
+
+def _log_timings(result: OCRResult) -> OCRResult:
+    """
+    在 DEBUG 级别记录一次识别的耗时分解
+    Log the timing breakdown of one recognition at DEBUG level
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("OCR 耗时 | OCR timings (%s): %s", result.host, result.timings.to_dict())
+    return result
+
+
+def _resolve_cache(cache: Union[OCRCache, bool, None]) -> Optional[OCRCache]:
+    """
+    解析缓存参数：None 从环境变量创建，False 禁用
+    Resolve the cache argument: None builds from the environment, False disables
+    """
+    if cache is None or cache is True:
+        return OCRCache.from_env()
+    if cache is False:
+        return None
+    return cache
+
+
+def _parse_generate_response(result: dict) -> str:
+    """
+    从 /api/generate 响应中提取识别文本
+    Extract the recognized text from an /api/generate response
+
+    Args:
+        result: 解析后的 JSON 响应 | Decoded JSON response
+
+    Returns:
+        str: 识别结果 | Recognized text
+
+    Raises:
+        ValueError: 如果响应格式无效 | If the response format is invalid
+    """
+    # 检查响应格式
+    # Check response format
+    if not isinstance(result, dict) or "response" not in result:
+        raise ValueError(
+            f"无效的 API 响应格式 | Invalid API response format: {result}"
+        )
+
+    return result.get('response', '').strip()
+
+
+def _parse_stream_line(line: Union[bytes, str]) -> Tuple[str, bool]:
+    """
+    解析 NDJSON 流中的一行
+    Parse one line of the NDJSON stream
+
+    Args:
+        line: 一行 JSON | One JSON line
+
+    Returns:
+        Tuple[str, bool]: (文本片段, 是否结束) | (text chunk, done)
+
+    Raises:
+        ValueError: 如果该行无效或服务器报告错误 | If the line is invalid or reports an error
+    """
+    try:
+        chunk = json.loads(line)
+    except ValueError as e:
+        raise ValueError(
+            f"解析 API 响应失败 | Failed to parse API response: {e}"
+        ) from e
+
+    if not isinstance(chunk, dict):
+        raise ValueError(f"无效的 API 响应格式 | Invalid API response format: {chunk}")
+    if chunk.get("error"):
+        raise ValueError(f"API 返回错误 | API returned an error: {chunk['error']}")
+    return chunk.get("response", ""), bool(chunk.get("done"))
+
+
+def _check_host(get: Callable[..., requests.Response], host: str) -> dict:
+    """
+    检查单个 Ollama 主机的连接状态和模型是否可用
+    Check one Ollama host's connection status and model availability
+
+    Args:
+        get: 发送 GET 请求的函数（会话的 get 或 requests.get）
+             Function sending GET requests (a session's get or requests.get)
+        host: 主机基础 URL | Host base URL
+
+    Returns:
+        dict: 包含连接状态的字典 | Dictionary containing connection status
+    """
+    result = {
+        "connected": False,
+        "model_available": False,
+        "version": None,
+        "error": None
+    }
+
+    try:
+        # 尝试获取服务器信息
+        # Try to get server info
+        response = get(
+            f"{host}/api/version",
+            timeout=10
+        )
+
+        if response.status_code == 200:
+            result["connected"] = True
+            version_data = response.json()
+            result["version"] = version_data.get("version", "unknown")
+
+    except requests.RequestException as e:
+        result["error"] = str(e)
+        return result
+
+    # 检查模型是否可用
+    # Check if model is available
+    try:
+        models_response = get(
+            f"{host}/api/tags",
+            timeout=10
+        )
+
+        if models_response.status_code == 200:
+            models_data = models_response.json()
+            models = models_data.get("models", [])
+
+            # 检查 glm-ocr 模型是否存在
+            # Check if glm-ocr model exists
+            for model in models:
+                if model.get("name", "").startswith("glm-ocr"):
+                    result["model_available"] = True
+                    break
+
+    except requests.RequestException as e:
+        result["error"] = str(e)
+
+    return result
+
+
+def _request_error(error: requests.RequestException) -> Exception:
+    """
+    将 requests 异常转换为客户端对外抛出的异常
+    Translate a requests exception into the client's public exceptions
+    """
+    if isinstance(error, requests.ConnectionError):
+        return ConnectionError(
+            f"无法连接到 Ollama 服务器 | Cannot connect to Ollama server: {error}\n"
+            "请确保 Ollama 服务正在运行 | Please ensure Ollama service is running"
+        )
+    if isinstance(error, requests.Timeout):
+        return ConnectionError(
+            f"请求超时 | Request timeout: {error}\n"
+            "GLM-OCR 模型较大，首次运行可能需要较长时间\n"
+            "GLM-OCR model is large, first run may take longer"
+        )
+    return requests.RequestException(f"API 请求失败 | API request failed: {error}")
+
+
+def _aiohttp_error(error: BaseException, aiohttp) -> Exception:
+    """
+    将 aiohttp 异常转换为与 OllamaOCR 相同的异常
+    Translate an aiohttp exception into the same exceptions as OllamaOCR
+    """
+    connect_timeout = getattr(aiohttp, "ConnectionTimeoutError", ())
+    if isinstance(error, asyncio.TimeoutError) and not isinstance(error, connect_timeout):
+        return ConnectionError(
+            f"请求超时 | Request timeout: {error}\n"
+            "GLM-OCR 模型较大，首次运行可能需要较长时间\n"
+            "GLM-OCR model is large, first run may take longer"
+        )
+    if isinstance(error, aiohttp.ClientConnectionError):
+        return ConnectionError(
+            f"无法连接到 Ollama 服务器 | Cannot connect to Ollama server: {error}\n"
+            "请确保 Ollama 服务正在运行 | Please ensure Ollama service is running"
+        )
+    return requests.RequestException(f"API 请求失败 | API request failed: {error}")
+
+
+def _error_status(error: BaseException) -> Optional[int]:
+    """从转换后的异常中取出 HTTP 状态码 | Extract the HTTP status from a translated exception"""
+    cause = error.__cause__
+    response = getattr(cause, "response", None)
+    status = getattr(response, "status_code", None) or getattr(cause, "status", None)
+    return status if isinstance(status, int) else None
+
+
+def _error_outcome(error: BaseException) -> str:
+    """
+    将请求错误归类为指标中的结果标签
+    Classify a request error as the outcome label used in metrics
+    """
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    status = _error_status(error)
+    if status is not None:
+        return "http_5xx" if status >= 500 else "http_4xx"
+    if isinstance(error.__cause__, (requests.Timeout, asyncio.TimeoutError)):
+        return "timeout"
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return "connection_error"
+    if isinstance(error, ValueError):
+        return "invalid_response"
+    return "error"
+
+
+class _RequestMetrics:
+    """
+    记录一次 Ollama 请求的进行中数量、耗时和结果
+    Record the in-flight count, duration and outcome of one Ollama request
+
+    压入请求的 ExitStack 后，读取响应期间的错误也会计入。
+    Pushed onto the request's ExitStack so errors while reading the response
+    are counted as well.
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.started = time.perf_counter()
+        OLLAMA_IN_FLIGHT.inc()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        OLLAMA_IN_FLIGHT.dec()
+        if exc_type is None:
+            OLLAMA_REQUESTS_TOTAL.inc(outcome="success")
+            OLLAMA_SECONDS.observe(time.perf_counter() - self.started, mode=self.mode)
+        elif issubclass(exc_type, Exception):
+            # 客户端断开（GeneratorExit）等不计为错误 | Client disconnects are not errors
+            OLLAMA_REQUESTS_TOTAL.inc(outcome=_error_outcome(exc_value))
+        return False
+
+
+def _is_backend_failure(error: BaseException) -> bool:
+    """
+    判断请求错误是否说明主机故障（连接失败、超时或 5xx），用于剔除主机和熔断
+    Decide whether a request error indicates a host failure (connection
+    error, timeout or 5xx), used for ejection and circuit breaking
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    status = _error_status(error)
+    return status is not None and status >= 500
+
+
+def _is_retryable(error: BaseException, policy: RetryPolicy) -> bool:
+    """
+    判断错误是否可以安全重试：连接失败、连接超时和可重试的状态码（如加载模型时的 503）。
+    读取超时不重试，因为服务器可能仍在处理该请求。
+    Decide whether an error is safe to retry: connection failures, connect
+    timeouts and retryable statuses (such as 503 while the model loads).
+    Read timeouts are not retried because the server may still be working.
+    """
+    cause = error.__cause__
+    if isinstance(cause, requests.ConnectionError):
+        return True
+    if isinstance(cause, requests.Timeout):
+        return False
+    return _error_status(error) in policy.retry_statuses
+
+
+def _is_retryable_async(error: BaseException, policy: RetryPolicy, aiohttp) -> bool:
+    """_is_retryable 的 aiohttp 版本 | aiohttp version of _is_retryable"""
+    cause = error.__cause__
+    connect_timeout = getattr(aiohttp, "ConnectionTimeoutError", ())
+    if isinstance(cause, asyncio.TimeoutError) and not isinstance(cause, connect_timeout):
+        return False
+    if isinstance(cause, aiohttp.ClientConnectionError):
+        return True
+    return _error_status(error) in policy.retry_statuses
+
+
+def _resolve_backends(
+    host: Optional[str],
+    backends: Optional[BackendPool],
+    health_check: Callable[[str], bool]
+) -> Tuple[BackendPool, bool]:
+    """
+    解析主机参数：显式主机只使用该主机，否则从环境变量读取主机列表
+    Resolve the host arguments: an explicit host is used alone, otherwise the
+    host list is read from the environment
+
+    Returns:
+        Tuple[BackendPool, bool]: (主机池, 是否由客户端创建) | (pool, created by the client)
+    """
+    owned = backends is None
+    if backends is None:
+        if host is None:
+            # 从环境变量获取，或使用默认值
+            # Get from environment variable or use default
+            host = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+            backends = BackendPool.from_env(host, health_check=health_check)
+        else:
+            backends = BackendPool(parse_backends(host), health_check=health_check)
+    elif backends.health_check is None:
+        backends.health_check = health_check
+
+    # 验证 URL 格式
+    # Validate URL format
+    for backend in backends.backends:
+        if not backend.url.startswith(("http://", "https://")):
+            raise ValueError(
+                f"无效的 Ollama URL | Invalid Ollama URL: {backend.url}/api/generate"
+            )
+    return backends, owned
+
+
+def _is_healthy(status: dict) -> bool:
+    """主机可连接且模型可用 | Host is reachable and has the model"""
+    return bool(status.get("connected") and status.get("model_available"))
 
 
 class OllamaOCR:
@@ -42,9 +736,19 @@ class OllamaOCR:
     用于与 Ollama 服务器上的 GLM-OCR 模型进行交互。
     Used to interact with GLM-OCR model on Ollama server.
 
+    实例是线程安全的，可在多个工作线程之间共享，所有请求复用同一个连接池。
+    Instances are thread-safe and can be shared between worker threads;
+    all requests reuse the same connection pool.
+
     Attributes:
-        host (str): Ollama 服务器地址 | Ollama server address
-        api_url (str): API 端点 URL | API endpoint URL
+        host (str): 第一个 Ollama 服务器地址 | First Ollama server address
+        api_url (str): 第一个服务器的 API 端点 URL | API endpoint URL of the first server
+        backends (BackendPool): Ollama 主机池 | Ollama host pool
+        session (PooledSession): keep-alive 连接池会话 | Keep-alive pooled session
+        max_workers (int): 批量识别的默认并发数 | Default batch concurrency
+        cache (Optional[OCRCache]): OCR 结果缓存 | OCR result cache
+        preprocessor (Optional[ImagePreprocessor]): 图片预处理器 | Image pre-processor
+        tiler (Optional[ImageTiler]): 超大图片分块识别 | Tiling of oversized images
 
     Example:
         >>> client = OllamaOCR()
@@ -52,7 +756,18 @@ class OllamaOCR:
         >>> print(result)
     """
 
-    def __init__(self, host: Optional[str] = None):
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        pool_config: Optional[PoolConfig] = None,
+        max_workers: Optional[int] = None,
+        cache: Union[OCRCache, bool, None] = None,
+        preprocessor: Union[ImagePreprocessor, bool, None] = None,
+        backends: Optional[BackendPool] = None,
+        retrier: Optional[Retrier] = None,
+        keep_alive: Optional[KeepAlive] = None,
+        tiler: Union[ImageTiler, bool, None] = None
+    ):
         """
         初始化 Ollama OCR 客户端
         Initialize Ollama OCR client
@@ -60,32 +775,102 @@ class OllamaOCR:
         Args:
             host: Ollama 服务器基础 URL，如果不提供则从环境变量读取
                   Ollama server base URL, reads from environment variable if not provided
+            pool_config: 连接池配置，如果不提供则从环境变量读取
+                         Connection pool configuration, reads from environment if not provided
+            max_workers: 批量识别时同时在途的最大请求数，如果不提供则从环境变量读取
+                         Maximum in-flight requests for batches, reads from environment if not provided
+            cache: OCR 结果缓存；None 从环境变量创建，False 禁用
+                   OCR result cache; None builds one from the environment, False disables it
+            preprocessor: 图片预处理器；None 从环境变量创建，False 禁用
+                          Image pre-processor; None builds one from the environment, False disables it
+            backends: Ollama 主机池，可在客户端之间共享；默认由 host 或环境变量创建
+                      Ollama host pool, can be shared between clients; built from
+                      host or the environment by default
+            retrier: 重试策略和熔断器，默认从环境变量创建
+                     Retry policy and circuit breaker, built from the environment by default
+            keep_alive: 请求后模型保持加载的时长（秒数或 "30m" 这样的时长），默认读取 OCR_KEEP_ALIVE
+                        How long the model stays loaded after a request (seconds or a
+                        duration such as "30m"), defaults to OCR_KEEP_ALIVE
+            tiler: 超大图片的分块识别；None 从环境变量创建，False 禁用
+                   Tiled recognition of oversized images; None builds one from the environment, False disables it
 
         Environment Variables:
             OLLAMA_BASE_URL: Ollama 服务器地址（默认：http://localhost:11434）
+            OLLAMA_BASE_URLS: 逗号分隔的多个主机，参见 BackendPool.from_env
+                              Comma-separated hosts, see BackendPool.from_env
+            OLLAMA_MAX_WORKERS: 批量识别并发数（默认：4，应与服务器 OLLAMA_NUM_PARALLEL 匹配）
+                                Batch concurrency (default: 4, match the server's OLLAMA_NUM_PARALLEL)
+            OCR_CACHE_*: 缓存设置，参见 OCRCache.from_env
+                         Cache settings, see OCRCache.from_env
+            OCR_PREPROCESS / OCR_IMAGE_*: 预处理设置，参见 PreprocessConfig.from_env
+                                          Pre-processing settings, see PreprocessConfig.from_env
+            OLLAMA_POOL_*: 连接池设置，参见 PoolConfig.from_env
+                           Connection pool settings, see PoolConfig.from_env
+            OCR_KEEP_ALIVE: 模型保持加载的时长（默认：服务器设置）
+                            How long the model stays loaded (default: server setting)
+            OCR_TILING / OCR_TILE_*: 分块识别设置，参见 TilingConfig.from_env
+                                     Tiling settings, see TilingConfig.from_env
+            OLLAMA_*_TIMEOUT / OLLAMA_*RETR* / OLLAMA_BREAKER_*: 超时、重试和熔断设置，
+                参见 RetryPolicy.from_env 和 CircuitBreaker.from_env
+                Timeout, retry and breaker settings, see RetryPolicy.from_env and
+                CircuitBreaker.from_env
         """
-        if host is None:
-            # 从环境变量获取，或使用默认值
-            # Get from environment variable or use default
-            host = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-
-        self.host = host
-        self.api_url = f"{host}/api/generate"
-
-        # 验证 URL 格式
-        # Validate URL format
-        if not self.api_url.startswith(("http://", "https://")):
-            raise ValueError(
-                f"无效的 Ollama URL | Invalid Ollama URL: {self.api_url}"
-            )
-
-    def recognize(self, image_path: str) -> str:
+        # 构造第一个客户端时才读取 .env，导入本模块没有副作用
+        # .env is read when the first client is built, importing this module has no side effects
+        load_env_file()
+
+        # 所有请求共享的 keep-alive 连接池
+        # Keep-alive connection pool shared by all requests
+        self.session = PooledSession(pool_config)
+
+        # 瞬时错误重试，服务器不可用时快速失败
+        # Retry transient errors, fail fast while the server is down
+        self.retrier = retrier or Retrier()
+
+        # 请求在一个或多个 Ollama 主机之间分配，健康检查复用 check_connection
+        # Requests are spread over one or more Ollama hosts; health checks
+        # reuse check_connection
+        self.backends, self._owns_backends = _resolve_backends(
+            host, backends, lambda url: _is_healthy(self.check_connection(url))
+        )
+        self.host = self.backends.primary.url
+        self.api_url = f"{self.host}/api/generate"
+
+        # 批量并发数不超过每主机连接上限，避免线程空等连接
+        # Cap batch concurrency at the per-host connection limit
+        if max_workers is None:
+            max_workers = env_int("OLLAMA_MAX_WORKERS", 4)
+        self.max_workers = max(1, min(max_workers, self.session.config.pool_maxsize))
+
+        # 相同图片 + 模型 + 提示词的结果直接从缓存返回
+        # Identical image + model + prompt requests are served from the cache
+        self.cache = _resolve_cache(cache)
+
+        # 发送前缩小图片负载 | Shrink image payloads before sending
+        self.preprocessor = _resolve_preprocessor(preprocessor)
+
+        # 超大图片切成重叠图块并发识别 | Oversized images are cut into overlapping tiles recognized concurrently
+        self.tiler = _resolve_tiler(tiler, self.preprocessor)
+
+        # 请求结束后模型保持加载的时长 | How long the model stays loaded after each request
+        self.keep_alive = (
+            keep_alive if keep_alive is not None else parse_keep_alive(env_str("OCR_KEEP_ALIVE"))
+        )
+
+    def recognize(self, image: ImageInput) -> str:
         """
         对单张图片进行 OCR 识别
         Perform OCR on a single image
 
+        图片可以是文件路径、字节、二进制文件对象或 PIL 图片，
+        内存中的图片直接编码进请求，不会写入磁盘。
+        The image may be a file path, bytes, a binary file object or a PIL
+        image; in-memory images are encoded straight into the request
+        without touching disk.
+
         Args:
-            image_path: 图片文件路径 | Path to the image file
+            image: 图片文件路径、字节、文件对象或 PIL 图片
+                   Image file path, bytes, file-like object or PIL image
 
         Returns:
             str: Markdown 格式的 OCR 识别结果
@@ -101,108 +886,248 @@ class OllamaOCR:
             >>> result = client.recognize("screenshot.png")
             >>> print(result)
         """
-        # 验证文件是否存在
-        # Validate file exists
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(
-                f"图片文件不存在 | Image file not found: {image_path}"
-            )
+        return self.recognize_detailed(image).text
 
-        # 检查文件大小（限制为 20MB）
-        # Check file size (limit to 20MB)
-        file_size = os.path.getsize(image_path)
-        if file_size > 20 * 1024 * 1024:  # 20MB
-            raise ValueError(
-                f"图片文件过大 | Image file too large: {file_size / 1024 / 1024:.2f}MB "
-                "(最大 20MB | maximum 20MB)"
-            )
+    def recognize_detailed(self, image: ImageInput) -> OCRResult:
+        """
+        识别单张图片，并返回包含耗时分解的结构化结果
+        Recognize a single image and return a structured result with a
+        timing breakdown
 
-        # 读取并编码图片
-        # Load and encode image
-        try:
-            with open(image_path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
-        except UnicodeDecodeError:
-            raise ValueError(
-                f"无法解码图片文件 | Cannot decode image file: {image_path}"
-            )
+        耗时分为客户端的编码、请求和解析时间，以及 Ollama 报告的模型加载、
+        图片预填充和令牌生成时间，便于定位每页的时间花在哪里。
+        Timings cover the client-side encode, request and parse phases and
+        the model load, image prefill and token generation times reported by
+        Ollama, showing where each page spends its time.
 
-        # 准备请求负载
-        # Prepare request payload
-        payload = {
-            "model": "glm-ocr",  # GLM-OCR 模型名称 | GLM-OCR model name
-            "prompt": "请识别图片中的所有文字内容，并以 Markdown 格式输出。\n"
-                      "Please recognize all text content in the image and output in Markdown format.",
-            "images": [image_data],
-            "stream": False,  # 禁用流式输出 | Disable streaming
-            "options": {
-                # OCR 相关选项 | OCR related options
-                "temperature": 0.1,  # 低温度以获得更稳定的结果 | Low temperature for stable results
-            }
-        }
+        Args:
+            image: 图片文件路径、字节、文件对象或 PIL 图片
+                   Image file path, bytes, file-like object or PIL image
 
-        # 发送 API 请求
-        # Make API request
-        try:
-            response = requests.post(
-                self.api_url,
-                json=payload,
-                timeout=300  # 5 分钟超时 | 5-minute timeout
-            )
+        Returns:
+            OCRResult: 识别文本和耗时 | Recognized text and timings
 
-            # 检查响应状态
-            # Check response status
-            response.raise_for_status()
+        Raises:
+            与 recognize 相同 | Same as recognize
 
-        except requests.ConnectionError as e:
-            raise ConnectionError(
-                f"无法连接到 Ollama 服务器 | Cannot connect to Ollama server: {e}\n"
-                "请确保 Ollama 服务正在运行 | Please ensure Ollama service is running"
-            ) from e
-        except requests.Timeout as e:
-            raise ConnectionError(
-                f"请求超时 | Request timeout: {e}\n"
-                "GLM-OCR 模型较大，首次运行可能需要较长时间\n"
-                "GLM-OCR model is large, first run may take longer"
-            ) from e
-        except requests.RequestException as e:
-            raise requests.RequestException(
-                f"API 请求失败 | API request failed: {e}"
-            ) from e
+        Example:
+            >>> result = OllamaOCR().recognize_detailed("screenshot.png")
+            >>> print(result.timings.to_dict())
+        """
+        started = time.perf_counter()
+
+        # 超大图片分块识别 | Oversized images are recognized tile by tile
+        plan = _plan_tiles(image, self.tiler, self.preprocessor)
+        if plan is not None:
+            return self._recognize_tiles(plan, started)
+
+        timings = OCRTimings()
+
+        # 读取图片、查询缓存并预处理
+        # Load image, consult the cache and pre-process
+        prepared = _prepare_image(image, self.preprocessor, self.cache)
+        if prepared.cached_text is not None:
+            timings.encode_seconds = timings.total_seconds = time.perf_counter() - started
+            return OCRResult(prepared.cached_text, timings, cached=True, model=OCR_MODEL)
+        cache_key = prepared.cache_key
+        timings.payload_bytes = len(prepared.data)
+
+        # 编码图片，准备请求体（释放图片字节，只保留请求体）
+        # Encode image into the request body (the image bytes are released)
+        body = _encode_request(prepared.data, keep_alive=self.keep_alive)
+        del prepared
+        sent = time.perf_counter()
+        timings.encode_seconds = sent - started
+
+        # 发送 API 请求（瞬时错误自动重试）
+        # Make API request (transient errors are retried)
+        stack, response = self._send(body)
+        received = time.perf_counter()
+        timings.request_seconds = received - sent
 
         # 解析响应结果
         # Parse response result
-        try:
-            result = response.json()
-
-            # 检查响应格式
-            # Check response format
-            if "response" not in result:
+        with stack:
+            try:
+                result = response.json()
+            except Exception as e:
                 raise ValueError(
-                    f"无效的 API 响应格式 | Invalid API response format: {result}"
-                )
+                    f"解析 API 响应失败 | Failed to parse API response: {e}"
+                ) from e
+
+        text = _parse_generate_response(result)
+        finished = time.perf_counter()
+        timings.parse_seconds = finished - received
+        timings.total_seconds = finished - started
+        timings.apply_response(result)
+
+        if cache_key is not None:
+            self.cache.set(cache_key, text)
+        return _log_timings(OCRResult(
+            text, timings, host=_response_host(response.url), model=result.get("model", OCR_MODEL)
+        ))
+
+    def recognize_stream(self, image: ImageInput) -> Iterator[str]:
+        """
+        以流式方式识别单张图片，逐块产出文本
+        Recognize a single image as a stream, yielding text chunks
 
-            return result.get('response', '').strip()
+        消费 Ollama 的 NDJSON 令牌流，文本到达后立即产出；
+        缓存命中时一次性产出完整结果，完成后写入缓存。
+        Consumes Ollama's NDJSON token stream and yields text as it arrives;
+        a cache hit yields the full result at once, and the finished text is
+        cached.
 
-        except ValueError as e:
-            raise e
-        except Exception as e:
-            raise ValueError(
-                f"解析 API 响应失败 | Failed to parse API response: {e}"
-            ) from e
+        Args:
+            image: 图片文件路径、字节、文件对象或 PIL 图片
+                   Image file path, bytes, file-like object or PIL image
+
+        Yields:
+            str: 文本片段 | Text chunk
+
+        Raises:
+            ConnectionError: 如果 Ollama 服务器不可用 | If Ollama server is unavailable
+            ValueError: 如果流中的数据无效 | If the stream contains invalid data
+            requests.RequestException: 其他 API 错误 | For other API errors
+
+        Example:
+            >>> client = OllamaOCR()
+            >>> for chunk in client.recognize_stream("screenshot.png"):
+            ...     print(chunk, end="", flush=True)
+        """
+        # 分块识别的图块并发完成，拼接后一次产出 | Tiles finish concurrently and are yielded once stitched
+        plan = _plan_tiles(image, self.tiler, self.preprocessor)
+        if plan is not None:
+            yield self._recognize_tiles(plan, time.perf_counter()).text
+            return
+
+        prepared = _prepare_image(image, self.preprocessor, self.cache)
+        if prepared.cached_text is not None:
+            yield prepared.cached_text
+            return
+        cache_key = prepared.cache_key
+
+        body = _encode_request(prepared.data, stream=True, keep_alive=self.keep_alive)
+        del prepared
+
+        # 只有在收到第一个数据块之前的错误会重试
+        # Only errors before the first chunk arrives are retried
+        stack, response = self._send(body, stream=True)
+
+        chunks: List[str] = []
+        done = False
+        with stack:
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    text, done = _parse_stream_line(line)
+                    if text:
+                        chunks.append(text)
+                        yield text
+                    if done:
+                        break
+            except requests.RequestException as e:
+                raise _request_error(e) from e
+
+        # 只缓存完整的结果 | Only complete results are cached
+        if done and cache_key is not None:
+            self.cache.set(cache_key, "".join(chunks).strip())
+
+    def _recognize_tiles(self, plan: TilePlan, started: float) -> OCRResult:
+        """
+        并发识别所有图块（最多 max_workers 个）并拼接
+        Recognize every tile concurrently (at most max_workers) and stitch them
+        """
+        results = map_ordered(
+            lambda box: self.recognize_detailed(plan.crop(box)),
+            plan.boxes,
+            max_workers=self.max_workers,
+        )
+        return _tiled_result(plan, results, started)
+
+    def _open_generate(
+        self,
+        body: bytes,
+        stream: bool = False
+    ) -> Tuple[ExitStack, requests.Response]:
+        """
+        选择一个主机并发送一次 /api/generate 请求
+        Pick a host and send a single /api/generate request
+
+        返回的 ExitStack 持有主机租约和响应，读取完毕后由调用方关闭，
+        读取期间的错误也会计入该主机。
+        The returned ExitStack holds the host lease and the response; the
+        caller closes it after reading, so errors while reading are also
+        attributed to the host.
+        """
+        stack = ExitStack()
+        try:
+            backend = stack.enter_context(self.backends.lease(_is_backend_failure))
+            try:
+                response = self.session.post(
+                    f"{backend.url}/api/generate",
+                    data=body,
+                    headers=_JSON_HEADERS,
+                    stream=stream,
+                    timeout=self.retrier.policy.timeout  # (连接, 读取) | (connect, read)
+                )
+                stack.callback(response.close)
+
+                # 检查响应状态
+                # Check response status
+                response.raise_for_status()
+            except requests.RequestException as e:
+                raise _request_error(e) from e
+        except BaseException:
+            stack.__exit__(*sys.exc_info())
+            raise
+        return stack, response
+
+    def _send(self, body: bytes, stream: bool = False) -> Tuple[ExitStack, requests.Response]:
+        """
+        按重试策略发送请求，熔断器打开时快速失败
+        Send the request under the retry policy, failing fast while the breaker is open
+        """
+        policy = self.retrier.policy
+        metrics = _RequestMetrics("stream" if stream else "generate")
+        try:
+            stack, response = self.retrier.call(
+                lambda: self._open_generate(body, stream),
+                is_retryable=lambda error: _is_retryable(error, policy),
+                is_failure=_is_backend_failure,
+            )
+        except BaseException:
+            metrics.__exit__(*sys.exc_info())
+            raise
+        stack.push(metrics)
+        return stack, response
 
     def recognize_batch(
         self,
-        image_paths: List[str],
-        show_progress: bool = True
+        image_paths: List[ImageInput],
+        show_progress: bool = True,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None
     ) -> List[str]:
         """
-        批量处理多张图片进行 OCR 识别
-        Perform OCR on multiple images
+        批量并发处理多张图片进行 OCR 识别
+        Perform OCR on multiple images concurrently
+
+        最多同时发送 max_workers 个请求，结果按输入顺序返回；
+        单张图片失败时在对应位置返回错误占位符，不影响其他图片。
+        At most max_workers requests are in flight; results are returned in
+        input order and a failing image yields an error placeholder in its slot.
 
         Args:
-            image_paths: 图片文件路径列表 | List of paths to image files
-            show_progress: 是否显示进度信息 | Whether to show progress information
+            image_paths: 图片列表（路径、字节、文件对象或 PIL 图片）
+                         List of images (paths, bytes, file objects or PIL images)
+            show_progress: 未提供回调时是否打印进度信息
+                           Whether to print progress when no callback is given
+            max_workers: 最大并发数，默认使用 self.max_workers
+                         Maximum concurrency, defaults to self.max_workers
+            progress_callback: 进度回调 (已完成数, 总数, 路径, 错误或 None)
+                               Progress callback (completed, total, path, error or None)
 
         Returns:
             List[str]: OCR 识别结果列表 | List of OCR recognition results
@@ -212,41 +1137,134 @@ class OllamaOCR:
 
         Example:
             >>> client = OllamaOCR()
-            >>> results = client.recognize_batch(["img1.png", "img2.jpg"])
+            >>> results = client.recognize_batch(["img1.png", "img2.jpg"], max_workers=2)
             >>> for i, result in enumerate(results):
             ...     print(f"Image {i + 1}: {result[:100]}...")
         """
         if not image_paths:
             raise ValueError("图片路径列表不能为空 | Image paths list cannot be empty")
 
-        results = []
         total = len(image_paths)
 
-        for i, path in enumerate(image_paths):
-            try:
-                if show_progress:
-                    print(
-                        f"处理中 | Processing: [{i + 1}/{total}] {os.path.basename(path)}"
-                    )
+        if progress_callback is None and show_progress:
+            progress_callback = _print_progress
 
-                result = self.recognize(path)
-                results.append(result)
+        def _on_error(path: str, error: BaseException) -> str:
+            return f"[错误 | Error: {str(error)}]"
 
-            except Exception as e:
-                error_msg = f"处理 | Processing {path}: {str(e)}"
-                results.append(f"[错误 | Error: {str(e)}]")
-                print(f"[错误 | Error] {error_msg}")
+        results = map_ordered(
+            self.recognize,
+            image_paths,
+            max_workers=max_workers or self.max_workers,
+            on_error=_on_error,
+            progress_callback=progress_callback,
+        )
 
-        if show_progress:
+        if show_progress and progress_callback is _print_progress:
             print(f"完成 | Completed: {len(results)}/{total} 张图片 processed")
 
         return results
 
-    def check_connection(self) -> dict:
+    def _post_for_timing(self, host: str, payload: dict) -> dict:
+        """
+        直接向指定主机发送请求并返回带计时字段的响应（不经过缓存和重试）
+        Send a request straight to one host and return the response with its
+        timing fields (bypasses the cache and retries)
+        """
+        try:
+            response = self.session.post(
+                f"{host}/api/generate",
+                json=payload,
+                timeout=self.retrier.policy.timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            raise _request_error(e) from e
+
+    def load_model(self, host: Optional[str] = None) -> dict:
+        """
+        让 Ollama 预加载模型（不带提示词的请求只加载模型）
+        Ask Ollama to preload the model (a request without a prompt only loads it)
+
+        Args:
+            host: 目标主机，默认为第一个主机 | Target host, defaults to the first host
+
+        Returns:
+            dict: host, load_seconds（模型加载耗时）, wall_seconds（请求总耗时）
+                  host, load_seconds (model load time), wall_seconds (request time)
+
+        Raises:
+            ConnectionError: 如果 Ollama 服务器不可用 | If Ollama server is unavailable
+        """
+        host = host or self.host
+        payload: Dict[str, Any] = {"model": OCR_MODEL}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
+        started = time.perf_counter()
+        result = self._post_for_timing(host, payload)
+        wall = time.perf_counter() - started
+        load = _seconds(result.get("load_duration"))
+        return {
+            "host": host,
+            "load_seconds": load if load is not None else round(wall, 3),
+            "wall_seconds": round(wall, 3),
+        }
+
+    def warm_up(self, probe: bool = True) -> List[dict]:
+        """
+        在所有主机上预加载模型，可选地执行一次小图片推理
+        Preload the model on every host, optionally running one tiny inference
+
+        模型加载耗时与推理耗时分开报告，错误记录在结果中而不会抛出。
+        Model load time is reported separately from inference time; errors
+        are recorded in the results instead of being raised.
+
+        Args:
+            probe: 是否执行一次推理以预热视觉编码器
+                   Run one inference to also warm up the vision encoder
+
+        Returns:
+            List[dict]: 每个主机的 host, load_seconds, inference_seconds, error
+                        host, load_seconds, inference_seconds, error per host
+
+        Example:
+            >>> for result in OllamaOCR().warm_up():
+            ...     print(result["host"], result["load_seconds"], result["inference_seconds"])
+        """
+        def _warm(backend) -> dict:
+            result = {
+                "host": backend.url,
+                "load_seconds": None,
+                "inference_seconds": None,
+                "error": None,
+            }
+            try:
+                result["load_seconds"] = self.load_model(backend.url)["load_seconds"]
+                if probe:
+                    timing = self._post_for_timing(
+                        backend.url,
+                        _build_payload(_probe_image(), keep_alive=self.keep_alive),
+                    )
+                    total = _seconds(timing.get("total_duration")) or 0.0
+                    load = _seconds(timing.get("load_duration")) or 0.0
+                    result["inference_seconds"] = round(total - load, 3)
+            except Exception as e:
+                result["error"] = str(e)
+            return result
+
+        hosts = self.backends.backends
+        return map_ordered(_warm, hosts, max_workers=len(hosts))
+
+    def check_connection(self, host: Optional[str] = None) -> dict:
         """
         检查 Ollama 服务器连接状态
         Check Ollama server connection status
 
+        Args:
+            host: 要检查的主机，默认为第一个主机 | Host to check, defaults to the first host
+
         Returns:
             dict: 包含连接状态的字典 | Dictionary containing connection status
 
@@ -256,53 +1274,567 @@ class OllamaOCR:
             >>> print(status)
             {'connected': True, 'model_available': True, 'version': '0.5.41'}
         """
+        return _check_host(self.session.get, host or self.host)
+
+    def backend_stats(self) -> list:
+        """
+        获取每个 Ollama 主机的统计信息
+        Get per-host Ollama statistics
+
+        Returns:
+            list: 每个主机的可用状态、在途请求、错误率和延迟
+                  Availability, in-flight requests, error rate and latency per host
+        """
+        return self.backends.stats()
+
+    def retry_stats(self) -> dict:
+        """
+        获取重试和熔断统计信息
+        Get retry and circuit breaker statistics
+
+        Returns:
+            dict: 重试次数、重试后成功数、重试耗尽数和熔断器状态/打开次数
+                  Retries, recoveries, exhausted calls and breaker state/trips
+        """
+        return self.retrier.stats()
+
+    def cache_stats(self) -> dict:
+        """
+        获取 OCR 结果缓存统计信息
+        Get OCR result cache statistics
+
+        Returns:
+            dict: 命中/未命中次数和命中率，未启用缓存时为空字典
+                  Hit/miss counts and hit ratio, empty when caching is disabled
+        """
+        return self.cache.stats() if self.cache is not None else {}
+
+    def preprocess_stats(self) -> dict:
+        """
+        获取图片预处理统计信息
+        Get image pre-processing statistics
+
+        Returns:
+            dict: 处理数量和节省的字节数，未启用预处理时为空字典
+                  Request count and bytes saved, empty when pre-processing is disabled
+        """
+        return self.preprocessor.stats() if self.preprocessor is not None else {}
+
+    def pool_stats(self) -> dict:
+        """
+        获取连接池统计信息
+        Get connection pool statistics
+
+        Returns:
+            dict: 连接复用次数、打开的连接数和等待时间等
+                  Connection reuse count, open connections, wait time, etc.
+
+        Example:
+            >>> client = OllamaOCR()
+            >>> client.recognize("page.png")
+            >>> client.pool_stats()["reused_connections"]
+            0
+        """
+        return self.session.stats()
+
+    def close(self) -> None:
+        """
+        关闭连接池中的所有连接，并停止自有主机池的健康检查
+        Close all connections in the pool and stop health checks of an owned host pool
+        """
+        self.session.close()
+        if self._owns_backends:
+            self.backends.close()
+
+    def __enter__(self) -> "OllamaOCR":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _import_aiohttp():
+    """
+    按需导入可选依赖 aiohttp
+    Import the optional aiohttp dependency on demand
+
+    Raises:
+        ImportError: 如果未安装 aiohttp | If aiohttp is not installed
+    """
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError(
+            "异步客户端需要 aiohttp，请运行：pip install aiohttp | "
+            "The async client requires aiohttp: pip install aiohttp"
+        ) from e
+    return aiohttp
+
+
+class AsyncOllamaOCR:
+    """
+    异步 Ollama OCR 客户端类
+    Asynchronous Ollama OCR Client Class
+
+    OllamaOCR 的 asyncio 版本，基于 aiohttp。等待 Ollama 响应时不占用线程，
+    单个进程即可同时保持大量 OCR 请求在途。错误语义与 OllamaOCR 相同。
+    asyncio counterpart of OllamaOCR built on aiohttp. Waiting for Ollama does
+    not block a thread, so one process can keep many OCR requests in flight.
+    Error semantics match OllamaOCR.
+
+    Attributes:
+        host (str): 第一个 Ollama 服务器地址 | First Ollama server address
+        api_url (str): 第一个服务器的 API 端点 URL | API endpoint URL of the first server
+        backends (BackendPool): Ollama 主机池 | Ollama host pool
+        max_workers (int): 批量识别的默认并发数 | Default batch concurrency
+
+    Example:
+        >>> async with AsyncOllamaOCR() as client:
+        ...     result = await client.recognize("image.png")
+        >>> print(result)
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        cache: Union[OCRCache, bool, None] = None,
+        preprocessor: Union[ImagePreprocessor, bool, None] = None,
+        backends: Optional[BackendPool] = None,
+        retrier: Optional[Retrier] = None,
+        keep_alive: Optional[KeepAlive] = None,
+        tiler: Union[ImageTiler, bool, None] = None
+    ):
+        """
+        初始化异步 Ollama OCR 客户端
+        Initialize asynchronous Ollama OCR client
+
+        Args:
+            host: Ollama 服务器基础 URL，如果不提供则从环境变量读取
+                  Ollama server base URL, reads from environment variable if not provided
+            max_connections: 每主机最大连接数，如果不提供则从环境变量读取
+                             Maximum connections per host, reads from environment if not provided
+            max_workers: 批量识别时同时在途的最大请求数，如果不提供则从环境变量读取
+                         Maximum in-flight requests for batches, reads from environment if not provided
+            cache: OCR 结果缓存，可与 OllamaOCR 共享；None 从环境变量创建，False 禁用
+                   OCR result cache, can be shared with OllamaOCR; None builds from
+                   the environment, False disables it
+            preprocessor: 图片预处理器；None 从环境变量创建，False 禁用
+                          Image pre-processor; None builds one from the environment, False disables it
+            backends: Ollama 主机池，可与 OllamaOCR 共享以合并统计
+                      Ollama host pool, can be shared with OllamaOCR to combine statistics
+            retrier: 重试策略和熔断器，可与 OllamaOCR 共享熔断状态
+                     Retry policy and circuit breaker, can share breaker state with OllamaOCR
+            keep_alive: 请求后模型保持加载的时长，默认读取 OCR_KEEP_ALIVE
+                        How long the model stays loaded after a request, defaults to OCR_KEEP_ALIVE
+            tiler: 超大图片的分块识别，可与 OllamaOCR 共享；None 从环境变量创建，False 禁用
+                   Tiled recognition of oversized images, can be shared with OllamaOCR;
+                   None builds one from the environment, False disables it
+
+        Environment Variables:
+            OLLAMA_BASE_URL: Ollama 服务器地址（默认：http://localhost:11434）
+            OLLAMA_BASE_URLS: 逗号分隔的多个主机，参见 BackendPool.from_env
+                              Comma-separated hosts, see BackendPool.from_env
+            OLLAMA_POOL_MAXSIZE: 每主机最大连接数（默认：8）
+            OLLAMA_MAX_WORKERS: 批量识别并发数（默认：4）
+        """
+        load_env_file()
+        self.retrier = retrier or Retrier()
+
+        # 后台健康检查在线程中运行，使用同步请求
+        # Background health checks run in a thread and use blocking requests
+        self.backends, self._owns_backends = _resolve_backends(
+            host, backends, lambda url: _is_healthy(_check_host(requests.get, url))
+        )
+        self.host = self.backends.primary.url
+        self.api_url = f"{self.host}/api/generate"
+
+        pool_config = PoolConfig.from_env()
+        self.max_connections = max_connections or pool_config.pool_maxsize
+        self.keepalive_expiry = pool_config.keepalive_expiry
+        self.max_workers = max(1, max_workers or env_int("OLLAMA_MAX_WORKERS", 4))
+        self.cache = _resolve_cache(cache)
+        self.preprocessor = _resolve_preprocessor(preprocessor)
+        self.tiler = _resolve_tiler(tiler, self.preprocessor)
+
+        # 请求结束后模型保持加载的时长 | How long the model stays loaded after each request
+        self.keep_alive = (
+            keep_alive if keep_alive is not None else parse_keep_alive(env_str("OCR_KEEP_ALIVE"))
+        )
+
+        # aiohttp 会话绑定到创建时的事件循环，因此延迟创建
+        # aiohttp sessions are bound to the creating event loop, so create lazily
+        self._session = None
+        self._session_loop = None
+
+    async def _get_session(self):
+        """
+        获取（必要时创建）当前事件循环的 aiohttp 会话
+        Get (creating if needed) the aiohttp session for the running loop
+        """
+        aiohttp = _import_aiohttp()
+        loop = asyncio.get_running_loop()
+
+        # 在其他事件循环中创建的会话无法复用，需要为当前循环新建
+        # A session created on another loop cannot be reused here
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=self.keepalive_expiry or None,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+
+        return self._session
+
+    async def recognize(self, image: ImageInput) -> str:
+        """
+        异步地对单张图片进行 OCR 识别
+        Perform OCR on a single image asynchronously
+
+        Args:
+            image: 图片文件路径、字节、文件对象或 PIL 图片
+                   Image file path, bytes, file-like object or PIL image
+
+        Returns:
+            str: Markdown 格式的 OCR 识别结果
+                 Markdown formatted OCR result
+
+        Raises:
+            FileNotFoundError: 如果图片文件不存在 | If image file doesn't exist
+            ConnectionError: 如果 Ollama 服务器不可用或超时 | If Ollama server is unavailable or times out
+            ValueError: 如果响应无效 | If the response is invalid
+            requests.RequestException: 其他 API 错误 | For other API errors
+        """
+        return (await self.recognize_detailed(image)).text
+
+    async def recognize_detailed(self, image: ImageInput) -> OCRResult:
+        """
+        异步识别单张图片，并返回包含耗时分解的结构化结果（与 OllamaOCR.recognize_detailed 相同）
+        Recognize a single image asynchronously and return a structured
+        result with a timing breakdown (as OllamaOCR.recognize_detailed)
+        """
+        aiohttp = _import_aiohttp()
+        started = time.perf_counter()
+
+        # 超大图片分块识别，解码放到线程中 | Oversized images are tiled, decoding in a thread
+        plan = await asyncio.to_thread(_plan_tiles, image, self.tiler, self.preprocessor)
+        if plan is not None:
+            return await self._recognize_tiles(plan, started)
+
+        timings = OCRTimings()
+
+        # 文件读取、哈希、预处理和编码放到线程中，避免阻塞事件循环
+        # Read, hash, pre-process and encode in a thread so the event loop is not blocked
+        prepared = await asyncio.to_thread(
+            _prepare_image, image, self.preprocessor, self.cache
+        )
+        if prepared.cached_text is not None:
+            timings.encode_seconds = timings.total_seconds = time.perf_counter() - started
+            return OCRResult(prepared.cached_text, timings, cached=True, model=OCR_MODEL)
+        cache_key = prepared.cache_key
+        timings.payload_bytes = len(prepared.data)
+
+        body = await asyncio.to_thread(
+            _encode_request, prepared.data, False, self.keep_alive
+        )
+        del prepared
+        sent = time.perf_counter()
+        timings.encode_seconds = sent - started
+
+        stack, response = await self._send(body)
+        received = time.perf_counter()
+        timings.request_seconds = received - sent
+        async with stack:
+            try:
+                result = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise _aiohttp_error(e, aiohttp) from e
+            except Exception as e:
+                raise ValueError(
+                    f"解析 API 响应失败 | Failed to parse API response: {e}"
+                ) from e
+
+        text = _parse_generate_response(result)
+        finished = time.perf_counter()
+        timings.parse_seconds = finished - received
+        timings.total_seconds = finished - started
+        timings.apply_response(result)
+
+        if cache_key is not None:
+            self.cache.set(cache_key, text)
+        return _log_timings(OCRResult(
+            text, timings, host=_response_host(response.url), model=result.get("model", OCR_MODEL)
+        ))
+
+    async def recognize_stream(self, image: ImageInput) -> AsyncIterator[str]:
+        """
+        异步地以流式方式识别单张图片，逐块产出文本
+        Recognize a single image as an async stream, yielding text chunks
+
+        Args:
+            image: 图片文件路径、字节、文件对象或 PIL 图片
+                   Image file path, bytes, file-like object or PIL image
+
+        Yields:
+            str: 文本片段 | Text chunk
+
+        Raises:
+            ConnectionError: 如果 Ollama 服务器不可用或超时 | If Ollama server is unavailable or times out
+            ValueError: 如果流中的数据无效 | If the stream contains invalid data
+            requests.RequestException: 其他 API 错误 | For other API errors
+        """
+        aiohttp = _import_aiohttp()
+
+        # 分块识别的图块并发完成，拼接后一次产出 | Tiles finish concurrently and are yielded once stitched
+        plan = await asyncio.to_thread(_plan_tiles, image, self.tiler, self.preprocessor)
+        if plan is not None:
+            yield (await self._recognize_tiles(plan, time.perf_counter())).text
+            return
+
+        prepared = await asyncio.to_thread(
+            _prepare_image, image, self.preprocessor, self.cache
+        )
+        if prepared.cached_text is not None:
+            yield prepared.cached_text
+            return
+        cache_key = prepared.cache_key
+
+        body = await asyncio.to_thread(
+            _encode_request, prepared.data, True, self.keep_alive
+        )
+        del prepared
+
+        stack, response = await self._send(body, stream=True)
+        chunks: List[str] = []
+        done = False
+        async with stack:
+            try:
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    text, done = _parse_stream_line(line)
+                    if text:
+                        chunks.append(text)
+                        yield text
+                    if done:
+                        break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise _aiohttp_error(e, aiohttp) from e
+
+        if done and cache_key is not None:
+            self.cache.set(cache_key, "".join(chunks).strip())
+
+    async def _recognize_tiles(self, plan: TilePlan, started: float) -> OCRResult:
+        """
+        并发识别所有图块（最多 max_workers 个）并拼接
+        Recognize every tile concurrently (at most max_workers) and stitch them
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def _run(box) -> OCRResult:
+            async with semaphore:
+                tile = await asyncio.to_thread(plan.crop, box)
+                return await self.recognize_detailed(tile)
+
+        results = await asyncio.gather(*(_run(box) for box in plan.boxes))
+        return _tiled_result(plan, list(results), started)
+
+    async def _open_generate(self, body: bytes) -> Tuple[AsyncExitStack, Any]:
+        """
+        选择一个主机并发送一次 /api/generate 请求（与 OllamaOCR._open_generate 相同）
+        Pick a host and send a single /api/generate request (as OllamaOCR._open_generate)
+        """
+        aiohttp = _import_aiohttp()
+        policy = self.retrier.policy
+        session = await self._get_session()
+
+        stack = AsyncExitStack()
+        try:
+            backend = stack.enter_context(self.backends.lease(_is_backend_failure))
+            try:
+                response = await stack.enter_async_context(session.post(
+                    f"{backend.url}/api/generate",
+                    data=body,
+                    headers=_JSON_HEADERS,
+                    timeout=aiohttp.ClientTimeout(
+                        total=None,
+                        sock_connect=policy.connect_timeout,
+                        sock_read=policy.read_timeout,
+                    )
+                ))
+                response.raise_for_status()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise _aiohttp_error(e, aiohttp) from e
+        except BaseException:
+            await stack.__aexit__(*sys.exc_info())
+            raise
+        return stack, response
+
+    async def _send(self, body: bytes, stream: bool = False) -> Tuple[AsyncExitStack, Any]:
+        """
+        按重试策略发送请求，熔断器打开时快速失败
+        Send the request under the retry policy, failing fast while the breaker is open
+        """
+        aiohttp = _import_aiohttp()
+        policy = self.retrier.policy
+        metrics = _RequestMetrics("stream" if stream else "generate")
+        try:
+            stack, response = await self.retrier.call_async(
+                lambda: self._open_generate(body),
+                is_retryable=lambda error: _is_retryable_async(error, policy, aiohttp),
+                is_failure=_is_backend_failure,
+            )
+        except BaseException:
+            metrics.__exit__(*sys.exc_info())
+            raise
+        stack.push(metrics)
+        return stack, response
+
+    async def recognize_batch(
+        self,
+        image_paths: List[ImageInput],
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[str]:
+        """
+        异步批量识别，最多同时发送 max_workers 个请求，结果按输入顺序返回
+        Recognize a batch asynchronously with at most max_workers requests in
+        flight, returning results in input order
+
+        Args:
+            image_paths: 图片文件路径列表 | List of paths to image files
+            max_workers: 最大并发数，默认使用 self.max_workers
+                         Maximum concurrency, defaults to self.max_workers
+            progress_callback: 进度回调 (已完成数, 总数, 路径, 错误或 None)
+                               Progress callback (completed, total, path, error or None)
+
+        Returns:
+            List[str]: OCR 识别结果列表 | List of OCR recognition results
+
+        Raises:
+            ValueError: 如果路径列表为空 | If image_paths is empty
+        """
+        if not image_paths:
+            raise ValueError("图片路径列表不能为空 | Image paths list cannot be empty")
+
+        total = len(image_paths)
+        semaphore = asyncio.Semaphore(max_workers or self.max_workers)
+        completed = 0
+
+        async def _run(path: str) -> str:
+            nonlocal completed
+            error = None
+            async with semaphore:
+                try:
+                    result = await self.recognize(path)
+                except Exception as e:
+                    error = e
+                    result = f"[错误 | Error: {str(e)}]"
+            completed += 1
+            if progress_callback is not None:
+                progress_callback(completed, total, path, error)
+            return result
+
+        return list(await asyncio.gather(*(_run(path) for path in image_paths)))
+
+    async def check_connection(self, host: Optional[str] = None) -> dict:
+        """
+        异步检查 Ollama 服务器连接状态
+        Check Ollama server connection status asynchronously
+
+        Args:
+            host: 要检查的主机，默认为第一个主机 | Host to check, defaults to the first host
+
+        Returns:
+            dict: 包含连接状态的字典，格式与 OllamaOCR.check_connection 相同
+                  Connection status, same format as OllamaOCR.check_connection
+        """
+        aiohttp = _import_aiohttp()
         result = {
             "connected": False,
             "model_available": False,
             "version": None,
             "error": None
         }
+        timeout = aiohttp.ClientTimeout(total=10)
+        session = await self._get_session()
+        host = host or self.host
 
         try:
-            # 尝试获取服务器信息
-            # Try to get server info
-            response = requests.get(
-                f"{self.host}/api/version",
-                timeout=10
-            )
-
-            if response.status_code == 200:
-                result["connected"] = True
-                version_data = response.json()
-                result["version"] = version_data.get("version", "unknown")
-
-        except requests.RequestException as e:
+            async with session.get(f"{host}/api/version", timeout=timeout) as response:
+                if response.status == 200:
+                    result["connected"] = True
+                    version_data = await response.json(content_type=None)
+                    result["version"] = version_data.get("version", "unknown")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
             result["error"] = str(e)
             return result
 
-        # 检查模型是否可用
-        # Check if model is available
         try:
-            models_response = requests.get(
-                f"{self.host}/api/tags",
-                timeout=10
-            )
+            async with session.get(f"{host}/api/tags", timeout=timeout) as response:
+                if response.status == 200:
+                    models_data = await response.json(content_type=None)
+                    for model in models_data.get("models", []):
+                        if model.get("name", "").startswith("glm-ocr"):
+                            result["model_available"] = True
+                            break
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            result["error"] = str(e)
 
-            if models_response.status_code == 200:
-                models_data = models_response.json()
-                models = models_data.get("models", [])
+        return result
 
-                # 检查 glm-ocr 模型是否存在
-                # Check if glm-ocr model exists
-                for model in models:
-                    if model.get("name", "").startswith("glm-ocr"):
-                        result["model_available"] = True
-                        break
+    def backend_stats(self) -> list:
+        """
+        获取每个 Ollama 主机的统计信息
+        Get per-host Ollama statistics
+        """
+        return self.backends.stats()
 
-        except requests.RequestException as e:
-            result["error"] = str(e)
+    def retry_stats(self) -> dict:
+        """
+        获取重试和熔断统计信息
+        Get retry and circuit breaker statistics
+        """
+        return self.retrier.stats()
 
-        return result
+    async def close(self) -> None:
+        """
+        关闭 aiohttp 会话
+        Close the aiohttp session
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+        if self._owns_backends:
+            self.backends.close()
+
+    async def __aenter__(self) -> "AsyncOllamaOCR":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+
+def _print_progress(
+    completed: int,
+    total: int,
+    path: str,
+    error: Optional[BaseException]
+) -> None:
+    """
+    默认的批量进度输出
+    Default batch progress printer
+    """
+    if error is not None:
+        print(f"[错误 | Error] 处理 | Processing {describe_image(path)}: {str(error)}")
+    else:
+        print(
+            f"处理中 | Processing: [{completed}/{total}] {describe_image(path)}"
+        )
 
 
 def call_glm_ocr(image_path: str) -> str:
@@ -320,14 +1852,15 @@ def call_glm_ocr(image_path: str) -> str:
         >>> result = call_glm_ocr("document.png")
         >>> print(result)
     """
-    ocr_client = OllamaOCR()
-    return ocr_client.recognize(image_path)
+    with OllamaOCR() as ocr_client:
+        return ocr_client.recognize(image_path)
 
 
 def batch_ocr(
     image_paths: List[str],
     output_file: Optional[str] = None,
-    show_progress: bool = True
+    show_progress: bool = True,
+    max_workers: Optional[int] = None
 ) -> List[str]:
     """
     批量 OCR 识别函数
@@ -337,6 +1870,7 @@ def batch_ocr(
         image_paths: 图片文件路径列表 | List of paths to image files
         output_file: 可选的输出文件路径 | Optional output file path
         show_progress: 是否显示进度信息 | Whether to show progress information
+        max_workers: 最大并发数 | Maximum concurrency
 
     Returns:
         List[str]: OCR 识别结果列表 | List of OCR recognition results
@@ -345,8 +1879,8 @@ def batch_ocr(
         >>> results = batch_ocr(["1.png", "2.jpg"], "output.md")
         >>> print(f"识别了 {len(results)} 张图片 | Recognized {len(results)} images")
     """
-    ocr_client = OllamaOCR()
-    results = ocr_client.recognize_batch(image_paths, show_progress)
+    with OllamaOCR(max_workers=max_workers) as ocr_client:
+        results = ocr_client.recognize_batch(image_paths, show_progress)
 
     # 如果指定了输出文件，保存结果
     # Save results if output file is specified
@@ -21,13 +21,29 @@ __author__ = "GLM-OCR Team"
 __license__ = "MIT License"
 __repository__ = "https://github.com/yourusername/glm-ocr-webui"
 
-# 导入主要组件 | Import main components
-from .models import *
-from .utils import *
-from .handlers import *
+# 标准库导入 | Standard Library Imports
+from importlib import import_module  # 延迟导入
+
+# 主要组件在首次访问时从子包导入，导入本包没有副作用
+# Main components are imported from the subpackages on first access, so
+# importing this package has no side effects
+_SUBPACKAGES = ("models", "utils", "handlers")
 
 __all__ = [
     "__version__",
     "__author__",
     "__license__",
 ]
+
+
+def __getattr__(name: str):
+    """首次访问时从子包导入主要组件（PEP 562）| Import main components from the subpackages on first access (PEP 562)"""
+    if name in _SUBPACKAGES:
+        return import_module(f".{name}", __name__)
+    for subpackage in _SUBPACKAGES:
+        module = import_module(f".{subpackage}", __name__)
+        if name in getattr(module, "__all__", ()):
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -13,8 +13,49 @@ Provide handlers for file processing and OCR recognition.
 - Word 处理器 | Word handler
 - 图片处理器 | Image handler
 - OCR 处理器 | OCR handler
+- 后台任务 | Background jobs
+
+子模块在首次访问其导出名称时才导入，导入本包不会加载全部处理器及其依赖。
+Submodules are imported on first access to one of their names, so
+importing this package does not load the handlers and their dependencies.
 
 =====================================================================
 """
 
-__all__ = []
+# 标准库导入 | Standard Library Imports
+from importlib import import_module  # 延迟导入
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .doc_handler import extract_doc_text
+    from .job_runner import JobRunner, JobStore
+    from .pdf_handler import NO_TEXT_PLACEHOLDER, PageError, iter_pdf_page_texts
+
+# 导出名称 -> 所在子模块 | Exported name -> defining submodule
+_EXPORTS = {
+    "extract_doc_text": "doc_handler",
+    "JobRunner": "job_runner",
+    "JobStore": "job_runner",
+    "NO_TEXT_PLACEHOLDER": "pdf_handler",
+    "PageError": "pdf_handler",
+    "iter_pdf_page_texts": "pdf_handler",
+}
+
+__all__ = [
+    "extract_doc_text",
+    "JobRunner",
+    "JobStore",
+    "NO_TEXT_PLACEHOLDER",
+    "PageError",
+    "iter_pdf_page_texts",
+]
+
+
+def __getattr__(name: str):
+    """首次访问时导入所在的子模块（PEP 562）| Import the defining submodule on first access (PEP 562)"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+Word 文档处理器
+Word Document Handler
+
+按文档顺序提取 Word 文档的段落、表格和嵌入图片，供 Web UI、后台任务
+和命令行共用。嵌入图片直接从文档包中读取，按内容哈希去重后通过 OCR
+客户端并发识别，识别结果放回图片所在的位置。
+Extracts paragraphs, tables and embedded images of Word documents in
+document order, shared by the web UI, background jobs and the command line.
+Embedded images are read straight from the package, deduplicated by content
+hash, recognized concurrently through the OCR client, and each result is
+placed where its image appears.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import hashlib  # 图片内容哈希
+import logging  # 日志
+import os  # 文件路径
+from dataclasses import dataclass, field  # 数据类
+from io import BytesIO  # 内存中的图片
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..utils.concurrency import map_ordered  # 有界并发执行
+
+logger = logging.getLogger(__name__)
+
+# 未提取到文本时的占位符 | Placeholder used when a document has no text
+NO_DOC_TEXT_PLACEHOLDER = "[未提取到文本 | No text extracted]"
+
+# 模型可直接接收的图片类型，其他位图先转换为 PNG
+# Image types the model accepts as is; other bitmaps are converted to PNG first
+_NATIVE_IMAGE_TYPES = {"image/png", "image/jpeg"}
+
+# 小于该边长（像素）的图片视为项目符号、分隔线等装饰，不识别
+# Images with a side below this (pixels) are bullets, rules and other decoration
+_MIN_IMAGE_SIDE = 32
+
+# WordprocessingML 元素 | WordprocessingML elements
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_P = f"{{{_W_NS}}}p"
+_TBL = f"{{{_W_NS}}}tbl"
+_R_EMBED = f"{{{_R_NS}}}embed"
+_R_ID = f"{{{_R_NS}}}id"
+
+
+@dataclass
+class _Block:
+    """
+    文档中的一个内容块：段落、表格或图片
+    One block of the document: a paragraph, a table or an image
+    """
+
+    kind: str
+    text: str = ""
+    image: Optional[str] = None  # 图片内容哈希 | Image content hash
+
+
+@dataclass
+class _DocImages:
+    """
+    去重后的嵌入图片（哈希 -> 可识别的图片输入）
+    Deduplicated embedded images (hash -> recognizable image input)
+    """
+
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    skipped: int = 0
+
+
+def _image_input(blob: bytes, content_type: str) -> Optional[Any]:
+    """
+    将图片部件转换为 OCR 输入，无法识别或过小时返回 None
+    Turn an image part into OCR input, None when it cannot be read or is too small
+
+    EMF/WMF 等矢量格式 Pillow 通常无法打开，直接跳过。
+    Vector formats such as EMF/WMF usually cannot be opened by Pillow and are skipped.
+    """
+    try:
+        from PIL import Image
+
+        image = Image.open(BytesIO(blob))
+        width, height = image.size
+    except Exception:
+        return None
+    if min(width, height) < _MIN_IMAGE_SIDE:
+        return None
+    if content_type in _NATIVE_IMAGE_TYPES:
+        return blob
+    try:
+        image.load()
+        return image.convert("RGB") if image.mode not in ("RGB", "L") else image
+    except Exception:
+        return None
+
+
+def _image_refs(element: Any) -> Iterator[Optional[str]]:
+    """
+    元素中图片引用的关系 ID | Relationship IDs of the image references in an element
+    """
+    for node in element.iter():
+        tag = node.tag if isinstance(node.tag, str) else ""
+        if tag.endswith("}blip"):
+            yield node.get(_R_EMBED)
+        elif tag.endswith("}imagedata"):
+            yield node.get(_R_ID)
+
+
+def _element_images(element: Any, part: Any, images: _DocImages) -> List[str]:
+    """
+    按顺序收集元素中的嵌入图片（DrawingML 和旧版 VML），返回内容哈希
+    Collect an element's embedded images in order (DrawingML and legacy VML)
+    and return their content hashes
+    """
+    hashes = []
+    for rel_id in _image_refs(element):
+        image_part = part.related_parts.get(rel_id) if rel_id else None
+        blob = getattr(image_part, "blob", None)
+        if not blob:
+            continue
+        digest = hashlib.sha256(blob).hexdigest()
+        if digest not in images.inputs:
+            image = _image_input(blob, getattr(image_part, "content_type", ""))
+            if image is None:
+                images.skipped += 1
+                continue
+            images.inputs[digest] = image
+        hashes.append(digest)
+    return hashes
+
+
+def _cell_text(cell: Any) -> str:
+    """表格单元格文本，换行替换为 <br> 以保持 Markdown 表格结构 | Cell text with <br> line breaks"""
+    text = "\n".join(paragraph.text for paragraph in cell.paragraphs).strip()
+    return text.replace("|", "\\|").replace("\n", "<br>")
+
+
+def _table_markdown(table: Any) -> str:
+    """
+    将表格转换为 Markdown，合并单元格只输出一次
+    Convert a table to Markdown, writing merged cells once
+    """
+    rows = []
+    for row in table.rows:
+        cells, previous = [], None
+        for cell in row.cells:
+            # 横向合并的单元格在 row.cells 中重复出现 | Merged cells repeat in row.cells
+            cells.append("" if cell._tc is previous else _cell_text(cell))
+            previous = cell._tc
+        rows.append(cells)
+    if not any(any(cells) for cells in rows):
+        return ""
+    width = max(len(cells) for cells in rows)
+    lines = []
+    for index, cells in enumerate(rows):
+        cells = cells + [""] * (width - len(cells))
+        lines.append("| " + " | ".join(cells) + " |")
+        if index == 0:
+            lines.append("|" + " --- |" * width)
+    return "\n".join(lines)
+
+
+def _iter_blocks(doc: Any, with_images: bool, images: _DocImages) -> List[_Block]:
+    """
+    按文档顺序列出正文的段落、表格和图片
+    List the body's paragraphs, tables and images in document order
+
+    表格中的图片紧跟在表格之后。
+    Images inside a table follow the table.
+    """
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    part = doc.part
+    blocks: List[_Block] = []
+    for element in doc.element.body.iterchildren():
+        if element.tag == _P:
+            text = Paragraph(element, doc).text
+            # 只放图片的空段落由图片的识别结果代替 | An empty paragraph holding only images is replaced by their text
+            if text or not with_images or next(_image_refs(element), None) is None:
+                blocks.append(_Block("paragraph", text))
+        elif element.tag == _TBL:
+            blocks.append(_Block("table", _table_markdown(Table(element, doc))))
+        else:
+            continue
+        if with_images:
+            blocks.extend(
+                _Block("image", image=digest)
+                for digest in _element_images(element, part, images)
+            )
+    return blocks
+
+
+def _join_blocks(blocks: List[_Block]) -> str:
+    """
+    合并内容块：相邻段落以换行分隔，表格和图片前后空一行
+    Join the blocks: adjacent paragraphs are separated by a newline, tables
+    and images by a blank line
+    """
+    parts: List[str] = []
+    previous = None
+    for block in blocks:
+        if block.kind != "paragraph" and not block.text.strip():
+            continue
+        if parts:
+            both_paragraphs = block.kind == previous == "paragraph"
+            parts.append("\n" if both_paragraphs else "\n\n")
+        parts.append(block.text)
+        previous = block.kind
+    return "".join(parts)
+
+
+def extract_doc_text(
+    file_path: str,
+    client: Any = None,
+    max_workers: Optional[int] = None,
+    strict: bool = False
+) -> str:
+    """
+    从 Word 文档中提取文本内容，提供客户端时同时识别嵌入图片
+    Extract text content from a Word document, recognizing embedded images
+    when a client is given
+
+    Args:
+        file_path: Word 文档路径 | Word document path
+        client: OCR 客户端，None 时只提取段落和表格文本
+                OCR client, None extracts paragraph and table text only
+        max_workers: 图片识别并发数，默认使用客户端的 max_workers
+                     Image OCR concurrency, the client's max_workers by default
+        strict: 图片识别失败时抛出异常，而不是在原位置写入错误占位符（后台任务和命令行使用）
+                Raise when an image fails OCR instead of writing an error placeholder in
+                its place (used by background jobs and the CLI)
+
+    Returns:
+        str: 提取的文本内容，没有文本时为占位符
+             Extracted text, the placeholder when there is none
+
+    Raises:
+        ImportError: 如果未安装 python-docx | If python-docx is not installed
+        Exception: 文档无法解析，或 strict 时图片识别失败 | If the document cannot be parsed, or an image fails OCR with strict
+    """
+    from docx import Document
+
+    doc = Document(file_path)
+    images = _DocImages()
+    blocks = _iter_blocks(doc, client is not None, images)
+
+    if images.inputs:
+        digests = list(images.inputs)
+        texts = map_ordered(
+            lambda digest: client.recognize(images.inputs[digest]),
+            digests,
+            max_workers=max_workers or getattr(client, "max_workers", 4),
+            on_error=None if strict else lambda _, e: f"[图片识别失败 | Image OCR failed: {e}]",
+        )
+        recognized = dict(zip(digests, texts))
+        occurrences = sum(block.kind == "image" for block in blocks)
+        logger.info(
+            "%s: %d images, %d unique, %d skipped",
+            os.path.basename(file_path), occurrences, len(digests), images.skipped,
+        )
+        for block in blocks:
+            if block.image is not None:
+                block.text = recognized[block.image].strip()
+
+    text = _join_blocks(blocks)
+    return text if text.strip() else NO_DOC_TEXT_PLACEHOLDER
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+后台任务
+Background Jobs
+
+长文档在单个 Gradio 请求中处理时，刷新浏览器或重启进程会丢失全部
+OCR 结果。任务系统把上传的文件复制到任务目录，每完成一页就写入
+SQLite；用户拿到任务 ID 后可以轮询或流式查看进度，进程重启后未完成
+或失败的任务自动恢复，已完成的页面不会重新识别，识别失败的页面不会
+保存，恢复时重新识别。每个任务记录运行次数，达到上限后不再恢复，
+始终失败的文件不会在每次重启时无限重试。
+When a long document is processed inside a single Gradio request, a
+browser refresh or a restart loses all OCR work. The job system copies
+the upload into a job directory and writes every page to SQLite as soon
+as it finishes; users get a job ID to poll or stream progress, and after
+a restart unfinished or failed jobs resume without re-running finished
+pages. Pages that failed OCR are never stored, so they are re-run when
+the job resumes. Every job counts its runs and is no longer resumed once
+it reaches the cap, so a file that always fails is not retried on every
+restart forever.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import json  # 任务统计
+import logging  # 日志
+import os  # 文件路径
+import shutil  # 文件复制
+import sqlite3  # 任务存储
+import threading  # 线程锁
+import time  # 时间戳
+import uuid  # 任务 ID
+from collections import Counter  # 页面路由计数
+from concurrent.futures import ThreadPoolExecutor  # 任务线程池
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.utils.env import env_bool, env_int, env_str
+from src.utils.memory import MemoryMonitor
+from src.utils.scheduler import FairScheduler, ScheduledClient
+
+from .pdf_handler import PageError, iter_pdf_page_texts
+
+logger = logging.getLogger(__name__)
+
+# 任务状态 | Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# 文件类型 | File kinds
+KIND_PDF = "pdf"
+KIND_DOCX = "docx"
+KIND_IMAGE = "image"
+
+
+def file_kind(file_path: str) -> str:
+    """
+    根据扩展名判断文件类型
+    Determine the file kind from its extension
+    """
+    lower = file_path.lower()
+    if lower.endswith(".pdf"):
+        return KIND_PDF
+    if lower.endswith((".doc", ".docx")):
+        return KIND_DOCX
+    return KIND_IMAGE
+
+
+class JobStore:
+    """
+    基于 SQLite 的任务和页面结果存储（线程安全）
+    SQLite-backed storage for jobs and page results (thread-safe)
+    """
+
+    def __init__(self, path: str):
+        """
+        打开（或创建）任务数据库
+        Open (or create) the job database
+
+        Args:
+            path: SQLite 文件路径 | SQLite file path
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " file_name TEXT NOT NULL,"
+            " file_path TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " total_pages INTEGER,"
+            " error TEXT,"
+            " created REAL NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS job_pages ("
+            " job_id TEXT NOT NULL,"
+            " page INTEGER NOT NULL,"
+            " text TEXT NOT NULL,"
+            " PRIMARY KEY (job_id, page))"
+        )
+        # 旧数据库没有统计列和运行次数列 | Databases from older versions lack the stats and attempts columns
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "stats" not in columns:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN stats TEXT")
+        if "attempts" not in columns:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+
+    def create(self, job_id: str, file_name: str, file_path: str, kind: str) -> None:
+        """创建排队中的任务 | Create a queued job"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, file_name, file_path, kind, status, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, file_name, file_path, kind, JOB_QUEUED, now, now),
+            )
+
+    def update(
+        self,
+        job_id: str,
+        status: Optional[str] = None,
+        total_pages: Optional[int] = None,
+        error: Optional[str] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        clear_error: bool = False
+    ) -> None:
+        """
+        更新任务状态、总页数、错误信息或统计（统计与已有内容合并）
+        Update a job's status, page count, error or stats (stats are merged
+        into the existing ones)
+
+        为 None 的字段保持不变；已记录的错误只在 clear_error 为 True 时清除。
+        Fields left as None are unchanged; a recorded error is only cleared
+        when clear_error is True.
+        """
+        with self._lock:
+            if stats:
+                row = self._db.execute("SELECT stats FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                merged = json.loads(row[0]) if row and row[0] else {}
+                merged.update(stats)
+                self._db.execute(
+                    "UPDATE jobs SET stats = ? WHERE id = ?", (json.dumps(merged), job_id)
+                )
+            self._db.execute(
+                "UPDATE jobs SET status = COALESCE(?, status),"
+                " total_pages = COALESCE(?, total_pages),"
+                " error = CASE WHEN ? THEN NULL ELSE COALESCE(?, error) END, updated = ?"
+                " WHERE id = ?",
+                (status, total_pages, clear_error, error, time.time(), job_id),
+            )
+
+    def start(self, job_id: str) -> int:
+        """
+        标记任务开始运行并增加运行次数
+        Mark a job as running and count the attempt
+
+        Returns:
+            int: 包括本次在内的运行次数 | Attempts including this one
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated = ? WHERE id = ?",
+                (JOB_RUNNING, time.time(), job_id),
+            )
+            row = self._db.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else 0
+
+    def save_page(self, job_id: str, page: int, text: str) -> None:
+        """保存一页结果 | Save one page's result"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO job_pages (job_id, page, text) VALUES (?, ?, ?)",
+                (job_id, page, text),
+            )
+            self._db.execute("UPDATE jobs SET updated = ? WHERE id = ?", (time.time(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取任务信息（含已完成页数、统计和运行次数）
+        Get a job (including the number of finished pages, its stats and attempts)
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, file_name, file_path, kind, status, total_pages, error, created, updated,"
+                " (SELECT COUNT(*) FROM job_pages WHERE job_id = jobs.id), stats, attempts"
+                " FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = (
+            "id", "file_name", "file_path", "kind", "status", "total_pages",
+            "error", "created", "updated", "done_pages", "stats", "attempts",
+        )
+        job = dict(zip(keys, row))
+        job["stats"] = json.loads(job["stats"]) if job["stats"] else {}
+        return job
+
+    def pages(self, job_id: str) -> Dict[int, str]:
+        """已完成页面的结果 | Results of the finished pages"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT page, text FROM job_pages WHERE job_id = ? ORDER BY page", (job_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def unfinished(self, include_failed: bool = False) -> List[str]:
+        """
+        排队中或运行中的任务（按创建顺序），可包括失败的任务
+        Queued or running jobs, oldest first, optionally with failed jobs
+        """
+        states = (JOB_QUEUED, JOB_RUNNING) + ((JOB_FAILED,) if include_failed else ())
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT id FROM jobs WHERE status IN ({', '.join('?' * len(states))}) ORDER BY created",
+                states,
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """关闭数据库连接 | Close the database connection"""
+        with self._lock:
+            self._db.close()
+
+
+class JobRunner:
+    """
+    后台任务执行器
+    Background job runner
+
+    Example:
+        >>> runner = JobRunner(OllamaOCR(), JobStore("ocr_jobs/jobs.sqlite3"))
+        >>> runner.resume()
+        >>> job_id = runner.submit("book.pdf")
+        >>> for status in runner.watch(job_id):
+        ...     print(status["done_pages"], "/", status["total_pages"])
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: JobStore,
+        files_dir: Optional[str] = None,
+        workers: int = 2,
+        scheduler: Optional[FairScheduler] = None,
+        text_extractor: Optional[Callable[[str, Any], str]] = None,
+        max_attempts: int = 3
+    ):
+        """
+        初始化任务执行器
+        Initialize the runner
+
+        Args:
+            client: OCR 客户端 | OCR client
+            store: 任务存储 | Job store
+            files_dir: 上传文件副本的目录，默认为数据库旁的 files 目录
+                       Directory for upload copies, defaults to "files" next to the database
+            workers: 同时运行的任务数 | Jobs run at once
+            scheduler: 公平调度器，任务与交互请求按会话轮转 | Fair scheduler shared with interactive requests
+            text_extractor: Word 文档的文本提取函数，参数为路径和 OCR 客户端（用于嵌入图片）
+                            Text extractor for Word documents, called with the path and the OCR client (for embedded images)
+            max_attempts: 每个任务最多运行的次数，达到后不再恢复 | Runs per job before it is no longer resumed
+        """
+        self.client = client
+        self.store = store
+        self.files_dir = files_dir or os.path.join(
+            os.path.dirname(os.path.abspath(store.path)), "files"
+        )
+        os.makedirs(self.files_dir, exist_ok=True)
+        self.scheduler = scheduler
+        self.text_extractor = text_extractor
+        self.max_attempts = max(1, max_attempts)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ocr-job")
+        self._cancelled: set = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, client: Any, **kwargs: Any) -> Optional["JobRunner"]:
+        """
+        从环境变量创建任务执行器，未启用时返回 None
+        Build the runner from environment variables, None when disabled
+
+        Environment Variables:
+            OCR_JOBS: 启用后台任务（默认：true）
+            OCR_JOBS_DIR: 任务数据库和文件副本目录（默认：ocr_jobs）
+            OCR_JOB_WORKERS: 同时运行的任务数（默认：2）
+            OCR_JOB_MAX_ATTEMPTS: 每个任务最多运行的次数（默认：3）
+        """
+        if not env_bool("OCR_JOBS", True):
+            return None
+        directory = env_str("OCR_JOBS_DIR", "ocr_jobs") or "ocr_jobs"
+        store = JobStore(os.path.join(directory, "jobs.sqlite3"))
+        return cls(
+            client, store,
+            workers=env_int("OCR_JOB_WORKERS", 2),
+            max_attempts=env_int("OCR_JOB_MAX_ATTEMPTS", 3),
+            **kwargs,
+        )
+
+    def submit(self, file_path: str, file_name: Optional[str] = None) -> str:
+        """
+        提交文件，返回任务 ID
+        Submit a file and return its job ID
+
+        文件会被复制到任务目录，Gradio 清理临时文件或进程重启后仍可继续。
+        The file is copied into the job directory so the job survives Gradio
+        temp-file cleanup and restarts.
+
+        Args:
+            file_path: 文件路径 | File path
+            file_name: 显示名称，默认为文件名 | Display name, defaults to the file name
+
+        Returns:
+            str: 任务 ID | Job ID
+        """
+        job_id = uuid.uuid4().hex
+        extension = os.path.splitext(file_path)[1]
+        stored = os.path.join(self.files_dir, f"{job_id}{extension}")
+        shutil.copyfile(file_path, stored)
+        self.store.create(
+            job_id, file_name or os.path.basename(file_path), stored, file_kind(file_path)
+        )
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def resume(self) -> List[str]:
+        """
+        重新排队上次未完成或失败的任务（启动时调用），只识别尚未保存的页面
+        Re-queue jobs left unfinished by a previous process or failed (call at
+        startup); only pages not stored yet are recognized
+
+        排队中的任务总会恢复；运行中（进程中断）和失败的任务只在运行次数
+        未达到 max_attempts 时恢复，达到上限的中断任务标记为失败。
+        Queued jobs always resume; running (interrupted) and failed jobs only
+        while they have run fewer than max_attempts times, and interrupted
+        jobs at the cap are marked failed.
+
+        Returns:
+            List[str]: 恢复的任务 ID | Resumed job IDs
+        """
+        job_ids = []
+        for job_id in self.store.unfinished(include_failed=True):
+            job = self.store.get(job_id)
+            if job["status"] != JOB_QUEUED and job["attempts"] >= self.max_attempts:
+                if job["status"] == JOB_RUNNING:
+                    self.store.update(
+                        job_id,
+                        status=JOB_FAILED,
+                        error=f"任务已中断 {job['attempts']} 次，不再恢复 | "
+                              f"Interrupted {job['attempts']} time(s), not resumed again",
+                    )
+                continue
+            self.store.update(job_id, status=JOB_QUEUED)
+            self._executor.submit(self._run, job_id)
+            job_ids.append(job_id)
+        if job_ids:
+            logger.info("恢复后台任务 | Resuming %d background job(s)", len(job_ids))
+        return job_ids
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        取消任务（运行中的任务在当前页完成后停止）
+        Cancel a job (a running job stops after its current page)
+
+        Returns:
+            bool: 任务是否存在且尚未结束 | Whether the job exists and had not finished
+        """
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATES:
+            return False
+        with self._lock:
+            self._cancelled.add(job_id)
+        if job["status"] == JOB_QUEUED:
+            self.store.update(job_id, status=JOB_CANCELLED)
+        return True
+
+    def _is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancelled
+
+    def _client_for(self, job_id: str) -> Any:
+        """任务使用的客户端（启用调度时按任务轮转）| Client for a job (rotated per job when scheduling)"""
+        if self.scheduler is None:
+            return self.client
+        return ScheduledClient(self.client, self.scheduler, f"job-{job_id}")
+
+    def _run(self, job_id: str) -> None:
+        """执行一个任务 | Run one job"""
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATES or self._is_cancelled(job_id):
+            return
+
+        attempts = self.store.start(job_id)
+        stats: Dict[str, Any] = {}
+        monitor = MemoryMonitor()
+        try:
+            with monitor:
+                finished = self._process(job, stats)
+        except Exception as e:
+            logger.warning("后台任务失败 | Background job %s failed: %s", job_id, e)
+            self.store.update(job_id, status=JOB_FAILED, error=str(e), stats=monitor.to_dict())
+            return
+        # 同一进程中的任务共享内存，峰值为整个进程的常驻内存
+        # Jobs share the process, so the peak is the whole process's resident memory
+        stats.update(monitor.to_dict())
+        self.store.update(job_id, stats=stats)
+        logger.info(
+            "后台任务完成 | Background job %s finished, peak RSS %s MB", job_id, monitor.peak_mb
+        )
+
+        if not finished:
+            self.store.update(job_id, status=JOB_CANCELLED)
+            return
+        failed = stats.get("failed_pages", 0)
+        if failed:
+            # 失败的页面未保存，保留文件副本，恢复任务时重新识别
+            # Failed pages were not stored; keep the file copy so they are re-run on resume
+            if attempts < self.max_attempts:
+                error = (
+                    f"{failed} 页识别失败，恢复任务时重新识别 | "
+                    f"{failed} page(s) failed OCR and are re-run when the job resumes"
+                )
+            else:
+                error = (
+                    f"{failed} 页识别失败（已运行 {attempts} 次，不再恢复）| "
+                    f"{failed} page(s) failed OCR ({attempts} attempts, not resumed again)"
+                )
+            self.store.update(job_id, status=JOB_FAILED, error=error)
+            return
+        self.store.update(job_id, status=JOB_DONE, clear_error=True)
+        # 结果已全部写入数据库，删除文件副本 | Every page is stored, drop the file copy
+        try:
+            os.remove(job["file_path"])
+        except OSError:
+            pass
+
+    def _process(self, job: Dict[str, Any], stats: Dict[str, Any]) -> bool:
+        """
+        处理任务中尚未完成的页面
+        Process the job's unfinished pages
+
+        OCR 失败的页面不保存，计入 stats["failed_pages"]；Word 文档和图片识别
+        失败时抛出异常。
+        Pages that failed OCR are not stored and are counted in
+        stats["failed_pages"]; Word documents and images raise on failure.
+
+        Args:
+            job: 任务信息 | Job record
+            stats: 写入任务统计的字典（PDF 页面路由计数、失败页数）| Dict filled with job stats (PDF page routes, failed pages)
+
+        Returns:
+            bool: 是否处理了所有页面（False 表示被取消）| Whether every page was processed (False if cancelled)
+        """
+        job_id = job["id"]
+        path = job["file_path"]
+        done = set(self.store.pages(job_id))
+
+        if job["kind"] == KIND_PDF:
+            client = self._client_for(job_id)
+            routes: Counter = Counter()
+            failed = 0
+            pages = iter_pdf_page_texts(path, client, skip_pages=done, routes=routes)
+            try:
+                for i, total, text in pages:
+                    if i == 0:
+                        self.store.update(job_id, total_pages=total)
+                    if isinstance(text, PageError):
+                        failed += 1
+                    elif text is not None:
+                        self.store.save_page(job_id, i, text)
+                    if self._is_cancelled(job_id):
+                        return False
+            finally:
+                pages.close()
+                for (route, _), count in routes.items():
+                    stats[f"{route}_pages"] = stats.get(f"{route}_pages", 0) + count
+                stats["failed_pages"] = failed
+            return True
+
+        self.store.update(job_id, total_pages=1)
+        if 0 in done:
+            return True
+        if job["kind"] == KIND_DOCX:
+            if self.text_extractor is None:
+                raise ValueError("未配置 Word 文本提取 | No Word text extractor configured")
+            text = self.text_extractor(path, self._client_for(job_id))
+        else:
+            text = self._client_for(job_id).recognize(path)
+        self.store.save_page(job_id, 0, text)
+        return True
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取任务进度
+        Get a job's progress
+
+        Returns:
+            Optional[dict]: 状态、已完成页数、总页数和进度（0-1），任务不存在时为 None
+                            Status, finished and total pages and progress (0-1), None if unknown
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        total = job["total_pages"]
+        job["progress"] = round(job["done_pages"] / total, 4) if total else 0.0
+        job.pop("file_path", None)
+        return job
+
+    def pages(self, job_id: str) -> List[Optional[str]]:
+        """
+        按页码顺序返回结果，未完成的页面为 None
+        Results in page order, None for unfinished pages
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            return []
+        stored = self.store.pages(job_id)
+        total = job["total_pages"] or (max(stored) + 1 if stored else 0)
+        return [stored.get(i) for i in range(total)]
+
+    def watch(self, job_id: str, interval: float = 1.0) -> Iterator[Dict[str, Any]]:
+        """
+        轮询任务进度，状态变化时产出，任务结束后停止
+        Poll a job, yielding whenever its progress changes until it finishes
+
+        Args:
+            job_id: 任务 ID | Job ID
+            interval: 轮询间隔（秒）| Poll interval (seconds)
+
+        Yields:
+            dict: 任务进度，同 status() | Job progress, as status()
+        """
+        last = None
+        while True:
+            status = self.status(job_id)
+            if status is None:
+                return
+            marker = (status["status"], status["done_pages"], status["total_pages"])
+            if marker != last:
+                last = marker
+                yield status
+            if status["status"] in FINISHED_STATES:
+                return
+            time.sleep(interval)
+
+    def close(self) -> None:
+        """停止接受任务并关闭存储 | Stop accepting jobs and close the store"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.store.close()
@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+PDF 处理器
+PDF Handler
+
+逐页提取 PDF 文本并评估文本层质量，空白、乱码或稀疏的文本层页面
+栅格化后交给 OCR 识别；空白页直接跳过，近似重复页复用之前的结果。
+流水线模式将三个阶段重叠执行：
+Extracts PDF text page by page and scores each text layer; pages whose
+layer is empty, garbled or sparse are rasterized and sent to OCR, except
+blank pages, which are skipped, and near-duplicates, which reuse an
+earlier result. The pipelined mode overlaps three stages:
+
+1. 文本层提取（独立线程）| Text-layer extraction (dedicated thread)
+2. 页面栅格化（共享进程池）| Page rasterization (shared process pool)
+3. OCR 请求（有界并发）| OCR requests (bounded concurrency)
+
+结果始终按页码顺序产出。
+Results are always yielded in page order.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import logging  # 日志
+import multiprocessing  # 进程启动方式
+import os  # 操作系统接口
+import queue  # 线程安全队列
+import threading  # 线程
+from collections import Counter  # 路由计数
+from io import BytesIO  # 内存字节流
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace  # 配置副本
+from typing import TYPE_CHECKING, AbstractSet, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.utils.env import env_bool, env_int
+from src.utils.image_preprocess import ImagePreprocessor, PreprocessConfig, PreprocessResult
+from src.utils.memory import MemoryBudget, estimate_page_bytes
+from src.utils.metrics import PDF_PAGE_ROUTES_TOTAL, PDF_PAGES_TOTAL, submit_queued
+from src.utils.page_filter import (
+    REASON_BLANK,
+    REASON_DUPLICATE,
+    ROUTE_REUSED,
+    ROUTE_SKIPPED,
+    DuplicateIndex,
+    PageFilterConfig,
+    PageSignature,
+    page_signature,
+)
+from src.utils.pdf_raster import PdfRasterizer, RasterConfig
+from src.utils.text_layer import (
+    ROUTE_OCR,
+    ROUTE_TEXT,
+    TextLayerConfig,
+    format_route_counts,
+    route_page,
+)
+from src.utils.text_utils import clean_pdf_text
+
+if TYPE_CHECKING:
+    from ollama_client import OllamaOCR
+
+logger = logging.getLogger(__name__)
+
+# 无法提取文本时的占位符
+# Placeholder used when a page yields no text
+NO_TEXT_PLACEHOLDER = (
+    "[未提取到文本 - 可能是图片型 PDF | No text extracted - may be image-only PDF]"
+)
+
+# 跳过的空白页的占位符 | Placeholder for skipped blank pages
+BLANK_PAGE_PLACEHOLDER = "[空白页 | Blank page]"
+
+
+class PageError(str):
+    """
+    OCR 失败的页面：文本为显示用的错误占位符，类型标记该页失败
+    A page that failed OCR: the text is the error placeholder shown to the
+    user, the type marks the page as failed
+
+    后台任务和命令行据此区分失败的页面，不把占位符当作已完成的结果保存。
+    Background jobs and the CLI use it to tell failed pages apart, so the
+    placeholder is never stored as a finished result.
+
+    Example:
+        >>> for i, total, text in iter_pdf_page_texts("scan.pdf", client):
+        ...     if isinstance(text, PageError):
+        ...         failed.append(i)
+    """
+
+    __slots__ = ()
+
+
+# 共享的栅格化进程池，按进程数区分 | Shared rasterization pools, keyed by process count
+_RASTER_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_RASTER_POOLS_LOCK = threading.Lock()
+
+
+def _raster_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    获取长期存在的栅格化进程池，首次使用时创建
+    Get the long-lived rasterization pool, created on first use
+
+    所有文档共用进程池，不为每个 PDF 启动新进程。Web 服务是多线程的，
+    fork 会复制其他线程持有的锁，因此工作进程用 forkserver（不可用时用 spawn）启动。
+    Every document shares the pool instead of starting processes per PDF.
+    The web server is multi-threaded and fork would copy locks held by other
+    threads, so workers start through forkserver (spawn where unavailable).
+    """
+    with _RASTER_POOLS_LOCK:
+        pool = _RASTER_POOLS.get(workers)
+        if pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method)
+            )
+            _RASTER_POOLS[workers] = pool
+        return pool
+
+
+def _discard_raster_pool(pool: ProcessPoolExecutor) -> None:
+    """丢弃损坏的进程池，下次使用时重新创建 | Drop a broken pool so the next use creates a new one"""
+    with _RASTER_POOLS_LOCK:
+        for workers, current in list(_RASTER_POOLS.items()):
+            if current is pool:
+                del _RASTER_POOLS[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _ocr_error(error: BaseException) -> PageError:
+    """OCR 失败时的页面占位符（计入失败页数）| Page placeholder for OCR failures (counted as a failed page)"""
+    PDF_PAGES_TOTAL.inc(source="error")
+    return PageError(f"[OCR 错误 | OCR Error: {str(error)}]")
+
+
+def _text_layer_page(text: str) -> str:
+    """清理文本层页面（计入文本层页数）| Clean a text-layer page (counted as a text page)"""
+    PDF_PAGES_TOTAL.inc(source="text")
+    return clean_pdf_text(text)
+
+
+def _encode_png(image) -> bytes:
+    """
+    在内存中将页面图片编码为 PNG
+    Encode a page image to PNG in memory
+    """
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _render_run(
+    pdf_path: str,
+    config: RasterConfig,
+    first_page: int,
+    last_page: int,
+    preprocess_config: Optional[PreprocessConfig] = None,
+    filter_config: Optional[PageFilterConfig] = None
+) -> List[Tuple[Union[bytes, PreprocessResult], Optional[PageSignature]]]:
+    """
+    用一次 poppler 调用渲染连续页面并编码（在进程池中运行）
+    Render a contiguous page run in one poppler call and encode each page
+    (runs in the process pool)
+
+    编码在工作进程中完成，结果通过进程间管道返回，不写入磁盘。
+    启用预处理时直接输出缩小后的图片，否则输出 PNG 字节。
+    Encoding happens in the worker process and the bytes come back over the
+    process pipe, never touching disk. With pre-processing enabled the
+    downscaled image is produced directly, otherwise PNG bytes. The blank and
+    duplicate page features are computed here too, from the full-size page.
+
+    Args:
+        pdf_path: PDF 文件路径 | Path to PDF file
+        config: 栅格化配置 | Rasterization configuration
+        first_page: 起始页（从 1 开始）| First page (1-based)
+        last_page: 结束页（包含）| Last page (inclusive)
+        preprocess_config: 预处理配置，None 表示不预处理
+                           Pre-processing settings, None to skip
+        filter_config: 空白页与重复页过滤配置，None 表示不过滤
+                       Blank and duplicate page filter settings, None to skip
+
+    Returns:
+        List[Tuple[Union[bytes, PreprocessResult], Optional[PageSignature]]]:
+            每页的编码结果和页面特征 | Encoded result and page features per page
+    """
+    rasterizer = PdfRasterizer(pdf_path, config)
+    preprocessor = ImagePreprocessor(preprocess_config) if preprocess_config else None
+    return [
+        (
+            preprocessor.process(image) if preprocessor is not None else _encode_png(image),
+            page_signature(image, filter_config) if filter_config is not None else None,
+        )
+        for _, image in rasterizer.iter_pages(range(first_page, last_page + 1))
+    ]
+
+
+def _ocr_page_image(client: "OllamaOCR", image) -> str:
+    """
+    识别内存中的页面图片（PIL 图片、PNG 字节或预处理结果）
+    Recognize an in-memory page image (PIL image, PNG bytes or pre-processing result)
+    """
+    if image is None:
+        return ""
+    text = clean_pdf_text(client.recognize(image))
+    PDF_PAGES_TOTAL.inc(source="ocr")
+    return text
+
+
+def _route(
+    page,
+    text: Optional[str],
+    config: TextLayerConfig,
+    routes: "Counter[Tuple[str, str]]"
+) -> Optional[str]:
+    """
+    评估文本层并记录路由结果；使用文本层时返回 None，否则返回 OCR 的原因
+    Score the text layer and record the routing decision; returns None when
+    the text layer is used, otherwise the reason for OCR
+    """
+    score = route_page(page, text, config)
+    routes[(score.route, score.reason)] += 1
+    PDF_PAGE_ROUTES_TOTAL.inc(route=score.route, reason=score.reason)
+    return None if score.route == ROUTE_TEXT else score.reason
+
+
+class _PageFilter:
+    """
+    一个文档的空白页与重复页过滤（线程安全）
+    Blank and duplicate page filter for one document (thread-safe)
+
+    重复页登记的是页面的 Future，流水线中较早的页面仍在识别时，重复页等待
+    其结果。过滤掉的页面在文档结束时从 OCR 路由移到 skipped / reused。
+    Duplicates are registered by their page Future, so in the pipeline a
+    duplicate waits for an earlier page still being recognized. Filtered
+    pages move from the OCR route to skipped / reused when the document ends.
+    """
+
+    def __init__(self, config: PageFilterConfig):
+        self.config = config
+        self.index: DuplicateIndex[Future] = DuplicateIndex(config)
+        # (OCR 原因, 过滤后的路由, 过滤原因) | (OCR reason, filtered route, filter reason)
+        self.outcomes: List[Tuple[str, str, str]] = []
+
+    def check(self, signature: Optional[PageSignature], reason: str, page_future: Future) -> bool:
+        """
+        过滤一页：空白页或重复页时设置 page_future 的结果并返回 True
+        Filter one page: for a blank or duplicate page, set page_future's
+        result and return True
+
+        Args:
+            signature: 页面特征 | Page features
+            reason: 该页路由到 OCR 的原因 | Why the page was routed to OCR
+            page_future: 该页结果的 Future | Future of the page result
+        """
+        if signature is None:
+            return False
+        if signature.blank:
+            PDF_PAGES_TOTAL.inc(source="blank")
+            self.outcomes.append((reason, ROUTE_SKIPPED, REASON_BLANK))
+            page_future.set_result(BLANK_PAGE_PLACEHOLDER)
+            return True
+        earlier = self.index.find(signature)
+        if earlier is not None:
+            PDF_PAGES_TOTAL.inc(source="duplicate")
+            self.outcomes.append((reason, ROUTE_REUSED, REASON_DUPLICATE))
+            earlier.add_done_callback(lambda done: page_future.set_result(done.result()))
+            return True
+        self.index.add(signature, page_future)
+        return False
+
+    def apply(self, routes: "Counter[Tuple[str, str]]") -> None:
+        """将过滤掉的页面从 OCR 路由移到各自的路由 | Move filtered pages from the OCR route to their own"""
+        for reason, route, filter_reason in self.outcomes:
+            routes[(ROUTE_OCR, reason)] -= 1
+            routes[(route, filter_reason)] += 1
+        self.outcomes.clear()
+
+
+def _iter_sequential(
+    reader,
+    pdf_path: str,
+    client: "OllamaOCR",
+    raster_config: RasterConfig,
+    text_config: TextLayerConfig,
+    routes: "Counter[Tuple[str, str]]",
+    page_filter: _PageFilter,
+    skip_pages: AbstractSet[int] = frozenset()
+) -> Iterator[Optional[str]]:
+    """
+    顺序处理：先提取并评估文本层，再惰性栅格化并识别需要 OCR 的页面
+    Sequential processing: extract and score text layers, then lazily
+    rasterize and OCR the pages routed to OCR
+    """
+    texts = [
+        None if i in skip_pages else page.extract_text()
+        for i, page in enumerate(reader.pages)
+    ]
+    ocr_reasons = [
+        None if i in skip_pages else _route(page, texts[i], text_config, routes)
+        for i, page in enumerate(reader.pages)
+    ]
+
+    # 所有需要 OCR 的页面共用一个栅格化器，按连续区间渲染
+    # One rasterizer renders every page that needs OCR, run by run
+    needed = [i + 1 for i, reason in enumerate(ocr_reasons) if reason is not None]
+    pages = PdfRasterizer(pdf_path, raster_config).iter_pages(needed)
+    raster_error: Optional[BaseException] = None
+    # 已取出但属于后面页面的图片（poppler 返回的图片少于区间页数时）
+    # An image pulled ahead for a later page (when poppler returns fewer images than the run has pages)
+    pulled: Optional[Tuple[int, object]] = None
+
+    for i, text in enumerate(texts):
+        if i in skip_pages:
+            yield None
+            continue
+        if ocr_reasons[i] is None:
+            yield _text_layer_page(text or "")
+            continue
+
+        # 文本层不可用时，使用 OCR 识别页面图片
+        # If the text layer is not usable, use OCR to recognize the page image
+        if raster_error is not None:
+            yield _ocr_error(raster_error)
+            continue
+        try:
+            if pulled is None:
+                pulled = next(pages, None)
+        except Exception as render_err:
+            # 栅格化失败后生成器已终止，剩余页面报告同一错误
+            # The generator is finished after a render failure
+            raster_error = render_err
+            yield _ocr_error(render_err)
+            continue
+
+        if pulled is None or pulled[0] != i + 1:
+            # 该页没有渲染结果；取出的图片留给它自己的页面
+            # No image was rendered for this page; the pulled image is kept for its own page
+            yield ""
+            continue
+        image = pulled[1]
+        pulled = None
+
+        # 空白页跳过，重复页复用之前的结果 | Blank pages are skipped, duplicates reuse an earlier result
+        page_future: Future = Future()
+        signature = page_signature(image, page_filter.config)
+        if page_filter.check(signature, ocr_reasons[i], page_future):
+            yield page_future.result()
+            continue
+
+        try:
+            text = _ocr_page_image(client, image)
+        except Exception as ocr_err:
+            text = _ocr_error(ocr_err)
+        page_future.set_result(text)
+        yield text
+
+
+def _iter_pipelined(
+    reader,
+    pdf_path: str,
+    client: "OllamaOCR",
+    raster_config: RasterConfig,
+    ocr_workers: int,
+    raster_workers: int,
+    text_config: TextLayerConfig,
+    routes: "Counter[Tuple[str, str]]",
+    page_filter: _PageFilter,
+    skip_pages: AbstractSet[int] = frozenset(),
+    max_in_flight: Optional[int] = None
+) -> Iterator[Optional[str]]:
+    """
+    流水线处理：文本提取、栅格化和 OCR 三个阶段重叠执行
+    Pipelined processing: text extraction, rasterization and OCR overlap
+
+    每页对应一个 Future，按页码顺序放入队列，消费者按顺序等待。
+    连续的图片页合并为一个栅格化任务提交到进程池。
+    Each page gets a Future queued in page order and the consumer waits on
+    them in order. Consecutive image-only pages are batched into a single
+    rasterization task on the process pool; blank and duplicate pages are
+    filtered out as their run comes back, before any OCR request.
+    """
+    total = len(reader.pages)
+    slots: "queue.Queue[Future]" = queue.Queue()
+    stop = threading.Event()
+
+    # 限制已栅格化但尚未识别的页面数量，避免占满内存
+    # （许可数不能小于区间大小，否则未提交的区间会一直等待）
+    # Bound pages rasterized but not yet recognized (never fewer permits
+    # than the run size, or an unsubmitted run would wait forever)
+    chunk_size = raster_config.chunk_size or total
+    backlog = threading.Semaphore(max(max_in_flight or ocr_workers * 2, chunk_size))
+
+    # 工作进程中按客户端的设置完成预处理 | Workers pre-process with the client's settings
+    preprocessor = getattr(client, "preprocessor", None)
+    preprocess_config = preprocessor.config if preprocessor is not None else None
+    filter_config = page_filter.config if page_filter.config.enabled else None
+
+    raster_pool = _raster_pool(raster_workers)
+    # 本文档提交的栅格化任务，退出时取消未开始的任务 | This document's render tasks, cancelled on exit if not started
+    raster_futures: List[Future] = []
+    ocr_pool = ThreadPoolExecutor(max_workers=ocr_workers)
+
+    def _start_ocr(raster_future: Future, run: List[Tuple[int, Future, str]]) -> None:
+        # 区间栅格化完成后立即为每页提交 OCR 请求
+        # Submit OCR for every page as soon as its run is rendered
+        try:
+            if raster_future.cancelled():
+                raise RuntimeError("栅格化已取消 | Rasterization cancelled")
+            images = raster_future.result()
+        except Exception as e:
+            for _, page_future, _ in run:
+                page_future.set_result(_ocr_error(e))
+                backlog.release()
+            return
+
+        for offset, (_, page_future, reason) in enumerate(run):
+            image, signature = images[offset] if offset < len(images) else (None, None)
+            if page_filter.check(signature, reason, page_future):
+                backlog.release()
+                continue
+
+            def _recognize(image=image, page_future=page_future) -> None:
+                try:
+                    page_future.set_result(_ocr_page_image(client, image))
+                except Exception as e:
+                    page_future.set_result(_ocr_error(e))
+                finally:
+                    backlog.release()
+
+            try:
+                submit_queued(ocr_pool, _recognize)
+            except RuntimeError as e:
+                # 线程池已关闭（消费者提前退出）
+                # Pool already shut down (consumer exited early)
+                page_future.set_result(_ocr_error(e))
+                backlog.release()
+
+    def _flush(run: List[Tuple[int, Future, str]]) -> None:
+        if not run:
+            return
+        first, last = run[0][0], run[-1][0]
+        try:
+            raster_future = raster_pool.submit(
+                _render_run, pdf_path, raster_config, first, last, preprocess_config, filter_config
+            )
+        except BrokenProcessPool:
+            _discard_raster_pool(raster_pool)
+            raise
+        raster_futures.append(raster_future)
+        raster_future.add_done_callback(lambda done, run=list(run): _start_ocr(done, run))
+        run.clear()
+
+    def _extract() -> None:
+        run: List[Tuple[int, Future, str]] = []
+        try:
+            for i, page in enumerate(reader.pages):
+                if stop.is_set():
+                    return
+                page_future: Future = Future()
+                if i in skip_pages:
+                    # 跳过的页面打断连续区间 | A skipped page ends the current run
+                    _flush(run)
+                    page_future.set_result(None)
+                    slots.put(page_future)
+                    continue
+                try:
+                    text = page.extract_text()
+                except Exception as e:
+                    page_future.set_exception(e)
+                    slots.put(page_future)
+                    return
+
+                reason = _route(page, text, text_config, routes)
+                if reason is None:
+                    _flush(run)
+                    page_future.set_result(_text_layer_page(text or ""))
+                else:
+                    backlog.acquire()
+                    if stop.is_set():
+                        backlog.release()
+                        return
+                    run.append((i + 1, page_future, reason))
+                    if len(run) >= chunk_size:
+                        _flush(run)
+                slots.put(page_future)
+            _flush(run)
+        except RuntimeError as e:
+            # 进程池已损坏或解释器正在退出
+            # Process pool broken or the interpreter is shutting down
+            for _, page_future, _ in run:
+                page_future.set_result(_ocr_error(e))
+
+    extractor = threading.Thread(target=_extract, name="pdf-text-extract", daemon=True)
+    extractor.start()
+
+    try:
+        for _ in range(total):
+            yield slots.get().result()
+    finally:
+        stop.set()
+        for raster_future in raster_futures:
+            raster_future.cancel()
+        ocr_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pdf_page_texts(
+    pdf_path: str,
+    client: "OllamaOCR",
+    pipelined: Optional[bool] = None,
+    raster_config: Optional[RasterConfig] = None,
+    ocr_workers: Optional[int] = None,
+    raster_workers: Optional[int] = None,
+    skip_pages: Optional[AbstractSet[int]] = None,
+    text_config: Optional[TextLayerConfig] = None,
+    routes: Optional["Counter[Tuple[str, str]]"] = None,
+    memory_budget: Optional[MemoryBudget] = None,
+    filter_config: Optional[PageFilterConfig] = None
+) -> Iterator[Tuple[int, int, Optional[str]]]:
+    """
+    按页码顺序产出每页的文本
+    Yield every page's text in page order
+
+    Args:
+        pdf_path: PDF 文件路径 | Path to PDF file
+        client: OCR 客户端 | OCR client
+        pipelined: 是否启用流水线模式，默认读取 PDF_PIPELINE
+                   Enable the pipelined mode, defaults to PDF_PIPELINE
+        raster_config: 栅格化配置，默认从环境变量读取
+                       Rasterization settings, read from the environment if not provided
+        ocr_workers: OCR 并发数，默认使用客户端的 max_workers
+                     OCR concurrency, defaults to the client's max_workers
+        raster_workers: 栅格化进程数，默认读取 PDF_RASTER_WORKERS
+                        Rasterization processes, defaults to PDF_RASTER_WORKERS
+        skip_pages: 跳过的页码索引（从 0 开始，例如已完成的页面），这些页面产出 None
+                    Page indexes to skip (0-based, e.g. already finished pages); they yield None
+        text_config: 文本层路由配置，默认从环境变量读取
+                     Text-layer routing settings, read from the environment if not provided
+        routes: 可选的计数器，按 (route, reason) 累加每页的路由结果；跳过的空白页和复用的
+                重复页在文档结束时计入 skipped / reused
+                Optional counter that accumulates each page's (route, reason); skipped
+                blank pages and reused duplicates are counted as skipped / reused when
+                the document ends
+        memory_budget: 内存预算，启用时按预算限制同时在内存中的页面数，默认从环境变量读取
+                       Memory budget; when enabled it caps the pages held in memory at once.
+                       Read from the environment if not provided
+        filter_config: 空白页与重复页过滤配置，默认从环境变量读取
+                       Blank and duplicate page filter settings, read from the environment if not provided
+
+    Yields:
+        Tuple[int, int, Optional[str]]: (页码索引, 总页数, 文本)，OCR 失败的页面为 PageError
+                                        (page index, total pages, text), a PageError for pages that failed OCR
+
+    Environment Variables:
+        PDF_PIPELINE: 启用流水线模式（默认：true）
+        PDF_RASTER_WORKERS: 栅格化进程数（默认：min(4, CPU 核数)）
+        PDF_RASTER_*: 分辨率、格式和区间大小，参见 RasterConfig.from_env
+                      DPI, format and run size, see RasterConfig.from_env
+        PDF_TEXT_*: 文本层路由模式和阈值，参见 TextLayerConfig.from_env
+                    Text-layer routing mode and thresholds, see TextLayerConfig.from_env
+        OCR_STREAMING / OCR_MEMORY_BUDGET_MB: 流式模式和内存预算，参见 MemoryBudget.from_env
+                                              Streaming mode and memory budget, see MemoryBudget.from_env
+        PDF_SKIP_BLANK / PDF_DEDUPE_PAGES / PDF_*: 空白页与重复页过滤，参见 PageFilterConfig.from_env
+                                                  Blank and duplicate page filter, see PageFilterConfig.from_env
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    total = len(reader.pages)
+    skip_pages = frozenset(skip_pages or ())
+
+    if pipelined is None:
+        pipelined = env_bool("PDF_PIPELINE", True)
+    raster_config = raster_config or RasterConfig.from_env()
+    text_config = text_config or TextLayerConfig.from_env()
+    routes = routes if routes is not None else Counter()
+    memory_budget = memory_budget or MemoryBudget.from_env()
+    page_filter = _PageFilter(filter_config or PageFilterConfig.from_env())
+
+    ocr_workers = max(1, ocr_workers or getattr(client, "max_workers", 1))
+    max_in_flight = None
+    if memory_budget.enabled:
+        # 流式模式：按预算限制渲染、编码和发送中的页面数，每页识别后立即释放
+        # Streaming mode: the budget caps the pages being rendered, encoded
+        # and sent; each page is released as soon as it is recognized
+        max_in_flight = memory_budget.pages_in_flight(
+            estimate_page_bytes(raster_config.dpi), ocr_workers * 2
+        )
+        ocr_workers = min(ocr_workers, max_in_flight)
+        raster_config = replace(
+            raster_config, chunk_size=min(raster_config.chunk_size or max_in_flight, max_in_flight)
+        )
+
+    if pipelined and total > 1:
+        raster_workers = max(
+            1, raster_workers or env_int("PDF_RASTER_WORKERS", min(4, os.cpu_count() or 1))
+        )
+        if max_in_flight is not None:
+            raster_workers = min(raster_workers, max_in_flight)
+        texts = _iter_pipelined(
+            reader, pdf_path, client, raster_config, ocr_workers, raster_workers,
+            text_config, routes, page_filter, skip_pages, max_in_flight
+        )
+    else:
+        texts = _iter_sequential(
+            reader, pdf_path, client, raster_config, text_config, routes, page_filter, skip_pages
+        )
+
+    try:
+        for i, text in enumerate(texts):
+            yield i, total, text
+    finally:
+        # 提前关闭时也计入已过滤的页面 | Filtered pages are counted even when closed early
+        page_filter.apply(routes)
+    logger.info("%s: %s", os.path.basename(pdf_path), format_route_counts(routes))
@@ -10,10 +10,20 @@ Define data structures and classes used in the project.
 
 包含 | Contains:
 - OCR 处理结果模型 | OCR processing result models
+- 文档与页面结果模型 | Document and page result models
 - 文件处理模型 | File processing models
 - 配置模型 | Configuration models
 
 =====================================================================
 """
 
-__all__ = []
+from .document_result import DocumentResult, FileResult, PageResult
+from .ocr_result import OCRResult, OCRTimings
+
+__all__ = [
+    "DocumentResult",
+    "FileResult",
+    "PageResult",
+    "OCRResult",
+    "OCRTimings",
+]
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+文档识别结果模型
+Document Result Model
+
+一次转换的结构化结果：每个文件的逐页文本、页数、状态和错误。
+Web UI 将其保存在服务器端的会话状态中，页面标记、合并或逐页视图和
+文件标题都只是对这一结构的渲染，切换视图不需要重新识别，也不需要
+重新拆分已合并的文本。
+The structured result of one conversion: per-page text, page count,
+status and error for every file. The web UI keeps it in server-side
+session state; page markers, the merged or per-page view and the file
+headers are all renders of this structure, so switching views neither
+re-runs OCR nor re-splits merged text.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+from dataclasses import dataclass, field  # 数据类
+from typing import Dict, List, Optional, Tuple
+
+# 文件类型 | File kinds
+KIND_IMAGE = "image"
+KIND_PDF = "pdf"
+KIND_DOCX = "docx"
+
+# 文件之间的分隔线 | Separator between files
+FILE_SEPARATOR = "\n\n---\n\n"
+
+
+def page_marker(number: int, total: int) -> str:
+    """合并视图中的页面标记 | Page marker of the merged view"""
+    return f"--- 第 {number}/{total} 页 | Page {number}/{total} ---"
+
+
+def page_heading(number: int, total: int) -> str:
+    """逐页视图中每页的标题 | Per-page heading of the separate view"""
+    return f"### 第 {number}/{total} 页 | Page {number}/{total}"
+
+
+@dataclass
+class PageResult:
+    """
+    一页的识别结果
+    Result of one page
+
+    Attributes:
+        number: 页码（从 1 开始）| Page number (1-based)
+        text: 页面文本 | Page text
+    """
+
+    number: int
+    text: str = ""
+
+
+@dataclass
+class FileResult:
+    """
+    一个文件的识别结果
+    Result of one file
+
+    图片和 Word 文档只有一页；PDF 每页一项，识别过程中逐页追加。PDF 的
+    渲染结果按视图缓存，流式更新时只渲染并追加新增的页面，不再重新拼接
+    所有页面；最后一页的文本变化时才重新渲染。
+    Images and Word documents have a single page; PDFs have one entry per
+    page, appended as recognition progresses. PDF renders are cached per
+    view, so a streaming update renders and appends only the new pages
+    instead of re-joining every page; the cache is rebuilt only when the
+    last page's text changes.
+
+    Attributes:
+        name: 文件名（用作标题）| File name (used as the header)
+        kind: 文件类型（image/pdf/docx）| File kind (image/pdf/docx)
+        pages: 已完成的页面 | Finished pages
+        total_pages: 总页数，未知时为 0 | Total pages, 0 when unknown
+        status: 状态行（例如后台任务进度）| Status line (e.g. background job progress)
+        error: 错误信息，保留已完成的页面 | Error message, finished pages are kept
+    """
+
+    name: str
+    kind: str = KIND_IMAGE
+    pages: List[PageResult] = field(default_factory=list)
+    total_pages: int = 0
+    status: str = ""
+    error: Optional[str] = None
+    # 视图 -> (已渲染的页数, 总页数, 最后一页的文本, 已渲染的文本)
+    # View -> (pages rendered, total pages, last page's text, rendered text)
+    _rendered: Dict[Tuple[bool, bool], Tuple[int, int, Optional[str], str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def add_page(self, text: str = "") -> PageResult:
+        """追加下一页 | Append the next page"""
+        page = PageResult(len(self.pages) + 1, text)
+        self.pages.append(page)
+        return page
+
+    @property
+    def text(self) -> str:
+        """不带标记的合并文本 | Merged text without markers"""
+        return "\n\n".join(page.text for page in self.pages)
+
+    def render(self, separate_pages: bool = False, page_markers: bool = True) -> str:
+        """
+        渲染文件内容（不含文件标题）
+        Render the file's content (without the file header)
+
+        Args:
+            separate_pages: PDF 每页带独立标题 | Give each PDF page its own heading
+            page_markers: 合并视图中显示页面标记 | Show page markers in the merged view
+
+        Returns:
+            str: Markdown 文本 | Markdown text
+        """
+        body = self.text.lstrip() if self.kind != KIND_PDF else self._pdf_body(separate_pages, page_markers)
+
+        if self.error:
+            body = f"{body.strip()}\n\n{self.error}" if body.strip() else self.error
+        if self.status:
+            body = f"{self.status}\n\n{body}" if body else self.status
+        return body
+
+    def _pdf_body(self, separate_pages: bool, page_markers: bool) -> str:
+        """
+        PDF 页面的渲染：缓存已渲染的文本，只追加新增的页面
+        Render the PDF pages: the rendered text is cached and only new pages
+        are appended to it
+        """
+        if not self.pages:
+            return ""
+        total = self.total_pages or len(self.pages)
+
+        def _render_page(page: PageResult) -> str:
+            if separate_pages:
+                return f"{page_heading(page.number, total)}\n\n{page.text}"
+            if page_markers:
+                return f"{page_marker(page.number, total)}\n\n{page.text}"
+            return page.text
+
+        key = (separate_pages, page_markers)
+        cached, cached_total, last_text, body = self._rendered.get(key, (0, total, None, ""))
+        # 总页数变化、页面被替换或最后一页仍在增长时重新渲染
+        # Re-render when the page count changed, pages were replaced or the last page kept growing
+        if (
+            cached_total != total
+            or cached > len(self.pages)
+            or (cached and self.pages[cached - 1].text is not last_text)
+        ):
+            cached, body = 0, ""
+        if cached < len(self.pages):
+            body += "".join(
+                ("\n\n" if i else "") + _render_page(self.pages[i])
+                for i in range(cached, len(self.pages))
+            )
+            self._rendered[key] = (len(self.pages), total, self.pages[-1].text, body)
+        return body
+
+
+@dataclass
+class DocumentResult:
+    """
+    一次转换（一个或多个文件）的结果
+    Result of one conversion (one or more files)
+
+    Example:
+        >>> result = DocumentResult([FileResult("scan.pdf", KIND_PDF)])
+        >>> result.files[0].add_page("第一页 | First page")
+        >>> print(result.render(page_markers=False))
+
+    Attributes:
+        files: 按上传顺序排列的文件结果 | File results in upload order
+        file_headers: 是否显示文件标题，None 表示多个文件时显示
+                      Show file headers, None shows them for more than one file
+    """
+
+    files: List[FileResult] = field(default_factory=list)
+    file_headers: Optional[bool] = None
+
+    def render(self, separate_pages: bool = False, page_markers: bool = True) -> str:
+        """
+        渲染所有文件，文件之间以分隔线分隔
+        Render every file, separated by a horizontal rule
+
+        Args:
+            separate_pages: PDF 每页带独立标题 | Give each PDF page its own heading
+            page_markers: 合并视图中显示页面标记 | Show page markers in the merged view
+
+        Returns:
+            str: Markdown 文本 | Markdown text
+        """
+        headers = len(self.files) > 1 if self.file_headers is None else self.file_headers
+        sections = []
+        for result in self.files:
+            body = result.render(separate_pages, page_markers)
+            sections.append(f"## {result.name}\n\n{body}" if headers else body)
+        return FILE_SEPARATOR.join(sections)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+OCR 结果模型
+OCR Result Model
+
+识别文本及其耗时分解：Ollama 响应中的模型加载、图片预填充和令牌生成
+时间，以及客户端的编码、上传和解析时间。
+Recognized text together with a breakdown of where the time went: model
+load, image prefill and token generation as reported by Ollama, plus the
+client-side encode, upload and parse times.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+from dataclasses import asdict, dataclass, field  # 数据类
+from typing import Any, Dict, Iterable, Optional
+
+
+def _ns_to_seconds(value: Any) -> Optional[float]:
+    """将 Ollama 返回的纳秒时长转换为秒 | Convert an Ollama nanosecond duration to seconds"""
+    return value / 1e9 if isinstance(value, (int, float)) else None
+
+
+@dataclass
+class OCRTimings:
+    """
+    单次识别的耗时分解（秒）
+    Timing breakdown of one recognition (seconds)
+
+    服务器端字段来自 Ollama 响应，缓存命中或服务器未返回时为 None。
+    Server-side fields come from the Ollama response and are None on cache
+    hits or when the server does not report them.
+
+    Attributes:
+        encode_seconds: 读取、查询缓存、预处理和 Base64 编码 | Load, cache lookup, pre-processing and Base64 encoding
+        request_seconds: 从发送请求到收到响应头（含重试）| From sending the request to the response headers (including retries)
+        parse_seconds: 读取并解析响应体 | Reading and decoding the response body
+        total_seconds: 客户端总耗时 | Total client-side time
+        payload_bytes: 发送的图片字节数 | Image bytes sent
+        server_total_seconds: Ollama total_duration
+        load_seconds: 模型加载（load_duration）| Model load (load_duration)
+        prompt_eval_seconds: 图片和提示词预填充（prompt_eval_duration）| Image and prompt prefill (prompt_eval_duration)
+        eval_seconds: 令牌生成（eval_duration）| Token generation (eval_duration)
+        prompt_eval_count: 预填充令牌数 | Prefill token count
+        eval_count: 生成令牌数 | Generated token count
+    """
+
+    encode_seconds: float = 0.0
+    request_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    total_seconds: float = 0.0
+    payload_bytes: int = 0
+    server_total_seconds: Optional[float] = None
+    load_seconds: Optional[float] = None
+    prompt_eval_seconds: Optional[float] = None
+    eval_seconds: Optional[float] = None
+    prompt_eval_count: Optional[int] = None
+    eval_count: Optional[int] = None
+
+    def apply_response(self, response: Dict[str, Any]) -> "OCRTimings":
+        """
+        读取 Ollama /api/generate 响应（或流的最后一块）中的计时字段
+        Read the timing fields of an Ollama /api/generate response (or the
+        final chunk of a stream)
+        """
+        self.server_total_seconds = _ns_to_seconds(response.get("total_duration"))
+        self.load_seconds = _ns_to_seconds(response.get("load_duration"))
+        self.prompt_eval_seconds = _ns_to_seconds(response.get("prompt_eval_duration"))
+        self.eval_seconds = _ns_to_seconds(response.get("eval_duration"))
+        self.prompt_eval_count = response.get("prompt_eval_count")
+        self.eval_count = response.get("eval_count")
+        return self
+
+    @classmethod
+    def combined(cls, parts: Iterable["OCRTimings"], total_seconds: float) -> "OCRTimings":
+        """
+        合并多个请求（例如分块识别的各个图块）的耗时，总耗时为实际经过的时间
+        Combine the timings of several requests (e.g. the tiles of a tiled
+        image); the total is the wall time actually elapsed
+        """
+        combined = cls(total_seconds=total_seconds)
+        for part in parts:
+            for name, value in asdict(part).items():
+                if name == "total_seconds" or value is None:
+                    continue
+                current = getattr(combined, name)
+                setattr(combined, name, value if current is None else current + value)
+        return combined
+
+    @property
+    def upload_seconds(self) -> Optional[float]:
+        """
+        上传和排队开销：请求耗时减去服务器处理时间（非流式请求的响应头在生成完成后才到达）
+        Upload and queueing overhead: request time minus server time (for
+        non-streaming requests the headers only arrive once generation is done)
+        """
+        if self.server_total_seconds is None:
+            return None
+        return max(0.0, self.request_seconds - self.server_total_seconds)
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """令牌生成速度 | Token generation rate"""
+        if not self.eval_count or not self.eval_seconds:
+            return None
+        return self.eval_count / self.eval_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典（包含派生字段，保留 3 位小数）
+        Convert to a dictionary (derived fields included, rounded to 3 places)
+        """
+        data = asdict(self)
+        data["upload_seconds"] = self.upload_seconds
+        data["tokens_per_second"] = self.tokens_per_second
+        return {
+            key: round(value, 3) if isinstance(value, float) else value
+            for key, value in data.items()
+        }
+
+
+@dataclass
+class OCRResult:
+    """
+    单张图片的识别结果
+    Recognition result for one image
+
+    Attributes:
+        text: Markdown 格式的识别文本 | Markdown formatted text
+        timings: 耗时分解 | Timing breakdown
+        cached: 是否来自缓存 | Whether the text came from the cache
+        host: 处理该请求的 Ollama 主机，缓存命中时为 None | Ollama host that served the request, None on cache hits
+        model: 模型名称 | Model name
+        tiles: 分块识别的图块数，整图识别为 1 | Tiles of a tiled recognition, 1 for a whole image
+
+    Example:
+        >>> result = client.recognize_detailed("page.png")
+        >>> print(result.timings.prompt_eval_seconds, result.timings.eval_seconds)
+    """
+
+    text: str
+    timings: OCRTimings = field(default_factory=OCRTimings)
+    cached: bool = False
+    host: Optional[str] = None
+    model: Optional[str] = None
+    tiles: int = 1
+
+    def __str__(self) -> str:
+        return self.text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典 | Convert to a dictionary"""
+        return {
+            "text": self.text,
+            "cached": self.cached,
+            "host": self.host,
+            "model": self.model,
+            "tiles": self.tiles,
+            "timings": self.timings.to_dict(),
+        }
@@ -13,8 +13,140 @@ Provide various utility functions used in the project.
 - 文本处理工具 | Text processing utilities
 - 图像处理工具 | Image processing utilities
 - 日期时间工具 | Date and time utilities
+- HTTP 连接池 | HTTP connection pool
+- 有界并发执行 | Bounded concurrent execution
+- PDF 栅格化 | PDF rasterization
+- OCR 结果缓存 | OCR result cache
+- 图片预处理 | Image pre-processing
+- 多主机负载均衡 | Multi-host load balancing
+- 重试与熔断 | Retries and circuit breaking
+- 模型预热与保活 | Model warm-up and keep-warm
+- 运行指标 | Runtime metrics
+- 按会话公平调度 | Per-session fair scheduling
+- PDF 文本层质量评估 | PDF text-layer quality
+- 内存预算与磁盘转存 | Memory budget and disk spill
+- 超大图片分块识别 | Tiled recognition of oversized images
+- 空白页与重复页过滤 | Blank and duplicate page filtering
+
+子模块在首次访问其导出名称时才导入，导入本包不会加载全部工具模块。
+Submodules are imported on first access to one of their names, so
+importing this package does not load every utility module.
 
 =====================================================================
 """
 
-__all__ = []
+# 标准库导入 | Standard Library Imports
+from importlib import import_module  # 延迟导入
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .backend_pool import BackendPool, parse_backends
+    from .concurrency import map_ordered
+    from .http_pool import PoolConfig, PooledSession
+    from .image_preprocess import ImagePreprocessor, PreprocessConfig, PreprocessResult
+    from .memory import MemoryBudget, MemoryMonitor, SpillBuffer
+    from .metrics import REGISTRY, MetricsRegistry, mount_metrics
+    from .ocr_cache import OCRCache
+    from .page_filter import DuplicateIndex, PageFilterConfig, PageSignature, page_signature
+    from .pdf_raster import PdfRasterizer, RasterConfig, group_page_runs
+    from .retry import CircuitBreaker, CircuitOpenError, Retrier, RetryPolicy
+    from .scheduler import AsyncScheduledClient, FairScheduler, ScheduledClient
+    from .text_layer import TextLayerConfig, TextLayerScore, route_page
+    from .text_utils import clean_pdf_text
+    from .tiling import ImageTiler, TilingConfig, stitch_tiles
+    from .warmup import KeepWarmConfig, KeepWarmPinger, parse_keep_alive
+
+# 导出名称 -> 所在子模块 | Exported name -> defining submodule
+_EXPORTS = {
+    "BackendPool": "backend_pool",
+    "parse_backends": "backend_pool",
+    "map_ordered": "concurrency",
+    "PoolConfig": "http_pool",
+    "PooledSession": "http_pool",
+    "ImagePreprocessor": "image_preprocess",
+    "PreprocessConfig": "image_preprocess",
+    "PreprocessResult": "image_preprocess",
+    "MemoryBudget": "memory",
+    "MemoryMonitor": "memory",
+    "SpillBuffer": "memory",
+    "REGISTRY": "metrics",
+    "MetricsRegistry": "metrics",
+    "mount_metrics": "metrics",
+    "OCRCache": "ocr_cache",
+    "DuplicateIndex": "page_filter",
+    "PageFilterConfig": "page_filter",
+    "PageSignature": "page_filter",
+    "page_signature": "page_filter",
+    "PdfRasterizer": "pdf_raster",
+    "RasterConfig": "pdf_raster",
+    "group_page_runs": "pdf_raster",
+    "CircuitBreaker": "retry",
+    "CircuitOpenError": "retry",
+    "Retrier": "retry",
+    "RetryPolicy": "retry",
+    "AsyncScheduledClient": "scheduler",
+    "FairScheduler": "scheduler",
+    "ScheduledClient": "scheduler",
+    "TextLayerConfig": "text_layer",
+    "TextLayerScore": "text_layer",
+    "route_page": "text_layer",
+    "clean_pdf_text": "text_utils",
+    "ImageTiler": "tiling",
+    "TilingConfig": "tiling",
+    "stitch_tiles": "tiling",
+    "KeepWarmConfig": "warmup",
+    "KeepWarmPinger": "warmup",
+    "parse_keep_alive": "warmup",
+}
+
+__all__ = [
+    "BackendPool",
+    "parse_backends",
+    "map_ordered",
+    "PoolConfig",
+    "PooledSession",
+    "ImagePreprocessor",
+    "PreprocessConfig",
+    "PreprocessResult",
+    "MemoryBudget",
+    "MemoryMonitor",
+    "SpillBuffer",
+    "REGISTRY",
+    "MetricsRegistry",
+    "mount_metrics",
+    "OCRCache",
+    "DuplicateIndex",
+    "PageFilterConfig",
+    "PageSignature",
+    "page_signature",
+    "PdfRasterizer",
+    "RasterConfig",
+    "group_page_runs",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "Retrier",
+    "RetryPolicy",
+    "AsyncScheduledClient",
+    "FairScheduler",
+    "ScheduledClient",
+    "TextLayerConfig",
+    "TextLayerScore",
+    "route_page",
+    "clean_pdf_text",
+    "ImageTiler",
+    "TilingConfig",
+    "stitch_tiles",
+    "KeepWarmConfig",
+    "KeepWarmPinger",
+    "parse_keep_alive",
+]
+
+
+def __getattr__(name: str):
+    """首次访问时导入所在的子模块（PEP 562）| Import the defining submodule on first access (PEP 562)"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
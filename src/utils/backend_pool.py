@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+Ollama 后端池
+Ollama Backend Pool
+
+在多个 Ollama 主机之间分配请求：按最少在途请求数或加权轮询选择主机，
+连续失败的主机被暂时剔除，后台健康检查恢复后重新加入，并记录每个
+主机的延迟和错误统计。只有一个主机时行为与直接连接相同。
+Spreads requests across several Ollama hosts: hosts are picked by least
+outstanding requests or weighted round-robin, hosts that keep failing are
+ejected for a while and re-admitted once a background health check
+passes, and per-host latency and error statistics are kept. With a single
+host the behaviour is the same as connecting to it directly.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import threading  # 线程锁和健康检查线程
+import time  # 计时
+from contextlib import contextmanager  # 上下文管理器
+from dataclasses import dataclass, field  # 数据类
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .env import env_float, env_int, env_str
+
+# 负载均衡策略 | Load-balancing strategies
+LEAST_OUTSTANDING = "least_outstanding"
+WEIGHTED = "weighted"
+STRATEGIES = (LEAST_OUTSTANDING, WEIGHTED)
+
+# 健康检查函数：主机 URL -> 是否可用
+# Health check: host URL -> whether it can serve requests
+HealthCheck = Callable[[str], bool]
+
+
+@dataclass
+class Backend:
+    """
+    单个 Ollama 主机及其统计信息
+    One Ollama host and its statistics
+
+    Attributes:
+        url: 主机基础 URL | Host base URL
+        weight: 路由权重 | Routing weight
+        outstanding: 在途请求数 | In-flight requests
+        requests: 已完成请求数 | Completed requests
+        errors: 失败请求数 | Failed requests
+        total_latency: 累计延迟（秒）| Cumulative latency (seconds)
+        max_latency: 最大延迟（秒）| Maximum latency (seconds)
+        consecutive_failures: 连续失败次数 | Consecutive failures
+        ejected_until: 剔除截止时间（monotonic），0 表示可用
+                       Ejection deadline (monotonic), 0 when available
+        ejections: 被剔除次数 | Number of ejections
+        last_error: 最近一次错误 | Most recent error
+    """
+
+    url: str
+    weight: int = 1
+    outstanding: int = 0
+    requests: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+    ejections: int = 0
+    last_error: Optional[str] = None
+    _current_weight: int = field(default=0, repr=False)
+
+    def is_available(self, now: float) -> bool:
+        """检查主机当前是否可接收请求 | Check whether the host may take requests"""
+        return self.ejected_until <= now
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        """
+        主机统计信息快照
+        Snapshot of the host statistics
+        """
+        return {
+            "url": self.url,
+            "weight": self.weight,
+            "available": self.is_available(now),
+            "ejected_for_seconds": round(max(0.0, self.ejected_until - now), 1),
+            "ejections": self.ejections,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "avg_latency_seconds": round(self.total_latency / self.requests, 4) if self.requests else 0.0,
+            "max_latency_seconds": round(self.max_latency, 4),
+            "last_error": self.last_error,
+        }
+
+
+def parse_backends(urls: str, weights: Optional[str] = None) -> List[Backend]:
+    """
+    解析逗号分隔的主机列表和权重
+    Parse a comma-separated host list and weights
+
+    Args:
+        urls: 逗号分隔的主机 URL | Comma-separated host URLs
+        weights: 逗号分隔的权重，缺省为 1 | Comma-separated weights, default 1
+
+    Returns:
+        List[Backend]: 主机列表 | Hosts
+
+    Raises:
+        ValueError: 如果权重无效 | If a weight is invalid
+
+    Example:
+        >>> [b.url for b in parse_backends("http://a:11434, http://b:11434/")]
+        ['http://a:11434', 'http://b:11434']
+    """
+    hosts = [url.strip().rstrip("/") for url in urls.split(",") if url.strip()]
+    values = [w.strip() for w in (weights or "").split(",") if w.strip()]
+
+    backends = []
+    for index, url in enumerate(hosts):
+        weight = 1
+        if index < len(values):
+            try:
+                weight = int(values[index])
+            except ValueError:
+                raise ValueError(f"无效的权重 | Invalid weight: {values[index]!r}") from None
+            if weight < 1:
+                raise ValueError(f"权重必须大于 0 | Weight must be positive: {weight}")
+        backends.append(Backend(url=url, weight=weight))
+    return backends
+
+
+class BackendPool:
+    """
+    Ollama 主机池（线程安全）
+    Pool of Ollama hosts (thread-safe)
+
+    Example:
+        >>> pool = BackendPool(parse_backends("http://a:11434,http://b:11434"))
+        >>> with pool.lease() as backend:
+        ...     post(f"{backend.url}/api/generate", ...)
+        >>> print(pool.stats())
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[Backend],
+        strategy: str = LEAST_OUTSTANDING,
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        health_interval: float = 15.0,
+        health_check: Optional[HealthCheck] = None
+    ):
+        """
+        初始化主机池
+        Initialize the backend pool
+
+        Args:
+            backends: 主机列表 | Hosts
+            strategy: least_outstanding 或 weighted | least_outstanding or weighted
+            eject_after: 连续失败多少次后剔除 | Consecutive failures before ejection
+            eject_seconds: 剔除时长（秒）| Ejection duration (seconds)
+            health_interval: 健康检查间隔（秒），0 表示不检查
+                             Health check interval (seconds), 0 disables it
+            health_check: 健康检查函数 | Health check function
+
+        Raises:
+            ValueError: 如果没有主机或策略未知 | If there are no hosts or the strategy is unknown
+        """
+        if not backends:
+            raise ValueError("至少需要一个 Ollama 主机 | At least one Ollama host is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"未知的负载均衡策略 | Unknown load-balancing strategy: {strategy!r} "
+                f"(可选 | choose from: {', '.join(STRATEGIES)})"
+            )
+
+        self.backends = list(backends)
+        self.strategy = strategy
+        self.eject_after = max(1, eject_after)
+        self.eject_seconds = max(0.0, eject_seconds)
+        self.health_interval = max(0.0, health_interval)
+        self.health_check = health_check
+
+        self._lock = threading.Lock()
+        self._rotation = 0
+        self._stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, default_url: str, health_check: Optional[HealthCheck] = None) -> "BackendPool":
+        """
+        从环境变量创建主机池
+        Build the pool from environment variables
+
+        Args:
+            default_url: 未设置 OLLAMA_BASE_URLS 时使用的主机 | Host used when OLLAMA_BASE_URLS is unset
+            health_check: 健康检查函数 | Health check function
+
+        Environment Variables:
+            OLLAMA_BASE_URLS: 逗号分隔的主机列表（默认：OLLAMA_BASE_URL）
+            OLLAMA_BACKEND_WEIGHTS: 逗号分隔的权重（默认：全部为 1）
+            OLLAMA_LB_STRATEGY: least_outstanding 或 weighted（默认：least_outstanding）
+            OLLAMA_EJECT_AFTER: 连续失败多少次后剔除（默认：3）
+            OLLAMA_EJECT_SECONDS: 剔除时长（默认：30）
+            OLLAMA_HEALTH_INTERVAL: 健康检查间隔秒数，0 禁用（默认：15）
+        """
+        backends = parse_backends(
+            env_str("OLLAMA_BASE_URLS") or default_url,
+            env_str("OLLAMA_BACKEND_WEIGHTS"),
+        )
+        return cls(
+            backends,
+            strategy=(env_str("OLLAMA_LB_STRATEGY", LEAST_OUTSTANDING) or LEAST_OUTSTANDING).lower(),
+            eject_after=env_int("OLLAMA_EJECT_AFTER", 3),
+            eject_seconds=env_float("OLLAMA_EJECT_SECONDS", 30.0),
+            health_interval=env_float("OLLAMA_HEALTH_INTERVAL", 15.0),
+            health_check=health_check,
+        )
+
+    @property
+    def primary(self) -> Backend:
+        """第一个主机 | The first host"""
+        return self.backends[0]
+
+    def _pick(self, candidates: List[Backend]) -> Backend:
+        """按策略从候选主机中选择一个 | Pick one candidate according to the strategy"""
+        if len(candidates) == 1:
+            return candidates[0]
+
+        if self.strategy == WEIGHTED:
+            # 平滑加权轮询（与 nginx 相同）| Smooth weighted round-robin (as in nginx)
+            total = sum(backend.weight for backend in candidates)
+            for backend in candidates:
+                backend._current_weight += backend.weight
+            chosen = max(candidates, key=lambda backend: backend._current_weight)
+            chosen._current_weight -= total
+            return chosen
+
+        # 按权重归一化的最少在途请求，平局时轮换
+        # Least outstanding requests normalised by weight, rotating on ties
+        self._rotation += 1
+        count = len(candidates)
+        return min(
+            (candidates[(self._rotation + i) % count] for i in range(count)),
+            key=lambda backend: (backend.outstanding + 1) / backend.weight,
+        )
+
+    def acquire(self) -> Backend:
+        """
+        选择一个主机并增加其在途请求数
+        Pick a host and count the request as outstanding
+
+        所有主机都被剔除时选择最早恢复的一个，而不是直接失败。
+        When every host is ejected, the one that recovers soonest is used
+        instead of failing outright.
+
+        Returns:
+            Backend: 选中的主机 | Chosen host
+        """
+        self._ensure_health_thread()
+        now = time.monotonic()
+        with self._lock:
+            candidates = [backend for backend in self.backends if backend.is_available(now)]
+            if candidates:
+                backend = self._pick(candidates)
+            else:
+                backend = min(self.backends, key=lambda b: b.ejected_until)
+            backend.outstanding += 1
+            return backend
+
+    def release(
+        self,
+        backend: Backend,
+        latency: float,
+        error: Optional[BaseException] = None,
+        failed: bool = False
+    ) -> None:
+        """
+        记录请求结果
+        Record the outcome of a request
+
+        Args:
+            backend: acquire() 返回的主机 | Host returned by acquire()
+            latency: 请求耗时（秒）| Request duration (seconds)
+            error: 请求错误 | Request error
+            failed: 是否为主机故障（计入剔除）| Whether it was a host failure (counts towards ejection)
+        """
+        with self._lock:
+            backend.outstanding = max(0, backend.outstanding - 1)
+            backend.requests += 1
+            backend.total_latency += latency
+            backend.max_latency = max(backend.max_latency, latency)
+            if error is not None:
+                backend.errors += 1
+                backend.last_error = str(error)
+
+            if not failed:
+                backend.consecutive_failures = 0
+                return
+
+            backend.consecutive_failures += 1
+            if backend.consecutive_failures >= self.eject_after and len(self.backends) > 1:
+                backend.ejected_until = time.monotonic() + self.eject_seconds
+                backend.consecutive_failures = 0
+                backend.ejections += 1
+
+    @contextmanager
+    def lease(
+        self,
+        is_failure: Optional[Callable[[BaseException], bool]] = None
+    ) -> Iterator[Backend]:
+        """
+        在一次请求期间占用一个主机
+        Hold a host for the duration of one request
+
+        Args:
+            is_failure: 判断异常是否为主机故障，默认所有异常都算
+                        Decides whether an exception is a host failure, all are by default
+
+        Yields:
+            Backend: 选中的主机 | Chosen host
+        """
+        backend = self.acquire()
+        start = time.perf_counter()
+        try:
+            yield backend
+        except Exception as e:
+            failed = is_failure(e) if is_failure is not None else True
+            self.release(backend, time.perf_counter() - start, error=e, failed=failed)
+            raise
+        except BaseException:
+            # 调用方放弃请求（生成器关闭或任务取消）不算错误
+            # The caller abandoning the request (generator closed, task cancelled) is not an error
+            self.release(backend, time.perf_counter() - start)
+            raise
+        else:
+            self.release(backend, time.perf_counter() - start)
+
+    def mark_healthy(self, backend: Backend) -> None:
+        """健康检查通过后恢复主机 | Re-admit a host after a passing health check"""
+        with self._lock:
+            backend.ejected_until = 0.0
+            backend.consecutive_failures = 0
+
+    def mark_unhealthy(self, backend: Backend, reason: Optional[str] = None) -> None:
+        """健康检查失败后剔除主机 | Eject a host after a failing health check"""
+        with self._lock:
+            if len(self.backends) == 1:
+                return
+            if backend.is_available(time.monotonic()):
+                backend.ejections += 1
+            backend.ejected_until = time.monotonic() + max(self.eject_seconds, self.health_interval)
+            if reason:
+                backend.last_error = reason
+
+    def check_health(self) -> None:
+        """
+        对所有主机执行一次健康检查
+        Run one health check against every host
+        """
+        if self.health_check is None:
+            return
+        for backend in self.backends:
+            try:
+                healthy = self.health_check(backend.url)
+                reason = None if healthy else "健康检查失败 | Health check failed"
+            except Exception as e:
+                healthy, reason = False, str(e)
+            if healthy:
+                self.mark_healthy(backend)
+            else:
+                self.mark_unhealthy(backend, reason)
+
+    def _ensure_health_thread(self) -> None:
+        """多主机时按需启动后台健康检查 | Lazily start health checks when there are several hosts"""
+        if (
+            self._health_thread is not None
+            or self.health_check is None
+            or not self.health_interval
+            or len(self.backends) < 2
+        ):
+            return
+        with self._lock:
+            if self._health_thread is not None:
+                return
+            self._health_thread = threading.Thread(
+                target=self._health_loop, name="ollama-health-check", daemon=True
+            )
+            self._health_thread.start()
+
+    def _health_loop(self) -> None:
+        """健康检查循环 | Health check loop"""
+        while not self._stop.wait(self.health_interval):
+            self.check_health()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        获取每个主机的统计信息
+        Get per-host statistics
+
+        Returns:
+            List[dict]: 每个主机的可用状态、在途请求、请求数、错误率和延迟
+                        Availability, in-flight requests, request count,
+                        error rate and latency per host
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [backend.snapshot(now) for backend in self.backends]
+
+    def close(self) -> None:
+        """停止健康检查 | Stop health checks"""
+        self._stop.set()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+并发执行工具
+Concurrency Utilities
+
+以有界并发执行任务，按输入顺序返回结果，并逐项捕获错误。
+Run tasks with bounded concurrency, return results in input order and
+capture errors per item.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# 进度回调：(已完成数, 总数, 当前项, 错误或 None)
+# Progress callback: (completed, total, item, error or None)
+ProgressCallback = Callable[[int, int, object, Optional[BaseException]], None]
+
+
+def map_ordered(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = 4,
+    on_error: Optional[Callable[[T, BaseException], R]] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+) -> List[R]:
+    """
+    并发执行 func，最多同时运行 max_workers 个任务，按输入顺序返回结果
+    Run func concurrently with at most max_workers in flight and return
+    results in input order
+
+    Args:
+        func: 对每一项调用的函数 | Function called for every item
+        items: 输入项 | Input items
+        max_workers: 最大并发数 | Maximum number of in-flight tasks
+        on_error: 将异常转换为结果的函数；为 None 时重新抛出第一个异常
+                  Converts an exception into a result; re-raises when None
+        progress_callback: 每完成一项时调用 | Called after every finished item
+
+    Returns:
+        List[R]: 与输入顺序一致的结果列表 | Results in input order
+
+    Example:
+        >>> map_ordered(len, ["a", "bb"], max_workers=2)
+        [1, 2]
+    """
+    items = list(items)
+    total = len(items)
+    results: List[Optional[R]] = [None] * total
+    if total == 0:
+        return []
+
+    max_workers = max(1, min(max_workers, total))
+    completed = 0
+
+    def _finish(index: int, future: Future) -> None:
+        nonlocal completed
+        error = future.exception()
+        if error is None:
+            results[index] = future.result()
+        elif on_error is not None:
+            results[index] = on_error(items[index], error)
+        else:
+            raise error
+        completed += 1
+        if progress_callback is not None:
+            progress_callback(completed, total, items[index], error)
+
+    # 单线程时直接顺序执行，避免线程开销
+    # Run inline when only one worker is requested
+    if max_workers == 1:
+        for index, item in enumerate(items):
+            future: Future = Future()
+            try:
+                future.set_result(func(item))
+            except Exception as e:
+                future.set_exception(e)
+            _finish(index, future)
+        return results
+
+    # 滑动窗口提交，保证同时在途的任务不超过 max_workers
+    # Sliding-window submission keeps at most max_workers tasks in flight
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Dict[Future, int] = {}
+        next_index = 0
+        while next_index < total or pending:
+            while next_index < total and len(pending) < max_workers:
+                pending[executor.submit(func, items[next_index])] = next_index
+                next_index += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    _finish(pending.pop(future), future)
+                except BaseException:
+                    for other in pending:
+                        other.cancel()
+                    raise
+
+    return results
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+环境变量读取工具
+Environment Variable Helpers
+
+统一解析 .env / 环境变量中的数字和布尔配置，非法值回退到默认值。
+Parse numeric and boolean settings from the environment, falling back
+to the default on missing or malformed values.
+
+=====================================================================
+"""
+
+import os  # 操作系统接口
+from typing import Optional  # 类型提示
+
+# 视为"真"的字符串 | Strings treated as true
+_TRUE_VALUES = {"1", "true", "yes", "on", "y"}
+# 视为"假"的字符串 | Strings treated as false
+_FALSE_VALUES = {"0", "false", "no", "off", "n"}
+
+
+def env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    读取字符串环境变量，空字符串视为未设置
+    Read a string variable, treating an empty string as unset
+
+    Args:
+        name: 变量名 | Variable name
+        default: 默认值 | Default value
+
+    Returns:
+        Optional[str]: 变量值或默认值 | Value or default
+    """
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip()
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    读取整数环境变量
+    Read an integer variable
+
+    Args:
+        name: 变量名 | Variable name
+        default: 默认值 | Default value
+
+    Returns:
+        int: 解析后的值 | Parsed value
+    """
+    value = env_str(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """
+    读取浮点数环境变量
+    Read a float variable
+
+    Args:
+        name: 变量名 | Variable name
+        default: 默认值 | Default value
+
+    Returns:
+        float: 解析后的值 | Parsed value
+    """
+    value = env_str(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """
+    读取布尔环境变量（1/true/yes/on 为真）
+    Read a boolean variable (1/true/yes/on are true)
+
+    Args:
+        name: 变量名 | Variable name
+        default: 默认值 | Default value
+
+    Returns:
+        bool: 解析后的值 | Parsed value
+    """
+    value = env_str(name)
+    if value is None:
+        return default
+    lowered = value.lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    return default
+
+
+_ENV_FILE_LOADED = False
+
+
+def load_env_file() -> None:
+    """
+    加载 .env 文件中的环境变量（只加载一次，已设置的变量不会被覆盖）
+    Load environment variables from the .env file (once; variables already
+    set are not overridden)
+
+    由入口点和客户端构造时调用，导入模块本身不读取 .env。
+    Called by the entry points and client constructors; importing a module
+    never reads .env by itself.
+    """
+    global _ENV_FILE_LOADED
+    if _ENV_FILE_LOADED:
+        return
+    _ENV_FILE_LOADED = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
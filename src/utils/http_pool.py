@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+HTTP 连接池
+HTTP Connection Pool
+
+为 Ollama 客户端提供可复用的 keep-alive 连接，避免每个请求都重新
+建立 TCP 连接，并统计连接复用次数、打开的连接数和等待时间。
+Provides reusable keep-alive connections for the Ollama client so that
+each request does not open a new TCP connection, and tracks connection
+reuse, open connections and pool wait time.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import threading  # 线程锁
+import time  # 计时
+import weakref  # 弱引用集合
+from dataclasses import dataclass  # 数据类
+from typing import Any, Dict  # 类型提示
+
+# 第三方库导入 | Third-party Library Imports
+import requests  # HTTP 请求库
+from requests.adapters import HTTPAdapter  # requests 传输适配器
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+from .env import env_bool, env_float, env_int
+
+
+@dataclass
+class PoolConfig:
+    """
+    连接池配置
+    Connection pool configuration
+
+    Attributes:
+        pool_connections: 缓存的主机连接池数量 | Number of per-host pools to cache
+        pool_maxsize: 每个主机的最大连接数 | Maximum connections per host
+        pool_block: 连接耗尽时是否阻塞等待 | Block when all connections are busy
+        keep_alive: 是否保持 HTTP 长连接 | Keep HTTP connections alive
+        keepalive_expiry: 空闲连接的最长复用时间（秒）| Max idle age before reconnecting (seconds)
+    """
+
+    pool_connections: int = 4
+    pool_maxsize: int = 8
+    pool_block: bool = True
+    keep_alive: bool = True
+    keepalive_expiry: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """
+        从环境变量创建配置
+        Build the configuration from environment variables
+
+        Environment Variables:
+            OLLAMA_POOL_CONNECTIONS: 主机连接池数量（默认：4）
+            OLLAMA_POOL_MAXSIZE: 每个主机的最大连接数（默认：8）
+            OLLAMA_POOL_BLOCK: 连接耗尽时阻塞（默认：true）
+            OLLAMA_HTTP_KEEPALIVE: 启用 HTTP 长连接（默认：true）
+            OLLAMA_KEEPALIVE_EXPIRY: 空闲连接过期秒数（默认：60）
+        """
+        return cls(
+            pool_connections=max(1, env_int("OLLAMA_POOL_CONNECTIONS", cls.pool_connections)),
+            pool_maxsize=max(1, env_int("OLLAMA_POOL_MAXSIZE", cls.pool_maxsize)),
+            pool_block=env_bool("OLLAMA_POOL_BLOCK", cls.pool_block),
+            keep_alive=env_bool("OLLAMA_HTTP_KEEPALIVE", cls.keep_alive),
+            keepalive_expiry=env_float("OLLAMA_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+        )
+
+
+class _PoolCounters:
+    """
+    线程安全的连接池计数器
+    Thread-safe pool counters shared by every per-host pool
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.expired_connections = 0
+        self.in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def checkout(self, wait: float, reused: bool, expired: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_use += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if reused:
+                self.reused_connections += 1
+            else:
+                self.new_connections += 1
+            if expired:
+                self.expired_connections += 1
+
+    def checkin(self) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+
+class _InstrumentedPoolMixin:
+    """
+    为 urllib3 连接池增加计时和过期检查
+    Adds wait timing and idle-expiry checks to urllib3 connection pools
+    """
+
+    # 由 _InstrumentedPoolManager 在创建后注入
+    # Injected by _InstrumentedPoolManager after creation
+    _glm_counters: _PoolCounters = None
+    _glm_keepalive_expiry: float = 0.0
+
+    def _get_conn(self, timeout=None):
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        wait = time.perf_counter() - start
+
+        # 空闲过久的连接可能已被服务器关闭，主动重连
+        # Connections idle for too long may have been closed server-side; reconnect
+        expired = False
+        last_used = getattr(conn, "_glm_last_used", None)
+        if (
+            conn.sock is not None
+            and last_used is not None
+            and self._glm_keepalive_expiry > 0
+            and time.monotonic() - last_used > self._glm_keepalive_expiry
+        ):
+            conn.close()
+            expired = True
+
+        if self._glm_counters is not None:
+            self._glm_counters.checkout(wait, reused=conn.sock is not None, expired=expired)
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._glm_last_used = time.monotonic()
+        if self._glm_counters is not None:
+            self._glm_counters.checkin()
+        super()._put_conn(conn)
+
+    def idle_connections(self) -> int:
+        """返回池中仍处于连接状态的空闲连接数 | Count idle connections that are still open"""
+        queue = getattr(self, "pool", None)
+        if queue is None:
+            return 0
+        with queue.mutex:
+            return sum(1 for conn in queue.queue if conn is not None and conn.sock is not None)
+
+
+class _InstrumentedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _InstrumentedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _InstrumentedPoolManager(PoolManager):
+    """
+    使用带统计功能的连接池的 PoolManager
+    PoolManager that creates instrumented per-host pools
+    """
+
+    def __init__(self, counters: _PoolCounters, keepalive_expiry: float, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.pool_classes_by_scheme = {
+            "http": _InstrumentedHTTPConnectionPool,
+            "https": _InstrumentedHTTPSConnectionPool,
+        }
+        self._glm_counters = counters
+        self._glm_keepalive_expiry = keepalive_expiry
+        self._glm_pools = weakref.WeakSet()
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool._glm_counters = self._glm_counters
+        pool._glm_keepalive_expiry = self._glm_keepalive_expiry
+        self._glm_pools.add(pool)
+        return pool
+
+    def idle_connections(self) -> int:
+        return sum(pool.idle_connections() for pool in list(self._glm_pools))
+
+
+class _PooledAdapter(HTTPAdapter):
+    """
+    使用带统计功能的 PoolManager 的 requests 适配器
+    requests adapter backed by the instrumented PoolManager
+    """
+
+    def __init__(self, counters: _PoolCounters, keepalive_expiry: float, **kwargs: Any):
+        self._glm_counters = counters
+        self._glm_keepalive_expiry = keepalive_expiry
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _InstrumentedPoolManager(
+            self._glm_counters,
+            self._glm_keepalive_expiry,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+
+class PooledSession:
+    """
+    线程安全的 keep-alive HTTP 会话
+    Thread-safe keep-alive HTTP session
+
+    封装 requests.Session，可在多个 Gradio 工作线程之间共享。
+    Wraps a requests.Session that can be shared between Gradio worker threads.
+
+    Example:
+        >>> session = PooledSession(PoolConfig(pool_maxsize=4))
+        >>> response = session.get("http://localhost:11434/api/version", timeout=10)
+        >>> print(session.stats())
+    """
+
+    def __init__(self, config: PoolConfig = None):
+        """
+        初始化连接池会话
+        Initialize the pooled session
+
+        Args:
+            config: 连接池配置，默认从环境变量读取
+                    Pool configuration, read from the environment if not provided
+        """
+        self.config = config or PoolConfig.from_env()
+        self._counters = _PoolCounters()
+        self._adapter = _PooledAdapter(
+            self._counters,
+            self.config.keepalive_expiry if self.config.keep_alive else 0.0,
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+        )
+
+        self._session = requests.Session()
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+        if not self.config.keep_alive:
+            self._session.headers["Connection"] = "close"
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """发送 GET 请求 | Send a GET request"""
+        return self._session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """发送 POST 请求 | Send a POST request"""
+        return self._session.post(url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取连接池统计信息
+        Get connection pool statistics
+
+        Returns:
+            dict: 请求数、复用数、打开的连接数和等待时间
+                  Request count, reuse count, open connections and wait time
+        """
+        counters = self._counters
+        with counters._lock:
+            snapshot = {
+                "requests": counters.requests,
+                "new_connections": counters.new_connections,
+                "reused_connections": counters.reused_connections,
+                "expired_connections": counters.expired_connections,
+                "in_use": counters.in_use,
+                "total_wait_seconds": round(counters.total_wait, 6),
+                "max_wait_seconds": round(counters.max_wait, 6),
+            }
+        snapshot["idle_connections"] = self._adapter.poolmanager.idle_connections()
+        snapshot["open_connections"] = snapshot["idle_connections"] + snapshot["in_use"]
+        snapshot["avg_wait_seconds"] = round(
+            snapshot["total_wait_seconds"] / snapshot["requests"], 6
+        ) if snapshot["requests"] else 0.0
+        snapshot["pool_maxsize"] = self.config.pool_maxsize
+        return snapshot
+
+    def close(self) -> None:
+        """关闭所有连接 | Close all pooled connections"""
+        self._session.close()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+图片预处理
+Image Pre-processing
+
+在发送到 Ollama 之前缩小图片负载：修正 EXIF 方向、限制最大边长、
+可选灰度化，并重新编码为更紧凑的格式。模型本身也会缩放输入，
+因此超出其分辨率的像素只会浪费带宽、Base64 内存和预填充时间。
+Shrinks image payloads before they are sent to Ollama: fixes EXIF
+orientation, caps the longest side, optionally converts to grayscale and
+re-encodes to a compact format. The model resizes inputs anyway, so pixels
+beyond its resolution only cost bandwidth, Base64 memory and prefill time.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import threading  # 线程锁
+from dataclasses import dataclass  # 数据类
+from io import BytesIO  # 内存字节流
+from typing import Any, Dict, Union
+
+from .env import env_bool, env_int, env_str
+
+# Pillow 格式名称映射 | Pillow format name aliases
+_FORMAT_ALIASES = {"JPG": "JPEG", "JPEG": "JPEG", "PNG": "PNG", "WEBP": "WEBP", "KEEP": "KEEP"}
+
+# EXIF 方向标签 | EXIF orientation tag
+_EXIF_ORIENTATION = 0x0112
+
+
+@dataclass
+class PreprocessConfig:
+    """
+    图片预处理配置
+    Image pre-processing configuration
+
+    Attributes:
+        enabled: 是否启用预处理 | Enable pre-processing
+        max_dimension: 最长边像素上限，0 表示不缩放 | Longest side cap in pixels, 0 disables
+        fmt: 输出格式（JPEG/PNG/WEBP/KEEP）| Output format (JPEG/PNG/WEBP/KEEP)
+        quality: 有损格式的编码质量 | Encoder quality for lossy formats
+        grayscale: 是否转换为灰度 | Convert to grayscale
+        fix_orientation: 是否按 EXIF 方向旋转 | Rotate according to EXIF orientation
+    """
+
+    enabled: bool = True
+    max_dimension: int = 2048
+    fmt: str = "JPEG"
+    quality: int = 90
+    grayscale: bool = False
+    fix_orientation: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PreprocessConfig":
+        """
+        从环境变量创建配置
+        Build the configuration from environment variables
+
+        Environment Variables:
+            OCR_PREPROCESS: 启用预处理（默认：true）
+            OCR_MAX_IMAGE_DIM: 最长边像素上限（默认：2048）
+            OCR_IMAGE_FORMAT: 输出格式 JPEG/PNG/WEBP/KEEP（默认：JPEG）
+            OCR_IMAGE_QUALITY: 编码质量 1-100（默认：90）
+            OCR_GRAYSCALE: 转换为灰度（默认：false）
+            OCR_FIX_ORIENTATION: 修正 EXIF 方向（默认：true）
+        """
+        fmt = (env_str("OCR_IMAGE_FORMAT", cls.fmt) or cls.fmt).upper()
+        return cls(
+            enabled=env_bool("OCR_PREPROCESS", cls.enabled),
+            max_dimension=max(0, env_int("OCR_MAX_IMAGE_DIM", cls.max_dimension)),
+            fmt=_FORMAT_ALIASES.get(fmt, cls.fmt),
+            quality=min(100, max(1, env_int("OCR_IMAGE_QUALITY", cls.quality))),
+            grayscale=env_bool("OCR_GRAYSCALE", cls.grayscale),
+            fix_orientation=env_bool("OCR_FIX_ORIENTATION", cls.fix_orientation),
+        )
+
+    def signature(self) -> Dict[str, Any]:
+        """
+        影响输出的设置，用于缓存键
+        Settings that affect the output, used in cache keys
+        """
+        return {
+            "max_dimension": self.max_dimension,
+            "fmt": self.fmt,
+            "quality": self.quality,
+            "grayscale": self.grayscale,
+            "fix_orientation": self.fix_orientation,
+        }
+
+
+@dataclass
+class PreprocessResult:
+    """
+    单张图片的预处理结果
+    Pre-processing result for one image
+
+    Attributes:
+        data: 发送给模型的图片字节 | Image bytes sent to the model
+        original_bytes: 原始大小（PIL 输入为未压缩像素字节数）
+                        Original size (uncompressed pixel bytes for PIL inputs)
+        output_bytes: 处理后大小 | Processed size
+        width: 输出宽度 | Output width
+        height: 输出高度 | Output height
+        changed: 是否重新编码 | Whether the image was re-encoded
+    """
+
+    data: bytes
+    original_bytes: int
+    output_bytes: int
+    width: int
+    height: int
+    changed: bool
+
+    @property
+    def bytes_saved(self) -> int:
+        """节省的字节数 | Bytes saved"""
+        return self.original_bytes - self.output_bytes
+
+
+def _is_pil_image(image: Any) -> bool:
+    """检查是否为 PIL 图片（无需导入 Pillow）| Check for a PIL image without importing Pillow"""
+    return hasattr(image, "save") and hasattr(image, "mode") and hasattr(image, "size")
+
+
+class ImagePreprocessor:
+    """
+    基于 Pillow 的图片预处理器（线程安全）
+    Pillow-based image pre-processor (thread-safe)
+
+    Example:
+        >>> preprocessor = ImagePreprocessor(PreprocessConfig(max_dimension=1600))
+        >>> result = preprocessor.process(open("photo.jpg", "rb").read())
+        >>> print(result.bytes_saved)
+    """
+
+    def __init__(self, config: PreprocessConfig = None):
+        """
+        初始化预处理器
+        Initialize the pre-processor
+
+        Args:
+            config: 预处理配置，默认从环境变量读取
+                    Pre-processing configuration, read from the environment if not provided
+        """
+        self.config = config or PreprocessConfig.from_env()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._changed = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def _needs_work(self, image) -> bool:
+        """
+        检查图片是否已满足要求，满足时可跳过解码和重新编码
+        Check whether the image already complies, so decoding can be skipped
+        """
+        config = self.config
+        if config.fmt != "KEEP" and image.format != config.fmt:
+            return True
+        if config.max_dimension and max(image.size) > config.max_dimension:
+            return True
+        if config.grayscale and image.mode not in ("L", "LA"):
+            return True
+        if config.fix_orientation:
+            try:
+                orientation = image.getexif().get(_EXIF_ORIENTATION, 1)
+            except Exception:
+                orientation = 1
+            if orientation not in (None, 1):
+                return True
+        return False
+
+    def _transform(self, image):
+        """
+        执行方向修正、灰度化和缩放
+        Apply orientation fix, grayscale conversion and downscaling
+        """
+        from PIL import Image, ImageOps
+
+        config = self.config
+        if config.fix_orientation:
+            image = ImageOps.exif_transpose(image)
+
+        if config.grayscale:
+            image = image.convert("L")
+
+        if config.max_dimension and max(image.size) > config.max_dimension:
+            image = image.copy() if image.mode != "P" else image.convert("RGB")
+            image.thumbnail(
+                (config.max_dimension, config.max_dimension), Image.Resampling.LANCZOS
+            )
+        return image
+
+    def _encode(self, image, source_format: str) -> bytes:
+        """
+        按配置的格式编码图片
+        Encode the image in the configured format
+        """
+        fmt = self.config.fmt if self.config.fmt != "KEEP" else (source_format or "PNG")
+        if fmt in ("JPEG", "WEBP") and image.mode not in ("RGB", "L"):
+            # 有损格式不支持透明通道，合成到白色背景
+            # Lossy formats have no alpha channel, composite onto white
+            from PIL import Image
+
+            rgba = image.convert("RGBA")
+            background = Image.new("RGB", rgba.size, (255, 255, 255))
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            image = background
+
+        buffer = BytesIO()
+        if fmt == "JPEG":
+            image.save(buffer, format="JPEG", quality=self.config.quality, optimize=True)
+        elif fmt == "WEBP":
+            image.save(buffer, format="WEBP", quality=self.config.quality, method=4)
+        else:
+            image.save(buffer, format=fmt)
+        return buffer.getvalue()
+
+    def process(self, image: Union[bytes, Any]) -> PreprocessResult:
+        """
+        预处理图片字节或 PIL 图片
+        Pre-process image bytes or a PIL image
+
+        已满足要求的字节输入原样返回；重新编码后反而变大且未缩放时保留原图。
+        Compliant byte inputs pass through untouched; if re-encoding makes an
+        unscaled image larger, the original is kept.
+
+        Args:
+            image: 图片字节或 PIL 图片 | Image bytes or PIL image
+
+        Returns:
+            PreprocessResult: 处理结果 | Processing result
+        """
+        from PIL import Image
+
+        if _is_pil_image(image):
+            source = image
+            original = None
+            original_size = source.width * source.height * len(source.getbands())
+        else:
+            original = bytes(image)
+            original_size = len(original)
+            try:
+                source = Image.open(BytesIO(original))
+            except Exception:
+                # 无法识别的格式原样发送，由服务器决定如何处理
+                # Unrecognized formats are sent as-is for the server to judge
+                return self.record(PreprocessResult(
+                    data=original,
+                    original_bytes=original_size,
+                    output_bytes=original_size,
+                    width=0,
+                    height=0,
+                    changed=False,
+                ))
+
+        if not self.config.enabled or (original is not None and not self._needs_work(source)):
+            if original is None:
+                buffer = BytesIO()
+                source.save(buffer, format="PNG")
+                original = buffer.getvalue()
+            result = PreprocessResult(
+                data=original,
+                original_bytes=original_size,
+                output_bytes=len(original),
+                width=source.width,
+                height=source.height,
+                changed=False,
+            )
+        else:
+            source_format = source.format
+            processed = self._transform(source)
+            data = self._encode(processed, source_format)
+            changed = True
+            resized = processed.size != source.size
+
+            if original is not None and not resized and len(data) >= original_size:
+                data = original
+                changed = False
+
+            result = PreprocessResult(
+                data=data,
+                original_bytes=original_size,
+                output_bytes=len(data),
+                width=processed.width,
+                height=processed.height,
+                changed=changed,
+            )
+
+        return self.record(result)
+
+    def record(self, result: PreprocessResult) -> PreprocessResult:
+        """
+        累计统计信息（也用于在其他进程中完成的预处理结果）
+        Accumulate statistics (also for results produced in another process)
+        """
+        with self._lock:
+            self._requests += 1
+            self._changed += int(result.changed)
+            self._bytes_in += result.original_bytes
+            self._bytes_out += result.output_bytes
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取预处理统计信息
+        Get pre-processing statistics
+
+        Returns:
+            dict: 处理数量、输入/输出字节数和平均每次节省的字节数
+                  Request count, bytes in/out and average bytes saved per request
+        """
+        with self._lock:
+            saved = self._bytes_in - self._bytes_out
+            return {
+                "requests": self._requests,
+                "reencoded": self._changed,
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+                "bytes_saved": saved,
+                "avg_bytes_saved": round(saved / self._requests, 1) if self._requests else 0.0,
+            }
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+内存预算
+Memory Budget
+
+处理超大 PDF 和多个大文件时限制内存占用：按预算计算同时在内存中的
+页面数，识别结果超过预算后转存到磁盘，并在任务期间采样常驻内存峰值。
+Bounds memory while processing very large PDFs and many large files: the
+budget decides how many pages are in memory at once, results spill to
+disk beyond the budget, and resident memory is sampled during each job to
+report its peak.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import contextlib  # 忽略可预期的读取失败、持有临时文件
+import os  # 操作系统接口
+import sys  # 平台判断
+import tempfile  # 磁盘转存
+import threading  # 采样线程
+from dataclasses import dataclass  # 数据类
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .env import env_bool, env_int, env_str
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class MemoryBudget:
+    """
+    流式处理的内存预算
+    Memory budget for streaming processing
+
+    Attributes:
+        enabled: 是否启用流式模式 | Enable the streaming mode
+        budget_mb: 每个任务的内存预算（MB）| Memory budget per job (MB)
+        spill_dir: 结果转存目录，None 使用系统临时目录 | Spill directory, None for the system temp dir
+    """
+
+    enabled: bool = False
+    budget_mb: int = 512
+    spill_dir: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "MemoryBudget":
+        """
+        从环境变量创建配置
+        Build the configuration from environment variables
+
+        Environment Variables:
+            OCR_STREAMING: 启用流式模式（默认：false）
+            OCR_MEMORY_BUDGET_MB: 每个任务的内存预算（默认：512）
+            OCR_SPILL_DIR: 结果转存目录（默认：系统临时目录）
+        """
+        return cls(
+            enabled=env_bool("OCR_STREAMING", cls.enabled),
+            budget_mb=max(16, env_int("OCR_MEMORY_BUDGET_MB", cls.budget_mb)),
+            spill_dir=env_str("OCR_SPILL_DIR", "") or None,
+        )
+
+    @property
+    def budget_bytes(self) -> int:
+        return self.budget_mb * _MB
+
+    def pages_in_flight(self, page_bytes: int, ceiling: int) -> int:
+        """
+        预算一半用于页面图片时，同时在内存中的页面数
+        Pages held in memory at once when half the budget goes to page images
+
+        另一半留给识别结果缓冲和解释器本身。
+        The other half is left for the result buffer and the interpreter.
+
+        Args:
+            page_bytes: 单页估计字节数 | Estimated bytes per page
+            ceiling: 上限（通常为 OCR 并发数的两倍）| Upper bound (usually twice the OCR concurrency)
+        """
+        fit = (self.budget_bytes // 2) // max(1, page_bytes)
+        return max(1, min(ceiling, fit))
+
+    def spill_bytes(self) -> int:
+        """结果缓冲转存到磁盘的阈值（预算的四分之一）| Result buffer spill threshold (a quarter of the budget)"""
+        return self.budget_bytes // 4
+
+
+def estimate_page_bytes(dpi: int, width_in: float = 8.5, height_in: float = 11.0) -> int:
+    """
+    估算一页在内存中的峰值字节数：RGB 像素、编码后的图片和 Base64 请求体
+    Estimate the peak bytes of one page in memory: RGB pixels, the encoded
+    image and the Base64 request body
+
+    Args:
+        dpi: 栅格化分辨率 | Rasterization DPI
+        width_in: 页面宽度（英寸）| Page width (inches)
+        height_in: 页面高度（英寸）| Page height (inches)
+    """
+    pixels = int(width_in * dpi) * int(height_in * dpi)
+    # 像素 3 字节 + 编码后约 1 字节 + Base64 约 1.33 字节
+    # 3 bytes of pixels + about 1 byte encoded + about 1.33 bytes of Base64
+    return int(pixels * 5.4)
+
+
+def current_rss() -> Optional[int]:
+    """
+    当前进程的常驻内存（字节），无法读取时返回 None
+    Resident memory of the current process in bytes, None if unavailable
+    """
+    with contextlib.suppress(OSError, ValueError, IndexError, AttributeError):
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    with contextlib.suppress(ImportError):
+        import psutil
+
+        with contextlib.suppress(psutil.Error):
+            return psutil.Process().memory_info().rss
+    try:
+        import resource
+
+        # 只能读到历史峰值；macOS 单位为字节，Linux 为 KB
+        # Only the historical peak is available; bytes on macOS, KB on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+
+class MemoryMonitor:
+    """
+    在后台线程中采样常驻内存，记录任务期间的峰值
+    Samples resident memory in a background thread and records the peak
+    during a job
+
+    同一进程内的并发任务共享内存，峰值反映的是整个进程。
+    Concurrent jobs share the process, so the peak covers the whole process.
+
+    Example:
+        >>> with MemoryMonitor() as monitor:
+        ...     process(pdf)
+        >>> print(monitor.peak_mb)
+    """
+
+    def __init__(self, interval: float = 0.05):
+        """
+        Args:
+            interval: 采样间隔（秒）| Sampling interval (seconds)
+        """
+        self.interval = interval
+        self.start_rss: Optional[int] = None
+        self.peak_rss: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        """采样一次 | Take one sample"""
+        rss = current_rss()
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> "MemoryMonitor":
+        """开始采样 | Start sampling"""
+        self.start_rss = current_rss()
+        self.peak_rss = self.start_rss
+        self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止采样 | Stop sampling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+
+    @property
+    def peak_mb(self) -> Optional[float]:
+        """峰值常驻内存（MB）| Peak resident memory (MB)"""
+        return round(self.peak_rss / _MB, 1) if self.peak_rss is not None else None
+
+    @property
+    def growth_mb(self) -> Optional[float]:
+        """峰值相对开始时的增长（MB）| Peak growth over the start (MB)"""
+        if self.peak_rss is None or self.start_rss is None:
+            return None
+        return round((self.peak_rss - self.start_rss) / _MB, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典 | Convert to a dictionary"""
+        return {"peak_rss_mb": self.peak_mb, "rss_growth_mb": self.growth_mb}
+
+    def __enter__(self) -> "MemoryMonitor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+class SpillBuffer:
+    """
+    按顺序追加文本片段的缓冲区，超过阈值后转存到磁盘临时文件
+    Append-only buffer of text parts that moves to a temporary file on disk
+    once it grows past a threshold
+
+    Example:
+        >>> with SpillBuffer(max_memory=64 * 1024 * 1024) as pages:
+        ...     for text in page_texts:
+        ...         pages.append(text)
+        ...     pages.write_to("result.md", separator="\\n\\n")
+    """
+
+    def __init__(self, max_memory: int = 64 * _MB, spill_dir: Optional[str] = None):
+        """
+        Args:
+            max_memory: 转存到磁盘前的最大内存字节数 | Bytes kept in memory before spilling
+            spill_dir: 临时文件目录 | Directory for the temporary file
+        """
+        # 临时文件随缓冲区一起存活：转交给 self._resources，由 close() 关闭
+        # The temporary file lives as long as the buffer: ownership moves to
+        # self._resources and close() releases it
+        with contextlib.ExitStack() as stack:
+            self._file = stack.enter_context(
+                tempfile.SpooledTemporaryFile(max_size=max_memory, mode="w+b", dir=spill_dir)
+            )
+            self._resources = stack.pop_all()
+        self._offsets: List[int] = []
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def append(self, text: str) -> None:
+        """追加一个片段 | Append one part"""
+        data = text.encode("utf-8")
+        with self._lock:
+            self._file.seek(self._size)
+            self._file.write(data)
+            self._offsets.append(self._size)
+            self._size += len(data)
+
+    def extend(self, texts: Iterable[str]) -> None:
+        for text in texts:
+            self.append(text)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def size(self) -> int:
+        """已写入的字节数 | Bytes written"""
+        return self._size
+
+    @property
+    def spilled(self) -> bool:
+        """是否已转存到磁盘 | Whether the buffer moved to disk"""
+        return bool(getattr(self._file, "_rolled", False))
+
+    def __getitem__(self, index: int) -> str:
+        with self._lock:
+            if index < 0:
+                index += len(self._offsets)
+            start = self._offsets[index]
+            end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._size
+            self._file.seek(start)
+            return self._file.read(end - start).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        """逐个读回片段，每次只有一个片段在内存中 | Read the parts back one at a time"""
+        for index in range(len(self._offsets)):
+            yield self[index]
+
+    def join(self, separator: str = "") -> str:
+        """
+        合并为一个字符串（仅在必须交给界面显示时使用）
+        Join into one string (only when the UI needs the whole text)
+        """
+        return separator.join(self)
+
+    def write_to(self, path: str, separator: str = "") -> None:
+        """
+        逐个片段写入文件，不在内存中合并
+        Write the parts to a file one by one without joining them in memory
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for index, text in enumerate(self):
+                if index:
+                    f.write(separator)
+                f.write(text)
+
+    def close(self) -> None:
+        """删除临时文件 | Remove the temporary file"""
+        self._resources.close()
+
+    def __enter__(self) -> "SpillBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
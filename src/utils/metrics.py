@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+运行指标
+Runtime Metrics
+
+轻量的 Prometheus 文本格式指标（计数器、仪表和直方图），无需额外依赖。
+热路径上每次更新只是一次加锁的加法；缓存、主机和重试统计在抓取时
+通过采集函数读取，不增加请求开销。
+Lightweight Prometheus text-format metrics (counters, gauges and
+histograms) with no extra dependency. Each update on the hot path is a
+single locked addition; cache, host and retry statistics are read by
+collector functions at scrape time and add nothing to requests.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import bisect  # 直方图分桶
+import math  # 无穷大
+import threading  # 线程锁
+import time  # 计时
+from concurrent.futures import Executor, Future  # 线程池任务
+from contextlib import contextmanager  # 上下文管理器
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Prometheus 文本格式的内容类型 | Content type of the Prometheus text format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# OCR 请求耗时的默认分桶（秒）| Default OCR latency buckets (seconds)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+# 采集函数返回的样本：(名称, 类型, 说明, [(标签, 值)])
+# Collector output: (name, type, help, [(labels, value)])
+Collected = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: Any) -> str:
+    """转义标签值 | Escape a label value"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    """格式化标签 | Format labels"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    """格式化样本值 | Format a sample value"""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """
+    带标签的指标基类
+    Base class for labelled metrics
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        """按声明顺序取出标签值 | Label values in declaration order"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} 需要标签 | expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelKey, **extra: Any) -> Dict[str, Any]:
+        labels: Dict[str, Any] = dict(zip(self.labelnames, key))
+        labels.update(extra)
+        return labels
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, Any], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """输出 Prometheus 文本格式 | Render in the Prometheus text format"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """
+    只增不减的计数器
+    Monotonically increasing counter
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """增加计数 | Increment"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """当前值 | Current value"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, Any], float]]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield self.name, self._labels(key), value
+
+
+class Gauge(Counter):
+    """
+    可增可减的仪表
+    Gauge that can go up and down
+    """
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        """减少 | Decrement"""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        """设置值 | Set the value"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    @contextmanager
+    def track(self, **labels: Any) -> Iterator[None]:
+        """
+        在代码块执行期间加一（用于统计进行中的请求）
+        Add one while the block runs (for in-flight counts)
+        """
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """
+    累积分桶直方图
+    Cumulative bucket histogram
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 每组标签：[各桶计数..., 总和, 数量] | Per label set: [bucket counts..., sum, count]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """记录一个观测值 | Record an observation"""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                row[index] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """记录代码块的耗时 | Time the block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, Any], float]]:
+        with self._lock:
+            values = sorted((key, list(row)) for key, row in self._values.items())
+        for key, row in values:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                yield f"{self.name}_bucket", self._labels(key, le=_format_value(bound)), cumulative
+            yield f"{self.name}_bucket", self._labels(key, le="+Inf"), row[-1]
+            yield f"{self.name}_sum", self._labels(key), row[-2]
+            yield f"{self.name}_count", self._labels(key), row[-1]
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+    Metrics registry
+
+    Example:
+        >>> registry = MetricsRegistry()
+        >>> hits = registry.counter("hits_total", "Hits", ("path",))
+        >>> hits.inc(path="/")
+        >>> print(registry.render())
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Collected]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # 重复注册（例如模块重新加载）时复用已有指标
+                # Re-registration (e.g. a module reload) reuses the existing metric
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"指标已存在 | Metric already registered: {metric.name}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """注册计数器 | Register a counter"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """注册仪表 | Register a gauge"""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """注册直方图 | Register a histogram"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Collected]]) -> None:
+        """
+        注册在抓取时调用的采集函数
+        Register a function called at scrape time
+
+        Args:
+            collector: 返回 (名称, 类型, 说明, [(标签, 值)]) 列表的函数
+                       Returns a list of (name, type, help, [(labels, value)])
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        以 Prometheus 文本格式输出所有指标
+        Render every metric in the Prometheus text format
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                collected = list(collector())
+            except Exception as e:
+                lines.append(f"# 采集失败 | collector failed: {_escape(e)}")
+                continue
+            for name, kind, documentation, samples in collected:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# 全局注册表 | Global registry
+REGISTRY = MetricsRegistry()
+
+# Web UI 请求 | Web UI requests
+FILES_TOTAL = REGISTRY.counter(
+    "glm_ocr_files_total", "Uploaded files processed, by file type", ("file_type",)
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "glm_ocr_requests_in_flight", "Web UI conversions currently running"
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "glm_ocr_request_seconds", "Web UI conversion duration in seconds"
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "glm_ocr_queue_depth", "Files and pages waiting for an OCR worker"
+)
+
+# PDF 页面 | PDF pages
+PDF_PAGES_TOTAL = REGISTRY.counter(
+    "glm_ocr_pdf_pages_total", "PDF pages processed, by source (text layer or OCR)", ("source",)
+)
+PDF_PAGE_ROUTES_TOTAL = REGISTRY.counter(
+    "glm_ocr_pdf_page_routes_total",
+    "PDF page routing decisions, by route and text-layer quality reason",
+    ("route", "reason"),
+)
+
+# Ollama 请求 | Ollama requests
+OLLAMA_REQUESTS_TOTAL = REGISTRY.counter(
+    "glm_ocr_ollama_requests_total", "Ollama OCR requests, by outcome", ("outcome",)
+)
+OLLAMA_IN_FLIGHT = REGISTRY.gauge(
+    "glm_ocr_ollama_in_flight", "Ollama OCR requests currently in flight"
+)
+OLLAMA_SECONDS = REGISTRY.histogram(
+    "glm_ocr_ollama_request_seconds", "Ollama OCR request duration in seconds", ("mode",)
+)
+
+
+def submit_queued(executor: Executor, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """
+    提交任务到线程池，任务开始执行前计入队列深度
+    Submit a task to an executor, counting it in the queue depth until it starts
+
+    Args:
+        executor: 线程池或进程池 | Thread or process pool
+        fn: 任务函数 | Task function
+
+    Returns:
+        Future: 任务的 Future | The task's Future
+    """
+    def _run() -> Any:
+        QUEUE_DEPTH.dec()
+        return fn(*args, **kwargs)
+
+    QUEUE_DEPTH.inc()
+    try:
+        future = executor.submit(_run)
+    except BaseException:
+        QUEUE_DEPTH.dec()
+        raise
+    # 已取消的任务不会执行，在此移出队列 | Cancelled tasks never run, leave the queue here
+    future.add_done_callback(lambda done: done.cancelled() and QUEUE_DEPTH.dec())
+    return future
+
+
+def client_collector(client: Any) -> Callable[[], List[Collected]]:
+    """
+    创建读取 OCR 客户端缓存、主机和重试统计的采集函数
+    Build a collector reading the OCR client's cache, host and retry statistics
+
+    Args:
+        client: OllamaOCR 实例 | OllamaOCR instance
+
+    Returns:
+        Callable: 采集函数 | Collector function
+    """
+    def _collect() -> List[Collected]:
+        collected: List[Collected] = []
+
+        cache = client.cache_stats()
+        if "hits" in cache:
+            collected += [
+                ("glm_ocr_cache_hits_total", "counter", "OCR cache hits", [({}, cache["hits"])]),
+                ("glm_ocr_cache_misses_total", "counter", "OCR cache misses", [({}, cache["misses"])]),
+                ("glm_ocr_cache_hit_ratio", "gauge", "OCR cache hit ratio", [({}, cache["hit_ratio"])]),
+            ]
+
+        hosts = client.backend_stats()
+        collected += [
+            ("glm_ocr_backend_requests_total", "counter", "Requests sent to each Ollama host",
+             [({"host": host["url"]}, host["requests"]) for host in hosts]),
+            ("glm_ocr_backend_errors_total", "counter", "Failed requests per Ollama host",
+             [({"host": host["url"]}, host["errors"]) for host in hosts]),
+            ("glm_ocr_backend_outstanding", "gauge", "Requests outstanding per Ollama host",
+             [({"host": host["url"]}, host["outstanding"]) for host in hosts]),
+            ("glm_ocr_backend_available", "gauge", "Whether each Ollama host is accepting requests",
+             [({"host": host["url"]}, int(host["available"])) for host in hosts]),
+        ]
+
+        retries = client.retry_stats()
+        breaker = retries.get("breaker") or {}
+        collected += [
+            ("glm_ocr_retries_total", "counter", "Ollama request retries",
+             [({}, retries.get("retries"))]),
+            ("glm_ocr_breaker_open", "gauge", "Whether the circuit breaker is open",
+             [({}, None if not breaker else int(breaker.get("state") == "open"))]),
+            ("glm_ocr_breaker_trips_total", "counter", "Circuit breaker trips",
+             [({}, breaker.get("trips"))]),
+        ]
+        return collected
+
+    return _collect
+
+
+def mount_metrics(app: Any, registry: Optional[MetricsRegistry] = None, path: str = "/metrics") -> None:
+    """
+    在 FastAPI/Starlette 应用上挂载指标端点
+    Mount the metrics endpoint on a FastAPI/Starlette app
+
+    Args:
+        app: FastAPI 应用 | FastAPI app
+        registry: 指标注册表，默认使用全局注册表 | Registry, the global one by default
+        path: 端点路径 | Endpoint path
+    """
+    from starlette.responses import Response
+
+    registry = registry or REGISTRY
+
+    def _metrics() -> Response:
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+    app.add_api_route(path, _metrics, methods=["GET"], include_in_schema=False)
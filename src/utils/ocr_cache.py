@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+OCR 结果缓存
+OCR Result Cache
+
+按内容寻址的两级缓存：键为图片字节与模型名、提示词和选项的哈希。
+第一级是内存 LRU，第二级是可选的 SQLite 磁盘存储，两者都支持
+按条目数、字节数和 TTL 淘汰。
+Content-addressed two-tier cache keyed by a hash of the image bytes plus
+model name, prompt and options. Tier one is an in-memory LRU, tier two an
+optional SQLite store; both evict by entry count, size and TTL.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import hashlib  # 哈希计算
+import json  # 选项序列化
+import os  # 操作系统接口
+import sqlite3  # 磁盘缓存
+import threading  # 线程锁
+import time  # 时间戳
+from collections import OrderedDict  # LRU 顺序
+from typing import Any, Dict, Optional, Tuple
+
+from .env import env_bool, env_float, env_int, env_str
+
+# 每插入多少次执行一次磁盘淘汰
+# Run disk eviction once every N inserts
+_DISK_EVICT_INTERVAL = 64
+
+
+class OCRCache:
+    """
+    OCR 结果的两级缓存（线程安全）
+    Two-tier cache for OCR results (thread-safe)
+
+    Example:
+        >>> cache = OCRCache(max_entries=256, disk_path="ocr_cache.sqlite3")
+        >>> key = OCRCache.make_key(image_bytes, "glm-ocr", prompt, options)
+        >>> cache.get(key) is None
+        True
+        >>> cache.set(key, "# Title")
+        >>> cache.get(key)
+        '# Title'
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 100_000,
+        disk_max_bytes: int = 1024 * 1024 * 1024
+    ):
+        """
+        初始化缓存
+        Initialize the cache
+
+        Args:
+            max_entries: 内存中最多保留的条目数 | Maximum in-memory entries
+            max_bytes: 内存中结果文本的最大总字节数 | Maximum in-memory text bytes
+            ttl: 条目过期时间（秒），None 表示不过期 | Entry lifetime in seconds, None for no expiry
+            disk_path: SQLite 文件路径，None 表示不使用磁盘缓存
+                       SQLite file path, None disables the disk tier
+            disk_max_entries: 磁盘中最多保留的条目数 | Maximum disk entries
+            disk_max_bytes: 磁盘中结果文本的最大总字节数 | Maximum disk text bytes
+        """
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.disk_path = disk_path
+        self.disk_max_entries = max(1, disk_max_entries)
+        self.disk_max_bytes = max(1, disk_max_bytes)
+
+        self._lock = threading.Lock()
+        # key -> (文本, 创建时间, 字节数) | key -> (text, created, size)
+        self._memory: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._memory_bytes = 0
+
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_inserts = 0
+        if disk_path:
+            self._open_disk(disk_path)
+
+    @classmethod
+    def from_env(cls) -> Optional["OCRCache"]:
+        """
+        从环境变量创建缓存，禁用时返回 None
+        Build the cache from environment variables, None when disabled
+
+        Environment Variables:
+            OCR_CACHE_ENABLED: 启用缓存（默认：true）
+            OCR_CACHE_MAX_ENTRIES: 内存条目上限（默认：1024）
+            OCR_CACHE_MAX_MB: 内存大小上限 MB（默认：64）
+            OCR_CACHE_TTL: 过期秒数，0 表示不过期（默认：0）
+            OCR_CACHE_PATH: SQLite 磁盘缓存路径（默认：不启用）
+            OCR_CACHE_DISK_MAX_ENTRIES: 磁盘条目上限（默认：100000）
+            OCR_CACHE_DISK_MAX_MB: 磁盘大小上限 MB（默认：1024）
+        """
+        if not env_bool("OCR_CACHE_ENABLED", True):
+            return None
+        return cls(
+            max_entries=env_int("OCR_CACHE_MAX_ENTRIES", 1024),
+            max_bytes=env_int("OCR_CACHE_MAX_MB", 64) * 1024 * 1024,
+            ttl=env_float("OCR_CACHE_TTL", 0.0),
+            disk_path=env_str("OCR_CACHE_PATH"),
+            disk_max_entries=env_int("OCR_CACHE_DISK_MAX_ENTRIES", 100_000),
+            disk_max_bytes=env_int("OCR_CACHE_DISK_MAX_MB", 1024) * 1024 * 1024,
+        )
+
+    @staticmethod
+    def make_key(
+        image_bytes: bytes,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        计算缓存键
+        Compute a cache key
+
+        Args:
+            image_bytes: 图片字节 | Image bytes
+            model: 模型名称 | Model name
+            prompt: 提示词 | Prompt
+            options: 生成选项 | Generation options
+
+        Returns:
+            str: SHA-256 十六进制摘要 | SHA-256 hex digest
+        """
+        digest = hashlib.sha256()
+        digest.update(image_bytes)
+        digest.update(b"\0")
+        digest.update(
+            json.dumps(
+                {"model": model, "prompt": prompt, "options": options or {}},
+                sort_keys=True,
+                ensure_ascii=False,
+            ).encode("utf-8")
+        )
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # 磁盘层 | Disk tier
+    # ------------------------------------------------------------------
+
+    def _open_disk(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS ocr_cache_accessed ON ocr_cache (accessed)"
+        )
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        row = self._db.execute(
+            "SELECT value, created FROM ocr_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        if self._is_expired(created, now):
+            self._db.execute("DELETE FROM ocr_cache WHERE key = ?", (key,))
+            self._counters["expired"] += 1
+            return None
+        self._db.execute("UPDATE ocr_cache SET accessed = ? WHERE key = ?", (now, key))
+        return value, created
+
+    def _disk_set(self, key: str, value: str, size: int, now: float) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO ocr_cache (key, value, size, created, accessed)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (key, value, size, now, now),
+        )
+        self._disk_inserts += 1
+        if self._disk_inserts % _DISK_EVICT_INTERVAL == 0:
+            self._disk_evict(now)
+
+    def _disk_evict(self, now: float) -> None:
+        """
+        按 TTL、条目数和总字节数淘汰磁盘条目（最久未访问优先）
+        Evict disk entries by TTL, count and total size (least recently used first)
+        """
+        if self.ttl is not None:
+            cursor = self._db.execute(
+                "DELETE FROM ocr_cache WHERE created < ?", (now - self.ttl,)
+            )
+            self._counters["expired"] += max(0, cursor.rowcount)
+
+        cursor = self._db.execute(
+            "DELETE FROM ocr_cache WHERE key IN ("
+            " SELECT key FROM ocr_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.disk_max_entries,),
+        )
+        self._counters["evictions"] += max(0, cursor.rowcount)
+
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()[0]
+        while total > self.disk_max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM ocr_cache ORDER BY accessed ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM ocr_cache WHERE key = ?", (row[0],))
+            self._counters["evictions"] += 1
+            total -= row[1]
+
+    # ------------------------------------------------------------------
+    # 内存层 | Memory tier
+    # ------------------------------------------------------------------
+
+    def _is_expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _memory_set(self, key: str, value: str, created: float, size: int) -> None:
+        if self.max_entries == 0 or size > self.max_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old[2]
+        self._memory[key] = (value, created, size)
+        self._memory_bytes += size
+
+        while self._memory and (
+            len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes
+        ):
+            _, (_, _, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._counters["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # 公共接口 | Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        查询缓存
+        Look up a cached result
+
+        Args:
+            key: 缓存键 | Cache key
+
+        Returns:
+            Optional[str]: 缓存的识别结果，未命中返回 None
+                           Cached text, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created, size = entry
+                if not self._is_expired(created, now):
+                    self._memory.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self._memory_bytes -= size
+                self._counters["expired"] += 1
+
+            if self._db is not None:
+                found = self._disk_get(key, now)
+                if found is not None:
+                    value, created = found
+                    # 磁盘命中后提升到内存层
+                    # Promote disk hits into the memory tier
+                    self._memory_set(key, value, created, len(value.encode("utf-8")))
+                    self._counters["hits"] += 1
+                    self._counters["disk_hits"] += 1
+                    return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        写入缓存
+        Store a result
+
+        Args:
+            key: 缓存键 | Cache key
+            value: 识别结果 | Recognized text
+        """
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._counters["sets"] += 1
+            self._memory_set(key, value, now, size)
+            if self._db is not None:
+                self._disk_set(key, value, size, now)
+
+    def clear(self) -> None:
+        """
+        清空所有缓存条目（统计计数保留）
+        Remove every cached entry (counters are kept)
+        """
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM ocr_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+        Get cache statistics
+
+        Returns:
+            dict: 命中/未命中次数、命中率、条目数和字节数
+                  Hit/miss counts, hit ratio, entry count and bytes
+        """
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._counters)
+            snapshot["memory_entries"] = len(self._memory)
+            snapshot["memory_bytes"] = self._memory_bytes
+            if self._db is not None:
+                count, total = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache"
+                ).fetchone()
+                snapshot["disk_entries"] = count
+                snapshot["disk_bytes"] = total
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        return snapshot
+
+    def close(self) -> None:
+        """关闭磁盘缓存连接 | Close the disk tier connection"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
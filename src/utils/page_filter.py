@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+空白页与重复页过滤
+Blank and Duplicate Page Filter
+
+扫描批次中常有空白分隔页和重复的封面、模板页。栅格化后、OCR 之前，
+用 NumPy 在缩小的灰度页面上计算墨迹比例跳过近乎空白的页面，并用
+感知哈希查找同一文档中已识别过的近似重复页面（重新扫描或略有偏移的
+页面），直接复用其结果。感知哈希只用于筛选候选，复用前还要确认：
+两页的全分辨率墨迹掩码对齐偏移后逐区块比较，只容忍零散的扫描噪点和
+笔画边缘的细微差异；任何一个区块中成片的差异（例如发票号或金额中
+改变的几个数字）都说明不是重复页。
+Scanned batches are full of blank separator sheets and repeated cover or
+boilerplate pages. After rasterization and before OCR, NumPy measures the
+ink coverage of a downsampled grayscale page to skip near-blank pages, and
+a perceptual hash finds near-duplicates (rescanned or slightly shifted
+copies) of pages already recognized in the same document so their result
+is reused. The hash only selects candidates; before reuse the two
+full-resolution ink masks are aligned for the shift between them and
+compared block by block. Scattered scan specks and stroke edges are
+tolerated, but a solid difference in any block (e.g. the few digits that
+change in an invoice number or amount) means the pages are not duplicates.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import threading  # 线程锁
+import zlib  # 墨迹掩码压缩
+from dataclasses import dataclass  # 数据类
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from .env import env_bool, env_float, env_int
+
+T = TypeVar("T")
+
+# 过滤后的页面路由（与文本层路由一起计数）| Routes of filtered pages (counted with the text-layer routes)
+ROUTE_SKIPPED = "skipped"
+ROUTE_REUSED = "reused"
+REASON_BLANK = "blank"
+REASON_DUPLICATE = "duplicate"
+
+# 空白检测用缩略图的最长边（像素）| Longest side of the blankness thumbnail (pixels)
+_THUMB_SIDE = 512
+
+# 与背景灰度相差超过该值的像素视为墨迹 | Pixels this far from the background gray count as ink
+_INK_DELTA = 32
+
+# 重复检测掩码使用更严格的阈值，忽略抗锯齿的浅色边缘 | Stricter threshold for the duplicate mask, ignoring light anti-aliased edges
+_MASK_DELTA = 48
+
+# 计算空白时忽略的页边比例（扫描件边缘常有黑边）| Page margin ignored for blankness (scans often have dark edges)
+_MARGIN = 0.04
+
+# 感知哈希：32x32 DCT 的左上 8x8 低频分量 | Perceptual hash: low 8x8 of a 32x32 DCT
+_HASH_SIZE = 32
+_HASH_LOW = 8
+
+# 掩码确认时比较的区块边长（像素，约为 200 DPI 下一个字符）| Side of the blocks compared when confirming (pixels, about one character at 200 DPI)
+_CELL = 32
+
+# 每页最多确认的候选数（按哈希距离从近到远）| Candidates confirmed per page at most (nearest hash first)
+_MAX_CANDIDATES = 4
+
+
+@dataclass
+class PageFilterConfig:
+    """
+    空白页与重复页过滤配置
+    Blank and duplicate page filter configuration
+
+    Attributes:
+        skip_blank: 是否跳过空白页 | Skip blank pages
+        blank_ink_ratio: 墨迹比例低于该值的页面视为空白 | Pages with less ink than this ratio are blank
+        dedupe: 是否复用近似重复页的结果 | Reuse results of near-duplicate pages
+        hash_distance: 感知哈希的最大汉明距离（筛选候选）| Maximum perceptual hash Hamming distance (candidates)
+        max_shift: 对齐时搜索的最大偏移（页面长边的比例）| Largest offset searched when aligning (share of the long side)
+        max_cell_diff: 任一区块中允许的不匹配墨迹像素数 | Unmatched ink pixels allowed in any block
+    """
+
+    skip_blank: bool = True
+    blank_ink_ratio: float = 0.0002
+    dedupe: bool = True
+    hash_distance: int = 10
+    max_shift: float = 0.01
+    max_cell_diff: int = 12
+
+    @classmethod
+    def from_env(cls) -> "PageFilterConfig":
+        """
+        从环境变量创建配置
+        Build the configuration from environment variables
+
+        Environment Variables:
+            PDF_SKIP_BLANK: 跳过空白页（默认：true）
+            PDF_BLANK_INK_RATIO: 空白页的墨迹比例上限（默认：0.0002）
+            PDF_DEDUPE_PAGES: 复用近似重复页的结果（默认：true）
+            PDF_DUPLICATE_HASH_DISTANCE: 感知哈希的最大汉明距离（默认：10）
+            PDF_DUPLICATE_MAX_SHIFT: 对齐时的最大偏移，页面长边的比例（默认：0.01）
+            PDF_DUPLICATE_MAX_CELL_DIFF: 任一区块允许的不匹配墨迹像素数（默认：12）
+        """
+        return cls(
+            skip_blank=env_bool("PDF_SKIP_BLANK", cls.skip_blank),
+            blank_ink_ratio=max(0.0, env_float("PDF_BLANK_INK_RATIO", cls.blank_ink_ratio)),
+            dedupe=env_bool("PDF_DEDUPE_PAGES", cls.dedupe),
+            hash_distance=min(63, max(0, env_int("PDF_DUPLICATE_HASH_DISTANCE", cls.hash_distance))),
+            max_shift=min(0.1, max(0.0, env_float("PDF_DUPLICATE_MAX_SHIFT", cls.max_shift))),
+            max_cell_diff=max(0, env_int("PDF_DUPLICATE_MAX_CELL_DIFF", cls.max_cell_diff)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.skip_blank or self.dedupe
+
+
+@dataclass
+class PageSignature:
+    """
+    页面的空白度和重复检测特征（可跨进程传递）
+    A page's blankness and duplicate-detection features (picklable)
+
+    Attributes:
+        ink_ratio: 墨迹像素比例 | Share of ink pixels
+        blank: 是否为空白页 | Whether the page is blank
+        phash: 64 位感知哈希 | 64-bit perceptual hash
+        mask: 去除孤立噪点后的全分辨率墨迹掩码（按位打包并压缩）
+              Full-resolution ink mask without isolated specks (bit-packed and compressed)
+        shape: 掩码尺寸（高, 宽）| Mask shape (height, width)
+    """
+
+    ink_ratio: float
+    blank: bool
+    phash: int = 0
+    mask: Optional[bytes] = None
+    shape: Tuple[int, int] = (0, 0)
+
+
+_DCT_CACHE: dict = {}
+
+
+def _dct_matrix(size: int):
+    """DCT-II 正交矩阵 | Orthonormal DCT-II matrix"""
+    import numpy as np
+
+    if size not in _DCT_CACHE:
+        k = np.arange(size)[:, None]
+        n = np.arange(size)[None, :]
+        matrix = np.sqrt(2.0 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+        matrix[0] /= np.sqrt(2.0)
+        _DCT_CACHE[size] = matrix
+    return _DCT_CACHE[size]
+
+
+def _gray_thumbnail(gray: Any, side: int):
+    """缩小为灰度 NumPy 数组（盒式滤波抑制孤立噪点）| Downsample to a grayscale array (box filter damps speckles)"""
+    import numpy as np
+    from PIL import Image
+
+    width, height = gray.size
+    scale = min(1.0, side / max(width, height))
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return np.asarray(gray.resize(size, Image.BOX) if scale < 1.0 else gray, dtype=np.int16)
+
+
+def _perceptual_hash(pixels) -> int:
+    """感知哈希：低频 DCT 系数与其中位数比较 | Perceptual hash: low DCT coefficients against their median"""
+    import numpy as np
+    from PIL import Image
+
+    small = np.asarray(
+        Image.fromarray(pixels.astype(np.uint8)).resize((_HASH_SIZE, _HASH_SIZE), Image.BOX),
+        dtype=np.float64,
+    )
+    dct = _dct_matrix(_HASH_SIZE)
+    low = (dct @ small @ dct.T)[:_HASH_LOW, :_HASH_LOW].flatten()[1:]
+    bits = low > np.median(low)
+    return int(sum(1 << i for i, bit in enumerate(bits) if bit))
+
+
+def ink_mask(gray: Any, background: float):
+    """
+    全分辨率墨迹掩码：与背景灰度相差超过阈值的像素
+    Full-resolution ink mask: pixels further than the threshold from the background gray
+
+    Args:
+        gray: 灰度 PIL 图片 | Grayscale PIL image
+        background: 背景灰度 | Background gray level
+
+    Returns:
+        numpy.ndarray: 布尔掩码 | Boolean mask
+    """
+    import numpy as np
+
+    pixels = np.asarray(gray)
+    # 在 uint8 上直接比较，避免整页的 int16 副本 | Compare on uint8 directly, avoiding a full-page int16 copy
+    return (pixels < background - _MASK_DELTA) | (pixels > background + _MASK_DELTA)
+
+
+def _neighbours(mask):
+    """3x3 邻域中是否有墨迹（不含自身）| Whether any 3x3 neighbour is ink (the pixel itself excluded)"""
+    import numpy as np
+
+    height, width = mask.shape
+    padded = np.pad(mask, 1)
+    found = np.zeros_like(mask)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dy != 1 or dx != 1:
+                found |= padded[dy:dy + height, dx:dx + width]
+    return found
+
+
+def _despeckle(mask):
+    """去除孤立的噪点像素 | Remove isolated speck pixels"""
+    return mask & _neighbours(mask)
+
+
+def _dilate(mask):
+    """3x3 膨胀，容忍一个像素的笔画边缘差异 | 3x3 dilation, tolerating one-pixel stroke edge differences"""
+    return mask | _neighbours(mask)
+
+
+def _unpack(signature: PageSignature):
+    import numpy as np
+
+    height, width = signature.shape
+    bits = np.unpackbits(
+        np.frombuffer(zlib.decompress(signature.mask), dtype=np.uint8), count=height * width
+    )
+    return bits.reshape(height, width).astype(bool)
+
+
+def _best_offset(profile_a, profile_b, limit: int) -> int:
+    """
+    使两个墨迹投影最吻合的偏移（b[i] 对应 a[i - offset]）
+    Offset at which two ink projections agree best (b[i] matches a[i - offset])
+    """
+    import numpy as np
+
+    size = len(profile_a)
+    best, best_score = 0, -1.0
+    for offset in range(-limit, limit + 1):
+        if offset >= 0:
+            score = float(np.dot(profile_a[:size - offset], profile_b[offset:]))
+        else:
+            score = float(np.dot(profile_a[-offset:], profile_b[:size + offset]))
+        # 得分相同时取更小的偏移 | Prefer the smaller offset on ties
+        if score > best_score or (score == best_score and abs(offset) < abs(best)):
+            best, best_score = offset, score
+    return best
+
+
+def mask_difference(a: PageSignature, b: PageSignature, max_shift: float = 0.01) -> Optional[int]:
+    """
+    对齐两页墨迹掩码后，任一区块中互相覆盖不到的墨迹像素数的最大值
+    After aligning two pages' ink masks, the largest number of ink pixels in
+    any block that the other page does not cover
+
+    每页的墨迹都与另一页膨胀一个像素后的墨迹比较，因此笔画边缘的细微差异
+    不计入；差异按区块统计，改变的几个字符会集中在一个区块中。
+    Each page's ink is checked against the other page's ink dilated by one
+    pixel, so small stroke edge differences do not count; differences are
+    counted per block, where a few changed characters add up.
+
+    Args:
+        a: 第一页的特征 | First page's features
+        b: 第二页的特征 | Second page's features
+        max_shift: 对齐时搜索的最大偏移（页面长边的比例）| Largest offset searched (share of the long side)
+
+    Returns:
+        Optional[int]: 不匹配像素最多的区块中的像素数，尺寸不同无法比较时为 None
+                       Unmatched pixels in the worst block, None when the shapes differ
+    """
+    import numpy as np
+
+    if a.mask is None or b.mask is None or a.shape != b.shape:
+        return None
+    mask_a, mask_b = _unpack(a), _unpack(b)
+    height, width = mask_a.shape
+    limit = int(max(height, width) * max_shift)
+    dy = _best_offset(mask_a.sum(axis=1), mask_b.sum(axis=1), min(limit, height - 1))
+    dx = _best_offset(mask_a.sum(axis=0), mask_b.sum(axis=0), min(limit, width - 1))
+
+    # 只比较对齐后的重叠区域 | Only the overlap after alignment is compared
+    mask_a = mask_a[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)]
+    mask_b = mask_b[max(0, dy):height + min(0, dy), max(0, dx):width + min(0, dx)]
+    unmatched = (mask_a & ~_dilate(mask_b)) | (mask_b & ~_dilate(mask_a))
+    if not unmatched.any():
+        return 0
+
+    rows, cols = unmatched.shape
+    padded = np.pad(unmatched, ((0, -rows % _CELL), (0, -cols % _CELL)))
+    cells = padded.reshape(padded.shape[0] // _CELL, _CELL, padded.shape[1] // _CELL, _CELL)
+    return int(cells.sum(axis=(1, 3)).max())
+
+
+def page_signature(image: Any, config: PageFilterConfig) -> Optional[PageSignature]:
+    """
+    计算页面特征，未安装 NumPy 或过滤未启用时返回 None
+    Compute a page's features, None when NumPy is missing or filtering is off
+
+    Args:
+        image: PIL 页面图片 | PIL page image
+        config: 过滤配置 | Filter configuration
+
+    Returns:
+        Optional[PageSignature]: 页面特征 | Page features
+    """
+    if not config.enabled:
+        return None
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+
+    gray = image.convert("L")
+    pixels = _gray_thumbnail(gray, _THUMB_SIDE)
+    background = float(np.median(pixels))
+    height, width = pixels.shape
+    top, left = int(height * _MARGIN), int(width * _MARGIN)
+    inner = pixels[top:height - top or None, left:width - left or None]
+    ink_ratio = float(np.mean(np.abs(inner - background) > _INK_DELTA)) if inner.size else 0.0
+    blank = config.skip_blank and ink_ratio < config.blank_ink_ratio
+    if blank or not config.dedupe:
+        return PageSignature(ink_ratio, blank)
+
+    mask = _despeckle(ink_mask(gray, background))
+    packed = zlib.compress(np.packbits(mask).tobytes(), 1)
+    return PageSignature(ink_ratio, False, _perceptual_hash(pixels), packed, mask.shape)
+
+
+class DuplicateIndex(Generic[T]):
+    """
+    同一文档内已识别页面的索引，用于查找近似重复页（线程安全）
+    Index of the pages already recognized in one document, for finding
+    near-duplicates (thread-safe)
+
+    掩码完全相同的页面直接命中；其余候选按哈希距离从近到远确认，
+    每页最多确认 _MAX_CANDIDATES 个。
+    Pages with an identical mask match at once; other candidates are
+    confirmed nearest hash first, at most _MAX_CANDIDATES per page.
+
+    Example:
+        >>> index = DuplicateIndex(config)
+        >>> earlier = index.find(signature)
+        >>> if earlier is None:
+        ...     index.add(signature, recognize(page))
+    """
+
+    def __init__(self, config: Optional[PageFilterConfig] = None):
+        self.config = config or PageFilterConfig()
+        self._exact: Dict[Tuple[Tuple[int, int], bytes], T] = {}
+        self._entries: List[Tuple[PageSignature, T]] = []
+        self._lock = threading.Lock()
+
+    def find(self, signature: Optional[PageSignature]) -> Optional[T]:
+        """查找近似重复的页面 | Find a near-duplicate page"""
+        if signature is None or signature.mask is None:
+            return None
+        with self._lock:
+            key = (signature.shape, signature.mask)
+            if key in self._exact:
+                return self._exact[key]
+            candidates = [
+                (bin(signature.phash ^ other.phash).count("1"), other, value)
+                for other, value in self._entries
+                if other.shape == signature.shape
+            ]
+        candidates = sorted(
+            (item for item in candidates if item[0] <= self.config.hash_distance),
+            key=lambda item: item[0],
+        )
+        for _, other, value in candidates[:_MAX_CANDIDATES]:
+            difference = mask_difference(signature, other, self.config.max_shift)
+            if difference is not None and difference <= self.config.max_cell_diff:
+                return value
+        return None
+
+    def add(self, signature: Optional[PageSignature], value: T) -> None:
+        """登记一个已识别（或正在识别）的页面 | Register a page recognized (or being recognized)"""
+        if signature is None or signature.mask is None:
+            return
+        with self._lock:
+            key = (signature.shape, signature.mask)
+            if key not in self._exact:
+                self._exact[key] = value
+                self._entries.append((signature, value))
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+PDF 栅格化工具
+PDF Rasterization Utilities
+
+将需要 OCR 的页面按连续区间分组，每个区间只调用一次 poppler，
+而不是每页启动一个进程并重新解析整个 PDF。页面以生成器方式惰性产出。
+Groups the pages that need OCR into contiguous runs and renders each run
+with a single poppler invocation, instead of spawning one process (and
+re-parsing the whole PDF) per page. Pages are yielded lazily.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+from dataclasses import dataclass  # 数据类
+from typing import Iterable, Iterator, List, Tuple
+
+from .env import env_int, env_str
+
+
+@dataclass
+class RasterConfig:
+    """
+    栅格化配置
+    Rasterization configuration
+
+    Attributes:
+        dpi: 渲染分辨率 | Render resolution
+        fmt: poppler 输出格式（ppm/png/jpeg/tiff）| poppler output format
+        thread_count: 每个区间使用的 poppler 进程数 | poppler processes per run
+        chunk_size: 单次调用渲染的最大页数，0 表示不限制
+                    Maximum pages rendered per call, 0 for unlimited
+    """
+
+    dpi: int = 200
+    fmt: str = "ppm"
+    thread_count: int = 1
+    chunk_size: int = 8
+
+    @classmethod
+    def from_env(cls) -> "RasterConfig":
+        """
+        从环境变量创建配置
+        Build the configuration from environment variables
+
+        Environment Variables:
+            PDF_RASTER_DPI: 渲染分辨率（默认：200）
+            PDF_RASTER_FORMAT: poppler 输出格式（默认：ppm）
+            PDF_RASTER_THREADS: 每个区间的 poppler 进程数（默认：1）
+            PDF_RASTER_CHUNK: 单次调用的最大页数（默认：8）
+        """
+        return cls(
+            dpi=max(36, env_int("PDF_RASTER_DPI", cls.dpi)),
+            fmt=(env_str("PDF_RASTER_FORMAT", cls.fmt) or cls.fmt).lower(),
+            thread_count=max(1, env_int("PDF_RASTER_THREADS", cls.thread_count)),
+            chunk_size=max(0, env_int("PDF_RASTER_CHUNK", cls.chunk_size)),
+        )
+
+
+def group_page_runs(page_numbers: Iterable[int], chunk_size: int = 0) -> List[Tuple[int, int]]:
+    """
+    将页码分组为连续区间
+    Group page numbers into contiguous runs
+
+    Args:
+        page_numbers: 页码（从 1 开始）| Page numbers (1-based)
+        chunk_size: 每个区间的最大页数，0 表示不限制
+                    Maximum pages per run, 0 for unlimited
+
+    Returns:
+        List[Tuple[int, int]]: (起始页, 结束页) 列表 | List of (first, last) pages
+
+    Example:
+        >>> group_page_runs([1, 2, 3, 7, 8], chunk_size=2)
+        [(1, 2), (3, 3), (7, 8)]
+    """
+    runs: List[Tuple[int, int]] = []
+    for number in sorted(set(page_numbers)):
+        if runs:
+            first, last = runs[-1]
+            size = last - first + 1
+            if number == last + 1 and (chunk_size <= 0 or size < chunk_size):
+                runs[-1] = (first, number)
+                continue
+        runs.append((number, number))
+    return runs
+
+
+class PdfRasterizer:
+    """
+    PDF 页面栅格化器
+    PDF page rasterizer
+
+    Example:
+        >>> rasterizer = PdfRasterizer("scan.pdf")
+        >>> for page_number, image in rasterizer.iter_pages([1, 2, 5]):
+        ...     print(page_number, image.size)
+    """
+
+    def __init__(self, pdf_path: str, config: RasterConfig = None):
+        """
+        初始化栅格化器
+        Initialize the rasterizer
+
+        Args:
+            pdf_path: PDF 文件路径 | Path to PDF file
+            config: 栅格化配置，默认从环境变量读取
+                    Rasterization configuration, read from the environment if not provided
+        """
+        self.pdf_path = pdf_path
+        self.config = config or RasterConfig.from_env()
+
+    def render_range(self, first_page: int, last_page: int) -> list:
+        """
+        用一次 poppler 调用渲染连续的页面区间
+        Render a contiguous page range with one poppler invocation
+
+        Args:
+            first_page: 起始页（从 1 开始）| First page (1-based)
+            last_page: 结束页（包含）| Last page (inclusive)
+
+        Returns:
+            list: PIL 图片列表 | List of PIL images
+        """
+        from pdf2image import convert_from_path
+
+        return convert_from_path(
+            self.pdf_path,
+            dpi=self.config.dpi,
+            first_page=first_page,
+            last_page=last_page,
+            fmt=self.config.fmt,
+            thread_count=min(self.config.thread_count, last_page - first_page + 1),
+        )
+
+    def iter_pages(self, page_numbers: Iterable[int]) -> Iterator[Tuple[int, object]]:
+        """
+        按页码顺序惰性产出渲染后的页面
+        Lazily yield rendered pages in page order
+
+        每次只渲染一个区间，内存中最多保留 chunk_size 张图片。
+        Only one run is rendered at a time, so at most chunk_size images are
+        held in memory.
+
+        Args:
+            page_numbers: 需要渲染的页码（从 1 开始）| Page numbers to render (1-based)
+
+        Yields:
+            Tuple[int, Image]: (页码, PIL 图片) | (page number, PIL image)
+        """
+        for first, last in group_page_runs(page_numbers, self.config.chunk_size):
+            images = self.render_range(first, last)
+            for offset, image in enumerate(images):
+                yield first + offset, image
+            del images
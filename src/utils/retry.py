@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+重试与熔断
+Retries and Circuit Breaking
+
+为 Ollama 请求提供带抖动的指数退避重试，以及在服务器明显不可用时
+快速失败、稍后再探测的熔断器。两者都记录计数，便于在生产环境观察。
+Provides jittered exponential-backoff retries for Ollama requests and a
+circuit breaker that fails fast once the server is clearly down and
+probes it again later. Both keep counters for production monitoring.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import asyncio  # 异步等待
+import random  # 退避抖动
+import threading  # 线程锁
+import time  # 计时
+from dataclasses import dataclass  # 数据类
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from .env import env_float, env_int
+
+R = TypeVar("R")
+
+# 异常分类函数 | Exception classifier
+Classifier = Callable[[BaseException], bool]
+
+# 熔断器状态 | Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class RetryPolicy:
+    """
+    重试和超时策略
+    Retry and timeout policy
+
+    Attributes:
+        max_retries: 首次请求之外的最大重试次数 | Retries after the first attempt
+        backoff_base: 第一次重试的退避上限（秒）| Backoff cap for the first retry (seconds)
+        backoff_max: 单次退避的最大时长（秒）| Maximum single backoff (seconds)
+        connect_timeout: 建立连接的超时（秒）| Connect timeout (seconds)
+        read_timeout: 等待响应数据的超时（秒）| Read timeout (seconds)
+        retry_statuses: 可重试的 HTTP 状态码 | Retryable HTTP status codes
+    """
+
+    max_retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 300.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """
+        从环境变量创建策略
+        Build the policy from environment variables
+
+        Environment Variables:
+            OLLAMA_MAX_RETRIES: 最大重试次数（默认：2）
+            OLLAMA_RETRY_BACKOFF: 初始退避秒数（默认：0.5）
+            OLLAMA_RETRY_BACKOFF_MAX: 最大退避秒数（默认：8）
+            OLLAMA_CONNECT_TIMEOUT: 连接超时秒数（默认：10）
+            OLLAMA_READ_TIMEOUT: 读取超时秒数（默认：300）
+        """
+        return cls(
+            max_retries=max(0, env_int("OLLAMA_MAX_RETRIES", cls.max_retries)),
+            backoff_base=max(0.0, env_float("OLLAMA_RETRY_BACKOFF", cls.backoff_base)),
+            backoff_max=max(0.0, env_float("OLLAMA_RETRY_BACKOFF_MAX", cls.backoff_max)),
+            connect_timeout=max(0.1, env_float("OLLAMA_CONNECT_TIMEOUT", cls.connect_timeout)),
+            read_timeout=max(0.1, env_float("OLLAMA_READ_TIMEOUT", cls.read_timeout)),
+        )
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """requests 使用的 (连接, 读取) 超时 | (connect, read) timeout for requests"""
+        return (self.connect_timeout, self.read_timeout)
+
+    def backoff(self, retry: int) -> float:
+        """
+        第 retry 次重试前的等待时间（完全抖动）
+        Wait before the given retry (full jitter)
+
+        Args:
+            retry: 重试序号（从 0 开始）| Retry number (0-based)
+
+        Returns:
+            float: 等待秒数 | Seconds to wait
+        """
+        cap = min(self.backoff_max, self.backoff_base * (2 ** retry))
+        return random.uniform(0, cap)
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    熔断器打开时快速失败的错误
+    Raised to fail fast while the circuit breaker is open
+    """
+
+
+class CircuitBreaker:
+    """
+    熔断器（线程安全）
+    Circuit breaker (thread-safe)
+
+    连续失败达到阈值后打开，打开期间请求立即失败；冷却时间过后进入半开状态，
+    只放行一个探测请求，成功则关闭，失败则重新打开。
+    Opens after a run of consecutive failures and rejects requests while
+    open; after the cool-down it goes half-open and lets a single probe
+    through, closing on success and re-opening on failure.
+
+    Example:
+        >>> breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+        >>> if breaker.allow():
+        ...     ...
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        初始化熔断器
+        Initialize the circuit breaker
+
+        Args:
+            failure_threshold: 打开前的连续失败次数，0 表示禁用
+                               Consecutive failures before opening, 0 disables
+            reset_timeout: 打开后到下一次探测的秒数 | Seconds before probing again
+        """
+        self.failure_threshold = max(0, failure_threshold)
+        self.reset_timeout = max(0.0, reset_timeout)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._trips = 0
+        self._rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """
+        从环境变量创建熔断器
+        Build the circuit breaker from environment variables
+
+        Environment Variables:
+            OLLAMA_BREAKER_THRESHOLD: 连续失败阈值，0 禁用（默认：5）
+            OLLAMA_BREAKER_RESET: 再次探测前的秒数（默认：30）
+        """
+        return cls(
+            failure_threshold=env_int("OLLAMA_BREAKER_THRESHOLD", 5),
+            reset_timeout=env_float("OLLAMA_BREAKER_RESET", 30.0),
+        )
+
+    @property
+    def state(self) -> str:
+        """当前状态 | Current state"""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        检查是否允许发送请求
+        Check whether a request may be sent
+
+        Returns:
+            bool: 允许时为 True；拒绝的请求会被计数
+                  True when allowed; rejected requests are counted
+        """
+        if not self.failure_threshold:
+            return True
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """记录成功，关闭熔断器 | Record a success and close the breaker"""
+        with self._lock:
+            self._failures = 0
+            self._state = CLOSED
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """记录失败，必要时打开熔断器 | Record a failure and open the breaker if needed"""
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._trips += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def release_probe(self) -> None:
+        """探测请求以非故障错误结束时放行下一个探测 | Let the next probe through after a non-failure error"""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取熔断器统计信息
+        Get circuit breaker statistics
+
+        Returns:
+            dict: 状态、连续失败数、打开次数和被拒绝的请求数
+                  State, consecutive failures, trip count and rejected requests
+        """
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "rejected": self._rejected,
+            }
+
+
+class Retrier:
+    """
+    按策略执行重试并驱动熔断器（线程安全）
+    Runs calls with retries according to a policy and drives the circuit
+    breaker (thread-safe)
+
+    Example:
+        >>> retrier = Retrier(RetryPolicy.from_env(), CircuitBreaker.from_env())
+        >>> result = retrier.call(send, is_retryable=is_transient, is_failure=is_down)
+        >>> print(retrier.stats())
+    """
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        初始化重试器
+        Initialize the retrier
+
+        Args:
+            policy: 重试策略，默认从环境变量读取 | Retry policy, read from the environment if not provided
+            breaker: 熔断器，默认从环境变量创建 | Circuit breaker, built from the environment if not provided
+        """
+        self.policy = policy or RetryPolicy.from_env()
+        self.breaker = breaker or CircuitBreaker.from_env()
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._retries = 0
+        self._recovered = 0
+        self._exhausted = 0
+
+    def _before_attempt(self, last_error: Optional[BaseException]) -> None:
+        """
+        熔断器打开时快速失败；重试途中打开时抛出上一次的真实错误
+        Fail fast while the breaker is open; if it opened mid-retry, raise the
+        real error from the previous attempt
+        """
+        if not self.breaker.allow():
+            if last_error is not None:
+                raise last_error
+            raise CircuitOpenError(
+                "Ollama 服务器暂时不可用，已快速失败 | Ollama server unavailable, "
+                f"failing fast (稍后重试 | retrying in up to {self.breaker.reset_timeout:.0f}s)"
+            )
+
+    def _after_error(
+        self,
+        error: BaseException,
+        attempt: int,
+        is_retryable: Classifier,
+        is_failure: Classifier
+    ) -> Optional[float]:
+        """
+        记录失败并返回重试前的等待时间，不再重试时返回 None
+        Record a failed attempt and return the wait before retrying, or None to give up
+        """
+        if is_failure(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release_probe()
+
+        if attempt < self.policy.max_retries and is_retryable(error):
+            with self._lock:
+                self._retries += 1
+            return self.policy.backoff(attempt)
+
+        if attempt and is_retryable(error):
+            with self._lock:
+                self._exhausted += 1
+        return None
+
+    def _after_success(self, attempt: int) -> None:
+        """记录成功 | Record a success"""
+        self.breaker.record_success()
+        if attempt:
+            with self._lock:
+                self._recovered += 1
+
+    def call(
+        self,
+        func: Callable[[], R],
+        is_retryable: Classifier,
+        is_failure: Classifier
+    ) -> R:
+        """
+        调用 func，遇到可重试的错误时退避后重试
+        Call func, backing off and retrying on retryable errors
+
+        Args:
+            func: 单次尝试 | One attempt
+            is_retryable: 判断错误是否可重试 | Decides whether an error is retryable
+            is_failure: 判断错误是否说明服务器故障（计入熔断）
+                        Decides whether an error means the server is failing (counts towards the breaker)
+
+        Returns:
+            R: func 的返回值 | The return value of func
+
+        Raises:
+            CircuitOpenError: 如果熔断器处于打开状态 | If the breaker is open
+        """
+        with self._lock:
+            self._calls += 1
+        attempt = 0
+        last_error: Optional[BaseException] = None
+        while True:
+            self._before_attempt(last_error)
+            try:
+                result = func()
+            except Exception as e:
+                wait = self._after_error(e, attempt, is_retryable, is_failure)
+                if wait is None:
+                    raise
+                last_error = e
+                time.sleep(wait)
+                attempt += 1
+                continue
+            except BaseException:
+                # 调用被取消时放行下一个探测 | Let the next probe through on cancellation
+                self.breaker.release_probe()
+                raise
+            self._after_success(attempt)
+            return result
+
+    async def call_async(
+        self,
+        func: Callable[[], Awaitable[R]],
+        is_retryable: Classifier,
+        is_failure: Classifier
+    ) -> R:
+        """
+        call 的异步版本，退避期间不阻塞事件循环
+        Async version of call; backoff does not block the event loop
+        """
+        with self._lock:
+            self._calls += 1
+        attempt = 0
+        last_error: Optional[BaseException] = None
+        while True:
+            self._before_attempt(last_error)
+            try:
+                result = await func()
+            except Exception as e:
+                wait = self._after_error(e, attempt, is_retryable, is_failure)
+                if wait is None:
+                    raise
+                last_error = e
+                await asyncio.sleep(wait)
+                attempt += 1
+                continue
+            except BaseException:
+                # 调用被取消时放行下一个探测 | Let the next probe through on cancellation
+                self.breaker.release_probe()
+                raise
+            self._after_success(attempt)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取重试和熔断统计信息
+        Get retry and circuit breaker statistics
+
+        Returns:
+            dict: 调用数、重试次数、重试后成功数、重试耗尽数和熔断器状态
+                  Calls, retries, calls recovered by a retry, calls that
+                  exhausted their retries and the breaker state
+        """
+        with self._lock:
+            snapshot = {
+                "calls": self._calls,
+                "retries": self._retries,
+                "recovered": self._recovered,
+                "exhausted": self._exhausted,
+            }
+        snapshot["breaker"] = self.breaker.stats()
+        return snapshot
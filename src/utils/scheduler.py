@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+公平调度
+Fair Scheduling
+
+所有会话共用同一个 OCR 客户端时，一个 300 页的 PDF 会占满所有并发，
+其他用户只能排在它后面。调度器以页面（单次 OCR 请求）为单位发放槽位，
+在有等待任务的会话之间轮转，单张图片的请求最多只需等待每个会话一页。
+When every session shares one OCR client, a 300-page PDF takes every slot
+and everyone else waits behind it. The scheduler hands out slots per page
+(one OCR request) and rotates between the sessions that have work
+waiting, so a single image waits for at most one page per session.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import asyncio  # 异步等待
+import threading  # 线程锁
+import time  # 计时
+from collections import OrderedDict, deque  # 轮转队列
+from contextlib import asynccontextmanager, contextmanager  # 上下文管理器
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+from .env import env_bool, env_int
+from .metrics import QUEUE_DEPTH
+
+
+class _Waiter:
+    """
+    等待槽位的任务（线程或协程）
+    A task (thread or coroutine) waiting for a slot
+    """
+
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.future = loop.create_future() if loop is not None else None
+        self.event = threading.Event() if loop is None else None
+        self.granted = False
+
+    def grant(self) -> None:
+        """唤醒等待者（持有调度器锁时调用）| Wake the waiter (called with the scheduler lock held)"""
+        self.granted = True
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class FairScheduler:
+    """
+    按会话轮转的 OCR 并发槽位
+    OCR concurrency slots shared round-robin between sessions
+
+    Example:
+        >>> scheduler = FairScheduler(concurrency=4)
+        >>> with scheduler.slot(session_id):
+        ...     text = client.recognize(page)
+    """
+
+    def __init__(self, concurrency: int = 4):
+        """
+        初始化调度器
+        Initialize the scheduler
+
+        Args:
+            concurrency: 同时进行的 OCR 请求数 | OCR requests running at once
+        """
+        self.concurrency = max(1, concurrency)
+        self._lock = threading.Lock()
+        # 有等待任务的会话，按轮转顺序排列 | Sessions with waiting tasks, in rotation order
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._running = 0
+        self._granted = 0
+        self._waited = 0
+        self._avg_seconds: Optional[float] = None
+
+    @classmethod
+    def from_env(cls, default_concurrency: int = 4) -> Optional["FairScheduler"]:
+        """
+        从环境变量创建调度器，未启用时返回 None
+        Build the scheduler from environment variables, None when disabled
+
+        Environment Variables:
+            OCR_FAIR_SCHEDULING: 启用按会话公平调度（默认：true）
+            OCR_SCHEDULER_CONCURRENCY: 同时进行的 OCR 请求数（默认：OLLAMA_MAX_WORKERS）
+        """
+        if not env_bool("OCR_FAIR_SCHEDULING", True):
+            return None
+        return cls(env_int("OCR_SCHEDULER_CONCURRENCY", default_concurrency))
+
+    def _enqueue(self, session: str, waiter: _Waiter) -> bool:
+        """
+        空闲且无人等待时立即占用槽位，否则加入会话队列
+        Take a slot at once when idle and nobody waits, otherwise queue up
+
+        Returns:
+            bool: 是否需要等待 | Whether the caller has to wait
+        """
+        with self._lock:
+            if self._running < self.concurrency and not self._queues:
+                self._running += 1
+                self._granted += 1
+                return False
+            self._queues.setdefault(session, deque()).append(waiter)
+            self._waited += 1
+        QUEUE_DEPTH.inc()
+        return True
+
+    def _dispatch(self) -> None:
+        """
+        把空闲槽位依次发给轮转中的下一个会话（持有锁时调用）
+        Hand free slots to the next sessions in rotation (called with the lock held)
+        """
+        while self._running < self.concurrency and self._queues:
+            session, waiters = next(iter(self._queues.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                self._queues.move_to_end(session)
+            else:
+                del self._queues[session]
+            self._running += 1
+            self._granted += 1
+            QUEUE_DEPTH.dec()
+            waiter.grant()
+
+    def _release(self, seconds: Optional[float]) -> None:
+        """
+        归还槽位并记录占用时长
+        Return a slot and record how long it was held
+        """
+        with self._lock:
+            self._running -= 1
+            if seconds is not None:
+                # 指数移动平均，用于估算等待时间 | Moving average used for wait estimates
+                self._avg_seconds = (
+                    seconds if self._avg_seconds is None
+                    else 0.8 * self._avg_seconds + 0.2 * seconds
+                )
+            self._dispatch()
+
+    def _withdraw(self, session: str, waiter: _Waiter) -> bool:
+        """
+        取消尚未获得槽位的等待者
+        Withdraw a waiter that has not been granted a slot
+
+        Returns:
+            bool: 是否已经获得了槽位 | Whether a slot had already been granted
+        """
+        with self._lock:
+            if waiter.granted:
+                return True
+            waiters = self._queues.get(session)
+            if waiters is not None:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._queues[session]
+        QUEUE_DEPTH.dec()
+        return False
+
+    @contextmanager
+    def slot(self, session: str) -> Iterator[None]:
+        """
+        等待并占用一个槽位（阻塞当前线程）
+        Wait for and hold a slot (blocks the calling thread)
+
+        Args:
+            session: 会话标识 | Session identifier
+        """
+        waiter = _Waiter()
+        if self._enqueue(session, waiter):
+            waiter.event.wait()
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self._release(None)
+            raise
+        self._release(time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def slot_async(self, session: str) -> AsyncIterator[None]:
+        """
+        slot 的异步版本，等待时不阻塞事件循环
+        Async version of slot that does not block the event loop while waiting
+        """
+        waiter = _Waiter(asyncio.get_running_loop())
+        if self._enqueue(session, waiter):
+            try:
+                await waiter.future
+            except BaseException:
+                # 已获得槽位但任务被取消时归还 | Return a slot granted to a cancelled task
+                if self._withdraw(session, waiter):
+                    self._release(None)
+                raise
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self._release(None)
+            raise
+        self._release(time.perf_counter() - started)
+
+    def estimate(self, session: str) -> Dict[str, Any]:
+        """
+        估算会话下一个任务的排队位置和等待时间
+        Estimate the queue position and wait for the session's next task
+
+        Returns:
+            dict: position（前面的会话数）、waiting（等待任务数）、eta_seconds
+                  position (sessions ahead), waiting (tasks waiting), eta_seconds
+        """
+        with self._lock:
+            sessions = list(self._queues)
+            position = sessions.index(session) if session in self._queues else len(sessions)
+            waiting = sum(len(waiters) for waiters in self._queues.values())
+            busy = self._running >= self.concurrency
+            avg = self._avg_seconds
+
+        eta = None
+        if not busy and position == 0:
+            eta = 0.0
+        elif avg is not None:
+            # 每个会话每轮获得一个槽位 | Each session gets one slot per round
+            eta = round((position + 1) * avg / self.concurrency, 1)
+        return {"position": position, "waiting": waiting, "busy": busy, "eta_seconds": eta}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取调度统计信息
+        Get scheduling statistics
+        """
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "running": self._running,
+                "waiting": sum(len(waiters) for waiters in self._queues.values()),
+                "sessions_waiting": len(self._queues),
+                "granted": self._granted,
+                "queued": self._waited,
+                "avg_slot_seconds": round(self._avg_seconds, 3) if self._avg_seconds else None,
+            }
+
+
+class ScheduledClient:
+    """
+    在调度器槽位内调用 OCR 客户端的会话代理，其余属性转发给客户端
+    Per-session proxy that calls the OCR client inside scheduler slots;
+    other attributes are forwarded to the client
+
+    Example:
+        >>> client = ScheduledClient(ocr_client, scheduler, request.session_hash)
+        >>> text = client.recognize("page.png")
+    """
+
+    def __init__(self, client: Any, scheduler: FairScheduler, session: str):
+        self.client = client
+        self.scheduler = scheduler
+        self.session = session
+
+    def recognize(self, image: Any) -> str:
+        with self.scheduler.slot(self.session):
+            return self.client.recognize(image)
+
+    def recognize_detailed(self, image: Any) -> Any:
+        with self.scheduler.slot(self.session):
+            return self.client.recognize_detailed(image)
+
+    def recognize_stream(self, image: Any) -> Iterator[str]:
+        """
+        流式识别，整个流期间占用一个槽位。提前停止读取时调用方必须 close()
+        生成器，否则槽位要到垃圾回收时才归还，其他会话会一直等待。
+        Streaming recognition holding one slot for the whole stream. Callers
+        that stop reading early must close() the generator, or the slot is
+        only returned at garbage collection while other sessions wait.
+        """
+        with self.scheduler.slot(self.session):
+            stream = self.client.recognize_stream(image)
+            try:
+                yield from stream
+            finally:
+                # 先结束底层的流（及其 HTTP 响应），再归还槽位
+                # End the underlying stream (and its HTTP response) before the slot is returned
+                stream.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+class AsyncScheduledClient:
+    """
+    ScheduledClient 的异步版本（包装 AsyncOllamaOCR）
+    Async version of ScheduledClient (wraps AsyncOllamaOCR)
+    """
+
+    def __init__(self, client: Any, scheduler: FairScheduler, session: str):
+        self.client = client
+        self.scheduler = scheduler
+        self.session = session
+
+    async def recognize(self, image: Any) -> str:
+        async with self.scheduler.slot_async(self.session):
+            return await self.client.recognize(image)
+
+    async def recognize_detailed(self, image: Any) -> Any:
+        async with self.scheduler.slot_async(self.session):
+            return await self.client.recognize_detailed(image)
+
+    async def recognize_stream(self, image: Any) -> AsyncIterator[str]:
+        """流式识别，提前停止时调用方必须 aclose() | Streaming recognition; callers that stop early must aclose()"""
+        async with self.scheduler.slot_async(self.session):
+            stream = self.client.recognize_stream(image)
+            try:
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+PDF 文本层质量评估
+PDF Text-layer Quality
+
+决定每页使用文本层还是 OCR。空文本层、乱码文本层（不可打印字符、
+私用区字符、替换字符过多），以及含有图片但文字稀疏的页面（扫描件上
+只有页眉页脚的文字）交给 OCR，其余页面直接使用文本层，
+只在 OCR 确实有帮助时才消耗 GPU 推理。
+Decides per page whether to use the text layer or OCR. Empty layers,
+garbled layers (too many unprintable, private-use or replacement
+characters) and sparse layers on pages with images (a scan that only has a
+header or footer as text) go to OCR; every other page uses the text layer,
+so GPU inference is only spent where it actually helps.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import unicodedata  # 字符类别
+from collections import Counter  # 计数
+from dataclasses import dataclass  # 数据类
+from typing import Any, Optional
+
+from .env import env_float, env_str
+
+# 路由目标 | Routes
+ROUTE_TEXT = "text"
+ROUTE_OCR = "ocr"
+
+# 路由原因 | Routing reasons
+REASON_GOOD = "good"
+REASON_FORCED = "forced"
+REASON_EMPTY = "empty"
+REASON_GARBLED = "garbled"
+REASON_SPARSE = "sparse_with_images"
+
+# 路由模式 | Routing modes
+MODES = ("auto", "text", "ocr")
+
+# 视为乱码的字符类别：控制符、私用区、未分配、代理项
+# Character categories counted as garbled: control, private use, unassigned, surrogate
+_GARBLED_CATEGORIES = frozenset(("Cc", "Co", "Cn", "Cs"))
+
+# PDF 用户空间单位（1/72 英寸）| PDF user-space units (1/72 inch)
+_POINTS_PER_INCH = 72.0
+
+
+@dataclass
+class TextLayerConfig:
+    """
+    文本层路由配置
+    Text-layer routing configuration
+
+    Attributes:
+        mode: auto（按质量评估）、text（从不 OCR）、ocr（所有页面 OCR）
+              auto (score quality), text (never OCR), ocr (OCR every page)
+        min_density: 含图片页面的最低字符密度（字符/平方英寸）
+                     Minimum character density on pages with images (characters per square inch)
+        max_garbled_ratio: 乱码字符占非空白字符的最大比例
+                           Maximum share of garbled characters among non-whitespace characters
+    """
+
+    mode: str = "auto"
+    min_density: float = 2.0
+    max_garbled_ratio: float = 0.1
+
+    @classmethod
+    def from_env(cls) -> "TextLayerConfig":
+        """
+        从环境变量创建配置
+        Build the configuration from environment variables
+
+        Environment Variables:
+            PDF_TEXT_LAYER_MODE: auto/text/ocr（默认：auto）
+            PDF_TEXT_MIN_DENSITY: 含图片页面的最低字符密度（默认：2.0 字符/平方英寸）
+            PDF_TEXT_MAX_GARBLED: 乱码字符最大比例（默认：0.1）
+        """
+        mode = (env_str("PDF_TEXT_LAYER_MODE", cls.mode) or cls.mode).lower()
+        return cls(
+            mode=mode if mode in MODES else cls.mode,
+            min_density=max(0.0, env_float("PDF_TEXT_MIN_DENSITY", cls.min_density)),
+            max_garbled_ratio=min(1.0, max(0.0, env_float("PDF_TEXT_MAX_GARBLED", cls.max_garbled_ratio))),
+        )
+
+
+@dataclass
+class TextLayerScore:
+    """
+    单页文本层的评估结果
+    Text-layer assessment for one page
+
+    Attributes:
+        route: text 或 ocr | text or ocr
+        reason: 路由原因 | Routing reason
+        chars: 非空白字符数 | Non-whitespace characters
+        density: 字符/平方英寸 | Characters per square inch
+        garbled_ratio: 乱码字符比例 | Share of garbled characters
+        has_images: 页面是否含图片，未检查时为 None | Whether the page has images, None when not checked
+    """
+
+    route: str
+    reason: str
+    chars: int = 0
+    density: float = 0.0
+    garbled_ratio: float = 0.0
+    has_images: Optional[bool] = None
+
+
+def garbled_ratio(text: str) -> float:
+    """
+    计算乱码字符占非空白字符的比例
+    Share of garbled characters among non-whitespace characters
+
+    乱码字符包括控制符、私用区、未分配码位和替换字符（U+FFFD），
+    通常来自缺少 ToUnicode 映射的字体。
+    Garbled characters are control, private-use, unassigned and replacement
+    (U+FFFD) characters, typically from fonts without a ToUnicode map.
+    """
+    total = garbled = 0
+    for char in text:
+        if char.isspace():
+            continue
+        total += 1
+        if char == "\ufffd" or unicodedata.category(char) in _GARBLED_CATEGORIES:
+            garbled += 1
+    return garbled / total if total else 0.0
+
+
+def page_area_sq_in(page: Any) -> float:
+    """
+    页面面积（平方英寸），无法读取时返回美国信纸面积
+    Page area in square inches, US Letter when the box cannot be read
+    """
+    try:
+        box = page.mediabox
+        area = abs(float(box.width) * float(box.height)) / (_POINTS_PER_INCH ** 2)
+    except Exception:
+        area = 0.0
+    return area or 8.5 * 11
+
+
+def page_has_images(page: Any, max_depth: int = 2) -> bool:
+    """
+    检查页面资源中是否有图片 XObject（不解码图片，包括表单中嵌套的图片）
+    Check the page resources for image XObjects without decoding them
+    (images nested in form XObjects included)
+    """
+
+    def _scan(resources: Any, depth: int) -> bool:
+        try:
+            xobjects = resources.get_object().get("/XObject")
+            if xobjects is None:
+                return False
+            for ref in xobjects.get_object().values():
+                xobject = ref.get_object()
+                subtype = xobject.get("/Subtype")
+                if subtype == "/Image":
+                    return True
+                if subtype == "/Form" and depth < max_depth and "/Resources" in xobject:
+                    if _scan(xobject["/Resources"], depth + 1):
+                        return True
+        except Exception:
+            return False
+        return False
+
+    resources = page.get("/Resources")
+    return resources is not None and _scan(resources, 0)
+
+
+def route_page(page: Any, text: Optional[str], config: TextLayerConfig) -> TextLayerScore:
+    """
+    评估一页的文本层并决定使用文本层还是 OCR
+    Score one page's text layer and decide between the text layer and OCR
+
+    Args:
+        page: pypdf 页面对象 | pypdf page object
+        text: 提取的文本层 | Extracted text layer
+        config: 路由配置 | Routing configuration
+
+    Returns:
+        TextLayerScore: 评估结果 | Assessment
+    """
+    if config.mode == "ocr":
+        return TextLayerScore(ROUTE_OCR, REASON_FORCED)
+
+    text = text or ""
+    chars = sum(1 for char in text if not char.isspace())
+    if config.mode == "text":
+        return TextLayerScore(ROUTE_TEXT, REASON_FORCED, chars=chars)
+    if not chars:
+        return TextLayerScore(ROUTE_OCR, REASON_EMPTY)
+
+    score = TextLayerScore(
+        ROUTE_TEXT,
+        REASON_GOOD,
+        chars=chars,
+        density=chars / page_area_sq_in(page),
+        garbled_ratio=garbled_ratio(text),
+    )
+    if score.garbled_ratio > config.max_garbled_ratio:
+        score.route, score.reason = ROUTE_OCR, REASON_GARBLED
+    elif score.density < config.min_density:
+        # 只有稀疏页面才检查图片 | Only sparse pages pay for the image check
+        score.has_images = page_has_images(page)
+        if score.has_images:
+            score.route, score.reason = ROUTE_OCR, REASON_SPARSE
+    return score
+
+
+def format_route_counts(counts: "Counter[tuple]") -> str:
+    """
+    格式化每条路径的页数，例如 "text 12 (good 12), ocr 3 (empty 1, garbled 2), skipped 1 (blank 1)"
+    Format page counts per path, e.g. "text 12 (good 12), ocr 3 (empty 1, garbled 2), skipped 1 (blank 1)"
+
+    text 和 ocr 始终显示，其他路径（例如空白页过滤）只在有页面时显示。
+    text and ocr are always shown, other paths (such as the blank page filter)
+    only when they have pages.
+
+    Args:
+        counts: 以 (route, reason) 为键的计数 | Counts keyed by (route, reason)
+    """
+    extra = [route for route in dict.fromkeys(r for r, _ in counts) if route not in (ROUTE_TEXT, ROUTE_OCR)]
+    parts = []
+    for route in (ROUTE_TEXT, ROUTE_OCR, *extra):
+        reasons = sorted((reason, n) for (r, reason), n in counts.items() if r == route and n)
+        total = sum(n for _, n in reasons)
+        if route in extra and not total:
+            continue
+        detail = ", ".join(f"{reason} {n}" for reason, n in reasons)
+        parts.append(f"{route} {total}" + (f" ({detail})" if detail else ""))
+    return ", ".join(parts)
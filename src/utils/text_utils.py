@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+文本处理工具
+Text Processing Utilities
+
+=====================================================================
+"""
+
+import re  # 正则表达式
+
+
+def clean_pdf_text(text: str) -> str:
+    """
+    清理 PDF 提取的文本
+    Clean up extracted PDF text
+
+    保留原始行结构，仅移除过多的空行。
+    Preserves original line structure, removes excessive blank lines only.
+
+    Args:
+        text: 原始文本 | Raw text
+
+    Returns:
+        str: 清理后的文本 | Cleaned text
+    """
+    if not text:
+        return text
+
+    # 移除超过 3 个连续空行
+    # Remove excessive blank lines (3+ blank lines -> 2 blank lines)
+    text = re.sub(r'\n\s*\n\s*\n\s*', '\n\n', text)
+    return text.strip()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+图片分块识别
+Tiled Image Recognition
+
+长截图等细长图片整体缩放到模型输入分辨率后文字过小无法识别，超大
+图片还可能超过单张图片的大小限制。分块模式将这类图片切成相互重叠的
+全宽横条并发识别，再按行从上到下拼接 Markdown，去掉重叠区域中重复
+识别的行；横条本身仍然过宽时才在宽度方向继续切分。普通照片和扫描页
+缩放后仍然清晰，照常整体缩放后识别，不分块。
+Elongated images such as scrolling screenshots become unreadable once the
+whole image is downscaled to the model's input resolution, and huge images
+may exceed the size limit for a single image. The tiling mode cuts such
+images into overlapping full-width horizontal strips, recognizes them
+concurrently and stitches the Markdown back together row by row, top to
+bottom, dropping the lines recognized twice in the overlap zones; the
+width is split as well only when a single strip would still be too wide.
+Ordinary photos and scanned pages stay readable once downscaled and are
+recognized whole, without tiling.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import difflib  # 重叠行匹配
+import math  # 图块数量
+import os  # 文件路径
+import threading  # 裁剪锁
+from contextlib import ExitStack  # 关闭打开的图片
+from dataclasses import dataclass, field  # 数据类
+from io import BytesIO  # 内存字节流
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .env import env_bool, env_float, env_int
+
+# 模型的有效输入分辨率（像素，最长边）；更大的图片会被模型缩小
+# The model's effective input resolution (pixels, longest side); larger images are downscaled by the model
+MODEL_INPUT_SIZE = 2048
+
+# 匹配重叠行时比较的行数（上一块末尾和下一块开头）
+# Lines compared when matching the overlap (end of one tile and start of the next)
+_OVERLAP_WINDOW = 40
+
+# 重叠行匹配允许图块边缘被截断的行数 | Cut-off lines allowed at a tile edge when matching the overlap
+_EDGE_SLACK = 2
+
+# 可信的重叠匹配至少包含的字符数，避免只匹配到分隔线等短行
+# Characters a trusted overlap match must contain, so short lines such as rules do not match alone
+_MIN_MATCH_CHARS = 12
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class TilingConfig:
+    """
+    分块识别配置
+    Tiling configuration
+
+    Attributes:
+        enabled: 是否启用分块识别 | Enable tiling
+        tile_size: 图块边长（像素），0 表示使用模型输入分辨率 | Tile side in pixels, 0 uses the model input resolution
+        overlap: 相邻图块的重叠像素 | Overlap between neighbouring tiles in pixels
+        min_scale: 整体缩放的比例低于横条缩放比例的该倍数时分块；横条缩放比例低于该值时在宽度方向切分
+                   Tile when downscaling the whole image keeps less than this share of the
+                   resolution full-width strips keep; split the width when a strip's own scale is below it
+    """
+
+    enabled: bool = True
+    tile_size: int = 0
+    overlap: int = 160
+    min_scale: float = 0.5
+
+    @classmethod
+    def from_env(cls) -> "TilingConfig":
+        """
+        从环境变量创建配置
+        Build the configuration from environment variables
+
+        Environment Variables:
+            OCR_TILING: 启用分块识别（默认：true）
+            OCR_TILE_SIZE: 图块边长，0 表示使用模型输入分辨率（默认：0）
+            OCR_TILE_OVERLAP: 相邻图块的重叠像素（默认：160）
+            OCR_TILE_MIN_SCALE: 整体缩放相对横条缩放的比例低于该值时分块（默认：0.5）
+        """
+        return cls(
+            enabled=env_bool("OCR_TILING", cls.enabled),
+            tile_size=max(0, env_int("OCR_TILE_SIZE", cls.tile_size)),
+            overlap=max(0, env_int("OCR_TILE_OVERLAP", cls.overlap)),
+            min_scale=min(1.0, max(0.0, env_float("OCR_TILE_MIN_SCALE", cls.min_scale))),
+        )
+
+
+def _spans(length: int, tile: int, overlap: int) -> List[Tuple[int, int]]:
+    """
+    沿一个方向均匀排列图块，相邻图块至少重叠 overlap 像素
+    Spread tiles evenly along one axis with at least `overlap` pixels between neighbours
+    """
+    if length <= tile:
+        return [(0, length)]
+    step = tile - overlap
+    count = max(2, math.ceil((length - overlap) / step))
+    stride = (length - tile) / (count - 1)
+    return [(round(i * stride), round(i * stride) + tile) for i in range(count)]
+
+
+def _strip_columns(width: int, tile_size: int, overlap: int, min_scale: float) -> List[Tuple[int, int]]:
+    """
+    横条的列：缩放到图块大小后仍不低于 min_scale 时使用全宽横条，否则在宽度方向切分
+    Columns of a strip: a single full-width column while fitting the width
+    into one tile keeps at least min_scale, otherwise the width is split
+
+    Args:
+        width: 图片宽度 | Image width
+        tile_size: 图块边长 | Tile side
+        overlap: 重叠像素 | Overlap in pixels
+        min_scale: 横条允许的最小缩放比例 | Smallest scale allowed for a strip
+
+    Returns:
+        List[Tuple[int, int]]: 每列的 (left, right) | (left, right) of every column
+    """
+    if tile_size / max(width, 1) >= min_scale:
+        return [(0, width)]
+    return _spans(width, tile_size, min(overlap, tile_size // 2))
+
+
+def plan_tiles(
+    width: int,
+    height: int,
+    tile_size: int,
+    overlap: int,
+    min_scale: float = 0.5
+) -> List[List[Box]]:
+    """
+    计算图块网格，按行从上到下返回，每行从左到右
+    Compute the tile grid, returned row by row from the top, each row left
+    to right
+
+    每行通常只有一个全宽横条；横条高度不小于其宽度，模型缩放横条时
+    只受宽度限制。
+    A row is usually a single full-width strip; strips are at least as tall
+    as they are wide, so only the width limits how far the model scales
+    them down.
+
+    Args:
+        width: 图片宽度 | Image width
+        height: 图片高度 | Image height
+        tile_size: 图块边长 | Tile side
+        overlap: 重叠像素，不超过横条高度的一半 | Overlap in pixels, at most half a strip
+        min_scale: 横条允许的最小缩放比例 | Smallest scale allowed for a strip
+
+    Returns:
+        List[List[Box]]: 每行的 (left, top, right, bottom) 图块 | (left, top, right, bottom) tiles per row
+    """
+    columns = _strip_columns(width, tile_size, overlap, min_scale)
+    strip_height = max(tile_size, max(right - left for left, right in columns))
+    rows = _spans(height, strip_height, min(overlap, strip_height // 2))
+    return [
+        [(left, top, right, bottom) for left, right in columns]
+        for top, bottom in rows
+    ]
+
+
+def _normalize(line: str) -> str:
+    """比较用的行：合并空白 | Line used for comparison, whitespace collapsed"""
+    return " ".join(line.split())
+
+
+def _overlap(upper_lines: List[str], lower_lines: List[str]) -> Optional[Tuple[int, int]]:
+    """
+    在上一块末尾和下一块开头中查找最长的相同行序列，返回 (上一块保留的行数,
+    下一块开始的行)；没有可信的匹配时返回 None
+    Find the longest run of identical lines between the end of the upper
+    tile and the start of the lower one; returns (lines of the upper tile to
+    keep, first line of the lower tile), None without a trusted match
+    """
+    # 只比较非空行，保留它们在原文中的下标 | Compare non-blank lines only, keeping their original index
+    tail = [
+        (i, _normalize(line)) for i, line in enumerate(upper_lines) if line.strip()
+    ][-_OVERLAP_WINDOW:]
+    head = [
+        (i, _normalize(line)) for i, line in enumerate(lower_lines) if line.strip()
+    ][:_OVERLAP_WINDOW]
+    if not tail or not head:
+        return None
+
+    matcher = difflib.SequenceMatcher(
+        None, [line for _, line in tail], [line for _, line in head], autojunk=False
+    )
+    match = matcher.find_longest_match(0, len(tail), 0, len(head))
+    matched_chars = sum(len(line) for _, line in tail[match.a:match.a + match.size])
+    trusted = (
+        match.size > 0
+        and matched_chars >= _MIN_MATCH_CHARS
+        and len(tail) - (match.a + match.size) <= _EDGE_SLACK
+        and match.b <= _EDGE_SLACK
+    )
+    if not trusted:
+        return None
+    return tail[match.a + match.size - 1][0] + 1, head[match.b + match.size - 1][0] + 1
+
+
+def merge_overlap(upper: str, lower: str) -> str:
+    """
+    拼接上下相邻两个图块的识别结果，去掉重叠区域中重复的行
+    Join the text of two vertically adjacent tiles, dropping the lines repeated
+    in the overlap zone
+
+    匹配之后上一块剩余的行和匹配之前下一块的行是被图块边缘截断的行，
+    一并去掉。找不到可信的匹配时直接以空行连接，宁可重复也不丢内容。
+    The upper tile's lines after the match and the lower tile's lines
+    before it were cut by the tile edges and are dropped too. Without a
+    trusted match the texts are joined with a blank line, repeating rather
+    than losing content.
+
+    Args:
+        upper: 上方图块的文本 | Text of the upper tile
+        lower: 下方图块的文本 | Text of the lower tile
+
+    Returns:
+        str: 拼接后的文本 | Joined text
+    """
+    upper_lines = upper.rstrip().split("\n")
+    lower_lines = lower.strip().split("\n")
+    cut = _overlap(upper_lines, lower_lines)
+    if cut is None:
+        return "\n\n".join(text for text in (upper.rstrip(), lower.strip()) if text)
+    upper_end, lower_start = cut
+    return "\n".join(upper_lines[:upper_end] + lower_lines[lower_start:]).rstrip()
+
+
+def _drop_repeated_head(upper: str, lower: str) -> str:
+    """去掉下方图块开头与上方图块重复的行 | Drop the lower tile's leading lines repeated from the upper tile"""
+    lower_lines = lower.strip().split("\n")
+    cut = _overlap(upper.rstrip().split("\n"), lower_lines)
+    return lower.strip() if cut is None else "\n".join(lower_lines[cut[1]:]).strip()
+
+
+def stitch_tiles(rows: Sequence[Sequence[str]]) -> str:
+    """
+    按阅读顺序拼接图块识别结果：全宽横条从上到下去重拼接；宽度方向也切分时，
+    每行从左到右，行与行之间去掉与上方图块重复的行
+    Stitch tile texts in reading order: full-width strips are merged top to
+    bottom; when the width is split too, each row is read left to right and
+    lines repeated from the tile above are dropped between rows
+
+    Args:
+        rows: 每行从左到右的图块文本，行从上到下 | Tile texts per row, left to right, rows top to bottom
+
+    Returns:
+        str: Markdown 文本 | Markdown text
+    """
+    if all(len(row) <= 1 for row in rows):
+        text = ""
+        for row in rows:
+            for tile_text in row:
+                text = merge_overlap(text, tile_text) if text.strip() else tile_text.strip()
+        return text.strip()
+
+    parts: List[str] = []
+    previous: Sequence[str] = ()
+    for row in rows:
+        for column, tile_text in enumerate(row):
+            if column < len(previous) and previous[column].strip():
+                tile_text = _drop_repeated_head(previous[column], tile_text)
+            if tile_text.strip():
+                parts.append(tile_text.strip())
+        previous = row
+    return "\n\n".join(parts)
+
+
+@dataclass
+class TilePlan:
+    """
+    一张图片的分块方案
+    Tiling plan for one image
+
+    Attributes:
+        image: 已解码的 PIL 图片 | Decoded PIL image
+        rows: 每行的图块位置 | Tile boxes per row
+    """
+
+    image: Any
+    rows: List[List[Box]]
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def boxes(self) -> List[Box]:
+        """按行展开的图块位置 | Tile boxes row by row"""
+        return [box for row in self.rows for box in row]
+
+    @property
+    def count(self) -> int:
+        return sum(len(row) for row in self.rows)
+
+    def crop(self, box: Box) -> Any:
+        """裁剪一个图块（线程安全）| Crop one tile (thread-safe)"""
+        with self._lock:
+            return self.image.crop(box)
+
+    def group(self, texts: Sequence[str]) -> List[List[str]]:
+        """将按行展开的结果重新分组 | Regroup flat results into rows"""
+        grouped, index = [], 0
+        for row in self.rows:
+            grouped.append(list(texts[index:index + len(row)]))
+            index += len(row)
+        return grouped
+
+
+class ImageTiler:
+    """
+    判断图片是否需要分块，并生成分块方案
+    Decides whether an image needs tiling and builds the plan
+
+    Example:
+        >>> tiler = ImageTiler(TilingConfig(tile_size=2048))
+        >>> plan = tiler.plan("long_screenshot.png")
+        >>> if plan is not None:
+        ...     texts = [client.recognize(plan.crop(box)) for box in plan.boxes]
+        ...     print(stitch_tiles(plan.group(texts)))
+    """
+
+    def __init__(self, config: Optional[TilingConfig] = None, model_input_size: int = MODEL_INPUT_SIZE):
+        """
+        Args:
+            config: 分块配置，默认从环境变量读取 | Tiling configuration, read from the environment if not provided
+            model_input_size: 模型有效输入分辨率，tile_size 为 0 时作为图块边长
+                              Model input resolution, the tile side when tile_size is 0
+        """
+        self.config = config or TilingConfig.from_env()
+        self.tile_size = self.config.tile_size or model_input_size or MODEL_INPUT_SIZE
+
+    def needs_tiling(self, width: int, height: int, size_bytes: int = 0, max_bytes: int = 0) -> bool:
+        """
+        整体缩放保留的分辨率不到全宽横条的 min_scale 倍，或超过大小限制时需要分块
+        Tile when downscaling the whole image keeps less than min_scale of the
+        resolution full-width strips keep, or the image exceeds the size limit
+
+        只有细长图片（例如长截图）满足条件；普通照片整体缩放与横条缩放的
+        比例相差不大，照常缩放后识别。
+        Only elongated images (e.g. scrolling screenshots) qualify; for an
+        ordinary photo the whole-image and strip scales are close, so it is
+        downscaled and recognized whole.
+        """
+        if max(width, height) <= self.tile_size:
+            return False
+        if max_bytes and size_bytes > max_bytes:
+            return True
+        whole_scale = self.tile_size / max(width, height)
+        strip_scale = min(1.0, self.tile_size / width)
+        return whole_scale < self.config.min_scale * strip_scale
+
+    def plan(self, image: Any, max_bytes: int = 0) -> Optional[TilePlan]:
+        """
+        为需要分块的图片生成方案，其他图片（或无法读取的输入）返回 None
+        Build a plan for an image that needs tiling, None for any other image
+        (or input that cannot be read)
+
+        只读取图片头判断尺寸；需要分块时才完整解码。
+        Only the image header is read to check the size; the image is fully
+        decoded only when it will be tiled.
+
+        Args:
+            image: 文件路径、字节、文件对象或 PIL 图片 | File path, bytes, file-like object or PIL image
+            max_bytes: 单张图片的大小限制，0 表示不检查 | Size limit for one image, 0 skips the check
+
+        Returns:
+            Optional[TilePlan]: 分块方案 | Tiling plan
+        """
+        try:
+            from PIL import Image, ImageOps
+        except ImportError:
+            return None
+
+        size_bytes = 0
+        position = None
+        # 这里打开的图片在离开 with 时关闭（调用方的文件对象不关闭），不需要分块时也不泄漏文件句柄
+        # Images opened here are closed on leaving the with block (callers' file
+        # objects stay open), so no file handle leaks when no tiling is needed
+        with ExitStack() as opened_here:
+            try:
+                if isinstance(image, (str, os.PathLike)):
+                    size_bytes = os.path.getsize(image)
+                    opened = opened_here.enter_context(Image.open(image))
+                elif isinstance(image, (bytes, bytearray, memoryview)):
+                    size_bytes = len(image)
+                    # BytesIO 直接读取原字节，不再复制一份 | BytesIO reads the payload as is, without another copy
+                    opened = opened_here.enter_context(Image.open(BytesIO(image)))
+                elif hasattr(image, "save") and hasattr(image, "size") and hasattr(image, "mode"):
+                    opened = image
+                elif hasattr(image, "read") and hasattr(image, "seek"):
+                    position = image.tell()
+                    opened = opened_here.enter_context(Image.open(image))
+                else:
+                    return None
+                width, height = opened.size
+            except Exception:
+                if position is not None:
+                    image.seek(position)
+                return None
+
+            if not self.needs_tiling(width, height, size_bytes, max_bytes):
+                # 文件对象退回原位置供正常识别读取 | Rewind file objects for the normal path
+                if position is not None:
+                    image.seek(position)
+                return None
+
+            # exif_transpose 返回新图片，完整解码后原图片即可关闭
+            # exif_transpose returns a new image; once it is decoded the original can be closed
+            tiled = ImageOps.exif_transpose(opened)
+            tiled.load()
+
+        width, height = tiled.size
+        return TilePlan(
+            tiled,
+            plan_tiles(width, height, self.tile_size, self.config.overlap, self.config.min_scale),
+        )
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+=====================================================================
+模型预热与保活
+Model Warm-up and Keep-warm
+
+Ollama 在模型空闲 keep_alive 时长后将其卸载，下一次请求需要重新加载
+GLM-OCR。本模块解析 keep_alive 设置，并提供在工作时间内定期唤醒模型的
+后台线程，避免用户承担冷启动延迟。
+Ollama unloads a model once it has been idle for keep_alive, so the next
+request pays the GLM-OCR load time again. This module parses keep_alive
+settings and provides a background thread that keeps the model loaded
+during business hours so users do not pay the cold start.
+
+=====================================================================
+"""
+
+# 标准库导入 | Standard Library Imports
+import logging  # 日志
+import threading  # 后台线程
+from dataclasses import dataclass  # 数据类
+from datetime import datetime, time as dt_time  # 日期时间
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple, Union
+
+from .env import env_bool, env_float, env_str
+
+logger = logging.getLogger(__name__)
+
+# 星期名称到 datetime.weekday() 的映射 | Day names to datetime.weekday()
+_DAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+KeepAlive = Union[int, str]
+
+
+def parse_keep_alive(value: Optional[str]) -> Optional[KeepAlive]:
+    """
+    解析 keep_alive 设置：纯数字为秒数（-1 表示永不卸载），否则为时长字符串
+    Parse a keep_alive setting: plain numbers are seconds (-1 keeps the model
+    loaded forever), anything else is passed on as a duration string
+
+    Args:
+        value: 设置值，如 "30m"、"1h"、"600"、"-1" | Setting such as "30m", "1h", "600", "-1"
+
+    Returns:
+        Optional[KeepAlive]: 传给 Ollama 的值，未设置时为 None
+                             Value sent to Ollama, None when unset
+
+    Example:
+        >>> parse_keep_alive("600"), parse_keep_alive("30m")
+        (600, '30m')
+    """
+    if value is None or not str(value).strip():
+        return None
+    value = str(value).strip()
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def parse_hours(spec: str) -> Tuple[dt_time, dt_time]:
+    """
+    解析 "HH:MM-HH:MM" 格式的时间段
+    Parse an "HH:MM-HH:MM" time window
+
+    Raises:
+        ValueError: 如果格式无效 | If the format is invalid
+    """
+    try:
+        start, end = (part.strip() for part in spec.split("-", 1))
+        return dt_time.fromisoformat(start), dt_time.fromisoformat(end)
+    except ValueError:
+        raise ValueError(
+            f"无效的时间段 | Invalid time window: {spec!r} (例如 | e.g. 08:00-19:00)"
+        ) from None
+
+
+def parse_days(spec: str) -> FrozenSet[int]:
+    """
+    解析星期设置，如 "mon-fri" 或 "mon,wed,sat"
+    Parse a day setting such as "mon-fri" or "mon,wed,sat"
+
+    Raises:
+        ValueError: 如果包含未知的星期名称 | If a day name is unknown
+    """
+    days = set()
+    for part in spec.lower().split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        try:
+            start = _DAYS[first.strip()[:3]]
+            end = _DAYS[last.strip()[:3]] if last else start
+        except KeyError:
+            raise ValueError(f"无效的星期 | Invalid day: {part!r}") from None
+        day = start
+        days.add(day)
+        while day != end:
+            day = (day + 1) % 7
+            days.add(day)
+    return frozenset(days)
+
+
+@dataclass
+class KeepWarmConfig:
+    """
+    保活配置
+    Keep-warm configuration
+
+    Attributes:
+        enabled: 是否启用后台保活 | Enable the background pinger
+        interval: 唤醒间隔（秒），应小于服务器的 keep_alive
+                  Ping interval (seconds), should be shorter than the server's keep_alive
+        hours: 生效时间段 | Active time window
+        days: 生效的星期 | Active weekdays
+    """
+
+    enabled: bool = False
+    interval: float = 240.0
+    hours: str = "08:00-19:00"
+    days: str = "mon-fri"
+
+    @classmethod
+    def from_env(cls) -> "KeepWarmConfig":
+        """
+        从环境变量创建配置
+        Build the configuration from environment variables
+
+        Environment Variables:
+            OCR_KEEP_WARM: 启用工作时间保活（默认：false）
+            OCR_KEEP_WARM_INTERVAL: 唤醒间隔秒数（默认：240）
+            OCR_KEEP_WARM_HOURS: 生效时间段（默认：08:00-19:00）
+            OCR_KEEP_WARM_DAYS: 生效的星期（默认：mon-fri）
+        """
+        return cls(
+            enabled=env_bool("OCR_KEEP_WARM", cls.enabled),
+            interval=max(10.0, env_float("OCR_KEEP_WARM_INTERVAL", cls.interval)),
+            hours=env_str("OCR_KEEP_WARM_HOURS", cls.hours),
+            days=env_str("OCR_KEEP_WARM_DAYS", cls.days),
+        )
+
+    def is_active(self, now: datetime) -> bool:
+        """
+        检查给定时间是否处于工作时间内（支持跨午夜的时间段）
+        Check whether the given time falls in business hours (windows may
+        cross midnight)
+        """
+        start, end = parse_hours(self.hours)
+        if now.weekday() not in parse_days(self.days):
+            return False
+        current = now.time()
+        if start <= end:
+            return start <= current < end
+        return current >= start or current < end
+
+
+class KeepWarmPinger:
+    """
+    在工作时间内定期调用 ping 函数的后台线程
+    Background thread that calls a ping function during business hours
+
+    Example:
+        >>> pinger = KeepWarmPinger(lambda: client.load_model(), KeepWarmConfig(enabled=True))
+        >>> pinger.start()
+    """
+
+    def __init__(
+        self,
+        ping: Callable[[], Any],
+        config: Optional[KeepWarmConfig] = None,
+        clock: Callable[[], datetime] = datetime.now
+    ):
+        """
+        初始化保活线程
+        Initialize the pinger
+
+        Args:
+            ping: 唤醒模型的函数 | Function that wakes the model
+            config: 保活配置，默认从环境变量读取 | Configuration, read from the environment if not provided
+            clock: 返回当前本地时间的函数 | Returns the current local time
+        """
+        self.ping = ping
+        self.config = config or KeepWarmConfig.from_env()
+        self.clock = clock
+        # 尽早校验配置 | Validate the configuration early
+        parse_hours(self.config.hours)
+        parse_days(self.config.days)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pings = 0
+        self._failures = 0
+        self._last_ping: Optional[datetime] = None
+
+    def start(self) -> bool:
+        """
+        启动后台线程（未启用时不执行任何操作）
+        Start the background thread (no-op unless enabled)
+
+        Returns:
+            bool: 是否已启动 | Whether the thread is running
+        """
+        if not self.config.enabled:
+            return False
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="ollama-keep-warm", daemon=True
+            )
+            self._thread.start()
+            logger.info(
+                "模型保活已启用 | Keep-warm enabled: every %.0fs, %s, %s",
+                self.config.interval, self.config.hours, self.config.days,
+            )
+        return True
+
+    def tick(self) -> bool:
+        """
+        执行一次检查：处于工作时间内则唤醒模型
+        Run one check, waking the model when inside business hours
+
+        Returns:
+            bool: 是否发送了唤醒请求 | Whether a ping was sent
+        """
+        now = self.clock()
+        if not self.config.is_active(now):
+            return False
+        try:
+            self.ping()
+            self._pings += 1
+        except Exception as e:
+            self._failures += 1
+            logger.warning("模型保活失败 | Keep-warm ping failed: %s", e)
+        self._last_ping = now
+        return True
+
+    def _run(self) -> None:
+        """后台循环 | Background loop"""
+        while not self._stop.wait(self.config.interval):
+            self.tick()
+
+    def stop(self) -> None:
+        """停止后台线程 | Stop the background thread"""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取保活统计信息
+        Get keep-warm statistics
+        """
+        return {
+            "enabled": self.config.enabled,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "pings": self._pings,
+            "failures": self._failures,
+            "last_ping": self._last_ping.isoformat() if self._last_ping else None,
+        }
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+测试配置：将仓库根目录加入导入路径，并提供本地模拟 Ollama 服务器
+Test configuration: put the repository root on the import path and
+provide a local mock Ollama server
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def mock_ollama():
+    """无延迟的模拟 Ollama 服务器 | Mock Ollama server without latency"""
+    from benchmarks.mock_ollama import MockConfig, MockOllamaServer
+
+    with MockOllamaServer(MockConfig(latency=0.0, jitter=0.0)) as server:
+        yield server
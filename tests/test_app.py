@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Web UI 辅助函数测试
+Web UI helper tests
+"""
+
+import dataclasses
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def extracted(monkeypatch):
+    """记录传给 extract_doc_text 的客户端 | Record the client passed to extract_doc_text"""
+    calls = []
+
+    def _extract(path, client=None, strict=False):
+        calls.append(client)
+        return "text"
+
+    monkeypatch.setattr(app, "extract_doc_text", _extract)
+    monkeypatch.setattr(app, "services", lambda: pytest.fail("services() should not be built"))
+    return calls
+
+
+@pytest.mark.parametrize("enabled, expected", [("true", "client"), ("false", None)])
+def test_doc_image_flag_is_read_the_same_way_everywhere(monkeypatch, extracted, enabled, expected):
+    monkeypatch.setenv("DOCX_IMAGE_OCR", enabled)
+    assert app.process_doc_file("report.docx", client="client") == "text"
+    assert app._job_doc_text("report.docx", "client") == "text"
+    assert extracted == [expected, expected]
+
+
+def test_doc_image_flag_has_no_second_copy_on_the_services():
+    assert "docx_image_ocr" not in {field.name for field in dataclasses.fields(app.AppServices)}
+    with pytest.raises(AttributeError):
+        app.DOCX_IMAGE_OCR
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+异步客户端测试
+Asynchronous client tests
+"""
+
+import asyncio
+import io
+
+import pytest
+import requests
+from PIL import Image
+
+from benchmarks.mock_ollama import MockConfig, MockOllamaServer
+from ollama_client import AsyncOllamaOCR, OllamaOCR
+from src.utils.retry import CircuitBreaker, Retrier, RetryPolicy
+
+
+def _png(width: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, 32), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _client(server, **kwargs) -> AsyncOllamaOCR:
+    return AsyncOllamaOCR(host=server.url, cache=False, preprocessor=False, tiler=False, **kwargs)
+
+
+def test_results_match_the_sync_client(mock_ollama):
+    image = _png(64)
+
+    async def _main():
+        async with _client(mock_ollama) as client:
+            text = await client.recognize(image)
+            streamed = [chunk async for chunk in client.recognize_stream(image)]
+            return text, streamed
+
+    text, streamed = asyncio.run(_main())
+    with OllamaOCR(host=mock_ollama.url, cache=False, preprocessor=False, tiler=False) as client:
+        assert text == client.recognize(image)
+    assert len(streamed) > 1
+    assert "".join(streamed).strip() == text
+
+
+def test_batch_keeps_input_order_and_limits_concurrency():
+    images = [_png(width) for width in (40, 80, 120, 160, 200, 240)]
+    running = [0, 0]
+
+    async def _main(server):
+        async with _client(server, max_workers=2) as client:
+            recognize = client.recognize
+
+            async def _counted(image):
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+                try:
+                    return await recognize(image)
+                finally:
+                    running[0] -= 1
+
+            client.recognize = _counted
+            progress = []
+            results = await client.recognize_batch(
+                images, progress_callback=lambda done, total, path, error: progress.append(done)
+            )
+            return results, progress
+
+    with MockOllamaServer(MockConfig(latency=0.05, jitter=0.0)) as server:
+        results, progress = asyncio.run(_main(server))
+        with OllamaOCR(host=server.url, cache=False, preprocessor=False, tiler=False) as client:
+            expected = [client.recognize(image) for image in images]
+
+    assert results == expected
+    assert progress == [1, 2, 3, 4, 5, 6]
+    assert running[1] == 2
+
+
+def test_batch_reports_errors_in_place():
+    policy = RetryPolicy(max_retries=0)
+    retrier = Retrier(policy, CircuitBreaker(failure_threshold=100))
+    errors = []
+
+    async def _main(server):
+        async with _client(server, retrier=retrier) as client:
+            return await client.recognize_batch(
+                [_png(64), _png(96)],
+                progress_callback=lambda done, total, path, error: errors.append(error),
+            )
+
+    with MockOllamaServer(MockConfig(latency=0.0, jitter=0.0, error_rate=1.0)) as server:
+        results = asyncio.run(_main(server))
+    assert all(result.startswith("[错误 | Error:") for result in results)
+    # 与同步客户端相同的错误类型 | Same error type as the sync client
+    assert all(isinstance(error, requests.RequestException) for error in errors)
+
+
+def test_session_follows_the_running_loop(mock_ollama):
+    client = _client(mock_ollama)
+    image = _png(64)
+
+    async def _recognize():
+        return await client.recognize(image), await client._get_session()
+
+    # 每次 asyncio.run 都是新的事件循环 | Each asyncio.run is a new event loop
+    first, first_session = asyncio.run(_recognize())
+    second, second_session = asyncio.run(_recognize())
+    asyncio.run(client.close())
+    assert first == second
+    assert first_session is not second_session
+
+
+def test_empty_batch_is_rejected(mock_ollama):
+    async def _main():
+        async with _client(mock_ollama) as client:
+            await client.recognize_batch([])
+
+    with pytest.raises(ValueError):
+        asyncio.run(_main())
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+多主机负载均衡测试
+Multi-host load balancing tests
+"""
+
+import io
+import socket
+from collections import Counter
+
+import pytest
+from PIL import Image
+
+from benchmarks.mock_ollama import MockConfig, MockOllamaServer
+from ollama_client import OllamaOCR
+from src.utils import backend_pool
+from src.utils.backend_pool import WEIGHTED, BackendPool, parse_backends
+from src.utils.retry import CircuitBreaker, Retrier, RetryPolicy
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可控的单调时钟 | Controllable monotonic clock"""
+    now = [1000.0]
+    monkeypatch.setattr(backend_pool.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _pool(count=2, **kwargs) -> BackendPool:
+    urls = ",".join(f"http://host{i}:11434" for i in range(count))
+    return BackendPool(parse_backends(urls), **kwargs)
+
+
+def _fail(pool, backend):
+    pool.release(backend, 0.1, error=ConnectionError("down"), failed=True)
+
+
+def test_parse_backends():
+    backends = parse_backends(" http://a:11434/ ,, http://b:11434", "3")
+    assert [(b.url, b.weight) for b in backends] == [("http://a:11434", 3), ("http://b:11434", 1)]
+    with pytest.raises(ValueError):
+        parse_backends("http://a:11434", "x")
+    with pytest.raises(ValueError):
+        parse_backends("http://a:11434", "0")
+    with pytest.raises(ValueError):
+        BackendPool([])
+
+
+def test_least_outstanding_spreads_in_flight_requests():
+    pool = _pool(3)
+    held = [pool.acquire() for _ in range(3)]
+    assert len({backend.url for backend in held}) == 3
+    pool.release(held[1], 0.1)
+    assert pool.acquire() is held[1]
+
+
+def test_weighted_round_robin_follows_the_weights():
+    pool = BackendPool(parse_backends("http://a:11434,http://b:11434", "3,1"), strategy=WEIGHTED)
+    picks = []
+    for _ in range(8):
+        backend = pool.acquire()
+        picks.append(backend.url)
+        pool.release(backend, 0.1)
+    assert Counter(picks) == {"http://a:11434": 6, "http://b:11434": 2}
+    # 平滑轮询不会连续选中同一主机太多次 | Smooth round-robin never bunches the heavy host
+    assert picks[:4].count("http://b:11434") == 1
+
+
+def test_failing_hosts_are_ejected_and_come_back(clock):
+    pool = _pool(2, eject_after=2, eject_seconds=30)
+    bad = pool.backends[0]
+    _fail(pool, bad)
+    _fail(pool, bad)
+    assert not bad.is_available(clock[0])
+    assert all(pool.acquire() is pool.backends[1] for _ in range(4))
+
+    clock[0] += 31
+    assert bad.is_available(clock[0])
+    assert pool.stats()[0]["ejections"] == 1
+
+
+def test_all_hosts_ejected_uses_the_soonest_to_recover(clock):
+    pool = _pool(2, eject_after=1, eject_seconds=30)
+    _fail(pool, pool.backends[1])
+    clock[0] += 5
+    _fail(pool, pool.backends[0])
+    assert pool.acquire() is pool.backends[1]
+
+
+def test_single_host_is_never_ejected(clock):
+    pool = _pool(1, eject_after=1)
+    _fail(pool, pool.backends[0])
+    pool.mark_unhealthy(pool.backends[0])
+    assert pool.backends[0].is_available(clock[0])
+
+
+def test_lease_counts_only_host_failures():
+    pool = _pool(1)
+    with pytest.raises(ValueError), pool.lease(lambda error: isinstance(error, ConnectionError)):
+        raise ValueError("bad response")
+    with pytest.raises(ConnectionError), pool.lease(lambda error: isinstance(error, ConnectionError)):
+        raise ConnectionError("down")
+    backend = pool.backends[0]
+    assert (backend.requests, backend.errors, backend.consecutive_failures) == (2, 2, 1)
+    assert backend.outstanding == 0
+
+
+def test_health_checks_eject_and_readmit(clock):
+    healthy = {"http://host0:11434": False, "http://host1:11434": True}
+    pool = _pool(2, health_check=lambda url: healthy[url], health_interval=0)
+    pool.check_health()
+    assert [b["available"] for b in pool.stats()] == [False, True]
+    healthy["http://host0:11434"] = True
+    pool.check_health()
+    assert [b["available"] for b in pool.stats()] == [True, True]
+
+
+def _free_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_client_spreads_requests_and_fails_over():
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 32), "white").save(buffer, format="PNG")
+    image = buffer.getvalue()
+
+    config = MockConfig(latency=0.0, jitter=0.0)
+    with MockOllamaServer(config) as first, MockOllamaServer(config) as second:
+        pool = BackendPool(parse_backends(f"{first.url},{second.url},{_free_url()}"), health_interval=0)
+        retrier = Retrier(RetryPolicy(max_retries=2, backoff_base=0.0), CircuitBreaker(failure_threshold=100))
+        with OllamaOCR(backends=pool, retrier=retrier, cache=False, preprocessor=False, tiler=False) as client:
+            results = [client.recognize(image) for _ in range(9)]
+            stats = client.backend_stats()
+        pool.close()
+
+    assert len(set(results)) == 1 and "Mock Page" in results[0]
+    assert first.stats()["requests"] > 0 and second.stats()["requests"] > 0
+    # 不可用的主机连续失败后被剔除 | The unreachable host is ejected after consecutive failures
+    assert stats[2]["ejections"] == 1 and not stats[2]["available"]
+    assert stats[2]["errors"] == 3
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试运行器和模拟服务器测试
+Benchmark runner and mock server tests
+"""
+
+import json
+
+import requests
+
+from benchmarks import run
+from benchmarks.corpus import build_corpus
+from benchmarks.mock_ollama import MockConfig, MockOllamaServer
+from benchmarks.run import ScenarioResult, compare, run_scenario
+from ollama_client import OllamaOCR
+from src.utils.retry import CircuitBreaker, Retrier, RetryPolicy
+
+
+def _generate(server, stream=False):
+    return requests.post(
+        f"{server.url}/api/generate",
+        json={"model": "glm-ocr", "images": ["aGVsbG8="], "stream": stream},
+        timeout=5,
+    )
+
+
+def test_mock_server_speaks_the_ollama_api():
+    with MockOllamaServer(MockConfig(latency=0.0, jitter=0.0, stream_chunks=4, load_delay=0.05)) as server:
+        tags = requests.get(f"{server.url}/api/tags", timeout=5).json()
+        first = _generate(server).json()
+        second = _generate(server).json()
+        lines = [json.loads(line) for line in _generate(server, stream=True).iter_lines() if line]
+
+    assert tags["models"][0]["name"].startswith("glm-ocr")
+    # 只有第一个请求加载模型 | Only the first request loads the model
+    assert first["load_duration"] >= 50_000_000 and second["load_duration"] == 0
+    assert first["response"] == second["response"]
+    assert len(lines) == 5 and lines[-1]["done"]
+    assert "".join(line["response"] for line in lines) == first["response"]
+
+
+def test_injected_errors_are_reproducible():
+    def _statuses():
+        with MockOllamaServer(MockConfig(latency=0.0, jitter=0.0, error_rate=0.5, seed=7)) as server:
+            return [_generate(server).status_code for _ in range(20)], server.stats()
+
+    statuses, stats = _statuses()
+    assert statuses == _statuses()[0]
+    assert stats["errors"] == statuses.count(503) and 0 < stats["errors"] < 20
+
+
+def test_percentiles_and_report():
+    result = ScenarioResult("recognize", pages=10, seconds=2.0, latencies=[0.1 * i for i in range(1, 11)])
+    assert result.percentile(50) == 0.5
+    assert result.percentile(95) == 1.0
+    data = result.to_dict()
+    assert (data["pages_per_second"], data["p50_ms"], data["p99_ms"]) == (5.0, 500.0, 1000.0)
+    assert "latencies" not in data
+    assert ScenarioResult("empty").percentile(50) is None
+
+
+def test_compare_flags_throughput_and_latency_regressions():
+    baseline = [
+        {"name": "recognize", "pages_per_second": 10.0, "p95_ms": 100.0},
+        {"name": "pdf_scanned", "pages_per_second": 5.0, "p95_ms": 100.0},
+    ]
+    results = [
+        {"name": "recognize", "pages_per_second": 7.0, "p95_ms": 130.0},
+        {"name": "pdf_scanned", "pages_per_second": 0.0, "p95_ms": None, "skipped": "no poppler"},
+    ]
+    assert compare(results, baseline, max_regression=0.2) == [
+        "recognize: pages/s 10.0 -> 7.0",
+        "recognize: p95 100.0 ms -> 130.0 ms",
+    ]
+    assert compare(results, baseline, max_regression=0.5) == []
+
+
+def test_client_scenarios_count_requests_and_errors(tmp_path):
+    corpus = build_corpus(str(tmp_path), images=4, text_pdfs=0, scanned_pdfs=0, pages=1)
+    retrier = Retrier(RetryPolicy(max_retries=0), CircuitBreaker(failure_threshold=100))
+
+    with MockOllamaServer(MockConfig(latency=0.0, jitter=0.0, error_rate=0.5, seed=3)) as server:
+        def _client():
+            return OllamaOCR(host=server.url, retrier=retrier, cache=False, max_workers=2)
+
+        results = [
+            run_scenario(name, corpus, _client, lambda: None)
+            for name in ("recognize", "recognize_stream", "recognize_batch")
+        ]
+        injected = server.stats()["errors"]
+
+    assert [(r.pages, r.requests, len(r.latencies)) for r in results] == [(4, 4, 4)] * 3
+    assert sum(r.errors for r in results) == injected > 0
+    assert all(r.peak_rss_mb for r in results)
+
+
+def test_main_writes_json_and_fails_on_regression(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("OCR_CACHE_ENABLED", "false")
+    output = tmp_path / "results.json"
+    argv = [
+        "--scenarios", "recognize", "--corpus-dir", str(tmp_path / "corpus"),
+        "--images", "2", "--pdfs", "0", "--latency", "0", "--jitter", "0", "--json", str(output),
+    ]
+    assert run.main(argv) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert [item["name"] for item in report["scenarios"]] == ["recognize"]
+    assert report["scenarios"][0]["requests"] == 2
+
+    report["scenarios"][0]["pages_per_second"] *= 1000
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report), encoding="utf-8")
+    assert run.main(argv + ["--baseline", str(baseline)]) == 1
+    assert "Regressions" in capsys.readouterr().out
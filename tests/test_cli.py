@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+命令行批量识别测试
+Command-line bulk OCR tests
+"""
+
+import io
+import os
+
+import cli
+from src.handlers.pdf_handler import PageError
+
+
+def _fake_pdf(failing):
+    """代替 iter_pdf_page_texts 的三页 PDF | Three-page stand-in for iter_pdf_page_texts"""
+
+    def _iter(path, client, text_config=None, routes=None):
+        for i in range(3):
+            if i in failing:
+                yield i, 3, PageError("[OCR 错误 | OCR Error: backend down]")
+            else:
+                yield i, 3, f"page {i + 1}"
+
+    return _iter
+
+
+def _run(inputs, output_dir, manifest_path):
+    with cli.Manifest(manifest_path) as manifest:
+        return cli.run(
+            inputs, output_dir=output_dir, workers=2, manifest=manifest,
+            client=object(), log=io.StringIO(),
+        ), len(manifest)
+
+
+def test_pdf_with_failed_pages_is_a_failed_file(tmp_path, monkeypatch):
+    scans = tmp_path / "scans"
+    scans.mkdir()
+    (scans / "book.pdf").write_bytes(b"%PDF-1.4 test")
+    output = str(tmp_path / "out")
+    manifest_path = str(tmp_path / "manifest.jsonl")
+
+    monkeypatch.setattr(cli, "iter_pdf_page_texts", _fake_pdf(failing={0, 1, 2}))
+    stats, recorded = _run([str(scans)], output, manifest_path)
+    assert (stats.files, stats.failed, recorded) == (0, 1, 0)
+    assert not os.path.exists(os.path.join(output, "book.pdf.md"))
+
+    # 后端恢复后重新运行：文件不会被跳过 | Rerun once the backend is back: the file is not skipped
+    monkeypatch.setattr(cli, "iter_pdf_page_texts", _fake_pdf(failing=set()))
+    stats, recorded = _run([str(scans)], output, manifest_path)
+    assert (stats.files, stats.skipped, stats.failed, recorded) == (1, 0, 0, 1)
+    with open(os.path.join(output, "book.pdf.md"), encoding="utf-8") as f:
+        assert "page 3" in f.read()
+
+    stats, _ = _run([str(scans)], output, manifest_path)
+    assert stats.skipped == 1
+
+
+def test_recognize_file_reports_failed_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "iter_pdf_page_texts", _fake_pdf(failing={1}))
+    failed = []
+    pages = cli.recognize_file(str(tmp_path / "a.pdf"), object(), failed_pages=failed)
+    assert failed == [1]
+    assert pages[0] == "page 1" and pages[1].startswith("[OCR 错误")
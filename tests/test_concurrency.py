@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+有序并发映射测试
+Ordered concurrent map tests
+"""
+
+import random
+import threading
+import time
+
+import pytest
+
+from src.utils.concurrency import map_ordered
+
+
+def _slow_square(n):
+    # 打乱完成顺序 | Shuffle the completion order
+    time.sleep(random.uniform(0, 0.01))
+    return n * n
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_results_keep_input_order(max_workers):
+    assert map_ordered(_slow_square, range(20), max_workers=max_workers) == [n * n for n in range(20)]
+
+
+def test_empty_input():
+    assert map_ordered(_slow_square, [], max_workers=4) == []
+
+
+def test_in_flight_tasks_never_exceed_max_workers():
+    lock, running, peak = threading.Lock(), [0], [0]
+
+    def _task(n):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.005)
+        with lock:
+            running[0] -= 1
+        return n
+
+    assert map_ordered(_task, range(16), max_workers=3) == list(range(16))
+    assert peak[0] <= 3
+
+
+def _fail_on_odd(n):
+    if n % 2:
+        raise ValueError(f"odd {n}")
+    return n
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_on_error_turns_failures_into_results(max_workers):
+    results = map_ordered(
+        _fail_on_odd, range(6), max_workers=max_workers,
+        on_error=lambda item, error: f"{item}: {error}",
+    )
+    assert results == [0, "1: odd 1", 2, "3: odd 3", 4, "5: odd 5"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_error_is_raised_without_on_error(max_workers):
+    with pytest.raises(ValueError, match="odd"):
+        map_ordered(_fail_on_odd, range(6), max_workers=max_workers)
+
+
+def test_progress_reports_every_item():
+    seen = []
+    map_ordered(
+        _fail_on_odd, range(4), max_workers=2,
+        on_error=lambda item, error: None,
+        progress_callback=lambda done, total, item, error: seen.append((done, total, item, error is None)),
+    )
+    assert [done for done, *_ in seen] == [1, 2, 3, 4]
+    assert all(total == 4 for _, total, _, _ in seen)
+    assert sorted((item, ok) for _, _, item, ok in seen) == [(0, True), (1, False), (2, True), (3, False)]
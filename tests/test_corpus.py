@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试语料测试
+Benchmark corpus tests
+"""
+
+from benchmarks.corpus import build_corpus
+
+
+def _page_count(path: str) -> int:
+    with open(path, "rb") as f:
+        return f.read().count(b"/Type /Page ")
+
+
+def test_corpus_is_rebuilt_when_parameters_change(tmp_path):
+    three = build_corpus(str(tmp_path), images=0, text_pdfs=1, scanned_pdfs=0, pages=3)
+    four = build_corpus(str(tmp_path), images=0, text_pdfs=1, scanned_pdfs=0, pages=4)
+    assert three.text_pdfs[0] != four.text_pdfs[0]
+    assert _page_count(three.text_pdfs[0]) == 3
+    assert _page_count(four.text_pdfs[0]) == 4
+
+
+def test_corpus_is_reused_with_the_same_parameters(tmp_path):
+    first = build_corpus(str(tmp_path), images=1, text_pdfs=1, scanned_pdfs=0, pages=2)
+    with open(first.text_pdfs[0], "rb") as f:
+        content = f.read()
+    second = build_corpus(str(tmp_path), images=1, text_pdfs=1, scanned_pdfs=0, pages=2)
+    assert second.files == first.files
+    with open(second.text_pdfs[0], "rb") as f:
+        assert f.read() == content
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Word 文档提取测试
+Word document extraction tests
+"""
+
+import io
+import threading
+
+import pytest
+from docx import Document
+from PIL import Image
+
+from src.handlers.doc_handler import NO_DOC_TEXT_PLACEHOLDER, extract_doc_text
+
+
+def _png(color, size=(64, 48)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class FakeClient:
+    """按图片内容返回标签的 OCR 客户端 | OCR client answering with a label per image"""
+
+    max_workers = 4
+
+    def __init__(self, labels, fail=()):
+        self.labels = labels
+        self.fail = set(fail)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def recognize(self, image):
+        with self._lock:
+            self.calls.append(image)
+        label = self.labels[image]
+        if label in self.fail:
+            raise RuntimeError(f"{label} failed")
+        return f"  {label}\n"
+
+
+def _save(doc, tmp_path, name="doc.docx"):
+    path = tmp_path / name
+    doc.save(path)
+    return str(path)
+
+
+def test_paragraphs_and_tables_in_document_order(tmp_path):
+    doc = Document()
+    doc.add_paragraph("Title")
+    doc.add_paragraph("Intro")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Name"
+    table.cell(0, 1).text = "Value"
+    table.cell(1, 0).text = "a|b"
+    table.cell(1, 1).text = "1\n2"
+    doc.add_paragraph("Outro")
+
+    text = extract_doc_text(_save(doc, tmp_path))
+
+    assert text == (
+        "Title\nIntro\n\n"
+        "| Name | Value |\n| --- | --- |\n| a\\|b | 1<br>2 |\n\n"
+        "Outro"
+    )
+
+
+def test_merged_cells_are_written_once(tmp_path):
+    doc = Document()
+    table = doc.add_table(rows=2, cols=3)
+    merged = table.cell(0, 0).merge(table.cell(0, 1))
+    merged.text = "Wide"
+    table.cell(0, 2).text = "Right"
+    for col, value in enumerate("xyz"):
+        table.cell(1, col).text = value
+
+    text = extract_doc_text(_save(doc, tmp_path))
+
+    assert text.splitlines()[0] == "| Wide |  | Right |"
+
+
+def test_images_are_recognized_in_place_and_deduplicated(tmp_path):
+    red, blue = _png("red"), _png("blue")
+    doc = Document()
+    doc.add_paragraph("Before")
+    doc.add_picture(io.BytesIO(red))
+    doc.add_paragraph("Middle")
+    doc.add_picture(io.BytesIO(blue))
+    doc.add_picture(io.BytesIO(red))
+    client = FakeClient({red: "RED", blue: "BLUE"})
+
+    text = extract_doc_text(_save(doc, tmp_path), client=client)
+
+    assert text == "Before\n\nRED\n\nMiddle\n\nBLUE\n\nRED"
+    # 重复图片只识别一次 | A repeated image is recognized once
+    assert sorted(client.calls) == sorted([red, blue])
+
+
+def test_images_are_ignored_without_client(tmp_path):
+    doc = Document()
+    doc.add_paragraph("Text")
+    doc.add_picture(io.BytesIO(_png("red")))
+
+    # 只放图片的段落保留为空段落 | The picture-only paragraph stays an empty paragraph
+    assert extract_doc_text(_save(doc, tmp_path)) == "Text\n"
+
+
+def test_tiny_images_are_skipped(tmp_path):
+    tiny = _png("red", size=(16, 16))
+    doc = Document()
+    doc.add_paragraph("Text")
+    doc.add_picture(io.BytesIO(tiny))
+    client = FakeClient({})
+
+    assert extract_doc_text(_save(doc, tmp_path), client=client) == "Text"
+    assert client.calls == []
+
+
+def test_failed_image_writes_placeholder_unless_strict(tmp_path):
+    good, bad = _png("green"), _png("black")
+    doc = Document()
+    doc.add_picture(io.BytesIO(good))
+    doc.add_picture(io.BytesIO(bad))
+    path = _save(doc, tmp_path)
+
+    text = extract_doc_text(path, client=FakeClient({good: "GOOD", bad: "BAD"}, fail={"BAD"}))
+    assert text.startswith("GOOD\n\n")
+    assert "Image OCR failed: BAD failed" in text
+
+    with pytest.raises(RuntimeError, match="BAD failed"):
+        extract_doc_text(
+            path, client=FakeClient({good: "GOOD", bad: "BAD"}, fail={"BAD"}), strict=True
+        )
+
+
+def test_empty_document_returns_placeholder(tmp_path):
+    doc = Document()
+    doc.add_paragraph("   ")
+
+    assert extract_doc_text(_save(doc, tmp_path)) == NO_DOC_TEXT_PLACEHOLDER
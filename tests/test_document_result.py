@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+文档识别结果模型测试
+Document result model tests
+"""
+
+import pytest
+
+from src.models.document_result import KIND_IMAGE, KIND_PDF, DocumentResult, FileResult
+
+
+def _full_render(result: FileResult, separate: bool, markers: bool) -> str:
+    """不使用缓存的渲染结果 | Render without the cache"""
+    fresh = FileResult(result.name, result.kind, list(result.pages), result.total_pages)
+    return fresh.render(separate, markers)
+
+
+@pytest.mark.parametrize("separate, markers", [(False, True), (True, True), (False, False)])
+def test_streamed_pdf_render_matches_full_render(separate, markers):
+    result = FileResult("scan.pdf", KIND_PDF, total_pages=4)
+    for number in range(1, 5):
+        result.add_page(f"page {number} text")
+        assert result.render(separate, markers) == _full_render(result, separate, markers)
+
+
+def test_views_are_cached_independently():
+    result = FileResult("scan.pdf", KIND_PDF, total_pages=2)
+    result.add_page("first")
+    merged = result.render(page_markers=True)
+    result.add_page("second")
+    assert result.render(page_markers=False) == "first\n\nsecond"
+    assert result.render(page_markers=True).startswith(merged)
+    assert "### 第 2/2 页 | Page 2/2" in result.render(separate_pages=True)
+
+
+def test_growing_last_page_is_rerendered():
+    result = FileResult("scan.pdf", KIND_PDF, total_pages=1)
+    page = result.add_page("partial")
+    assert result.render(page_markers=False) == "partial"
+    page.text += " text"
+    assert result.render(page_markers=False) == "partial text"
+
+
+def test_document_render_with_status_and_error():
+    image = FileResult("a.png", KIND_IMAGE)
+    image.add_page("  recognized")
+    failed = FileResult("b.pdf", KIND_PDF, error="错误 | Error: broken")
+    document = DocumentResult([image, failed])
+    assert document.render() == "## a.png\n\nrecognized\n\n---\n\n## b.pdf\n\n错误 | Error: broken"
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+keep-alive 连接池测试
+Keep-alive connection pool tests
+"""
+
+import io
+import threading
+import time
+
+from PIL import Image
+
+from ollama_client import OllamaOCR
+from src.utils.http_pool import PoolConfig, PooledSession
+
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 32), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _get(session, server, times=1):
+    for _ in range(times):
+        session.get(f"{server.url}/api/version", timeout=5).raise_for_status()
+
+
+def test_requests_reuse_one_connection(mock_ollama):
+    session = PooledSession(PoolConfig(pool_maxsize=2))
+    try:
+        _get(session, mock_ollama, times=3)
+        stats = session.stats()
+    finally:
+        session.close()
+    assert stats["requests"] == 3
+    assert (stats["new_connections"], stats["reused_connections"]) == (1, 2)
+    assert (stats["in_use"], stats["open_connections"]) == (0, 1)
+
+
+def test_concurrent_requests_stay_within_pool_maxsize(mock_ollama):
+    session = PooledSession(PoolConfig(pool_maxsize=2, pool_block=True))
+    threads = [threading.Thread(target=_get, args=(session, mock_ollama, 5)) for _ in range(6)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = session.stats()
+    finally:
+        session.close()
+    assert stats["requests"] == 30
+    assert stats["new_connections"] <= 2
+    assert stats["open_connections"] <= 2
+
+
+def test_idle_connections_expire(mock_ollama):
+    session = PooledSession(PoolConfig(keepalive_expiry=0.05))
+    try:
+        _get(session, mock_ollama)
+        time.sleep(0.1)
+        _get(session, mock_ollama)
+        stats = session.stats()
+    finally:
+        session.close()
+    assert stats["expired_connections"] == 1
+    assert stats["reused_connections"] == 0
+
+
+def test_keep_alive_disabled_opens_a_connection_per_request(mock_ollama):
+    session = PooledSession(PoolConfig(keep_alive=False))
+    try:
+        _get(session, mock_ollama, times=3)
+        stats = session.stats()
+    finally:
+        session.close()
+    assert (stats["new_connections"], stats["reused_connections"]) == (3, 0)
+
+
+def test_client_requests_share_the_pool(mock_ollama):
+    with OllamaOCR(host=mock_ollama.url, cache=False, preprocessor=False, tiler=False) as client:
+        image = _png()
+        assert "Mock Page" in client.recognize(image)
+        assert "Mock Page" in client.recognize(image)
+        stats = client.pool_stats()
+    # 之后的请求都复用第一个连接 | Every later request reuses the first connection
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == stats["requests"] - 1
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+内存中图片输入测试
+In-memory image input tests
+"""
+
+import base64
+import io
+import json
+import os
+import tempfile
+
+import pytest
+from PIL import Image
+from pypdf import PdfWriter
+
+from ollama_client import OllamaOCR, _build_payload, _encode_request, _load_image_bytes
+from src.handlers import pdf_handler
+from src.utils.memory import MemoryBudget
+from src.utils.page_filter import PageFilterConfig
+from src.utils.pdf_raster import PdfRasterizer, RasterConfig
+from src.utils.text_layer import TextLayerConfig
+
+
+@pytest.fixture
+def png_path(tmp_path):
+    path = tmp_path / "page.png"
+    Image.new("RGB", (80, 40), "white").save(path, format="PNG")
+    return str(path)
+
+
+def test_every_input_type_sends_the_same_image(png_path, mock_ollama):
+    with open(png_path, "rb") as f:
+        data = f.read()
+    inputs = [png_path, data, bytearray(data), io.BytesIO(data), Image.open(io.BytesIO(data))]
+    with OllamaOCR(host=mock_ollama.url, cache=False, preprocessor=False, tiler=False) as client:
+        results = [client.recognize(image) for image in inputs]
+    assert len(set(results)) == 1
+    assert f"(image {len(data)} bytes)" in results[0]
+
+
+def test_request_body_matches_json_encoding():
+    body = _encode_request(b"\x89PNG data", stream=True, keep_alive="30m")
+    expected = _build_payload(base64.b64encode(b"\x89PNG data").decode("ascii"), True, "30m")
+    assert json.loads(body) == expected
+
+
+def test_invalid_inputs_are_rejected(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        _load_image_bytes(str(tmp_path / "missing.png"))
+    with pytest.raises(ValueError):
+        _load_image_bytes(b"")
+    with pytest.raises(ValueError):
+        _load_image_bytes(io.StringIO("text"))
+    with pytest.raises(ValueError):
+        _load_image_bytes(b"x" * 11, max_bytes=10)
+    with pytest.raises(TypeError):
+        _load_image_bytes(42)
+
+
+def test_pdf_pages_reach_the_client_without_temp_files(tmp_path, monkeypatch):
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=200)
+    path = str(tmp_path / "scan.pdf")
+    with open(path, "wb") as f:
+        writer.write(f)
+
+    monkeypatch.setattr(
+        PdfRasterizer, "render_range",
+        lambda self, first, last: [Image.new("RGB", (50, 50), "white") for _ in range(first, last + 1)],
+    )
+    before = set(os.listdir(tempfile.gettempdir()))
+    received = []
+
+    class _Client:
+        max_workers = 1
+
+        def recognize(self, image):
+            received.append(image)
+            return "text"
+
+    texts = [
+        text for _, _, text in pdf_handler.iter_pdf_page_texts(
+            path, _Client(), pipelined=False,
+            raster_config=RasterConfig(),
+            text_config=TextLayerConfig(mode="ocr"),
+            memory_budget=MemoryBudget(enabled=False),
+            filter_config=PageFilterConfig(skip_blank=False, dedupe=False),
+        )
+    ]
+    assert texts == ["text"] * 3
+    assert all(isinstance(image, Image.Image) for image in received)
+    assert not {name for name in os.listdir(tempfile.gettempdir()) if name.startswith("pdf_page_")} - before
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+图片预处理测试
+Image pre-processing tests
+"""
+
+import io
+
+from PIL import Image
+
+from src.utils.image_preprocess import ImagePreprocessor, PreprocessConfig
+
+
+def _encode(image, fmt="PNG", **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def _open(data: bytes):
+    return Image.open(io.BytesIO(data))
+
+
+def _scan(width, height):
+    """带噪点的灰色页面，PNG 压缩效果差 | Noisy grey page that PNG compresses poorly"""
+    return Image.merge("RGB", [Image.effect_noise((width, height), 40)] * 3)
+
+
+def test_oversized_scans_are_downscaled_and_reencoded():
+    source = _encode(_scan(2000, 1000))
+    preprocessor = ImagePreprocessor(PreprocessConfig(max_dimension=1000, fmt="JPEG", quality=80))
+    result = preprocessor.process(source)
+
+    assert result.changed
+    assert (result.width, result.height) == (1000, 500)
+    assert result.output_bytes < result.original_bytes == len(source)
+    assert _open(result.data).format == "JPEG"
+    stats = preprocessor.stats()
+    assert (stats["requests"], stats["reencoded"]) == (1, 1)
+    assert stats["bytes_saved"] == result.bytes_saved > 0
+
+
+def test_compliant_images_pass_through_untouched():
+    source = _encode(_scan(400, 300), "JPEG", quality=95)
+    result = ImagePreprocessor(PreprocessConfig(max_dimension=1000, fmt="JPEG")).process(source)
+    assert not result.changed
+    assert result.data == source
+
+
+def test_reencoding_that_grows_an_image_keeps_the_original():
+    # 纯色 PNG 很小，转 JPEG 只会更大 | A flat PNG is tiny and only grows as JPEG
+    source = _encode(Image.new("RGB", (300, 200), "white"))
+    result = ImagePreprocessor(PreprocessConfig(fmt="JPEG")).process(source)
+    assert not result.changed
+    assert result.data == source
+
+
+def test_exif_orientation_is_applied():
+    image = _scan(200, 100)
+    exif = image.getexif()
+    exif[0x0112] = 6  # 顺时针旋转 90° | Rotate 90° clockwise
+    source = _encode(image, "JPEG", exif=exif.tobytes())
+    result = ImagePreprocessor(PreprocessConfig(fmt="JPEG", max_dimension=150)).process(source)
+    assert (result.width, result.height) == (75, 150)
+
+
+def test_transparency_is_flattened_onto_white():
+    image = Image.new("RGBA", (200, 200), (0, 0, 0, 0))
+    image.paste((0, 0, 0, 255), (0, 0, 100, 200))
+    result = ImagePreprocessor(PreprocessConfig(fmt="JPEG", max_dimension=100)).process(image)
+    output = _open(result.data).convert("L")
+    assert output.getpixel((10, 50)) < 20
+    assert output.getpixel((90, 50)) > 235
+
+
+def test_grayscale_conversion():
+    result = ImagePreprocessor(PreprocessConfig(fmt="PNG", grayscale=True)).process(
+        _encode(_scan(100, 100))
+    )
+    assert _open(result.data).mode == "L"
+
+
+def test_unrecognized_bytes_are_sent_as_is():
+    result = ImagePreprocessor(PreprocessConfig()).process(b"not an image")
+    assert (result.data, result.changed) == (b"not an image", False)
+
+
+def test_disabled_preprocessing_only_encodes_pil_images():
+    image = _scan(3000, 100)
+    result = ImagePreprocessor(PreprocessConfig(enabled=False)).process(image)
+    assert not result.changed
+    assert _open(result.data).size == (3000, 100)
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("OCR_IMAGE_FORMAT", "jpg")
+    monkeypatch.setenv("OCR_IMAGE_QUALITY", "500")
+    monkeypatch.setenv("OCR_MAX_IMAGE_DIM", "1600")
+    config = PreprocessConfig.from_env()
+    assert (config.fmt, config.quality, config.max_dimension) == ("JPEG", 100, 1600)
+    assert config.signature() != PreprocessConfig().signature()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+后台任务测试
+Background job tests
+"""
+
+import pytest
+
+from src.handlers import job_runner as job_runner_module
+from src.handlers.job_runner import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JobRunner,
+    JobStore,
+)
+from src.handlers.pdf_handler import PageError
+
+
+class _FakePdf:
+    """
+    代替 iter_pdf_page_texts：按 failing 集合让页面失败，并记录跳过的页面
+    Stand-in for iter_pdf_page_texts: pages in `failing` fail, skipped pages are recorded
+    """
+
+    def __init__(self, total: int, failing=()):
+        self.total = total
+        self.failing = set(failing)
+        self.skipped = []
+
+    def __call__(self, path, client, skip_pages=frozenset(), routes=None):
+        self.skipped.append(set(skip_pages))
+        for i in range(self.total):
+            if i in skip_pages:
+                yield i, self.total, None
+            elif i in self.failing:
+                yield i, self.total, PageError("[OCR 错误 | OCR Error: backend down]")
+            else:
+                yield i, self.total, f"page {i + 1}"
+
+
+def _finish(runner: JobRunner, job_id: str) -> dict:
+    return list(runner.watch(job_id, interval=0.01))[-1]
+
+
+@pytest.fixture
+def upload(tmp_path):
+    path = tmp_path / "book.pdf"
+    path.write_bytes(b"%PDF-1.4 test")
+    return str(path)
+
+
+def test_failed_pages_are_not_stored_and_rerun_on_resume(tmp_path, upload, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs" / "jobs.sqlite3"))
+    fake = _FakePdf(3, failing={0, 2})
+    monkeypatch.setattr(job_runner_module, "iter_pdf_page_texts", fake)
+
+    runner = JobRunner(object(), store)
+    job_id = runner.submit(upload)
+    status = _finish(runner, job_id)
+    assert status["status"] == JOB_FAILED
+    assert status["done_pages"] == 1
+    assert status["stats"]["failed_pages"] == 2
+    assert runner.pages(job_id) == [None, "page 2", None]
+
+    # 后端恢复后重启：只重新识别失败的页面 | Backend is back after a restart: only the failed pages are re-run
+    fake.failing.clear()
+    restarted = JobRunner(object(), store)
+    assert restarted.resume() == [job_id]
+    status = _finish(restarted, job_id)
+    assert status["status"] == JOB_DONE
+    assert status["error"] is None
+    assert fake.skipped[-1] == {1}
+    assert restarted.pages(job_id) == ["page 1", "page 2", "page 3"]
+    restarted.close()
+
+
+def test_always_failing_job_stops_resuming_at_the_attempt_cap(tmp_path, upload, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs" / "jobs.sqlite3"))
+    monkeypatch.setattr(job_runner_module, "iter_pdf_page_texts", _FakePdf(2, failing={1}))
+
+    runner = JobRunner(object(), store, max_attempts=2)
+    job_id = runner.submit(upload)
+    assert _finish(runner, job_id)["status"] == JOB_FAILED
+
+    restarted = JobRunner(object(), store, max_attempts=2)
+    assert restarted.resume() == [job_id]
+    status = _finish(restarted, job_id)
+    assert (status["status"], status["attempts"]) == (JOB_FAILED, 2)
+    assert "2 attempts" in status["error"]
+
+    # 之后的重启不再恢复该任务 | Later restarts leave the job alone
+    assert JobRunner(object(), store, max_attempts=2).resume() == []
+    restarted.close()
+
+
+def test_interrupted_job_at_the_attempt_cap_is_marked_failed(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    store.create("job", "book.pdf", "/tmp/book.pdf", "pdf")
+    store.start("job")
+    runner = JobRunner(object(), store, max_attempts=1)
+    assert runner.resume() == []
+    job = store.get("job")
+    assert job["status"] == JOB_FAILED and "Interrupted 1" in job["error"]
+    runner.close()
+
+
+def test_update_keeps_the_recorded_error_unless_cleared(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    store.create("job", "book.pdf", "/tmp/book.pdf", "pdf")
+    store.update("job", status=JOB_FAILED, error="backend down")
+    store.update("job", status=JOB_QUEUED)
+    assert store.get("job")["error"] == "backend down"
+    store.update("job", status=JOB_DONE, clear_error=True)
+    assert store.get("job")["error"] is None
+    store.close()
+
+
+def test_store_lists_unfinished_jobs_oldest_first(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    for job_id, status in (("a", JOB_RUNNING), ("b", JOB_DONE), ("c", JOB_QUEUED), ("d", JOB_FAILED)):
+        store.create(job_id, f"{job_id}.pdf", f"/tmp/{job_id}.pdf", "pdf")
+        store.update(job_id, status=status)
+    assert store.unfinished() == ["a", "c"]
+    assert store.unfinished(include_failed=True) == ["a", "c", "d"]
+    store.close()
+
+
+def test_store_keeps_pages_across_connections(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(path)
+    store.create("job", "book.pdf", "/tmp/book.pdf", "pdf")
+    store.update("job", total_pages=2, stats={"ocr_pages": 1})
+    store.save_page("job", 1, "second")
+    store.close()
+
+    reopened = JobStore(path)
+    job = reopened.get("job")
+    assert (job["total_pages"], job["done_pages"], job["stats"]) == (2, 1, {"ocr_pages": 1})
+    assert reopened.pages("job") == {1: "second"}
+    reopened.close()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+内存预算测试
+Memory budget tests
+"""
+
+from PIL import Image
+from pypdf import PdfWriter
+
+from src.handlers.pdf_handler import iter_pdf_page_texts
+from src.utils.memory import (
+    MemoryBudget,
+    MemoryMonitor,
+    SpillBuffer,
+    current_rss,
+    estimate_page_bytes,
+)
+from src.utils.page_filter import PageFilterConfig
+from src.utils.pdf_raster import PdfRasterizer, RasterConfig
+from src.utils.text_layer import TextLayerConfig
+
+_MB = 1024 * 1024
+
+
+def test_pages_in_flight_follow_the_budget():
+    budget = MemoryBudget(enabled=True, budget_mb=512)
+    assert budget.pages_in_flight(100 * _MB, ceiling=8) == 2
+    assert budget.pages_in_flight(1 * _MB, ceiling=8) == 8
+    # 单页超过预算时仍处理一页 | One page is still processed when it alone exceeds the budget
+    assert budget.pages_in_flight(1024 * _MB, ceiling=8) == 1
+    assert budget.spill_bytes() == 128 * _MB
+
+
+def test_page_estimate_grows_with_dpi():
+    assert estimate_page_bytes(200) == int(1700 * 2200 * 5.4)
+    assert estimate_page_bytes(300) > 2 * estimate_page_bytes(200)
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("OCR_STREAMING", "yes")
+    monkeypatch.setenv("OCR_MEMORY_BUDGET_MB", "1")
+    monkeypatch.setenv("OCR_SPILL_DIR", "")
+    budget = MemoryBudget.from_env()
+    assert (budget.enabled, budget.budget_mb, budget.spill_dir) == (True, 16, None)
+
+
+def test_spill_buffer_moves_to_disk_and_reads_back(tmp_path):
+    parts = [f"第 {i} 页 | page {i}\n" * 20 for i in range(50)]
+    with SpillBuffer(max_memory=4096, spill_dir=str(tmp_path)) as buffer:
+        buffer.extend(parts[:2])
+        assert not buffer.spilled
+        buffer.extend(parts[2:])
+        assert buffer.spilled
+        assert len(buffer) == 50
+        assert buffer.size == sum(len(part.encode("utf-8")) for part in parts)
+        assert (buffer[0], buffer[-1]) == (parts[0], parts[-1])
+        assert list(buffer) == parts
+        assert buffer.join("---") == "---".join(parts)
+
+        output = tmp_path / "result.md"
+        buffer.write_to(str(output), separator="\n\n")
+        assert output.read_text(encoding="utf-8") == "\n\n".join(parts)
+
+
+def test_monitor_records_the_peak():
+    assert current_rss() is not None
+    with MemoryMonitor(interval=0.01) as monitor:
+        block = bytearray(64 * _MB)
+        block[::4096] = b"x" * len(block[::4096])
+        monitor.sample()
+        del block
+    assert monitor.peak_rss >= monitor.start_rss
+    assert monitor.growth_mb >= 32
+    assert monitor.to_dict()["peak_rss_mb"] == monitor.peak_mb
+
+
+def test_streaming_mode_bounds_the_pages_in_memory(tmp_path, monkeypatch):
+    writer = PdfWriter()
+    for _ in range(6):
+        writer.add_blank_page(width=200, height=200)
+    path = str(tmp_path / "scan.pdf")
+    with open(path, "wb") as f:
+        writer.write(f)
+
+    runs = []
+
+    def _render(self, first, last):
+        runs.append(last - first + 1)
+        return [Image.new("RGB", (20, 20), "white") for _ in range(first, last + 1)]
+
+    class _Client:
+        max_workers = 8
+
+        def recognize(self, image):
+            return "text"
+
+    monkeypatch.setattr(PdfRasterizer, "render_range", _render)
+    # 16 MB 预算在 300 DPI 下只够一页 | A 16 MB budget fits one page at 300 DPI
+    texts = [
+        text for _, _, text in iter_pdf_page_texts(
+            path, _Client(), pipelined=False,
+            raster_config=RasterConfig(dpi=300, chunk_size=8),
+            text_config=TextLayerConfig(mode="ocr"),
+            memory_budget=MemoryBudget(enabled=True, budget_mb=16),
+            filter_config=PageFilterConfig(skip_blank=False, dedupe=False),
+        )
+    ]
+    assert texts == ["text"] * 6
+    assert runs == [1] * 6
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+运行指标测试
+Metrics tests
+"""
+
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from benchmarks.mock_ollama import MockConfig, MockOllamaServer
+from ollama_client import OllamaOCR
+from src.utils.metrics import (
+    CONTENT_TYPE,
+    OLLAMA_IN_FLIGHT,
+    OLLAMA_REQUESTS_TOTAL,
+    QUEUE_DEPTH,
+    MetricsRegistry,
+    client_collector,
+    mount_metrics,
+    submit_queued,
+)
+from src.utils.retry import CircuitBreaker, Retrier, RetryPolicy
+
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 32), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_counters_and_gauges_render_in_prometheus_format():
+    registry = MetricsRegistry()
+    files = registry.counter("files_total", "Files", ("file_type",))
+    files.inc(file_type="pdf")
+    files.inc(2, file_type='say "hi"\n')
+    running = registry.gauge("running", "Running")
+    with running.track():
+        assert running.value() == 1
+    running.set(0.5)
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP files_total Files", "# TYPE files_total counter"]
+    assert 'files_total{file_type="pdf"} 1' in lines
+    assert 'files_total{file_type="say \\"hi\\"\\n"} 2' in lines
+    assert "# TYPE running gauge" in lines and "running 0.5" in lines
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("mode",), buckets=(1.0, 5.0))
+    for value in (0.5, 1.0, 3.0, 10.0):
+        latency.observe(value, mode="generate")
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{mode="generate",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{mode="generate",le="5"} 3' in lines
+    assert 'latency_seconds_bucket{mode="generate",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{mode="generate"} 14.5' in lines
+    assert 'latency_seconds_count{mode="generate"} 4' in lines
+
+
+def test_registration_and_labels_are_checked():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits", ("path",))
+    assert registry.counter("hits_total", "Hits", ("path",)) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("hits_total", "Hits", ("path",))
+    with pytest.raises(ValueError):
+        counter.inc(host="a")
+
+
+def test_failing_collectors_do_not_break_the_scrape():
+    registry = MetricsRegistry()
+    registry.register_collector(lambda: 1 / 0)
+    registry.register_collector(lambda: [("up", "gauge", "Up", [({}, 1), ({"host": "b"}, None)])])
+    text = registry.render()
+    assert "# 采集失败 | collector failed: division by zero" in text
+    assert "up 1\n" in text and 'host="b"' not in text
+
+
+def test_queue_depth_counts_waiting_tasks():
+    baseline = QUEUE_DEPTH.value()
+    release = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        running = submit_queued(executor, release.wait)
+        waiting = [submit_queued(executor, lambda: None) for _ in range(3)]
+        # 第一个任务开始执行后离开队列 | The first task leaves the queue once it starts
+        deadline = time.monotonic() + 5
+        while QUEUE_DEPTH.value() != baseline + 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        waiting[0].cancel()
+        assert QUEUE_DEPTH.value() == baseline + 2
+        release.set()
+        running.result()
+        for future in waiting[1:]:
+            future.result()
+    finally:
+        executor.shutdown()
+    assert QUEUE_DEPTH.value() == baseline
+
+
+def test_client_requests_are_counted_by_outcome():
+    success = OLLAMA_REQUESTS_TOTAL.value(outcome="success")
+    errors = OLLAMA_REQUESTS_TOTAL.value(outcome="http_5xx")
+    retrier = Retrier(RetryPolicy(max_retries=0), CircuitBreaker(failure_threshold=100))
+
+    with MockOllamaServer(MockConfig(latency=0.0, jitter=0.0)) as server:
+        with OllamaOCR(host=server.url, cache=False, preprocessor=False, tiler=False) as client:
+            client.recognize(_png())
+            "".join(client.recognize_stream(_png()))
+    with MockOllamaServer(MockConfig(latency=0.0, jitter=0.0, error_rate=1.0)) as server:
+        with OllamaOCR(
+            host=server.url, retrier=retrier, cache=False, preprocessor=False, tiler=False
+        ) as client:
+            with pytest.raises(Exception):
+                client.recognize(_png())
+            registry = MetricsRegistry()
+            registry.register_collector(client_collector(client))
+            scraped = registry.render()
+
+    assert OLLAMA_REQUESTS_TOTAL.value(outcome="success") == success + 2
+    assert OLLAMA_REQUESTS_TOTAL.value(outcome="http_5xx") == errors + 1
+    assert OLLAMA_IN_FLIGHT.value() == 0
+    assert f'glm_ocr_backend_errors_total{{host="{server.url}"}} 1' in scraped
+    assert "glm_ocr_breaker_open 0" in scraped
+
+
+def test_metrics_endpoint():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits").inc()
+    app = FastAPI()
+    mount_metrics(app, registry, path="/internal/metrics")
+
+    response = TestClient(app).get("/internal/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert "hits_total 1" in response.text
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+OCR 结果缓存测试
+OCR result cache tests
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from ollama_client import OllamaOCR
+from src.utils import ocr_cache
+from src.utils.ocr_cache import OCRCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可控的墙钟时间 | Controllable wall clock"""
+    now = [1000.0]
+    monkeypatch.setattr(ocr_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_key_covers_image_model_prompt_and_options():
+    key = OCRCache.make_key(b"image", "glm-ocr", "prompt", {"temperature": 0, "top_p": 1})
+    assert key == OCRCache.make_key(b"image", "glm-ocr", "prompt", {"top_p": 1, "temperature": 0})
+    assert key != OCRCache.make_key(b"other", "glm-ocr", "prompt", {"temperature": 0, "top_p": 1})
+    assert key != OCRCache.make_key(b"image", "glm-ocr:q8", "prompt", {"temperature": 0, "top_p": 1})
+    assert key != OCRCache.make_key(b"image", "glm-ocr", "prompt 2", {"temperature": 0, "top_p": 1})
+    assert key != OCRCache.make_key(b"image", "glm-ocr", "prompt", {"temperature": 0.1, "top_p": 1})
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = OCRCache(max_entries=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"
+    cache.set("c", "C")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("A", "C")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_tier_respects_the_byte_limit():
+    cache = OCRCache(max_bytes=10)
+    cache.set("a", "12345")
+    cache.set("b", "67890")
+    cache.set("c", "x")
+    assert cache.get("a") is None
+    # 超过上限的单个结果不进入内存 | A single result over the limit is not kept in memory
+    cache.set("big", "x" * 11)
+    assert cache.get("big") is None
+    assert cache.stats()["memory_bytes"] <= 10
+
+
+def test_entries_expire(clock, tmp_path):
+    cache = OCRCache(ttl=60, disk_path=str(tmp_path / "cache.sqlite3"))
+    cache.set("a", "A")
+    clock[0] += 30
+    assert cache.get("a") == "A"
+    clock[0] += 31
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 2
+    cache.close()
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = OCRCache(disk_path=path)
+    first.set("a", "页面 A")
+    first.close()
+
+    second = OCRCache(disk_path=path)
+    assert second.get("a") == "页面 A"
+    assert second.get("a") == "页面 A"
+    stats = second.stats()
+    second.close()
+    # 磁盘命中后提升到内存 | Disk hits are promoted to memory
+    assert (stats["disk_hits"], stats["memory_hits"], stats["hit_ratio"]) == (1, 1, 1.0)
+
+
+def test_disk_tier_evicts_by_count(tmp_path):
+    cache = OCRCache(max_entries=0, disk_path=str(tmp_path / "cache.sqlite3"), disk_max_entries=10)
+    for i in range(ocr_cache._DISK_EVICT_INTERVAL):
+        cache.set(f"key {i}", "text")
+    stats = cache.stats()
+    cache.close()
+    assert stats["disk_entries"] == 10
+    assert stats["evictions"] == ocr_cache._DISK_EVICT_INTERVAL - 10
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("OCR_CACHE_ENABLED", "false")
+    assert OCRCache.from_env() is None
+    monkeypatch.setenv("OCR_CACHE_ENABLED", "true")
+    monkeypatch.setenv("OCR_CACHE_MAX_ENTRIES", "7")
+    monkeypatch.setenv("OCR_CACHE_TTL", "0")
+    cache = OCRCache.from_env()
+    assert (cache.max_entries, cache.ttl, cache.disk_path) == (7, None, None)
+
+
+def test_client_serves_repeated_images_from_the_cache(mock_ollama):
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 32), "white").save(buffer, format="PNG")
+    image = buffer.getvalue()
+
+    cache = OCRCache()
+    with OllamaOCR(host=mock_ollama.url, cache=cache, preprocessor=False, tiler=False) as client:
+        first = client.recognize(image)
+        requests_after_first = mock_ollama.stats()["requests"]
+        assert client.recognize(image) == first
+        assert "".join(client.recognize_stream(image)) == first
+        assert mock_ollama.stats()["requests"] == requests_after_first
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+识别结果和耗时分解测试
+Recognition result and timing breakdown tests
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from benchmarks.mock_ollama import MockConfig, MockOllamaServer
+from ollama_client import OllamaOCR
+from src.models.ocr_result import OCRResult, OCRTimings
+from src.utils.ocr_cache import OCRCache
+
+
+def test_response_fields_are_converted_to_seconds():
+    timings = OCRTimings(request_seconds=2.5).apply_response({
+        "total_duration": 2_000_000_000,
+        "load_duration": 500_000_000,
+        "prompt_eval_duration": 600_000_000,
+        "eval_duration": 800_000_000,
+        "prompt_eval_count": 256,
+        "eval_count": 40,
+    })
+    assert (timings.server_total_seconds, timings.load_seconds) == (2.0, 0.5)
+    assert (timings.prompt_eval_seconds, timings.eval_seconds) == (0.6, 0.8)
+    assert timings.upload_seconds == pytest.approx(0.5)
+    assert timings.tokens_per_second == pytest.approx(50.0)
+
+
+def test_missing_server_fields_stay_unknown():
+    timings = OCRTimings(request_seconds=1.0).apply_response({"response": "text"})
+    data = timings.to_dict()
+    assert data["server_total_seconds"] is None and data["upload_seconds"] is None
+    assert data["tokens_per_second"] is None
+
+
+def test_tile_timings_are_summed_with_the_wall_time():
+    parts = [
+        OCRTimings(encode_seconds=0.1, total_seconds=1.0, payload_bytes=100, eval_seconds=0.5, eval_count=10),
+        OCRTimings(encode_seconds=0.2, total_seconds=1.5, payload_bytes=50),
+    ]
+    combined = OCRTimings.combined(parts, total_seconds=1.6)
+    assert combined.total_seconds == 1.6
+    assert combined.encode_seconds == pytest.approx(0.3)
+    assert combined.payload_bytes == 150
+    assert (combined.eval_seconds, combined.eval_count, combined.load_seconds) == (0.5, 10, None)
+
+
+def test_client_reports_where_the_time_went():
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 32), "white").save(buffer, format="PNG")
+    image = buffer.getvalue()
+
+    with MockOllamaServer(MockConfig(latency=0.1, jitter=0.0, load_delay=0.05)) as server:
+        with OllamaOCR(host=server.url, cache=OCRCache(), preprocessor=False, tiler=False) as client:
+            first = client.recognize_detailed(image)
+            second = client.recognize_detailed(image)
+
+    assert isinstance(first, OCRResult) and str(first) == first.text
+    assert (first.host, first.model, first.cached) == (server.url, "glm-ocr", False)
+    timings = first.timings
+    assert timings.payload_bytes == len(image)
+    assert timings.load_seconds == pytest.approx(0.05, abs=0.01)
+    assert timings.prompt_eval_seconds + timings.eval_seconds == pytest.approx(0.1, abs=0.01)
+    assert timings.request_seconds >= timings.server_total_seconds - 0.01
+    assert timings.total_seconds >= timings.encode_seconds + timings.request_seconds
+
+    # 缓存命中没有服务器耗时 | Cache hits have no server-side timings
+    assert (second.text, second.cached, second.host) == (first.text, True, None)
+    assert second.timings.server_total_seconds is None
+    assert second.to_dict()["timings"]["request_seconds"] == 0.0
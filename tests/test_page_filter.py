@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+空白页与重复页过滤测试
+Blank and duplicate page filter tests
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+from PIL import ImageChops, ImageDraw
+
+from src.utils.page_filter import DuplicateIndex, PageFilterConfig, page_signature
+
+
+def _text(page: "Image.Image", xy, text: str, scale: int = 3) -> None:
+    """放大的位图字体，笔画宽度接近 200 DPI 下的 12 磅字 | Scaled bitmap font, strokes close to 12 pt text at 200 DPI"""
+    width, height = ImageDraw.Draw(page).textbbox((0, 0), text)[2:]
+    glyphs = Image.new("L", (width + 2, height + 2), 0)
+    ImageDraw.Draw(glyphs).text((1, 1), text, fill=255)
+    glyphs = glyphs.resize((glyphs.width * scale, glyphs.height * scale), Image.NEAREST)
+    page.paste("black", xy, glyphs)
+
+
+def _invoice(number: str, amount: str) -> "Image.Image":
+    """200 DPI 下同一版式的发票页面，只有发票号和金额不同 | Fixed-layout invoice page at 200 DPI, only number and amount vary"""
+    page = Image.new("RGB", (1654, 2339), "white")
+    draw = ImageDraw.Draw(page)
+    draw.rectangle((100, 100, 1550, 300), outline="black", width=6)
+    _text(page, (150, 160), "ACME Corporation - INVOICE")
+    for row in range(12):
+        y = 400 + row * 80
+        draw.line((100, y, 1550, y), fill="black", width=3)
+        _text(page, (130, y + 20), f"Item {row + 1}  Widget, standard size")
+    _text(page, (130, 1500), f"Invoice No. {number}")
+    _text(page, (130, 1580), f"Total due: {amount}")
+    return page
+
+
+def _rescan(page: "Image.Image", dx: int, dy: int, specks: float = 0.0005) -> "Image.Image":
+    """模拟重新扫描：整页偏移并加入零散噪点 | Simulate a rescan: shift the page and add scattered specks"""
+    pixels = np.asarray(ImageChops.offset(page.convert("L"), dx, dy)).copy()
+    rng = np.random.default_rng(7)
+    noise = rng.random(pixels.shape) < specks
+    pixels[noise] = rng.integers(0, 256, int(noise.sum()))
+    return Image.fromarray(pixels)
+
+
+@pytest.fixture(scope="module")
+def index():
+    """登记了第 1 页的索引 | Index holding page 1"""
+    index: DuplicateIndex[str] = DuplicateIndex(PageFilterConfig())
+    index.add(page_signature(_invoice("2024-0001", "1,250.00"), PageFilterConfig()), "page 1")
+    return index
+
+
+def test_blank_page_is_detected():
+    signature = page_signature(Image.new("RGB", (1654, 2339), "white"), PageFilterConfig())
+    assert signature.blank
+    assert not page_signature(_invoice("2024-0001", "1,250.00"), PageFilterConfig()).blank
+
+
+def test_identical_pages_are_duplicates(index):
+    assert index.find(page_signature(_invoice("2024-0001", "1,250.00"), PageFilterConfig())) == "page 1"
+
+
+@pytest.mark.parametrize("dx, dy", [(5, -3), (-12, 9), (0, 0)])
+def test_rescanned_and_shifted_pages_are_duplicates(index, dx, dy):
+    rescan = _rescan(_invoice("2024-0001", "1,250.00"), dx, dy)
+    assert index.find(page_signature(rescan, PageFilterConfig())) == "page 1"
+
+
+@pytest.mark.parametrize("number, amount", [
+    ("2024-0007", "1,250.00"),
+    ("2024-0002", "1,250.00"),
+    ("2024-0001", "1,850.00"),
+])
+def test_same_layout_different_digits_is_not_a_duplicate(index, number, amount):
+    assert index.find(page_signature(_invoice(number, amount), PageFilterConfig())) is None
+    rescan = _rescan(_invoice(number, amount), 4, 4)
+    assert index.find(page_signature(rescan, PageFilterConfig())) is None
+
+
+def test_dedupe_disabled_has_no_mask():
+    signature = page_signature(_invoice("2024-0001", "1,250.00"), PageFilterConfig(dedupe=False))
+    assert signature.mask is None
+    assert DuplicateIndex().find(signature) is None
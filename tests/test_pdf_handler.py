@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+PDF 处理器测试
+PDF handler tests
+"""
+
+import pytest
+from PIL import Image
+from pypdf import PdfWriter
+
+from src.handlers import pdf_handler
+from src.handlers.pdf_handler import iter_pdf_page_texts
+from src.utils.memory import MemoryBudget
+from src.utils.page_filter import PageFilterConfig
+from src.utils.pdf_raster import PdfRasterizer, RasterConfig
+from src.utils.text_layer import TextLayerConfig
+
+
+class _WidthClient:
+    """按图片宽度返回文本的 OCR 客户端 | OCR client that reports the image width"""
+
+    max_workers = 1
+
+    def recognize(self, image):
+        return f"width {image.width}"
+
+
+@pytest.fixture
+def scanned_pdf(tmp_path):
+    """没有文本层的 6 页 PDF | 6-page PDF without a text layer"""
+    writer = PdfWriter()
+    for _ in range(6):
+        writer.add_blank_page(width=200, height=200)
+    path = tmp_path / "scan.pdf"
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+def _page_texts(path, **kwargs):
+    return [
+        text for _, _, text in iter_pdf_page_texts(
+            path, _WidthClient(), pipelined=False,
+            raster_config=RasterConfig(chunk_size=3),
+            text_config=TextLayerConfig(mode="ocr"),
+            memory_budget=MemoryBudget(enabled=False),
+            filter_config=PageFilterConfig(skip_blank=False, dedupe=False),
+            **kwargs,
+        )
+    ]
+
+
+def test_sequential_pages_keep_their_images_when_a_run_comes_back_short(scanned_pdf, monkeypatch):
+    def _render_range(self, first, last):
+        # 第一个区间少返回最后一页 | The first run is missing its last page
+        last = last - 1 if first == 1 else last
+        return [Image.new("L", (100 + number, 50), 255) for number in range(first, last + 1)]
+
+    monkeypatch.setattr(PdfRasterizer, "render_range", _render_range)
+    assert _page_texts(scanned_pdf) == [
+        "width 101", "width 102", "", "width 104", "width 105", "width 106"
+    ]
+
+
+def test_sequential_skip_pages_are_not_rendered(scanned_pdf, monkeypatch):
+    rendered = []
+
+    def _render_range(self, first, last):
+        rendered.extend(range(first, last + 1))
+        return [Image.new("L", (100 + number, 50), 255) for number in range(first, last + 1)]
+
+    monkeypatch.setattr(PdfRasterizer, "render_range", _render_range)
+    texts = _page_texts(scanned_pdf, skip_pages={0, 3})
+    assert texts == [None, "width 102", "width 103", None, "width 105", "width 106"]
+    assert rendered == [2, 3, 5, 6]
+
+
+def test_raster_pool_is_shared_and_does_not_fork():
+    pool = pdf_handler._raster_pool(1)
+    assert pdf_handler._raster_pool(1) is pool
+    assert pool._mp_context.get_start_method() != "fork"
+    encoded = pool.submit(pdf_handler._encode_png, Image.new("L", (8, 8), 255)).result(timeout=60)
+    assert encoded.startswith(b"\x89PNG")
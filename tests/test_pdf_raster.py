@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+PDF 栅格化测试
+PDF rasterization tests
+"""
+
+from PIL import Image
+
+from src.utils.pdf_raster import PdfRasterizer, RasterConfig, group_page_runs
+
+
+def test_pages_are_grouped_into_contiguous_runs():
+    assert group_page_runs([1, 2, 3, 7, 8], chunk_size=2) == [(1, 2), (3, 3), (7, 8)]
+    assert group_page_runs([5, 3, 4, 4, 10]) == [(3, 5), (10, 10)]
+    assert group_page_runs(range(1, 8), chunk_size=3) == [(1, 3), (4, 6), (7, 7)]
+    assert group_page_runs([]) == []
+
+
+def test_each_run_is_rendered_with_one_call(monkeypatch):
+    calls = []
+
+    def _render(self, first_page, last_page):
+        calls.append((first_page, last_page))
+        return [Image.new("L", (10, page)) for page in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(PdfRasterizer, "render_range", _render)
+    rasterizer = PdfRasterizer("scan.pdf", RasterConfig(chunk_size=4))
+    pages = [(number, image.height) for number, image in rasterizer.iter_pages([9, 1, 2, 3, 5, 6])]
+
+    assert calls == [(1, 3), (5, 6), (9, 9)]
+    # 页码与渲染出的图片一一对应 | Page numbers line up with the rendered images
+    assert pages == [(1, 1), (2, 2), (3, 3), (5, 5), (6, 6), (9, 9)]
+
+
+def test_runs_are_rendered_lazily(monkeypatch):
+    calls = []
+
+    def _render(self, first_page, last_page):
+        calls.append(first_page)
+        return [Image.new("L", (1, 1))] * (last_page - first_page + 1)
+
+    monkeypatch.setattr(PdfRasterizer, "render_range", _render)
+    pages = PdfRasterizer("scan.pdf", RasterConfig(chunk_size=2)).iter_pages(range(1, 7))
+    assert next(pages)[0] == 1
+    assert calls == [1]
+    assert [number for number, _ in pages] == [2, 3, 4, 5, 6]
+    assert calls == [1, 3, 5]
+
+
+def test_config_from_env(monkeypatch):
+    monkeypatch.setenv("PDF_RASTER_DPI", "10")
+    monkeypatch.setenv("PDF_RASTER_FORMAT", "PNG")
+    monkeypatch.setenv("PDF_RASTER_CHUNK", "-1")
+    config = RasterConfig.from_env()
+    assert (config.dpi, config.fmt, config.chunk_size) == (36, "png", 0)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+熔断器测试
+Circuit breaker tests
+"""
+
+import pytest
+
+from src.utils import retry
+from src.utils.retry import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可控的单调时钟 | Controllable monotonic clock"""
+    now = [1000.0]
+    monkeypatch.setattr(retry.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    # 成功会清零连续失败计数 | A success resets the consecutive failures
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    stats = breaker.stats()
+    assert stats["trips"] == 1 and stats["rejected"] == 1
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    _trip(breaker)
+    clock[0] += 29
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock[0] += 1
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    # 探测进行中时拒绝其他请求 | Other requests are rejected while the probe runs
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    _trip(breaker)
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+    assert breaker.stats()["trips"] == 2
+
+    clock[0] += 30
+    assert breaker.allow()
+
+
+def test_released_probe_lets_the_next_one_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5)
+    _trip(breaker)
+    clock[0] += 5
+    assert breaker.allow() and not breaker.allow()
+    breaker.release_probe()
+    assert breaker.allow()
+
+
+def test_zero_threshold_disables_the_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+公平调度测试
+Fair scheduling tests
+"""
+
+import asyncio
+import threading
+import time
+
+from src.utils.scheduler import FairScheduler, ScheduledClient
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_slots_rotate_between_sessions():
+    scheduler = FairScheduler(concurrency=1)
+    order, threads = [], []
+
+    def _task(session, name):
+        with scheduler.slot(session):
+            order.append(name)
+
+    with scheduler.slot("holder"):
+        # 逐个排队，保证入队顺序确定 | Queue one by one so the enqueue order is fixed
+        for session, name in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1"), ("c", "c1"), ("b", "b2")]:
+            waiting = scheduler.stats()["waiting"]
+            thread = threading.Thread(target=_task, args=(session, name))
+            thread.start()
+            threads.append(thread)
+            _wait_for(lambda waiting=waiting: scheduler.stats()["waiting"] == waiting + 1)
+        assert scheduler.estimate("c")["position"] == 2
+
+    for thread in threads:
+        thread.join(timeout=2)
+    assert order == ["a1", "b1", "c1", "a2", "b2", "a3"]
+    stats = scheduler.stats()
+    assert stats["running"] == 0 and stats["waiting"] == 0 and stats["granted"] == 7
+
+
+def test_idle_scheduler_grants_immediately():
+    scheduler = FairScheduler(concurrency=2)
+    with scheduler.slot("a"), scheduler.slot("a"):
+        assert scheduler.stats()["running"] == 2
+        assert scheduler.estimate("b")["busy"]
+    assert scheduler.stats()["queued"] == 0
+
+
+def test_slot_is_released_on_error():
+    scheduler = FairScheduler(concurrency=1)
+    try:
+        with scheduler.slot("a"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert scheduler.stats()["running"] == 0
+
+
+def test_async_slots_rotate_and_cancelled_waiters_are_withdrawn():
+    async def _main():
+        scheduler = FairScheduler(concurrency=1)
+        order = []
+        release = asyncio.Event()
+
+        async def _task(session, name):
+            async with scheduler.slot_async(session):
+                order.append(name)
+                if name == "holder":
+                    await release.wait()
+
+        tasks = [asyncio.create_task(_task("holder", "holder"))]
+        await asyncio.sleep(0)
+        for session, name in [("a", "a1"), ("a", "a2"), ("b", "b1"), ("c", "c1")]:
+            tasks.append(asyncio.create_task(_task(session, name)))
+            await asyncio.sleep(0)
+        tasks[-1].cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return order, scheduler.stats()
+
+    order, stats = asyncio.run(_main())
+    assert order == ["holder", "a1", "b1", "a2"]
+    assert stats["running"] == 0 and stats["waiting"] == 0
+
+
+class _StreamClient:
+    """逐块产出并记录流是否被关闭的客户端 | Client that streams chunks and records whether the stream was closed"""
+
+    def __init__(self):
+        self.closed = False
+
+    def recognize_stream(self, image):
+        try:
+            yield from ("a", "b", "c")
+        finally:
+            self.closed = True
+
+
+def test_closing_a_scheduled_stream_returns_its_slot():
+    scheduler = FairScheduler(concurrency=1)
+    inner = _StreamClient()
+    stream = ScheduledClient(inner, scheduler, "a").recognize_stream("page.png")
+    assert next(stream) == "a"
+    assert scheduler.stats()["running"] == 1
+    stream.close()
+    assert inner.closed and scheduler.stats()["running"] == 0
+
+
+def _statuses(monkeypatch, values):
+    """让 app.queue_status 依次返回 values，最后一个值重复 | Make app.queue_status return values in turn, repeating the last"""
+    import app
+
+    values = list(values)
+    monkeypatch.setattr(app, "queue_status", lambda request=None: values.pop(0) if len(values) > 1 else values[0])
+    return app
+
+
+def test_queue_status_is_refreshed_until_the_first_result(monkeypatch):
+    app = _statuses(monkeypatch, ["3 ahead", "3 ahead", "2 ahead", "1 ahead", ""])
+    release = threading.Event()
+
+    def _documents():
+        release.wait(2)
+        yield "doc 1"
+        yield "doc 2"
+
+    items = app.with_queue_status(_documents(), interval=0.01)
+    assert [next(items) for _ in range(3)] == ["3 ahead", "2 ahead", "1 ahead"]
+    assert next(items) == ""
+    release.set()
+    assert list(items) == ["doc 1", "doc 2"]
+
+
+def test_queue_status_stream_is_closed_when_dropped_while_waiting(monkeypatch):
+    app = _statuses(monkeypatch, ["1 ahead"])
+    release, closed = threading.Event(), threading.Event()
+
+    def _documents():
+        try:
+            release.wait(2)
+            yield "doc 1"
+        finally:
+            closed.set()
+
+    items = app.with_queue_status(_documents(), interval=0.01)
+    assert next(items) == "1 ahead"
+    items.close()
+    release.set()
+    assert closed.wait(2)
+
+
+def test_queue_status_is_skipped_when_nobody_waits(monkeypatch):
+    app = _statuses(monkeypatch, [""])
+    assert list(app.with_queue_status(doc for doc in ["doc"])) == ["doc"]
+
+
+def test_async_queue_status_is_refreshed_until_the_first_result(monkeypatch):
+    app = _statuses(monkeypatch, ["2 ahead", "2 ahead", "1 ahead", ""])
+
+    async def _main():
+        release = asyncio.Event()
+        closed = []
+
+        async def _documents():
+            try:
+                await release.wait()
+                yield "doc 1"
+                yield "doc 2"
+            finally:
+                closed.append(True)
+
+        items = app.with_queue_status_async(_documents(), interval=0.01)
+        seen = [await anext(items) for _ in range(3)]
+        release.set()
+        seen += [item async for item in items]
+        return seen, closed
+
+    seen, closed = asyncio.run(_main())
+    assert seen == ["2 ahead", "1 ahead", "", "doc 1", "doc 2"]
+    assert closed == [True]
+
+
+def test_async_queue_status_stream_is_closed_when_dropped_while_waiting(monkeypatch):
+    app = _statuses(monkeypatch, ["1 ahead"])
+
+    async def _main():
+        closed = []
+
+        async def _documents():
+            try:
+                await asyncio.Event().wait()
+                yield "never"
+            finally:
+                closed.append(True)
+
+        items = app.with_queue_status_async(_documents(), interval=0.01)
+        assert await anext(items) == "1 ahead"
+        await asyncio.sleep(0.03)
+        await items.aclose()
+        return closed
+
+    assert asyncio.run(_main()) == [True]
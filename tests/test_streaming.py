@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+流式识别测试
+Streaming recognition tests
+"""
+
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+import app
+from ollama_client import OllamaOCR, _parse_stream_line
+from src.utils.ocr_cache import OCRCache
+
+
+def _png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 32), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class _StreamClient:
+    """逐块返回固定文本的客户端 | Client that streams fixed text chunks"""
+
+    max_workers = 2
+
+    def recognize(self, image):
+        return "Hello world"
+
+    def recognize_stream(self, image):
+        yield from ("Hello", " ", "world")
+
+
+def test_stream_yields_chunks_that_add_up_to_the_result(mock_ollama):
+    with OllamaOCR(host=mock_ollama.url, cache=False, preprocessor=False, tiler=False) as client:
+        chunks = list(client.recognize_stream(_png()))
+        text = client.recognize(_png())
+    assert len(chunks) > 1
+    assert "".join(chunks).strip() == text
+
+
+def test_unfinished_streams_are_not_cached(mock_ollama):
+    cache = OCRCache()
+    with OllamaOCR(host=mock_ollama.url, cache=cache, preprocessor=False, tiler=False) as client:
+        stream = client.recognize_stream(_png())
+        next(stream)
+        stream.close()
+        assert cache.stats()["sets"] == 0
+
+        text = "".join(client.recognize_stream(_png())).strip()
+        assert cache.stats()["sets"] == 1
+        assert client.recognize(_png()) == text
+
+
+@pytest.mark.parametrize("line", [b"not json", b"[1]", b'{"error": "model not found"}'])
+def test_invalid_stream_lines_raise(line):
+    with pytest.raises(ValueError):
+        _parse_stream_line(line)
+
+
+def test_image_results_grow_token_by_token():
+    outputs = list(app.stream_single_file(SimpleNamespace(name="scan.png"), client=_StreamClient()))
+    assert outputs == ["Hello", "Hello ", "Hello world"]
+
+
+def test_pdf_pages_are_emitted_as_they_finish(monkeypatch):
+    produced = []
+
+    def _pages(path, client, pipelined=None):
+        for i in range(3):
+            produced.append(i)
+            yield i, 3, f"page {i + 1}"
+
+    monkeypatch.setattr(app, "iter_pdf_page_texts", _pages)
+    outputs = app.stream_single_file(
+        SimpleNamespace(name="book.pdf"), pdf_output_mode="merge", client=_StreamClient()
+    )
+    first = next(outputs)
+    # 第一页显示时后面的页面还没有开始 | Later pages have not started when the first is shown
+    assert produced == [0]
+    assert "page 1" in first and "page 2" not in first
+    rest = list(outputs)
+    assert len(rest) == 2
+    assert all(f"page {i}" in rest[-1] for i in (1, 2, 3))
+
+
+def test_multiple_files_are_emitted_in_upload_order():
+    files = [SimpleNamespace(name=name) for name in ("a.png", "b.png", "c.png")]
+    documents = [
+        [result.name for result in document.files]
+        for document in app.stream_document(files, client=_StreamClient())
+    ]
+    assert documents == [["a.png"], ["a.png", "b.png"], ["a.png", "b.png", "c.png"]]
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+文本层与 OCR 路由测试
+Text-layer versus OCR routing tests
+"""
+
+from collections import Counter
+
+import pytest
+from PIL import Image
+from pypdf import PdfReader, PdfWriter
+
+from benchmarks.corpus import write_text_pdf
+from src.handlers.pdf_handler import iter_pdf_page_texts
+from src.utils.memory import MemoryBudget
+from src.utils.page_filter import PageFilterConfig
+from src.utils.pdf_raster import PdfRasterizer, RasterConfig
+from src.utils.text_layer import (
+    REASON_EMPTY,
+    REASON_FORCED,
+    REASON_GARBLED,
+    REASON_GOOD,
+    REASON_SPARSE,
+    ROUTE_OCR,
+    ROUTE_TEXT,
+    TextLayerConfig,
+    format_route_counts,
+    garbled_ratio,
+    page_has_images,
+    route_page,
+)
+
+_LINES = [f"Line {i}: the quick brown fox jumps over the lazy dog" for i in range(20)]
+
+
+@pytest.fixture
+def pages(tmp_path):
+    """一页文本层页面和一页扫描图片 | One text-layer page and one scanned image"""
+    text_path = str(tmp_path / "text.pdf")
+    write_text_pdf(text_path, [_LINES])
+    scan_path = str(tmp_path / "scan.pdf")
+    Image.new("RGB", (850, 1100), "white").save(scan_path, format="PDF", resolution=100)
+    return PdfReader(text_path).pages[0], PdfReader(scan_path).pages[0]
+
+
+def test_garbled_ratio():
+    assert garbled_ratio("") == 0.0
+    assert garbled_ratio("ab \n cd") == 0.0
+    assert garbled_ratio("ab�") == 0.5
+
+
+def test_image_detection(pages):
+    text_page, scan_page = pages
+    assert not page_has_images(text_page)
+    assert page_has_images(scan_page)
+
+
+def test_good_text_layer_is_used(pages):
+    text_page, _ = pages
+    text = text_page.extract_text()
+    score = route_page(text_page, text, TextLayerConfig())
+    assert (score.route, score.reason) == (ROUTE_TEXT, REASON_GOOD)
+    assert score.chars > 500 and score.density > 2.0
+    # 密度足够时不检查图片 | Dense pages skip the image check
+    assert score.has_images is None
+
+
+@pytest.mark.parametrize("text, reason", [
+    ("", REASON_EMPTY),
+    ("   \n ", REASON_EMPTY),
+    (" ok", REASON_GARBLED),
+    ("Figure 1", REASON_SPARSE),
+])
+def test_scans_and_bad_text_layers_go_to_ocr(pages, text, reason):
+    _, scan_page = pages
+    score = route_page(scan_page, text, TextLayerConfig())
+    assert (score.route, score.reason) == (ROUTE_OCR, reason)
+
+
+def test_sparse_text_without_images_is_kept(pages):
+    text_page, _ = pages
+    score = route_page(text_page, "Page 3", TextLayerConfig())
+    assert (score.route, score.has_images) == (ROUTE_TEXT, False)
+
+
+def test_forced_modes(pages):
+    text_page, scan_page = pages
+    assert route_page(text_page, "text", TextLayerConfig(mode="ocr")).route == ROUTE_OCR
+    forced = route_page(scan_page, "", TextLayerConfig(mode="text"))
+    assert (forced.route, forced.reason) == (ROUTE_TEXT, REASON_FORCED)
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("PDF_TEXT_LAYER_MODE", "bogus")
+    monkeypatch.setenv("PDF_TEXT_MAX_GARBLED", "3")
+    config = TextLayerConfig.from_env()
+    assert (config.mode, config.max_garbled_ratio) == ("auto", 1.0)
+
+
+def test_format_route_counts():
+    counts = Counter({("text", "good"): 12, ("ocr", "empty"): 1, ("ocr", "garbled"): 2})
+    assert format_route_counts(counts) == "text 12 (good 12), ocr 3 (empty 1, garbled 2)"
+    counts[("skipped", "blank")] = 1
+    assert format_route_counts(counts).endswith(", skipped 1 (blank 1)")
+    assert format_route_counts(Counter()) == "text 0, ocr 0"
+
+
+def test_only_pages_without_a_usable_text_layer_are_ocred(tmp_path, monkeypatch):
+    text_path = str(tmp_path / "text.pdf")
+    write_text_pdf(text_path, [_LINES, _LINES[:10]])
+    scan_path = str(tmp_path / "scan.pdf")
+    Image.new("RGB", (850, 1100), "white").save(scan_path, format="PDF", resolution=100)
+    writer = PdfWriter()
+    writer.append(text_path)
+    writer.append(scan_path)
+    mixed = str(tmp_path / "mixed.pdf")
+    with open(mixed, "wb") as f:
+        writer.write(f)
+
+    rendered = []
+
+    def _render(self, first, last):
+        rendered.extend(range(first, last + 1))
+        return [Image.new("RGB", (85, 110), "white") for _ in range(first, last + 1)]
+
+    class _Client:
+        max_workers = 1
+
+        def recognize(self, image):
+            return "ocr text"
+
+    monkeypatch.setattr(PdfRasterizer, "render_range", _render)
+    routes = Counter()
+    texts = [
+        text for _, _, text in iter_pdf_page_texts(
+            mixed, _Client(), pipelined=False, raster_config=RasterConfig(),
+            text_config=TextLayerConfig(), routes=routes,
+            memory_budget=MemoryBudget(enabled=False),
+            filter_config=PageFilterConfig(skip_blank=False, dedupe=False),
+        )
+    ]
+    assert "Line 0" in texts[0] and "Line 9" in texts[1]
+    assert texts[2] == "ocr text"
+    # 只栅格化需要 OCR 的页面 | Only the page that needs OCR is rasterized
+    assert rendered == [3]
+    assert routes == {(ROUTE_TEXT, REASON_GOOD): 2, (ROUTE_OCR, REASON_EMPTY): 1}
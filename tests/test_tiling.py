@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+分块识别测试
+Tiled recognition tests
+"""
+
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from src.utils.tiling import ImageTiler, TilingConfig, plan_tiles, stitch_tiles
+
+
+@pytest.mark.parametrize("size", [(4000, 6000), (4284, 5712), (3024, 4032), (1080, 3000)])
+def test_ordinary_photos_are_not_tiled(size):
+    assert not ImageTiler(TilingConfig(tile_size=2048)).needs_tiling(*size)
+
+
+def test_tall_screenshot_is_cut_into_full_width_strips():
+    tiler = ImageTiler(TilingConfig(tile_size=2048, overlap=160))
+    assert tiler.needs_tiling(1080, 8000)
+    rows = plan_tiles(1080, 8000, 2048, 160)
+    assert all(len(row) == 1 for row in rows)
+    assert all(left == 0 and right == 1080 for (left, _, right, _), in rows)
+    assert rows[0][0][1] == 0 and rows[-1][0][3] == 8000
+    # 相邻横条重叠 | Neighbouring strips overlap
+    assert all(rows[i + 1][0][1] < rows[i][0][3] for i in range(len(rows) - 1))
+
+
+def test_width_is_split_only_when_a_strip_is_too_wide():
+    assert len(plan_tiles(2560, 20000, 2048, 160)[0]) == 1
+    assert len(plan_tiles(5000, 30000, 2048, 160)[0]) == 3
+
+
+def test_strips_are_stitched_top_to_bottom_without_overlap():
+    strips = [
+        ["# Report", "First paragraph spans the whole width of the page.",
+         "Second paragraph also spans the whole width.", "Third paragraph is cut in ha"],
+        ["Second paragraph also spans the whole width.", "Third paragraph is cut in half by the edge.",
+         "Fourth paragraph closes the page."],
+    ]
+    text = stitch_tiles([["\n".join(strips[0])], ["\n".join(strips[1])]])
+    assert text.split("\n") == [
+        "# Report",
+        "First paragraph spans the whole width of the page.",
+        "Second paragraph also spans the whole width.",
+        "Third paragraph is cut in half by the edge.",
+        "Fourth paragraph closes the page.",
+    ]
+
+
+def test_grid_is_stitched_row_by_row():
+    rows = [
+        ["A1 left column line one\nA1 left column line two", "B1 right column line one"],
+        ["A1 left column line two\nA2 left column line three", "B2 right column line two"],
+    ]
+    assert stitch_tiles(rows).split("\n\n") == [
+        "A1 left column line one\nA1 left column line two",
+        "B1 right column line one",
+        "A2 left column line three",
+        "B2 right column line two",
+    ]
+
+
+def test_unmatched_strips_are_joined_not_dropped():
+    assert stitch_tiles([["upper text"], ["lower text"]]) == "upper text\n\nlower text"
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_plan_closes_images_it_opens(tmp_path, monkeypatch):
+    opened = []
+    real_open = Image.open
+
+    def _open(*args, **kwargs):
+        opened.append(real_open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(Image, "open", _open)
+    tiler = ImageTiler(TilingConfig(tile_size=256, overlap=32))
+    small, tall = tmp_path / "small.png", tmp_path / "tall.png"
+    small.write_bytes(_png(200, 300))
+    tall.write_bytes(_png(200, 2000))
+
+    assert tiler.plan(str(small)) is None
+    assert tiler.plan(_png(200, 300)) is None
+    plan = tiler.plan(str(tall))
+    assert plan is not None and plan.image.size == (200, 2000)
+    assert len(opened) == 3 and all(image.fp is None for image in opened)
+
+
+def test_plan_rewinds_and_keeps_caller_file_objects_open():
+    tiler = ImageTiler(TilingConfig(tile_size=256, overlap=32))
+    stream = BytesIO(_png(200, 300))
+    stream.seek(0)
+    assert tiler.plan(stream) is None
+    assert not stream.closed and stream.tell() == 0
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+模型预热和保活测试
+Model warm-up and keep-warm tests
+"""
+
+import socket
+from datetime import datetime
+
+import pytest
+
+from benchmarks.mock_ollama import MockConfig, MockOllamaServer
+from ollama_client import OllamaOCR
+from src.utils.backend_pool import BackendPool, parse_backends
+from src.utils.warmup import (
+    KeepWarmConfig,
+    KeepWarmPinger,
+    parse_days,
+    parse_hours,
+    parse_keep_alive,
+)
+
+# 2026-10-19 是星期一 | 2026-10-19 is a Monday
+MONDAY = datetime(2026, 10, 19)
+
+
+def test_parse_keep_alive():
+    assert parse_keep_alive(None) is None
+    assert parse_keep_alive("  ") is None
+    assert parse_keep_alive("600") == 600
+    assert parse_keep_alive("-1") == -1
+    assert parse_keep_alive(" 30m ") == "30m"
+
+
+def test_parse_schedule():
+    assert parse_days("mon-fri") == {0, 1, 2, 3, 4}
+    assert parse_days("fri-mon") == {4, 5, 6, 0}
+    assert parse_days("Monday, wed") == {0, 2}
+    with pytest.raises(ValueError):
+        parse_days("funday")
+    with pytest.raises(ValueError):
+        parse_hours("8am")
+
+
+@pytest.mark.parametrize("hours, days, moment, active", [
+    ("08:00-19:00", "mon-fri", MONDAY.replace(hour=8), True),
+    ("08:00-19:00", "mon-fri", MONDAY.replace(hour=19), False),
+    ("08:00-19:00", "mon-fri", MONDAY.replace(day=18, hour=12), False),
+    ("22:00-06:00", "mon-sun", MONDAY.replace(hour=23), True),
+    ("22:00-06:00", "mon-sun", MONDAY.replace(hour=5, minute=59), True),
+    ("22:00-06:00", "mon-sun", MONDAY.replace(hour=12), False),
+])
+def test_business_hours(hours, days, moment, active):
+    assert KeepWarmConfig(enabled=True, hours=hours, days=days).is_active(moment) is active
+
+
+def test_pinger_only_pings_during_business_hours():
+    now = [MONDAY.replace(hour=7)]
+    calls = []
+
+    def _ping():
+        calls.append(now[0])
+        if len(calls) == 2:
+            raise ConnectionError("down")
+
+    pinger = KeepWarmPinger(_ping, KeepWarmConfig(enabled=True), clock=lambda: now[0])
+    assert not pinger.tick()
+    now[0] = MONDAY.replace(hour=9)
+    assert pinger.tick()
+    now[0] = MONDAY.replace(hour=10)
+    assert pinger.tick()
+    stats = pinger.stats()
+    assert (stats["pings"], stats["failures"]) == (1, 1)
+    assert stats["last_ping"] == MONDAY.replace(hour=10).isoformat()
+
+
+def test_disabled_pinger_does_not_start():
+    pinger = KeepWarmPinger(lambda: None, KeepWarmConfig(enabled=False))
+    assert not pinger.start()
+    assert not pinger.stats()["running"]
+    with pytest.raises(ValueError):
+        KeepWarmPinger(lambda: None, KeepWarmConfig(hours="noon"))
+
+
+def test_warm_up_reports_load_and_inference_time_per_host():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        unreachable = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    with MockOllamaServer(MockConfig(latency=0.05, jitter=0.0, load_delay=0.2)) as server:
+        pool = BackendPool(parse_backends(f"{server.url},{unreachable}"), health_interval=0)
+        with OllamaOCR(backends=pool, keep_alive="30m", cache=False, preprocessor=False) as client:
+            payloads = []
+            post = client.session.post
+
+            def _post(url, **kwargs):
+                payloads.append(kwargs.get("json"))
+                return post(url, **kwargs)
+
+            client.session.post = _post
+            warm, down = client.warm_up()
+        pool.close()
+
+    assert warm["error"] is None
+    assert warm["load_seconds"] == pytest.approx(0.2, abs=0.05)
+    assert warm["inference_seconds"] == pytest.approx(0.05, abs=0.03)
+    # 不可用的主机记录错误而不是抛出 | The unreachable host records an error instead of raising
+    assert down["host"] == unreachable and down["error"]
+    assert all(payload["keep_alive"] == "30m" for payload in payloads)